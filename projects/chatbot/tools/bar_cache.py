@@ -0,0 +1,137 @@
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+import yfinance as yf
+
+from tools.rate_limiter import RateLimiter
+from tools.singleflight import SingleFlight
+
+
+# ============================================================
+# 🔹 BASE-RESOLUTION BAR CACHE (one download, every timeframe)
+# ============================================================
+BAR_CACHE_INTRADAY_BASE = os.getenv("BAR_CACHE_INTRADAY_BASE", "5m")
+BAR_CACHE_INTRADAY_DAYS = int(os.getenv("BAR_CACHE_INTRADAY_DAYS", "59"))  # Yahoo serves 5m bars for 60 days
+BAR_CACHE_INTRADAY_TTL = float(os.getenv("BAR_CACHE_INTRADAY_TTL", "300"))
+BAR_CACHE_DAILY_TTL = float(os.getenv("BAR_CACHE_DAILY_TTL", "3600"))
+# Off by default, as in stock-advisor (OHLCV_DAILY_FROM_INTRADAY): daily volume summed
+# from intraday bars misses the opening/closing auction prints. Set to 1 to serve 1d /
+# 1wk / 1mo bars from the cached 5m series and save the separate daily download.
+BAR_CACHE_DAILY_FROM_INTRADAY = os.getenv("BAR_CACHE_DAILY_FROM_INTRADAY", "0") == "1"
+
+INTRADAY = {
+    "1m": pd.Timedelta(minutes=1), "2m": pd.Timedelta(minutes=2), "5m": pd.Timedelta(minutes=5),
+    "15m": pd.Timedelta(minutes=15), "30m": pd.Timedelta(minutes=30), "60m": pd.Timedelta(hours=1),
+    "90m": pd.Timedelta(minutes=90), "1h": pd.Timedelta(hours=1),
+}
+CALENDAR = ("1d", "1wk", "1mo")
+
+
+def resample_ohlcv(df: pd.DataFrame, interval: str) -> pd.DataFrame:
+    """
+    Aggregate OHLCV bars into `interval` bars along session boundaries:
+    intraday bins start at each session's first bar and never span two sessions,
+    daily bars are one per session date, weekly bars start on Monday, monthly on the 1st.
+    """
+    if df.empty:
+        return df
+    sessions = df.index.normalize()
+    if interval in INTRADAY:
+        ts = pd.Series(df.index, index=df.index)
+        first = ts.groupby(sessions).transform("min")
+        labels = pd.DatetimeIndex(first + (ts - first) // INTRADAY[interval] * INTRADAY[interval])
+    elif interval == "1d":
+        labels = sessions
+    else:
+        local = sessions.tz_localize(None) if df.index.tz is not None else sessions
+        days = local.dayofweek if interval == "1wk" else local.day - 1
+        local = local - pd.to_timedelta(days, unit="D")
+        labels = local.tz_localize(df.index.tz) if df.index.tz is not None else local
+
+    grouped = df.groupby(labels, sort=True)
+    how = {"Open": "first", "High": "max", "Low": "min", "Volume": "sum", "Dividends": "sum", "Capital Gains": "sum"}
+    out = {}
+    for column in df.columns:
+        if column == "Stock Splits":
+            out[column] = df[column].replace(0, 1).groupby(labels, sort=True).prod().replace(1, 0)
+        else:
+            out[column] = grouped[column].agg(how.get(column, "last"))
+    result = pd.DataFrame(out)[list(df.columns)]
+    result.index.name = df.index.name if interval in INTRADAY else "Date"
+    return result
+
+
+class BarCache:
+    """
+    Keeps one base-resolution series per symbol and derives every requested
+    interval from it locally, so intraday requests for a symbol (get_summary's
+    1h bars, 5m-30m history) share a single Yahoo download, and daily-and-longer
+    requests share one daily download.
+
+    - Windows within BAR_CACHE_INTRADAY_DAYS use the intraday base (5m): 5m, 15m,
+      30m, 1h, 90m bars and (with BAR_CACHE_DAILY_FROM_INTRADAY) 1d / 1wk / 1mo bars.
+    - Longer windows use 1d bars for 1d / 1wk / 1mo.
+    - Anything else (e.g. 1m bars) is downloaded as requested.
+
+    A base series is re-downloaded when older than its TTL or when a request
+    reaches further back than it covers.
+    """
+
+    _data = {}  # (symbol, base) -> (fetched_at, covers_from, frame)
+    _lock = threading.Lock()
+
+    @staticmethod
+    def base_interval(start: str, interval: str) -> str:
+        window = datetime.today() - datetime.strptime(start, "%Y-%m-%d")
+        if window <= timedelta(days=BAR_CACHE_INTRADAY_DAYS):
+            base = INTRADAY[BAR_CACHE_INTRADAY_BASE]
+            if interval in INTRADAY and INTRADAY[interval] >= base and INTRADAY[interval] % base == pd.Timedelta(0):
+                return BAR_CACHE_INTRADAY_BASE
+            if interval in CALENDAR and BAR_CACHE_DAILY_FROM_INTRADAY:
+                return BAR_CACHE_INTRADAY_BASE
+        if interval in CALENDAR:
+            return "1d"
+        return interval
+
+    @classmethod
+    def _download(cls, symbol: str, start: str, interval: str) -> pd.DataFrame:
+        end = (datetime.today() + timedelta(days=1)).strftime("%Y-%m-%d")  # end is exclusive
+        key = ("history", symbol, start, end, interval)
+        return SingleFlight.do(
+            key,
+            lambda: RateLimiter.call("yahoo", yf.Ticker(symbol).history, start=start, end=end, interval=interval),
+        )
+
+    @classmethod
+    def _base(cls, symbol: str, start: str, base: str) -> pd.DataFrame:
+        ttl = BAR_CACHE_INTRADAY_TTL if base in INTRADAY else BAR_CACHE_DAILY_TTL
+        with cls._lock:
+            entry = cls._data.get((symbol, base))
+        if entry and time.time() - entry[0] < ttl and entry[1] <= start:
+            return entry[2]
+
+        covers_from = start
+        if base == BAR_CACHE_INTRADAY_BASE:
+            covers_from = min(start, (datetime.today() - timedelta(days=BAR_CACHE_INTRADAY_DAYS)).strftime("%Y-%m-%d"))
+        df = cls._download(symbol, covers_from, base)
+        with cls._lock:
+            cls._data[(symbol, base)] = (time.time(), covers_from, df)
+        return df
+
+    @classmethod
+    def history(cls, symbol: str, start: str, end: str, interval: str = "1d") -> pd.DataFrame:
+        """Bars in [start, end) at `interval`, like ticker.history(start=..., end=...)."""
+        symbol = symbol.upper()
+        base = cls.base_interval(start, interval)
+        df = cls._base(symbol, start, base)
+        if df.empty:
+            return df
+        tz = df.index.tz
+        lower, upper = pd.Timestamp(start), pd.Timestamp(end)
+        if tz is not None:
+            lower, upper = lower.tz_localize(tz), upper.tz_localize(tz)
+        df = df[(df.index >= lower) & (df.index < upper)]
+        return df if base == interval else resample_ohlcv(df, interval)
@@ -3,6 +3,7 @@ import requests
 from dotenv import load_dotenv
 from agents import function_tool
 from core.logger import log_call
+from tools.rate_limiter import RateLimiter
 
 # Load environment variables once
 load_dotenv()
@@ -71,7 +72,7 @@ class GoogleTools:
             headers = {"X-API-KEY": api_key, "Content-Type": "application/json"}
             payload = {"q": query, "num": num_results, "tbs": "qdr:d"}  # results from last 24h
 
-            response = requests.post(url, headers=headers, json=payload)
+            response = RateLimiter.call("serper", requests.post, url, headers=headers, json=payload)
             response.raise_for_status()
             data = response.json()
 
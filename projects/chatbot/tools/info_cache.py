@@ -0,0 +1,61 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import yfinance as yf
+
+from tools.rate_limiter import RateLimiter
+
+
+# ============================================================
+# 🔹 YAHOO .info CACHE (size-bounded LRU + per-field TTL)
+# ============================================================
+INFO_CACHE_SIZE = int(os.getenv("INFO_CACHE_SIZE", "1024"))
+INFO_STATIC_TTL = float(os.getenv("INFO_STATIC_TTL", str(24 * 3600)))
+INFO_PRICE_TTL = float(os.getenv("INFO_PRICE_TTL", "15"))
+
+# Quote fields that move intraday; everything else in .info is treated as static.
+PRICE_FIELDS = {
+    "currentPrice", "previousClose", "open", "dayLow", "dayHigh", "volume",
+    "bid", "ask", "marketCap", "fiftyTwoWeekLow", "fiftyTwoWeekHigh",
+}
+PRICE_FIELD_PREFIXES = ("regularMarket", "preMarket", "postMarket")
+
+
+class InfoCache:
+    """
+    Shared cache for yfinance `Ticker.info` payloads.
+
+    A lookup names the fields it needs and is served from memory while the payload
+    is younger than the strictest freshness among them: quote fields live for
+    seconds, static company metadata (name, currency, sector, ...) for a day.
+    """
+
+    _data = OrderedDict()  # symbol -> (fetched_at, info)
+    _lock = threading.Lock()
+
+    @staticmethod
+    def field_ttl(name: str) -> float:
+        if name in PRICE_FIELDS or name.startswith(PRICE_FIELD_PREFIXES):
+            return INFO_PRICE_TTL
+        return INFO_STATIC_TTL
+
+    @classmethod
+    def get_info(cls, symbol: str, fields=None) -> dict:
+        key = symbol.upper()
+        max_age = min((cls.field_ttl(f) for f in fields), default=INFO_PRICE_TTL) if fields else INFO_PRICE_TTL
+        now = time.time()
+        with cls._lock:
+            entry = cls._data.get(key)
+            if entry and now - entry[0] < max_age:
+                cls._data.move_to_end(key)
+                return entry[1]
+
+        info = RateLimiter.call("yahoo", getattr, yf.Ticker(key), "info") or {}
+        with cls._lock:
+            cls._data[key] = (time.time(), info)
+            cls._data.move_to_end(key)
+            while len(cls._data) > INFO_CACHE_SIZE:
+                cls._data.popitem(last=False)
+        return info
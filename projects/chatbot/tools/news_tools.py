@@ -3,6 +3,7 @@ import requests
 from dotenv import load_dotenv
 from agents import function_tool
 from core.logger import log_call
+from tools.rate_limiter import RateLimiter
 import datetime
 
 # Load environment variables once
@@ -108,7 +109,7 @@ class NewsTools:
                     "apiKey": api_key
                 }
 
-            response = requests.get(url, params=params)
+            response = RateLimiter.call("newsapi", requests.get, url, params=params)
             response.raise_for_status()
             data = response.json()
 
@@ -0,0 +1,45 @@
+import threading
+from collections import Counter
+from concurrent.futures import Future
+
+
+# ============================================================
+# 🔹 SINGLE-FLIGHT (coalesce concurrent identical requests)
+# ============================================================
+class SingleFlight:
+    """
+    Concurrent calls with the same key share one execution: the first caller runs
+    the request, callers arriving while it is in flight wait for its result.
+    `stats` counts executions and coalesced calls per key[0].
+    """
+
+    _lock = threading.Lock()
+    _inflight = {}
+    stats = Counter()
+
+    @classmethod
+    def do(cls, key, fn, *args, **kwargs):
+        with cls._lock:
+            future = cls._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = cls._inflight[key] = Future()
+                cls.stats[f"{key[0]}.executions"] += 1
+            else:
+                cls.stats[f"{key[0]}.coalesced"] += 1
+
+        if not leader:
+            result = future.result()
+            return result.copy() if hasattr(result, "copy") else result
+
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            with cls._lock:
+                del cls._inflight[key]
+            future.set_exception(e)
+            raise
+        with cls._lock:
+            del cls._inflight[key]
+        future.set_result(result)
+        return result
@@ -1,9 +1,10 @@
 import os
 import requests
-import yfinance as yf
 from dotenv import load_dotenv
 from agents import function_tool
 from core.logger import log_call
+from tools.bar_cache import BarCache
+from tools.info_cache import InfoCache
 from datetime import datetime, timedelta
 
 # Load environment variables
@@ -20,6 +21,15 @@ class FinanceTools:
     analyze recent market trends, market sentiments, and generate market insights.
     """
 
+    @staticmethod
+    def _history(symbol: str, start: str, end: str, interval: str = "1d"):
+        """
+        Bars for [start, end) at `interval`, derived from cached base series per
+        symbol (see BarCache): one intraday and one daily download serve every
+        timeframe get_summary, get_history and get_market_sentiment ask for.
+        """
+        return BarCache.history(symbol, start, end, interval=interval)
+
     @staticmethod
     @function_tool
     @log_call
@@ -48,8 +58,6 @@ class FinanceTools:
             - Period and interval used
         """
         try:
-            ticker = yf.Ticker(symbol)
-
             # Calculate start and end dates based on period
             end_date = datetime.today()
             if period.endswith("d"):
@@ -63,9 +71,10 @@ class FinanceTools:
             start_date = end_date - timedelta(days=days)
 
             # Fetch recent data explicitly
-            data = ticker.history(
-                start=start_date.strftime("%Y-%m-%d"),
-                end=end_date.strftime("%Y-%m-%d"),
+            data = FinanceTools._history(
+                symbol,
+                start_date.strftime("%Y-%m-%d"),
+                end_date.strftime("%Y-%m-%d"),
                 interval=interval
             )
 
@@ -78,7 +87,7 @@ class FinanceTools:
             change = round(current_price - open_price, 2)
             pct_change = round((change / open_price) * 100, 2)
 
-            info = ticker.info
+            info = InfoCache.get_info(symbol, fields=["longName", "currency"])
             long_name = info.get("longName", symbol)
             currency = info.get("currency", "USD")
 
@@ -122,8 +131,6 @@ class FinanceTools:
             A human-readable sentiment string including percentage change.
         """
         try:
-            ticker = yf.Ticker(symbol)
-
             # Calculate start/end dynamically
             end_date = datetime.today()
             if period.endswith("d"):
@@ -136,9 +143,10 @@ class FinanceTools:
                 days = 30
             start_date = end_date - timedelta(days=days)
 
-            data = ticker.history(
-                start=start_date.strftime("%Y-%m-%d"),
-                end=end_date.strftime("%Y-%m-%d")
+            data = FinanceTools._history(
+                symbol,
+                start_date.strftime("%Y-%m-%d"),
+                end_date.strftime("%Y-%m-%d")
             )
 
             if data.empty:
@@ -179,8 +187,6 @@ class FinanceTools:
             A formatted string showing the last 5 rows of historical prices (Open, High, Low, Close, Volume).
         """
         try:
-            ticker = yf.Ticker(symbol)
-
             # Calculate start/end dynamically
             end_date = datetime.today()
             if period.endswith("d"):
@@ -193,9 +199,10 @@ class FinanceTools:
                 days = 30
             start_date = end_date - timedelta(days=days)
 
-            data = ticker.history(
-                start=start_date.strftime("%Y-%m-%d"),
-                end=end_date.strftime("%Y-%m-%d")
+            data = FinanceTools._history(
+                symbol,
+                start_date.strftime("%Y-%m-%d"),
+                end_date.strftime("%Y-%m-%d")
             )
 
             if data.empty:
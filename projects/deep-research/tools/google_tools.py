@@ -3,6 +3,7 @@ import requests
 from dotenv import load_dotenv
 from agents import function_tool
 from core.logger import log_call
+from tools.rate_limiter import RateLimiter
 
 # Load environment variables once
 load_dotenv()
@@ -53,7 +54,7 @@ class GoogleTools:
                 "hl": "en",   # language code (optional)
             }
 
-            response = requests.post(url, headers=headers, json=payload)
+            response = RateLimiter.call("serper", requests.post, url, headers=headers, json=payload)
             response.raise_for_status()
             data = response.json()
 
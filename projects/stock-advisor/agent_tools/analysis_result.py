@@ -0,0 +1,195 @@
+# agents/analysis_result.py
+"""
+Compact Analysis Results
+------------------------
+Array-backed container for TechnicalAgent.analyze output, used in place of a
+dict of full-length float64 pandas Series when results are kept, logged,
+cached or shipped between worker processes (e.g. by the Orchestrator).
+
+Features:
+- __slots__ object: indicator names, the signal, the latest value of every
+  indicator (full precision) and, unless summary-only, one float32 row per
+  indicator plus the bar index (int64).
+- Lazy pandas: result["SMA_20"] builds a Series over the stored arrays on
+  access; nothing pandas-backed is kept on the object.
+- Summary-only mode: latest values and the signal only (a few hundred bytes
+  whatever the history length); result["SMA_20"] is then the latest value.
+- Binary serialization: to_bytes() / from_bytes() write a small header plus
+  the raw index and value buffers, and pickling goes through the same format,
+  so multiprocessing and caches move bytes instead of pandas objects.
+
+Dict-style access (result["signal"], "RSI_14" in result, result.get(...),
+keys()) keeps code written against the dict result working.
+
+Example Usage:
+
+    result = TechnicalAgent(result="compact").analyze(ohlcv)
+    result.signal, result.latest["RSI_14"]
+    result["RSI_14"]                        # float32 Series, built on access
+    blob = result.summary().to_bytes()      # latest values + signal only
+    TechnicalResult.from_bytes(blob).to_dict()
+"""
+
+import json
+import math
+import struct
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+MAGIC = b"TRES"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<4sHI")  # magic, version, metadata length
+
+RESULT_MODES = ("full", "compact", "summary")
+
+
+class TechnicalResult:
+    """
+    Attributes:
+        names: Indicator names, e.g. ("SMA_20", "EMA_20", "RSI_14").
+        signal: Buy / Sell / Hold.
+        latest: Indicator name -> last non-NaN value (NaN if none).
+
+    Methods:
+        from_arrays(indicators, signal, index, summary_only): Build from float arrays.
+        summary(): Summary-only copy.
+        to_frame(): All indicators as one DataFrame.
+        to_dict(): JSON-safe latest values plus the signal.
+        to_bytes() / from_bytes(data): Binary round trip.
+    """
+
+    __slots__ = ("names", "signal", "latest", "_index", "_values")
+
+    def __init__(self, names: Iterable[str], signal: str, latest: Dict[str, float],
+                 index: Optional[pd.Index] = None, values: Optional[np.ndarray] = None):
+        self.names = tuple(names)
+        self.signal = signal
+        self.latest = latest
+        self._index = index
+        self._values = values
+
+    @classmethod
+    def from_arrays(cls, indicators: Dict[str, np.ndarray], signal: str, index: Optional[pd.Index] = None,
+                    summary_only: bool = False) -> "TechnicalResult":
+        latest = {}
+        for name, values in indicators.items():
+            valid = np.flatnonzero(~np.isnan(values))
+            latest[name] = float(values[valid[-1]]) if len(valid) else math.nan
+        if summary_only:
+            return cls(indicators, signal, latest)
+        values = np.vstack([np.asarray(v, dtype=np.float32) for v in indicators.values()]) if indicators \
+            else np.empty((0, 0), dtype=np.float32)
+        if index is None:
+            index = pd.RangeIndex(values.shape[1])
+        return cls(indicators, signal, latest, index, values)
+
+    # -----------------------
+    # Access
+    # -----------------------
+    @property
+    def is_summary(self) -> bool:
+        return self._values is None
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the stored arrays (0 for summary-only results)."""
+        if self._values is None:
+            return 0
+        index = self._index.asi8 if isinstance(self._index, pd.DatetimeIndex) else np.asarray(self._index)
+        return self._values.nbytes + (0 if isinstance(self._index, pd.RangeIndex) else index.nbytes)
+
+    def __getitem__(self, key: str):
+        if key == "signal":
+            return self.signal
+        if key not in self.latest:
+            raise KeyError(key)
+        if self._values is None:
+            return self.latest[key]
+        return pd.Series(self._values[self.names.index(key)], index=self._index, name=key)
+
+    def __contains__(self, key) -> bool:
+        return key == "signal" or key in self.latest
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self) -> int:
+        return len(self.names) + 1
+
+    def keys(self):
+        return list(self.names) + ["signal"]
+
+    def get(self, key: str, default=None):
+        return self[key] if key in self else default
+
+    def summary(self) -> "TechnicalResult":
+        return self if self._values is None else TechnicalResult(self.names, self.signal, dict(self.latest))
+
+    def to_frame(self) -> pd.DataFrame:
+        if self._values is None:
+            return pd.DataFrame([self.latest], columns=list(self.names))
+        return pd.DataFrame(self._values.T, index=self._index, columns=list(self.names))
+
+    def to_dict(self) -> dict:
+        out = {k: (v if math.isfinite(v) else None) for k, v in self.latest.items()}
+        out["signal"] = self.signal
+        return out
+
+    def __repr__(self) -> str:
+        latest = ", ".join(f"{k}={v:.4g}" for k, v in self.latest.items())
+        bars = "summary" if self._values is None else f"{self._values.shape[1]} bars"
+        return f"TechnicalResult(signal={self.signal!r}, {latest}, {bars})"
+
+    # -----------------------
+    # Serialization
+    # -----------------------
+    def to_bytes(self) -> bytes:
+        meta = {"names": list(self.names), "signal": self.signal,
+                "latest": {k: (v if math.isfinite(v) else None) for k, v in self.latest.items()}}
+        buffers = []
+        if self._values is not None:
+            meta["bars"] = int(self._values.shape[1])
+            index = self._index
+            if isinstance(index, pd.DatetimeIndex):
+                meta["index"] = {"kind": "datetime", "tz": str(index.tz) if index.tz is not None else None,
+                                 "unit": index.unit, "name": index.name}
+                buffers.append(index.asi8.astype("<i8").tobytes())
+            elif pd.api.types.is_integer_dtype(index) and not isinstance(index, pd.RangeIndex):
+                meta["index"] = {"kind": "int64", "name": index.name}
+                buffers.append(np.asarray(index, dtype="<i8").tobytes())
+            else:  # RangeIndex, or labels without a binary form: positions
+                start, step = (index.start, index.step) if isinstance(index, pd.RangeIndex) else (0, 1)
+                meta["index"] = {"kind": "range", "start": start, "step": step}
+            buffers.append(np.ascontiguousarray(self._values, dtype="<f4").tobytes())
+        header = json.dumps(meta, separators=(",", ":")).encode()
+        return b"".join([_HEADER.pack(MAGIC, FORMAT_VERSION, len(header)), header] + buffers)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "TechnicalResult":
+        magic, version, size = _HEADER.unpack_from(data)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError("Not a TechnicalResult payload")
+        offset = _HEADER.size + size
+        meta = json.loads(bytes(data[_HEADER.size:offset]))
+        latest = {k: (math.nan if v is None else v) for k, v in meta["latest"].items()}
+        if "bars" not in meta:
+            return cls(meta["names"], meta["signal"], latest)
+
+        n, spec = meta["bars"], meta["index"]
+        if spec["kind"] == "range":
+            index = pd.RangeIndex(spec["start"], spec["start"] + n * spec["step"], spec["step"])
+        else:
+            stamps = np.frombuffer(data, dtype="<i8", count=n, offset=offset)
+            offset += stamps.nbytes
+            if spec["kind"] == "datetime":
+                index = pd.DatetimeIndex(stamps.view(f"datetime64[{spec['unit']}]"), name=spec["name"])
+                index = index.tz_localize("UTC").tz_convert(spec["tz"]) if spec["tz"] else index
+            else:
+                index = pd.Index(stamps, name=spec["name"])
+        values = np.frombuffer(data, dtype="<f4", count=len(meta["names"]) * n, offset=offset)
+        return cls(meta["names"], meta["signal"], latest, index, values.reshape(len(meta["names"]), n))
+
+    def __reduce__(self):
+        return TechnicalResult.from_bytes, (self.to_bytes(),)
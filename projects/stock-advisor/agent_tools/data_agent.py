@@ -47,6 +47,10 @@ Example Usage:
     # Search for tickers
     matches = agent.search("Apple")
     print(matches)
+
+    # Bulk fetches for a universe
+    batch = agent.ohlcv_many(["AAPL", "MSFT", "NVDA"], period="6mo")
+    print(batch.data["MSFT"].tail(3), batch.failures)
 """
 
 from __future__ import annotations
@@ -54,15 +58,20 @@ from __future__ import annotations
 import logging
 import os
 from dataclasses import dataclass
-from typing import Dict, Optional
+from typing import Dict, Iterable, Optional
 
 import pandas as pd
 
 from utils.data_fetcher import (
+    BatchResult,
     fetch_ohlcv,
+    fetch_ohlcv_many,
     fetch_company_info,
+    fetch_company_info_many,
     fetch_financials,
+    fetch_financials_many,
     fetch_latest_price,
+    fetch_latest_prices,
     search_tickers_by_company,
 )
 
@@ -99,6 +108,12 @@ class DataAgent:
         financials(ticker): Returns financial statements as a dict of DataFrames.
         latest_price(ticker): Returns the most recent market price.
         search(name, limit): Returns a list of ticker matches for a company name.
+
+    Bulk methods (return a BatchResult with per-symbol failures):
+        ohlcv_many(tickers, period, interval): Wide (ticker, field) OHLCV DataFrame.
+        latest_prices(tickers): Dict of ticker -> latest price.
+        companies(tickers): Dict of ticker -> company metadata.
+        financials_many(tickers): Dict of ticker -> financial statements.
     """
 
     def __init__(self):
@@ -131,17 +146,20 @@ class DataAgent:
         """
         return fetch_company_info(ticker)
 
-    def financials(self, ticker: str) -> Dict[str, pd.DataFrame]:
+    def financials(self, ticker: str, frequency: str = "annual") -> Dict[str, pd.DataFrame]:
         """
-        Fetch financial statements for a company.
+        Fetch financial statements for a company (served from the statement cache
+        until a new filing is expected).
 
         Args:
             ticker (str): Stock symbol.
+            frequency (str): "annual" or "quarterly".
 
         Returns:
-            dict: Keys are "financials", "balance_sheet", "cashflow", each a DataFrame.
+            dict: Keys are "financials", "balance_sheet", "cashflow", "earnings", each a
+            DataFrame with one column per fiscal period.
         """
-        return fetch_financials(ticker)
+        return fetch_financials(ticker, frequency=frequency)
 
     def latest_price(self, ticker: str) -> Optional[float]:
         """
@@ -155,18 +173,77 @@ class DataAgent:
         """
         return fetch_latest_price(ticker)
 
-    def search(self, name: str, limit: int = 5) -> list:
+    def search(self, name: str, limit: int = 5, remote: bool = True) -> list:
         """
-        Search tickers by company name using Yahoo Finance query endpoint.
+        Search tickers by company name (local symbol index, Yahoo Finance query
+        endpoint on a miss).
 
         Args:
             name (str): Partial or full company name.
             limit (int): Maximum number of results to return.
+            remote (bool): Fall back to Yahoo when the local index has no match.
 
         Returns:
             list: List of dicts containing symbol, shortname, exchange, and type.
         """
-        return search_tickers_by_company(name, limit)
+        return search_tickers_by_company(name, limit, remote=remote)
+
+    def ohlcv_many(self, tickers: Iterable[str], period: str = "1y", interval: str = "1d",
+                   batch_size: Optional[int] = None, max_workers: Optional[int] = None) -> BatchResult:
+        """
+        Fetch OHLCV data for many tickers in provider-sized batches.
+
+        Args:
+            tickers (Iterable[str]): Stock symbols.
+            period (str): Historical period, e.g., "1mo", "1y".
+            interval (str): Data interval, e.g., "1d", "1wk".
+            batch_size (int | None): Symbols per provider call (default YF_BATCH_SIZE).
+            max_workers (int | None): Concurrent provider calls (default YF_MAX_WORKERS).
+
+        Returns:
+            BatchResult: `data` is a DataFrame with (ticker, field) MultiIndex columns,
+            `failures` maps ticker -> error message.
+        """
+        return fetch_ohlcv_many(tickers, period=period, interval=interval, **_pool_kwargs(batch_size, max_workers))
+
+    def latest_prices(self, tickers: Iterable[str], batch_size: Optional[int] = None,
+                      max_workers: Optional[int] = None) -> BatchResult:
+        """
+        Get the latest market price for many stocks.
+
+        Returns:
+            BatchResult: `data` maps ticker -> float, `failures` maps ticker -> error message.
+        """
+        return fetch_latest_prices(tickers, **_pool_kwargs(batch_size, max_workers))
+
+    def companies(self, tickers: Iterable[str], max_workers: Optional[int] = None) -> BatchResult:
+        """
+        Fetch company information for many stocks.
+
+        Returns:
+            BatchResult: `data` maps ticker -> company dict, `failures` maps ticker -> error message.
+        """
+        return fetch_company_info_many(tickers, **_pool_kwargs(None, max_workers))
+
+    def financials_many(self, tickers: Iterable[str], max_workers: Optional[int] = None,
+                        frequency: str = "annual") -> BatchResult:
+        """
+        Fetch financial statements for many stocks.
+
+        Returns:
+            BatchResult: `data` maps ticker -> statements dict, `failures` maps ticker -> error message.
+        """
+        return fetch_financials_many(tickers, frequency=frequency, **_pool_kwargs(None, max_workers))
+
+
+def _pool_kwargs(batch_size: Optional[int], max_workers: Optional[int]) -> Dict[str, int]:
+    """Only forward explicitly-set pool settings so data_fetcher defaults apply."""
+    kwargs = {}
+    if batch_size is not None:
+        kwargs["batch_size"] = batch_size
+    if max_workers is not None:
+        kwargs["max_workers"] = max_workers
+    return kwargs
 
 
 if __name__ == "__main__":
@@ -7,42 +7,217 @@ Features:
 - Fetch financial statements (income, balance sheet, cashflow)
 - Compute key ratios (P/E, Debt/Equity, ROE, etc.)
 - Provide a simple fundamental signal (Strong/Neutral/Weak)
+- Ratio time series across fiscal periods and tickers, with trend signals
+
+Statements come from utils.data_fetcher.fetch_financials, i.e. the shared
+fiscal-period cache that DataAgent.financials reads too, so analysing a symbol
+the orchestrator already fetched costs no extra download. Ratios are computed
+column-wise over a (ticker, period) x line-item frame (ratio_panel), so every
+period of every ticker is one vectorized pass.
 """
 
-import yfinance as yf
+from typing import Dict, Iterable
+
 import pandas as pd
+import numpy as np
 import logging
 
+from utils.data_fetcher import fetch_financials, fetch_financials_many
+
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# Signal cutoffs (tuned by core.optimizer)
+ROE_STRONG = 0.15
+MAX_DEBT_TO_EQUITY = 1.0
+ROE_WEAK = 0.05
+
+
+def signal_panel(roe, debt_to_equity, roe_strong: float = ROE_STRONG,
+                 max_debt_to_equity: float = MAX_DEBT_TO_EQUITY, roe_weak: float = ROE_WEAK) -> np.ndarray:
+    """
+    Strong/Neutral/Weak for arrays of ratios (one entry per ticker), the same
+    rule as FundamentalAgent.analyze. Missing ratios count as 0.
+    """
+    roe = np.nan_to_num(np.asarray(roe, dtype="float64"))
+    debt_to_equity = np.nan_to_num(np.asarray(debt_to_equity, dtype="float64"))
+    strong = (roe > roe_strong) & (debt_to_equity < max_debt_to_equity)
+    return np.where(strong, "Strong", np.where(roe < roe_weak, "Weak", "Neutral"))
+
+
+# -----------------------
+# Multi-period ratio kernels
+# -----------------------
+# Ratio input -> (statement, row labels). The first label present wins; legacy
+# yfinance names come first, current ones after.
+LINE_ITEMS = {
+    "net_income": ("financials", ["Net Income", "Net Income Common Stockholders"]),
+    "revenue": ("financials", ["Total Revenue", "Operating Revenue"]),
+    "gross_profit": ("financials", ["Gross Profit"]),
+    "operating_income": ("financials", ["Operating Income", "EBIT"]),
+    "total_liabilities": ("balance_sheet", ["Total Liab", "Total Liabilities Net Minority Interest"]),
+    "equity": ("balance_sheet", ["Total Stockholder Equity", "Stockholders Equity", "Common Stock Equity"]),
+    "total_assets": ("balance_sheet", ["Total Assets"]),
+    "current_assets": ("balance_sheet", ["Current Assets", "Total Current Assets"]),
+    "current_liabilities": ("balance_sheet", ["Current Liabilities", "Total Current Liabilities"]),
+    "free_cash_flow": ("cashflow", ["Free Cash Flow"]),
+}
+
+RATIOS = ("debt_to_equity", "roe", "profit_margin", "roa", "gross_margin", "operating_margin",
+          "current_ratio", "fcf_margin", "revenue_growth", "earnings_growth")
+
+# Ratios whose per-period slope feeds the trend signal, and the direction that counts as better.
+TREND_RATIOS = {"roe": 1, "profit_margin": 1, "debt_to_equity": -1}
+TREND_TOLERANCE = 0.005  # Slopes smaller than this (per period) count as flat
+
+
+def line_items(financials: dict) -> pd.DataFrame:
+    """
+    Periods x LINE_ITEMS frame for one ticker, oldest period first.
+
+    Dated statements are aligned on fiscal period end. Statements without
+    dated columns are aligned by position instead (newest = 0, previous = -1, ...).
+    """
+    frames = {name: df for name, df in financials.items() if isinstance(df, pd.DataFrame) and not df.empty}
+    dated = all(isinstance(c, pd.Timestamp) for df in frames.values() for c in df.columns)
+    if dated:
+        periods = pd.Index(sorted(set().union(*(df.columns for df in frames.values()))))
+    else:
+        periods = pd.Index(np.arange(1 - max((len(df.columns) for df in frames.values()), default=0), 1))
+    # Per statement, once: numeric matrix, first position of each row label, target period rows.
+    matrices = {}
+    for name, df in frames.items():
+        try:
+            values = df.to_numpy(dtype="float64", na_value=np.nan)
+        except (TypeError, ValueError):
+            values = df.apply(pd.to_numeric, errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+        labels = {}
+        for i, label in enumerate(df.index):
+            labels.setdefault(label, i)  # Duplicate row labels: keep the first
+        rows = periods.get_indexer(df.columns) if dated else len(periods) - 1 - np.arange(len(df.columns))
+        matrices[name] = (values, labels, rows)
+
+    out = np.full((len(periods), len(LINE_ITEMS)), np.nan)
+    found = False
+    for j, (statement, candidates) in enumerate(LINE_ITEMS.values()):
+        if statement not in matrices:
+            continue
+        values, labels, rows = matrices[statement]
+        position = next((labels[l] for l in candidates if l in labels), None)
+        if position is None:
+            continue
+        out[rows, j] = values[position]
+        found = True
+    if not found:
+        return pd.DataFrame(columns=list(LINE_ITEMS), index=pd.Index([], name="period"), dtype="float64")
+    return pd.DataFrame(out, index=periods.rename("period"), columns=list(LINE_ITEMS))
+
+
+def ratio_panel(statements: Dict[str, dict]) -> pd.DataFrame:
+    """
+    RATIOS for every fiscal period of every ticker.
+
+    Args:
+        statements: ticker -> statements dict (as returned by fetch_financials).
+
+    Returns:
+        DataFrame indexed by (ticker, period), oldest period first per ticker,
+        one column per ratio. Ratios with a missing or zero denominator are NaN.
+    """
+    frames = {t: line_items(f) for t, f in statements.items() if f and "error" not in f}
+    frames = {t: f for t, f in frames.items() if not f.empty}
+    if not frames:
+        return pd.DataFrame(columns=list(RATIOS), index=pd.MultiIndex.from_tuples([], names=["ticker", "period"]))
+    items = pd.concat(frames, names=["ticker", "period"])
+    # Column arithmetic on the raw matrix: pandas ops on a (ticker, period) index cost more than the math.
+    values = items.to_numpy(dtype="float64")
+    column = {item: values[:, i] for i, item in enumerate(items.columns)}
+    tickers = items.index.codes[0]
+    same_ticker = np.zeros(len(values), dtype=bool)
+    same_ticker[1:] = tickers[1:] == tickers[:-1]
+
+    def safe(denominator):
+        return np.where(denominator != 0, denominator, np.nan)
+
+    def ratio(numerator, denominator):
+        return column[numerator] / safe(column[denominator])
+
+    def growth(name):
+        previous = np.full(len(values), np.nan)
+        previous[1:] = column[name][:-1]
+        previous[~same_ticker] = np.nan
+        return (column[name] - previous) / np.abs(safe(previous))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return pd.DataFrame({
+            "debt_to_equity": ratio("total_liabilities", "equity"),
+            "roe": ratio("net_income", "equity"),
+            "profit_margin": ratio("net_income", "revenue"),
+            "roa": ratio("net_income", "total_assets"),
+            "gross_margin": ratio("gross_profit", "revenue"),
+            "operating_margin": ratio("operating_income", "revenue"),
+            "current_ratio": ratio("current_assets", "current_liabilities"),
+            "fcf_margin": ratio("free_cash_flow", "revenue"),
+            "revenue_growth": growth("revenue"),
+            "earnings_growth": growth("net_income"),
+        }, index=items.index)
+
+
+def latest_ratios(panel: pd.DataFrame) -> pd.DataFrame:
+    """
+    Ratios of each ticker's latest fiscal period (ticker index). Ratios that
+    period does not report stay NaN rather than coming from older periods.
+    """
+    return panel.groupby(level="ticker").tail(1).droplevel("period")
+
+
+def trend_panel(panel: pd.DataFrame, tolerance: float = TREND_TOLERANCE) -> pd.DataFrame:
+    """
+    Least-squares slope per period of each TREND_RATIOS column, per ticker, and
+    an Improving / Stable / Deteriorating label from the sign of those slopes.
+    Tickers with fewer than two periods for a ratio get a NaN slope.
+    """
+    values = panel[list(TREND_RATIOS)]
+    by_ticker = values.groupby(level="ticker")
+    step = pd.Series(by_ticker.cumcount().to_numpy(dtype="float64"), index=values.index)
+    t = pd.DataFrame({c: step for c in TREND_RATIOS}).where(values.notna())
+    dt = t - t.groupby(level="ticker").transform("mean")
+    dx = values - by_ticker.transform("mean")
+    denominator = (dt * dt).groupby(level="ticker").sum()
+    slopes = (dt * dx).groupby(level="ticker").sum() / denominator.where(denominator > 0)
+
+    direction = np.array(list(TREND_RATIOS.values()), dtype="float64")
+    signed = slopes.to_numpy() * direction
+    score = (signed > tolerance).sum(axis=1) - (signed < -tolerance).sum(axis=1)
+    trends = slopes.add_suffix("_slope")
+    trends["trend"] = np.where(score > 0, "Improving", np.where(score < 0, "Deteriorating", "Stable"))
+    return trends
+
 
 class FundamentalAgent:
     def __init__(self):
         self.name = "FundamentalAgent"
 
-    def fetch_financials(self, symbol: str) -> dict:
+    def fetch_financials(self, symbol: str, frequency: str = "annual") -> dict:
         """
-        Fetch financial statements from Yahoo Finance.
+        Fetch financial statements through the shared statement cache.
         Returns a dictionary with income, balance sheet, cashflow, and earnings.
         """
-        try:
-            ticker = yf.Ticker(symbol)
-            financials = {
-                "financials": ticker.financials,
-                "balance_sheet": ticker.balance_sheet,
-                "cashflow": ticker.cashflow,
-                "earnings": ticker.income_stmt if hasattr(ticker, "income_stmt") else pd.DataFrame()
-            }
-            logger.info("Fetched financials for %s", symbol)
-            return financials
-        except Exception as e:
-            logger.exception("Failed to fetch financials for %s: %s", symbol, e)
+        financials = fetch_financials(symbol, frequency=frequency)
+        if "error" in financials:
+            logger.error("Failed to fetch financials for %s: %s", symbol, financials["error"])
             return {}
+        logger.info("Fetched financials for %s", symbol)
+        return financials
+
+    def ratio_history(self, financials: dict) -> pd.DataFrame:
+        """Every ratio for every fiscal period in `financials` (period index, oldest first)."""
+        return ratio_panel({"_": financials}).droplevel("ticker")
 
     def calculate_ratios(self, financials: dict) -> dict:
         """
-        Compute key financial ratios from fetched data.
+        Compute key financial ratios from fetched data (latest reported period).
+        Ratios that period cannot provide are left out, not taken from older periods.
         """
         ratios = {}
         try:
@@ -50,33 +225,41 @@ class FundamentalAgent:
             fs = financials.get("financials", pd.DataFrame())
 
             if not bs.empty and not fs.empty:
-                # Example ratios
-                ratios["debt_to_equity"] = bs.loc["Total Liab"].iloc[0] / bs.loc["Total Stockholder Equity"].iloc[0]
-                ratios["roe"] = fs.loc["Net Income"].iloc[0] / bs.loc["Total Stockholder Equity"].iloc[0]
-                ratios["profit_margin"] = fs.loc["Net Income"].iloc[0] / fs.loc["Total Revenue"].iloc[0]
+                latest = self.ratio_history(financials).iloc[-1]
+                ratios = {name: float(value) for name, value in latest.items() if pd.notna(value)}
             else:
                 logger.warning("Insufficient financial data to compute ratios")
         except Exception as e:
             logger.exception("Error calculating financial ratios: %s", e)
         return ratios
 
-    def analyze(self, symbol: str) -> dict:
+    def analyze(self, symbol) -> dict:
         """
         Perform full fundamental analysis: fetch financials, compute ratios, generate signal.
+
+        `symbol` may also be a statements dict that was already fetched (e.g. by
+        DataAgent.financials), in which case nothing is fetched again.
         """
-        financials = self.fetch_financials(symbol)
-        if not financials:
+        financials = symbol if isinstance(symbol, dict) else self.fetch_financials(symbol)
+        if not financials or "error" in financials:
             return {"signal": "Data Unavailable", "ratios": {}, "financials": {}}
 
         ratios = self.calculate_ratios(financials)
+        trend = "Stable"
+        try:
+            history = self.ratio_history(financials)
+            if len(history):
+                trend = trend_panel(pd.concat({"_": history}, names=["ticker"]))["trend"].iloc[0]
+        except Exception as e:
+            logger.exception("Error computing ratio trends: %s", e)
 
         # Simple signal logic
         signal = "Neutral"
         try:
             if ratios:
-                if ratios.get("roe", 0) > 0.15 and ratios.get("debt_to_equity", 0) < 1:
+                if ratios.get("roe", 0) > ROE_STRONG and ratios.get("debt_to_equity", 0) < MAX_DEBT_TO_EQUITY:
                     signal = "Strong"
-                elif ratios.get("roe", 0) < 0.05:
+                elif ratios.get("roe", 0) < ROE_WEAK:
                     signal = "Weak"
         except Exception as e:
             logger.exception("Error generating fundamental signal: %s", e)
@@ -84,11 +267,31 @@ class FundamentalAgent:
         analysis = {
             "signal": signal,
             "ratios": ratios,
+            "trend": trend,
             "financials": financials
         }
-        logger.info("Fundamental analysis for %s complete. Signal: %s", symbol, signal)
+        logger.info("Fundamental analysis for %s complete. Signal: %s",
+                    symbol if isinstance(symbol, str) else "prefetched statements", signal)
         return analysis
 
+    def analyze_many(self, symbols: Iterable[str], frequency: str = "annual") -> pd.DataFrame:
+        """
+        Latest ratios, trend and signal for many tickers in one vectorized pass
+        (statements via the cache, fetched concurrently when stale).
+
+        Returns:
+            DataFrame indexed by ticker with the RATIOS columns, the *_slope
+            trend columns, "trend" and "signal". Tickers whose statements could
+            not be fetched are absent.
+        """
+        batch = fetch_financials_many(symbols, frequency=frequency)
+        for ticker, error in batch.failures.items():
+            logger.warning("No financials for %s: %s", ticker, error)
+        panel = ratio_panel(batch.data)
+        summary = latest_ratios(panel).join(trend_panel(panel))
+        summary["signal"] = signal_panel(summary["roe"], summary["debt_to_equity"])
+        return summary
+
 
 # Example usage
 if __name__ == "__main__":
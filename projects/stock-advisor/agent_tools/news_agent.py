@@ -12,14 +12,27 @@ Features:
 Notes:
 - Requires .env file with OPENAI_API_KEY and NEWS_API_KEY
 - Can be extended to fetch RSS feeds, Yahoo Finance news, or web scraping
+- NewsAPI calls are paced/retried by the "newsapi" bucket of utils.rate_limiter
+- Batch mode (analyze_batch, used by fetch_and_analyze) classifies up to
+  SENTIMENT_BATCH_SIZE headlines per structured-output call, with at most
+  SENTIMENT_CONCURRENCY calls in flight on the async client. Labels are kept in
+  utils.sentiment_cache keyed by normalized headline, so a story is classified
+  once across tickers and refreshes; sentiment_stats() reports hit rate and
+  tokens saved.
 """
 
+import asyncio
+import json
 import os
 import logging
-from typing import List, Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Tuple
 import requests
 from dotenv import load_dotenv
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
+
+from utils.rate_limiter import get_rate_limiter
+from utils.sentiment_cache import SentimentCache, get_sentiment_cache, headline_key, normalize_headline
 
 # Load environment variables
 load_dotenv(override=True)
@@ -27,13 +40,58 @@ load_dotenv(override=True)
 logger = logging.getLogger(__name__)
 logger.setLevel(os.getenv("LOG_LEVEL", "INFO"))
 
+SENTIMENT_MODEL = os.getenv("SENTIMENT_MODEL", "gpt-4o-mini")
+SENTIMENT_BATCH_SIZE = int(os.getenv("SENTIMENT_BATCH_SIZE", "20"))
+SENTIMENT_CONCURRENCY = int(os.getenv("SENTIMENT_CONCURRENCY", "4"))
+SENTIMENT_LABELS = ("Positive", "Neutral", "Negative")
+
+# Structured output for batch classification: one label per numbered headline.
+BATCH_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "headline_sentiment",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "labels": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "index": {"type": "integer"},
+                            "sentiment": {"type": "string", "enum": list(SENTIMENT_LABELS)},
+                        },
+                        "required": ["index", "sentiment"],
+                        "additionalProperties": False,
+                    },
+                },
+            },
+            "required": ["labels"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+
+def _run_coroutine(coro):
+    """Run a coroutine to completion from sync code, even if this thread already runs a loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coro).result()
+
 
 class NewsAgent:
-    def __init__(self):
+    def __init__(self, sentiment_cache: Optional[SentimentCache] = None):
         self.name = "NewsAgent"
         self.OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
         self.NEWS_API_KEY = os.getenv("NEWS_API_KEY")
         self.client = OpenAI(api_key=self.OPENAI_API_KEY) if self.OPENAI_API_KEY else None
+        self.async_client = AsyncOpenAI(api_key=self.OPENAI_API_KEY) if self.OPENAI_API_KEY else None
+        self._sentiment_cache = sentiment_cache
 
         if not self.OPENAI_API_KEY:
             logger.warning("OPENAI_API_KEY not set. Sentiment analysis will return 'Neutral'.")
@@ -42,10 +100,17 @@ class NewsAgent:
 
         self.NEWS_API_URL = "https://newsapi.org/v2/everything"
 
+    @property
+    def sentiment_cache(self) -> SentimentCache:
+        """Headline label cache (the process-wide one unless injected)."""
+        if self._sentiment_cache is None:
+            self._sentiment_cache = get_sentiment_cache()
+        return self._sentiment_cache
+
     def fetch_news(self, query: str, limit: int = 5) -> List[Dict]:
         """
         Fetch the latest news articles for a query (company or ticker)
-        Returns a list of dicts: {title, description, url, publishedAt}
+        Returns a list of dicts: {title, description, url, publishedAt, source}
         """
         if not self.NEWS_API_KEY:
             logger.error("NEWS_API_KEY not set. Cannot fetch news.")
@@ -60,7 +125,7 @@ class NewsAgent:
         }
 
         try:
-            response = requests.get(self.NEWS_API_URL, params=params, timeout=10)
+            response = get_rate_limiter().call("newsapi", requests.get, self.NEWS_API_URL, params=params, timeout=10)
             response.raise_for_status()
             data = response.json()
             articles = data.get("articles", [])
@@ -69,7 +134,8 @@ class NewsAgent:
                     "title": a.get("title"),
                     "description": a.get("description"),
                     "url": a.get("url"),
-                    "publishedAt": a.get("publishedAt")
+                    "publishedAt": a.get("publishedAt"),
+                    "source": (a.get("source") or {}).get("name")
                 }
                 for a in articles
             ]
@@ -79,9 +145,10 @@ class NewsAgent:
             logger.exception("Failed to fetch news: %s", e)
             return []
 
-    def analyze_sentiment(self, text: str) -> str:
+    def analyze_sentiment(self, text: str, source: Optional[str] = None) -> str:
         """
         Analyze sentiment of a text using OpenAI.
+        `source` is the article's outlet name, used to drop its attribution from the cache key.
         Returns: "Positive", "Neutral", or "Negative"
         """
         if not self.OPENAI_API_KEY:
@@ -90,27 +157,116 @@ class NewsAgent:
         if not text.strip():
             return "Neutral"
 
+        key = headline_key(text, source)
+        cached = self.sentiment_cache.get_many([key]).get(key)
+        if cached:
+            return cached
+
         try:
             prompt = f"Classify the sentiment of the following financial news headline into Positive, Neutral, or Negative:\n\n{text}\n\nSentiment:"
             response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
+                model=SENTIMENT_MODEL,
                 messages=[{"role": "user", "content": prompt}],
                 temperature=0
             )
             sentiment = response.choices[0].message.content.strip()
+            if sentiment in SENTIMENT_LABELS:
+                usage = getattr(response, "usage", None)
+                self.sentiment_cache.put_many({key: sentiment}, getattr(usage, "total_tokens", 0) or 0,
+                                              SENTIMENT_MODEL)
             return sentiment
         except Exception as e:
             logger.exception("Failed to analyze sentiment: %s", e)
             return "Neutral"
 
-    def fetch_and_analyze(self, query: str, limit: int = 5) -> List[Dict]:
+    async def _classify_chunk(self, chunk: List[Tuple[str, str]]) -> Dict[str, str]:
+        """One structured-output call for (key, headline) pairs; returns key -> label."""
+        numbered = "\n".join(f"{i}. {headline}" for i, (_, headline) in enumerate(chunk))
+        prompt = (
+            "Classify the sentiment of each financial news headline below as Positive, Neutral, or Negative. "
+            "Return one label per headline, using its number as the index.\n\n" + numbered
+        )
+        try:
+            response = await self.async_client.chat.completions.create(
+                model=SENTIMENT_MODEL,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=0,
+                response_format=BATCH_RESPONSE_FORMAT,
+            )
+            payload = json.loads(response.choices[0].message.content)
+        except Exception as e:
+            logger.exception("Batch sentiment call failed for %d headlines: %s", len(chunk), e)
+            return {}
+
+        labels = {}
+        for item in payload.get("labels", []):
+            index, sentiment = item.get("index"), item.get("sentiment")
+            if isinstance(index, int) and 0 <= index < len(chunk) and sentiment in SENTIMENT_LABELS:
+                labels[chunk[index][0]] = sentiment
+        if len(labels) < len(chunk):
+            logger.warning("Batch sentiment returned %d of %d labels", len(labels), len(chunk))
+        usage = getattr(response, "usage", None)
+        tokens = (getattr(usage, "total_tokens", 0) or 0) / len(chunk)
+        self.sentiment_cache.put_many(labels, tokens, SENTIMENT_MODEL)
+        return labels
+
+    async def analyze_batch_async(self, headlines: List[str], batch_size: int = SENTIMENT_BATCH_SIZE,
+                                  concurrency: int = SENTIMENT_CONCURRENCY,
+                                  sources: Optional[List[Optional[str]]] = None) -> List[str]:
+        """
+        Sentiment for many headlines: cached labels first, then the remaining
+        distinct headlines in chunks of `batch_size`, `concurrency` calls at a time.
+        `sources` (one outlet name per headline) lets the cache key drop each attribution.
+        Headlines that could not be classified come back "Neutral" (and are not cached).
+        """
+        sources = sources or [None] * len(headlines)
+        keys = [headline_key(h, s) if normalize_headline(h, s) else None for h, s in zip(headlines, sources)]
+        labels = self.sentiment_cache.get_many(k for k in keys if k)
+
+        pending = {}
+        for key, headline in zip(keys, headlines):
+            if key and key not in labels:
+                pending.setdefault(key, headline)
+        if pending and self.async_client:
+            items = list(pending.items())
+            semaphore = asyncio.Semaphore(max(1, concurrency))
+
+            async def classify(chunk):
+                async with semaphore:
+                    return await self._classify_chunk(chunk)
+
+            chunks = [items[i:i + batch_size] for i in range(0, len(items), max(1, batch_size))]
+            for result in await asyncio.gather(*(classify(c) for c in chunks)):
+                labels.update(result)
+            logger.info("Classified %d new headlines in %d calls", len(items), len(chunks))
+        return [labels.get(key, "Neutral") if key else "Neutral" for key in keys]
+
+    def analyze_batch(self, headlines: List[str], batch_size: int = SENTIMENT_BATCH_SIZE,
+                      concurrency: int = SENTIMENT_CONCURRENCY,
+                      sources: Optional[List[Optional[str]]] = None) -> List[str]:
+        """Blocking wrapper around analyze_batch_async."""
+        return _run_coroutine(self.analyze_batch_async(headlines, batch_size, concurrency, sources))
+
+    def sentiment_stats(self) -> Dict:
+        """Cache hits, misses, hit_rate, tokens_used and tokens_saved for this process."""
+        return self.sentiment_cache.stats()
+
+    def fetch_and_analyze(self, query: str, limit: int = 5, batch: bool = True) -> List[Dict]:
         """
-        Fetch news and attach sentiment analysis
+        Fetch news and attach sentiment analysis (batched when an API key is set)
         """
         articles = self.fetch_news(query, limit)
-        for article in articles:
-            headline = article.get("title") or ""
-            article["sentiment"] = self.analyze_sentiment(headline)
+        headlines = [article.get("title") or "" for article in articles]
+        sources = [article.get("source") for article in articles]
+        if batch and self.async_client and headlines:
+            sentiments = self.analyze_batch(headlines, sources=sources)
+            stats = self.sentiment_stats()
+            logger.info("Sentiment cache hit rate %.0f%%, %d tokens saved",
+                        100 * stats["hit_rate"], stats["tokens_saved"])
+        else:
+            sentiments = [self.analyze_sentiment(headline, source) for headline, source in zip(headlines, sources)]
+        for article, sentiment in zip(articles, sentiments):
+            article["sentiment"] = sentiment
         return articles
 
 
@@ -121,3 +277,4 @@ if __name__ == "__main__":
     news = agent.fetch_and_analyze("Apple", limit=3)
     for n in news:
         print(f"{n['publishedAt']}: {n['title']} [{n['sentiment']}]")
+    print("Sentiment cache:", agent.sentiment_stats())
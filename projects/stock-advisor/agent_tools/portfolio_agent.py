@@ -8,58 +8,216 @@ Features:
 - Update stock prices
 - Calculate portfolio value and allocation
 - Track historical performance
+
+Storage is array-backed: every buy is a lot in aligned NumPy arrays (symbol
+code, shares, cost per share), and each symbol has one latest mark. Positions,
+valuation and allocation are reductions over those arrays (np.bincount), and
+removals consume lots first-in-first-out. Marking against the OHLCV cache
+(mark_to_market) and back-filling a value history over a close panel
+(backfill_history) are single vectorized passes, so thousands of lots and
+years of daily marks value instantly. history() returns the date/total_value
+frame expected by utils.visualization.plot_portfolio_history.
 """
 
 import logging
-from typing import Dict
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from agent_tools.technical_agent import last_valid_panel
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
 
 class PortfolioAgent:
-    def __init__(self):
+    def __init__(self, capacity: int = 64):
         self.name = "PortfolioAgent"
-        self.positions: Dict[str, Dict] = {}  # {symbol: {"shares": int, "price": float}}
+        # Symbol table: code -> symbol, plus the latest mark per symbol.
+        self._symbols: list = []
+        self._codes: Dict[str, int] = {}
+        self._prices = np.zeros(0)
+        # Lots, in purchase order (only the first _n_lots entries are live).
+        self._lot_symbol = np.zeros(capacity, dtype=np.int64)
+        self._lot_shares = np.zeros(capacity)
+        self._lot_cost = np.zeros(capacity)
+        self._n_lots = 0
+        # Value history: one point per date, later marks on the same date win.
+        self._history: Dict[pd.Timestamp, float] = {}
+
+    # -----------------------
+    # Array helpers
+    # -----------------------
+    def _code(self, symbol: str) -> int:
+        code = self._codes.get(symbol)
+        if code is None:
+            code = self._codes[symbol] = len(self._symbols)
+            self._symbols.append(symbol)
+            self._prices = np.append(self._prices, 0.0)
+        return code
+
+    def _append_lot(self, code: int, shares: float, cost: float):
+        if self._n_lots == len(self._lot_shares):
+            size = max(1, 2 * self._n_lots)
+            self._lot_symbol = np.resize(self._lot_symbol, size)
+            self._lot_shares = np.resize(self._lot_shares, size)
+            self._lot_cost = np.resize(self._lot_cost, size)
+        i = self._n_lots
+        self._lot_symbol[i], self._lot_shares[i], self._lot_cost[i] = code, shares, cost
+        self._n_lots += 1
+
+    def _lots(self):
+        n = self._n_lots
+        return self._lot_symbol[:n], self._lot_shares[:n], self._lot_cost[:n]
+
+    def _shares_by_symbol(self) -> np.ndarray:
+        codes, shares, _ = self._lots()
+        return np.bincount(codes, weights=shares, minlength=len(self._symbols))
+
+    def _position(self, code: int) -> Dict:
+        shares = self._shares_by_symbol()[code]
+        return {"shares": shares.item() if shares != int(shares) else int(shares), "price": float(self._prices[code])}
 
+    # -----------------------
+    # Positions
+    # -----------------------
     def add_position(self, symbol: str, shares: int, price: float):
-        """Add new position or update existing one"""
-        if symbol in self.positions:
-            self.positions[symbol]["shares"] += shares
-            self.positions[symbol]["price"] = price  # Update latest price
-        else:
-            self.positions[symbol] = {"shares": shares, "price": price}
-        logger.info("Added/Updated position: %s", self.positions[symbol])
+        """Add new position or update existing one (each call is a new lot bought at `price`)"""
+        code = self._code(symbol)
+        self._append_lot(code, shares, price)
+        self._prices[code] = price  # Update latest price
+        logger.info("Added/Updated position: %s", self._position(code))
 
     def remove_position(self, symbol: str, shares: int):
-        """Remove shares from a position; delete if zero"""
-        if symbol in self.positions:
-            self.positions[symbol]["shares"] -= shares
-            if self.positions[symbol]["shares"] <= 0:
-                del self.positions[symbol]
-                logger.info("Position %s removed from portfolio", symbol)
-            else:
-                logger.info("Updated position: %s", self.positions[symbol])
-        else:
+        """Remove shares from a position (oldest lots first); delete if zero"""
+        code = self._codes.get(symbol)
+        held = self._shares_by_symbol()[code] if code is not None else 0
+        if held <= 0:
             logger.warning("Cannot remove position; %s not in portfolio", symbol)
+            return
+
+        codes, lot_shares, _ = self._lots()
+        idx = np.flatnonzero(codes == code)
+        remaining = np.cumsum(lot_shares[idx]) - shares
+        lot_shares[idx] = np.clip(remaining, 0, lot_shares[idx])
+        self._compact()
+
+        if held - shares <= 0:
+            logger.info("Position %s removed from portfolio", symbol)
+        else:
+            logger.info("Updated position: %s", self._position(code))
+
+    def _compact(self):
+        """Drop emptied lots, keeping purchase order."""
+        codes, shares, cost = self._lots()
+        keep = shares > 0
+        n = int(keep.sum())
+        if n != self._n_lots:
+            self._lot_symbol[:n], self._lot_shares[:n], self._lot_cost[:n] = codes[keep], shares[keep], cost[keep]
+            self._n_lots = n
 
     def update_price(self, symbol: str, price: float):
         """Update price of a position"""
-        if symbol in self.positions:
-            self.positions[symbol]["price"] = price
+        code = self._codes.get(symbol)
+        if code is not None and self._shares_by_symbol()[code] > 0:
+            self._prices[code] = price
             logger.info("Updated price for %s: %s", symbol, price)
         else:
             logger.warning("Cannot update price; %s not in portfolio", symbol)
 
+    def holdings(self):
+        """(symbols, shares, prices, cost_basis) arrays for open positions, aligned by index."""
+        codes, lot_shares, lot_cost = self._lots()
+        n = len(self._symbols)
+        shares = self._shares_by_symbol()
+        cost_basis = np.bincount(codes, weights=lot_shares * lot_cost, minlength=n)
+        held = shares > 0
+        return np.array(self._symbols, dtype=object)[held], shares[held], self._prices[held], cost_basis[held]
+
+    def get_positions(self) -> Dict[str, Dict]:
+        """Return current positions"""
+        symbols, shares, prices, _ = self.holdings()
+        return {s: {"shares": int(q) if q == int(q) else float(q), "price": float(p)}
+                for s, q, p in zip(symbols, shares, prices)}
+
+    @property
+    def positions(self) -> Dict[str, Dict]:
+        """{symbol: {"shares", "price"}} view of the arrays."""
+        return self.get_positions()
+
+    # -----------------------
+    # Valuation
+    # -----------------------
     def get_portfolio_value(self) -> float:
         """Calculate total portfolio value"""
-        total = sum(pos["shares"] * pos["price"] for pos in self.positions.values())
+        total = float(self._shares_by_symbol() @ self._prices) if self._symbols else 0.0
         logger.info("Total portfolio value: %s", total)
         return total
 
-    def get_positions(self) -> Dict[str, Dict]:
-        """Return current positions"""
-        return self.positions.copy()
+    def get_allocation(self) -> Dict[str, float]:
+        """Fraction of portfolio value per symbol."""
+        symbols, shares, prices, _ = self.holdings()
+        values = shares * prices
+        total = values.sum()
+        return {s: float(v / total) if total else 0.0 for s, v in zip(symbols, values)}
+
+    def get_unrealized_pnl(self) -> Dict[str, float]:
+        """Market value minus cost basis per symbol."""
+        symbols, shares, prices, cost_basis = self.holdings()
+        return {s: float(v) for s, v in zip(symbols, shares * prices - cost_basis)}
+
+    def mark_to_market(self, closes: Optional[pd.DataFrame] = None, period: str = "5d") -> float:
+        """
+        Re-price every open position from a dates x tickers close panel in one
+        pass (last valid close per column) and record the value in the history.
+        Without `closes`, the panel comes from the OHLCV cache via a batched fetch.
+        """
+        symbols = list(self.holdings()[0])
+        if not symbols:
+            return 0.0
+        if closes is None:
+            from utils.data_fetcher import fetch_ohlcv_many
+
+            batch = fetch_ohlcv_many(symbols, period=period, interval="1d")
+            closes = batch.data.xs("Close", axis=1, level=1) if not batch.data.empty else pd.DataFrame()
+
+        closes = closes.reindex(columns=symbols)
+        latest = last_valid_panel(closes.to_numpy(dtype="float64"))
+        codes = np.array([self._codes[s] for s in symbols])
+        found = ~np.isnan(latest)
+        self._prices[codes[found]] = latest[found]
+        if not found.all():
+            logger.warning("No closes to mark %s", [s for s, ok in zip(symbols, found) if not ok])
+
+        value = self.get_portfolio_value()
+        if len(closes.index):
+            self._history[pd.Timestamp(closes.index[-1])] = value
+        return value
+
+    def backfill_history(self, closes: pd.DataFrame) -> pd.DataFrame:
+        """
+        Value the current holdings at every date of a close panel (one matrix-vector
+        product, gaps forward-filled) and merge the series into the history.
+        """
+        symbols, shares, _, _ = self.holdings()
+        if not len(symbols) or closes.empty:
+            return self.history()
+        panel = closes.reindex(columns=list(symbols)).ffill().fillna(0.0)
+        values = panel.to_numpy(dtype="float64") @ shares
+        self._history.update(zip(pd.DatetimeIndex(panel.index), values.tolist()))
+        return self.history()
+
+    def record_value(self, date=None) -> float:
+        """Append today's (or `date`'s) portfolio value at current marks to the history."""
+        value = self.get_portfolio_value()
+        self._history[pd.Timestamp(date) if date is not None else pd.Timestamp.now().normalize()] = value
+        return value
+
+    def history(self) -> pd.DataFrame:
+        """Portfolio value over time: DataFrame with columns ['date', 'total_value']."""
+        dates = sorted(self._history)
+        return pd.DataFrame({"date": dates, "total_value": [self._history[d] for d in dates]})
 
 
 # Example usage
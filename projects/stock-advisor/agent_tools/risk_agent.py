@@ -0,0 +1,288 @@
+# agents/risk_agent.py
+"""
+Risk Agent
+----------
+Portfolio risk analytics on the cached returns panel.
+
+Features:
+- Historical and parametric (normal) VaR and CVaR
+- Per-position contribution to portfolio volatility
+- Beta to a benchmark and the correlation matrix
+- Covariance updated incrementally as new daily returns arrive (RunningCovariance)
+- Ledoit-Wolf shrinkage covariance for large universes (p close to or above n)
+- "Portfolio impact" of adding a symbol, for Orchestrator.analyze_stock
+
+Prices come from the OHLCV cache via one batched fetch; nothing is refetched
+per ticker. All losses (VaR, CVaR) are reported as positive fractions of
+portfolio value for a one-bar horizon.
+"""
+
+import logging
+from statistics import NormalDist
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+DEFAULT_BENCHMARK = "SPY"
+DEFAULT_CONFIDENCE = 0.95
+
+
+# -----------------------
+# Kernels (rows = dates, columns = assets)
+# -----------------------
+def returns_panel(closes: pd.DataFrame) -> pd.DataFrame:
+    """Simple daily returns, keeping only dates where every column has a return."""
+    return closes.sort_index().pct_change(fill_method=None).iloc[1:].dropna(how="any")
+
+
+def historical_var(returns, confidence: float = DEFAULT_CONFIDENCE) -> float:
+    """Loss not exceeded with `confidence`, from the empirical return distribution."""
+    returns = np.asarray(returns, dtype="float64")
+    return float(-np.quantile(returns, 1 - confidence)) if len(returns) else float("nan")
+
+
+def historical_cvar(returns, confidence: float = DEFAULT_CONFIDENCE) -> float:
+    """Average loss on the days at or beyond the historical VaR (expected shortfall)."""
+    returns = np.asarray(returns, dtype="float64")
+    if not len(returns):
+        return float("nan")
+    tail = returns[returns <= -historical_var(returns, confidence)]
+    return float(-tail.mean())
+
+
+def parametric_var(mean: float, std: float, confidence: float = DEFAULT_CONFIDENCE) -> float:
+    """Normal-distribution VaR: z * sigma - mu."""
+    return float(NormalDist().inv_cdf(confidence) * std - mean)
+
+
+def parametric_cvar(mean: float, std: float, confidence: float = DEFAULT_CONFIDENCE) -> float:
+    """Normal-distribution CVaR: sigma * pdf(z) / (1 - confidence) - mu."""
+    z = NormalDist().inv_cdf(confidence)
+    return float(std * NormalDist().pdf(z) / (1 - confidence) - mean)
+
+
+def risk_contributions(weights, cov) -> np.ndarray:
+    """
+    Each position's share of portfolio volatility: w_i * (cov @ w)_i / (w' cov w).
+    Sums to 1 for a portfolio with non-zero variance.
+    """
+    weights = np.asarray(weights, dtype="float64")
+    marginal = np.asarray(cov) @ weights
+    variance = float(weights @ marginal)
+    return weights * marginal / variance if variance > 0 else np.zeros_like(weights)
+
+
+def betas(returns, benchmark) -> np.ndarray:
+    """Beta of every column of `returns` to the `benchmark` return series."""
+    returns = np.asarray(returns, dtype="float64")
+    benchmark = np.asarray(benchmark, dtype="float64")
+    bench = benchmark - benchmark.mean()
+    variance = bench @ bench
+    if variance == 0:
+        return np.full(returns.shape[1] if returns.ndim == 2 else 1, np.nan)
+    return (bench @ (returns - returns.mean(axis=0))) / variance
+
+
+def correlation(cov) -> np.ndarray:
+    """Correlation matrix from a covariance matrix."""
+    cov = np.asarray(cov, dtype="float64")
+    std = np.sqrt(np.diag(cov))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return cov / np.outer(std, std)
+
+
+def ledoit_wolf(returns) -> Tuple[np.ndarray, float]:
+    """
+    Ledoit-Wolf shrinkage towards a scaled identity. Returns (covariance, intensity);
+    intensity 0 is the sample covariance, 1 the identity target.
+    """
+    x = np.asarray(returns, dtype="float64")
+    n, p = x.shape
+    x = x - x.mean(axis=0)
+    sample = x.T @ x / n
+    mu = np.trace(sample) / p
+    target = mu * np.eye(p)
+    delta = np.sum((sample - target) ** 2) / p
+    # sum_k ||x_k x_k' - S||^2 = sum_k ||x_k||^4 - n ||S||^2
+    beta_bar = (np.sum(np.sum(x ** 2, axis=1) ** 2) - n * np.sum(sample ** 2)) / (n ** 2 * p)
+    intensity = float(min(beta_bar, delta) / delta) if delta > 0 else 1.0
+    return intensity * target + (1 - intensity) * sample, intensity
+
+
+class RunningCovariance:
+    """
+    Incremental mean/covariance (Welford / Chan merge). Adding k new return rows
+    costs O(k * p^2) regardless of how much history is already folded in.
+    """
+
+    __slots__ = ("n", "mean", "_m2")
+
+    def __init__(self, n_assets: int):
+        self.n = 0
+        self.mean = np.zeros(n_assets)
+        self._m2 = np.zeros((n_assets, n_assets))
+
+    def update(self, rows) -> "RunningCovariance":
+        """Fold in one return row or a block of rows (rows with NaN are skipped)."""
+        rows = np.atleast_2d(np.asarray(rows, dtype="float64"))
+        rows = rows[~np.isnan(rows).any(axis=1)]
+        k = len(rows)
+        if not k:
+            return self
+        batch_mean = rows.mean(axis=0)
+        centered = rows - batch_mean
+        delta = batch_mean - self.mean
+        total = self.n + k
+        self._m2 += centered.T @ centered + np.outer(delta, delta) * (self.n * k / total)
+        self.mean += delta * (k / total)
+        self.n = total
+        return self
+
+    @property
+    def cov(self) -> np.ndarray:
+        """Sample covariance (ddof=1)."""
+        return self._m2 / (self.n - 1) if self.n > 1 else np.full(self._m2.shape, np.nan)
+
+
+class RiskModel:
+    """Running covariance for a fixed universe, fed only returns newer than the last seen date."""
+
+    def __init__(self, symbols: Iterable[str]):
+        self.symbols = list(symbols)
+        self.running = RunningCovariance(len(self.symbols))
+        self.last_date = None
+
+    def refresh(self, returns: pd.DataFrame) -> "RiskModel":
+        returns = returns.reindex(columns=self.symbols)
+        if self.last_date is not None:
+            returns = returns[returns.index > self.last_date]
+        if len(returns):
+            self.running.update(returns.to_numpy())
+            self.last_date = returns.index[-1]
+        return self
+
+
+class RiskAgent:
+    def __init__(self, benchmark: str = DEFAULT_BENCHMARK, confidence: float = DEFAULT_CONFIDENCE):
+        self.name = "RiskAgent"
+        self.benchmark = benchmark
+        self.confidence = confidence
+        self._models: Dict[tuple, RiskModel] = {}
+
+    def load_closes(self, symbols: Iterable[str], period: str = "1y") -> pd.DataFrame:
+        """dates x tickers closes for the symbols plus the benchmark, from the OHLCV cache."""
+        from utils.data_fetcher import fetch_ohlcv_many
+
+        batch = fetch_ohlcv_many(list(dict.fromkeys([*symbols, self.benchmark])), period=period, interval="1d")
+        if batch.failures:
+            logger.warning("No OHLCV for %s", sorted(batch.failures))
+        return batch.data.xs("Close", axis=1, level=1) if not batch.data.empty else pd.DataFrame()
+
+    def covariance(self, returns: pd.DataFrame, shrink: bool = False) -> np.ndarray:
+        """
+        Covariance of `returns` columns. Shrinkage uses Ledoit-Wolf on the full
+        panel; otherwise the incremental model for this universe is topped up
+        with any new dates and reused.
+        """
+        if shrink:
+            return ledoit_wolf(returns.to_numpy())[0]
+        key = tuple(returns.columns)
+        model = self._models.get(key)
+        if model is None or (model.last_date is not None and len(returns) and returns.index[0] > model.last_date):
+            model = self._models[key] = RiskModel(key)
+        return model.refresh(returns).running.cov
+
+    def _stats(self, port_returns: np.ndarray, bench_returns: Optional[np.ndarray]) -> Dict:
+        mean, std = float(port_returns.mean()), float(port_returns.std(ddof=1))
+        return {
+            "volatility": std,
+            "historical_var": historical_var(port_returns, self.confidence),
+            "historical_cvar": historical_cvar(port_returns, self.confidence),
+            "parametric_var": parametric_var(mean, std, self.confidence),
+            "parametric_cvar": parametric_cvar(mean, std, self.confidence),
+            "beta": float(betas(port_returns[:, None], bench_returns)[0]) if bench_returns is not None else None,
+        }
+
+    def analyze_portfolio(self, portfolio, closes: Optional[pd.DataFrame] = None,
+                          shrink: bool = False, period: str = "1y") -> Dict:
+        """
+        Risk report for a PortfolioAgent's open positions (value-weighted).
+
+        Returns dict with volatility, historical/parametric VaR and CVaR, beta,
+        "contributions" (symbol -> share of volatility), "weights" and
+        "correlation" (DataFrame).
+        """
+        symbols, shares, prices, _ = portfolio.holdings()
+        if not len(symbols):
+            return {"positions": 0}
+        symbols = list(symbols)
+        closes = self.load_closes(symbols, period) if closes is None else closes
+        returns = returns_panel(closes.reindex(columns=list(dict.fromkeys([*symbols, self.benchmark]))).dropna(axis=1, how="all"))
+        held = [s for s in symbols if s in returns.columns]
+        if len(returns) < 2 or not held:
+            return {"positions": len(symbols), "error": "Not enough price history"}
+
+        values = (shares * prices)[[symbols.index(s) for s in held]]
+        weights = values / values.sum()
+        asset_returns = returns[held]
+        cov = self.covariance(asset_returns, shrink)
+        bench = returns[self.benchmark].to_numpy() if self.benchmark in returns.columns else None
+
+        report = {"positions": len(symbols), "observations": len(returns)}
+        report.update(self._stats(asset_returns.to_numpy() @ weights, bench))
+        report["weights"] = dict(zip(held, weights.tolist()))
+        report["contributions"] = dict(zip(held, risk_contributions(weights, cov).tolist()))
+        report["correlation"] = pd.DataFrame(correlation(cov), index=held, columns=held)
+        return report
+
+    def portfolio_impact(self, portfolio, symbol: str, weight: Optional[float] = None,
+                         closes: Optional[pd.DataFrame] = None, period: str = "1y") -> Dict:
+        """
+        How adding `symbol` at `weight` of the new portfolio (default: an equal
+        slot, 1 / (positions + 1)) would change its risk: before/after VaR, CVaR,
+        volatility and beta, the symbol's correlation to the current portfolio
+        and its share of the new portfolio's volatility.
+        """
+        holdings = portfolio.holdings()
+        symbols = list(holdings[0])
+        if not symbols:
+            return {"positions": 0, "note": "Portfolio is empty; nothing to compare against."}
+        shares, prices = holdings[1], holdings[2]
+
+        closes = self.load_closes([*symbols, symbol], period) if closes is None else closes
+        returns = returns_panel(closes.reindex(columns=list(dict.fromkeys([*symbols, symbol, self.benchmark])))
+                                .dropna(axis=1, how="all"))
+        held = [s for s in symbols if s in returns.columns]
+        if symbol not in returns.columns or not held or len(returns) < 2:
+            return {"positions": len(symbols), "error": f"Not enough price history for {symbol} or the portfolio"}
+
+        universe = list(dict.fromkeys([*held, symbol]))
+        values = np.zeros(len(universe))
+        values[:len(held)] = (shares * prices)[[symbols.index(s) for s in held]]
+        before = values / values.sum()
+        weight = 1 / (len(held) + 1) if weight is None else weight
+        after = before * (1 - weight)
+        after[universe.index(symbol)] += weight
+
+        asset_returns = returns[universe].to_numpy()
+        bench = returns[self.benchmark].to_numpy() if self.benchmark in returns.columns else None
+        port_before, port_after = asset_returns @ before, asset_returns @ after
+        cov = self.covariance(returns[universe])
+        stats_before, stats_after = self._stats(port_before, bench), self._stats(port_after, bench)
+
+        impact = {
+            "positions": len(symbols),
+            "weight": float(weight),
+            "correlation_to_portfolio": float(np.corrcoef(asset_returns[:, universe.index(symbol)], port_before)[0, 1]),
+            "risk_contribution": float(risk_contributions(after, cov)[universe.index(symbol)]),
+            "before": stats_before,
+            "after": stats_after,
+        }
+        impact["delta_var"] = stats_after["historical_var"] - stats_before["historical_var"]
+        logger.info("Portfolio impact of %s at %.1f%%: VaR %.4f -> %.4f", symbol, weight * 100,
+                    stats_before["historical_var"], stats_after["historical_var"])
+        return impact
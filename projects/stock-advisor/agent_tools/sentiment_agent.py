@@ -2,18 +2,34 @@
 import os
 from dotenv import load_dotenv
 import requests
-from textblob import TextBlob
 import logging
 
+import numpy as np
+
+from agent_tools.sentiment_scorer import LexiconScorer, TextClassifier, labels
+
 load_dotenv()  # load API_KEY from .env
 
 logger = logging.getLogger(__name__)
 
+# Optional trained TextClassifier (see agent_tools.sentiment_scorer); lexicon scoring otherwise.
+SENTIMENT_CLASSIFIER_PATH = os.getenv("SENTIMENT_CLASSIFIER_PATH")
+
+
 class SentimentAgent:
-    def __init__(self):
+    def __init__(self, scorer=None):
         self.api_key = os.getenv("OPENAI_API_KEY")
-        if not self.api_key:
-            logger.warning("OPENAI_API_KEY not found. Sentiment analysis will use TextBlob fallback.")
+        self.scorer = scorer or self._default_scorer()
+
+    @staticmethod
+    def _default_scorer():
+        if SENTIMENT_CLASSIFIER_PATH:
+            try:
+                return TextClassifier.load(SENTIMENT_CLASSIFIER_PATH)
+            except Exception as e:
+                logger.warning("Could not load sentiment classifier %s (%s); using lexicon scorer.",
+                               SENTIMENT_CLASSIFIER_PATH, e)
+        return LexiconScorer()
 
     def fetch_news(self, symbol: str):
         # Dummy fetch from a public endpoint or mock
@@ -24,21 +40,17 @@ class SentimentAgent:
             "Stock sees strong growth this quarter."
         ]
 
+    def score(self, texts) -> np.ndarray:
+        """Sentiment score in [-1, 1] per text, all texts in one batch."""
+        return self.scorer.score(texts)
+
+    def analyze_batch(self, texts) -> np.ndarray:
+        """Positive / Neutral / Negative per text (e.g. thousands of headlines in a screen)."""
+        return labels(self.score(texts))
+
     def analyze_sentiment(self, texts):
+        """Overall label for a headline (str) or list of headlines: the mean score, thresholded."""
         if not texts:
             return "Neutral"
-        if self.api_key:
-            # Use OpenAI API here if key exists (optional)
-            # openai_client = OpenAI(api_key=self.api_key)
-            # return openai_client.sentiment_analysis(texts)
-            return "Positive"  # dummy return for now
-        else:
-            # fallback to TextBlob if no API key
-            sentiments = [TextBlob(t).sentiment.polarity for t in texts]
-            avg_sentiment = sum(sentiments) / len(sentiments)
-            if avg_sentiment > 0.1:
-                return "Positive"
-            elif avg_sentiment < -0.1:
-                return "Negative"
-            else:
-                return "Neutral"
+        scores = self.score([texts] if isinstance(texts, str) else texts)
+        return str(labels(scores.mean()))
@@ -0,0 +1,223 @@
+# agents/sentiment_scorer.py
+"""
+Sentiment Scorer
+----------------
+Local, batch sentiment scoring for headlines without an LLM round trip.
+
+Features:
+- LexiconScorer: finance-tuned word weights (Loughran-McDonald style: "beats",
+  "downgrade", "default", "raised"...), negation ("not", "no", "fails to" flip the
+  next few words) and intensifiers ("sharply", "slightly", scaling the adjacent
+  lexicon word on either side: "sharply lower", "plunge sharply"). A whole list
+  of texts is scored in one vectorized pass: every token of every text goes into
+  one flat array, weights are looked up with np.searchsorted against the sorted
+  vocabulary, negation scopes are found with a running maximum, and per-text
+  sums come from np.bincount.
+- TextClassifier (optional): a small CPU classifier, sentence-transformers
+  embeddings (or sklearn hashing features when sentence-transformers is not
+  installed) into a scikit-learn LogisticRegression, trained on labelled
+  headlines (e.g. LLM labels) and scored in batches.
+
+Scores are in [-1, 1]; labels() maps them to Positive / Neutral / Negative.
+
+Example Usage:
+
+    scorer = LexiconScorer()
+    scorer.score(["Apple beats estimates", "Tesla doesn't beat delivery estimates"])
+    # array([ 0.6 , -0.49])
+"""
+
+import logging
+import os
+import pickle
+import re
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+POSITIVE_THRESHOLD = 0.1
+NEGATIVE_THRESHOLD = -0.1
+NEGATION_WINDOW = 3  # Words after a negator whose polarity is flipped
+NEGATION_FACTOR = -0.75  # Negated positives read weaker than plain negatives ("not good" > "bad")
+NORMALIZATION_ALPHA = 4.0  # score = s / sqrt(s^2 + alpha), as in VADER
+
+FINANCE_LEXICON: Dict[str, float] = {
+    # Positive
+    "beat": 1.5, "beats": 1.5, "tops": 1.2, "surpass": 1.2, "surpasses": 1.2, "exceed": 1.2, "exceeds": 1.2,
+    "upgrade": 1.5, "upgraded": 1.5, "upgrades": 1.5, "outperform": 1.3, "overweight": 1.0, "buy": 0.8,
+    "gain": 1.0, "gains": 1.0, "rally": 1.3, "rallies": 1.3, "surge": 1.5, "surges": 1.5, "soar": 1.6,
+    "soars": 1.6, "jump": 1.2, "jumps": 1.2, "rise": 0.8, "rises": 0.8, "climb": 0.9, "climbs": 0.9,
+    "rebound": 1.0, "rebounds": 1.0, "growth": 1.0, "grow": 0.8, "grows": 0.8, "profit": 1.0,
+    "profitable": 1.2, "strong": 1.0, "stronger": 1.0, "robust": 1.0, "bullish": 1.5, "optimistic": 1.0,
+    "record": 1.0, "high": 0.4, "raise": 0.8, "raises": 0.8, "raised": 0.8, "boost": 1.0, "boosts": 1.0,
+    "dividend": 0.5, "buyback": 0.8, "approval": 1.0, "approved": 1.0, "win": 1.0, "wins": 1.0,
+    "expands": 0.7, "expansion": 0.7, "improve": 0.9, "improves": 0.9, "improved": 0.9, "good": 0.8,
+    "great": 1.2, "positive": 1.0, "success": 1.2, "successful": 1.2, "innovative": 0.6, "partnership": 0.5,
+    # Negative
+    "miss": -1.5, "misses": -1.5, "missed": -1.5, "downgrade": -1.5, "downgraded": -1.5, "downgrades": -1.5,
+    "underperform": -1.3, "underweight": -1.0, "sell": -0.8, "loss": -1.2, "losses": -1.2, "lose": -1.0,
+    "fall": -1.0, "falls": -1.0, "fell": -1.0, "drop": -1.0, "drops": -1.0, "decline": -1.0,
+    "declines": -1.0, "plunge": -1.6, "plunges": -1.6, "tumble": -1.4, "tumbles": -1.4, "slump": -1.4,
+    "slumps": -1.4, "sink": -1.2, "sinks": -1.2, "crash": -1.8, "weak": -1.0, "weaker": -1.0,
+    "bearish": -1.5, "pessimistic": -1.0, "cut": -0.8, "cuts": -0.8, "layoff": -1.2, "layoffs": -1.2,
+    "lawsuit": -1.2, "probe": -1.0, "investigation": -1.0, "fraud": -2.0, "default": -1.8,
+    "bankruptcy": -2.0, "bankrupt": -2.0, "recall": -1.2, "warning": -1.0, "warns": -1.2,
+    "risk": -0.5, "risks": -0.5, "debt": -0.4, "fine": -0.6, "fined": -1.2, "penalty": -1.2,
+    "delay": -0.9, "delays": -0.9, "halt": -1.1, "halts": -1.1, "volatile": -0.6, "volatility": -0.5,
+    "concern": -0.8, "concerns": -0.8, "fears": -1.0, "slowdown": -1.1, "recession": -1.4, "bad": -0.8,
+    "poor": -1.0, "negative": -1.0, "fail": -1.2, "fails": -1.2, "failed": -1.2, "disappointing": -1.3,
+    "dilution": -1.0, "impairment": -1.2, "writedown": -1.2, "low": -0.4, "lower": -0.5,
+}
+NEGATORS = frozenset({"not", "no", "never", "without", "neither", "nor", "cannot", "dont", "doesnt", "didnt",
+                      "isnt", "wasnt", "wont", "fails", "failed", "lacks"})
+INTENSIFIERS: Dict[str, float] = {"sharply": 1.5, "significantly": 1.4, "strongly": 1.4, "massive": 1.5,
+                                  "huge": 1.4, "slightly": 0.6, "modestly": 0.7, "very": 1.3}
+
+_TOKEN = re.compile(r"[a-z]+(?:'[a-z]+)?")
+
+
+def labels(scores, positive: float = POSITIVE_THRESHOLD, negative: float = NEGATIVE_THRESHOLD) -> np.ndarray:
+    """Positive / Neutral / Negative for an array of scores."""
+    scores = np.asarray(scores, dtype="float64")
+    return np.where(scores > positive, "Positive", np.where(scores < negative, "Negative", "Neutral"))
+
+
+class LexiconScorer:
+    """
+    Vectorized lexicon scorer.
+
+    Methods:
+        score(texts): Array of scores in [-1, 1], one per text.
+        label(texts): Array of Positive / Neutral / Negative labels.
+    """
+
+    def __init__(self, lexicon: Optional[Dict[str, float]] = None, negators: Iterable[str] = NEGATORS,
+                 intensifiers: Optional[Dict[str, float]] = None, negation_window: int = NEGATION_WINDOW):
+        lexicon = dict(FINANCE_LEXICON if lexicon is None else lexicon)
+        intensifiers = dict(INTENSIFIERS if intensifiers is None else intensifiers)
+        negators = set(negators)
+        # One sorted vocabulary with aligned weight / multiplier / negator columns.
+        vocab = sorted(set(lexicon) | set(intensifiers) | negators)
+        self.vocab = np.array(vocab)
+        self.weights = np.array([lexicon.get(w, 0.0) for w in vocab])
+        self.multipliers = np.array([intensifiers.get(w, 1.0) for w in vocab])
+        self.negators = np.array([w in negators for w in vocab])
+        self.negation_window = negation_window
+
+    def _lookup(self, tokens: np.ndarray) -> np.ndarray:
+        """Vocabulary index per token, -1 when unknown."""
+        if not len(self.vocab):
+            return np.full(len(tokens), -1)
+        idx = np.searchsorted(self.vocab, tokens).clip(max=len(self.vocab) - 1)
+        return np.where(self.vocab[idx] == tokens, idx, -1)
+
+    def score(self, texts: Sequence[str]) -> np.ndarray:
+        texts = [texts] if isinstance(texts, str) else list(texts)
+        n = len(texts)
+        token_lists = [_TOKEN.findall((t or "").lower().replace("n't", "nt")) for t in texts]
+        counts = np.fromiter((len(t) for t in token_lists), dtype=np.int64, count=n)
+        if not counts.sum():
+            return np.zeros(n)
+        tokens = np.array([tok for toks in token_lists for tok in toks])
+        doc = np.repeat(np.arange(n), counts)
+        position = np.arange(len(tokens))
+
+        idx = self._lookup(tokens)
+        known = idx >= 0
+        weight = np.where(known, self.weights[idx], 0.0)
+        negator = known & self.negators[idx]
+
+        # Intensifiers scale the adjacent lexicon word of the same text: the next one
+        # ("sharply lower"), else the previous one ("plunge sharply").
+        multiplier = np.where(known, self.multipliers[idx], 1.0)
+        intensifier = multiplier != 1.0
+        same_doc = doc[1:] == doc[:-1]
+        polar = weight != 0
+        forward = np.zeros(len(tokens), dtype=bool)
+        forward[:-1] = intensifier[:-1] & same_doc & polar[1:]
+        backward = np.zeros(len(tokens), dtype=bool)
+        backward[1:] = intensifier[1:] & ~forward[1:] & same_doc & polar[:-1]
+        scale = np.ones_like(multiplier)
+        scale[1:] = np.where(forward[:-1], multiplier[:-1], 1.0)
+        scale[:-1] *= np.where(backward[1:], multiplier[1:], 1.0)
+        weight = weight * scale
+
+        # Distance to the most recent negator in the same text (running max of negator positions).
+        last_negator = np.maximum.accumulate(np.where(negator, position, -1))
+        starts = np.repeat(np.cumsum(counts) - counts, counts)
+        distance = position - last_negator
+        negated = (last_negator >= starts) & (distance > 0) & (distance <= self.negation_window)
+        weight = np.where(negated, weight * NEGATION_FACTOR, weight)
+
+        totals = np.bincount(doc, weights=weight, minlength=n)
+        return totals / np.sqrt(totals * totals + NORMALIZATION_ALPHA)
+
+    def label(self, texts: Sequence[str]) -> np.ndarray:
+        return labels(self.score(texts))
+
+
+class TextClassifier:
+    """
+    Optional local classifier: text embeddings + LogisticRegression, on CPU.
+
+    Requires scikit-learn; uses sentence-transformers for embeddings when it is
+    installed (SENTIMENT_EMBEDDING_MODEL), else sklearn's HashingVectorizer.
+    score() returns P(Positive) - P(Negative), on the same scale as LexiconScorer.
+    """
+
+    def __init__(self, embedding_model: Optional[str] = None, batch_size: int = 64):
+        from sklearn.linear_model import LogisticRegression
+
+        self.embedding_model = embedding_model or os.getenv("SENTIMENT_EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+        self.batch_size = batch_size
+        self.model = LogisticRegression(max_iter=1000, class_weight="balanced")
+        self._encoder = None
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        if self._encoder is None:
+            try:
+                from sentence_transformers import SentenceTransformer
+                self._encoder = SentenceTransformer(self.embedding_model, device="cpu")
+            except ImportError:
+                from sklearn.feature_extraction.text import HashingVectorizer
+                logger.info("sentence-transformers not installed; using hashed n-gram features")
+                self._encoder = HashingVectorizer(ngram_range=(1, 2), n_features=2 ** 18, alternate_sign=False)
+        if hasattr(self._encoder, "encode"):
+            return self._encoder.encode(texts, batch_size=self.batch_size, show_progress_bar=False)
+        return self._encoder.transform(texts)
+
+    def fit(self, texts: Sequence[str], targets: Sequence[str]) -> "TextClassifier":
+        self.model.fit(self._encode(list(texts)), list(targets))
+        return self
+
+    def score(self, texts: Sequence[str]) -> np.ndarray:
+        texts = [texts] if isinstance(texts, str) else list(texts)
+        if not texts:
+            return np.zeros(0)
+        classes = list(self.model.classes_)
+        scores = np.zeros(len(texts))
+        for start in range(0, len(texts), self.batch_size):
+            proba = self.model.predict_proba(self._encode(texts[start:start + self.batch_size]))
+            for sign, name in ((1, "Positive"), (-1, "Negative")):
+                if name in classes:
+                    scores[start:start + len(proba)] += sign * proba[:, classes.index(name)]
+        return scores
+
+    def label(self, texts: Sequence[str]) -> np.ndarray:
+        return labels(self.score(texts))
+
+    def save(self, path: str):
+        encoder, self._encoder = self._encoder, None  # Encoders are reloaded, not pickled
+        try:
+            with open(path, "wb") as f:
+                pickle.dump(self, f)
+        finally:
+            self._encoder = encoder
+
+    @staticmethod
+    def load(path: str) -> "TextClassifier":
+        with open(path, "rb") as f:
+            return pickle.load(f)
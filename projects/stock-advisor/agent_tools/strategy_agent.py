@@ -4,13 +4,43 @@ Strategy Agent
 --------------
 Responsible for generating actionable trading or investment recommendations
 by combining signals from other agents (Technical, Fundamental, Sentiment).
+
+The vote logic also has array forms (vote_panel / score_panel / strategy_panel)
+so the same rule can be replayed over history by core.backtester.
 """
 
 import logging
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+POSITIVE_SIGNALS = ["Buy", "Strong", "Positive"]
+NEGATIVE_SIGNALS = ["Sell", "Weak", "Negative"]
+
+
+def vote_panel(signals) -> np.ndarray:
+    """+1 / -1 / 0 for each positive / negative / other signal label in an array of labels."""
+    signals = np.asarray(signals, dtype=object)
+    return np.isin(signals, POSITIVE_SIGNALS).astype(np.int8) - np.isin(signals, NEGATIVE_SIGNALS).astype(np.int8)
+
+
+def score_panel(technical, fundamental, sentiment) -> np.ndarray:
+    """
+    Array form of StrategyAgent.score. Each argument is an array of labels or of
+    numeric votes (+1/0/-1); arrays broadcast against each other.
+    """
+    votes = [vote_panel(v) if np.asarray(v).dtype.kind in "OUS" else np.asarray(v, dtype=np.int8)
+             for v in (technical, fundamental, sentiment)]
+    return votes[0] + votes[1] + votes[2]
+
+
+def strategy_panel(score) -> np.ndarray:
+    """Buy/Sell/Hold for every element of a score array."""
+    score = np.asarray(score)
+    return np.where(score > 0, "Buy", np.where(score < 0, "Sell", "Hold"))
+
 
 class StrategyAgent:
     def __init__(self):
@@ -32,15 +62,11 @@ class StrategyAgent:
 
         logger.info("Received signals: %s", signals)
 
-        positive = ["Buy", "Strong", "Positive"]
-        negative = ["Sell", "Weak", "Negative"]
-
-        pos_count = sum(1 for s in signals.values() if s in positive)
-        neg_count = sum(1 for s in signals.values() if s in negative)
+        score = self.score(technical_signal, fundamental_signal, sentiment_signal)
 
-        if pos_count > neg_count:
+        if score > 0:
             strategy = "Buy"
-        elif neg_count > pos_count:
+        elif score < 0:
             strategy = "Sell"
         else:
             strategy = "Hold"
@@ -48,6 +74,16 @@ class StrategyAgent:
         logger.info("Generated strategy: %s", strategy)
         return strategy
 
+    def score(self, technical_signal: str, fundamental_signal: str, sentiment_signal: str) -> int:
+        """
+        Net signal vote: (# positive/strong signals) - (# negative/weak signals).
+        Ranges from -3 to 3; used to rank symbols when screening a universe.
+        """
+        signals = (technical_signal, fundamental_signal, sentiment_signal)
+        pos_count = sum(1 for s in signals if s in POSITIVE_SIGNALS)
+        neg_count = sum(1 for s in signals if s in NEGATIVE_SIGNALS)
+        return pos_count - neg_count
+
 
 # Example usage
 if __name__ == "__main__":
@@ -0,0 +1,170 @@
+# agents/streaming_indicators.py
+"""
+Streaming Indicators
+--------------------
+Stateful, O(1)-per-bar versions of the TechnicalAgent indicators for live bars.
+
+Features:
+- RollingSMA: ring buffer + running sum
+- RecursiveEMA: span-based EMA (adjust=False) carried as a single value
+- RollingRSI: rolling gain/loss averages + previous close
+- StreamingTechnicals: SMA/EMA/RSI + Buy/Sell/Hold for one symbol
+
+Each object can be seeded from history and then updated one bar at a time in
+constant time and memory. Values match the batch path in technical_agent (same
+formulas, same warm-up NaNs); RSI uses the same simple rolling averages as the
+batch RSI rather than Wilder smoothing, so live and batch signals agree.
+
+Updates must be real prices (no NaN).
+"""
+
+import math
+from typing import Iterable, Optional
+
+import numpy as np
+
+from agent_tools.technical_agent import RSI_OVERBOUGHT, RSI_OVERSOLD, ema_panel
+
+NAN = float("nan")
+
+
+class RollingSMA:
+    """Simple moving average over the last `period` updates."""
+
+    __slots__ = ("period", "value", "_buf", "_pos", "_count", "_sum")
+
+    def __init__(self, period: int = 20):
+        self.period = period
+        self.value = NAN
+        self._buf = [0.0] * period
+        self._pos = 0
+        self._count = 0
+        self._sum = 0.0
+
+    def update(self, x: float) -> float:
+        if self._count == self.period:
+            self._sum -= self._buf[self._pos]
+        else:
+            self._count += 1
+        self._buf[self._pos] = x
+        self._sum += x
+        self._pos = (self._pos + 1) % self.period
+        if self._pos == 0 and self._count == self.period:
+            # Re-sum once per lap so rounding drift in the running sum never accumulates.
+            self._sum = math.fsum(self._buf)
+        self.value = self._sum / self.period if self._count == self.period else NAN
+        return self.value
+
+    def seed(self, history: Iterable[float]) -> float:
+        for x in list(history)[-self.period:]:
+            self.update(float(x))
+        return self.value
+
+
+class RecursiveEMA:
+    """Exponential moving average with span=`period`, adjust=False (pandas semantics)."""
+
+    __slots__ = ("period", "value", "_alpha", "_old_wt")
+
+    def __init__(self, period: int = 20):
+        self.period = period
+        self.value = NAN
+        self._alpha = 2.0 / (period + 1)
+        self._old_wt = 1.0 - self._alpha
+
+    def update(self, x: float) -> float:
+        if self.value != self.value:
+            self.value = x
+        elif self.value != x:
+            self.value = (self._old_wt * self.value + self._alpha * x) / (self._old_wt + self._alpha)
+        return self.value
+
+    def seed(self, history: Iterable[float]) -> float:
+        history = np.asarray(list(history), dtype="float64")
+        if len(history):
+            self.value = float(ema_panel(history, self.period)[-1, 0])
+        return self.value
+
+
+class RollingRSI:
+    """RSI from rolling simple averages of gains and losses over `period` bars."""
+
+    __slots__ = ("period", "value", "_prev", "_gain", "_loss")
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.value = NAN
+        self._prev: Optional[float] = None
+        self._gain = RollingSMA(period)
+        self._loss = RollingSMA(period)
+
+    def update(self, x: float) -> float:
+        if self._prev is not None:
+            delta = x - self._prev
+            avg_gain = self._gain.update(delta if delta > 0 else 0.0)
+            avg_loss = self._loss.update(-delta if delta < 0 else 0.0)
+            if avg_gain != avg_gain:
+                self.value = NAN
+            elif avg_loss == 0:
+                self.value = 100.0 if avg_gain > 0 else NAN
+            else:
+                self.value = 100 - (100 / (1 + avg_gain / avg_loss))
+        self._prev = x
+        return self.value
+
+    def seed(self, history: Iterable[float]) -> float:
+        for x in list(history)[-(self.period + 1):]:
+            self.update(float(x))
+        return self.value
+
+
+class StreamingTechnicals:
+    """
+    Live SMA/EMA/RSI and signal for one symbol.
+
+    Example:
+        live = TechnicalAgent().stream(ohlcv)   # seeded from history
+        snapshot = live.update(231.4)           # each new bar's close
+        snapshot["signal"]
+    """
+
+    __slots__ = ("sma", "ema", "rsi", "bars")
+
+    def __init__(self, sma_period: int = 20, ema_period: int = 20, rsi_period: int = 14):
+        self.sma = RollingSMA(sma_period)
+        self.ema = RecursiveEMA(ema_period)
+        self.rsi = RollingRSI(rsi_period)
+        self.bars = 0
+
+    def seed(self, closes: Iterable[float]) -> dict:
+        closes = [float(x) for x in closes if x == x]
+        self.sma.seed(closes)
+        self.ema.seed(closes)
+        self.rsi.seed(closes)
+        self.bars = len(closes)
+        return self.snapshot()
+
+    def update(self, close: float) -> dict:
+        close = float(close)
+        self.sma.update(close)
+        self.ema.update(close)
+        self.rsi.update(close)
+        self.bars += 1
+        return self.snapshot()
+
+    @property
+    def signal(self) -> str:
+        rsi = self.rsi.value
+        if rsi < RSI_OVERSOLD:
+            return "Buy"
+        if rsi > RSI_OVERBOUGHT:
+            return "Sell"
+        return "Hold"
+
+    def snapshot(self) -> dict:
+        return {
+            f"SMA_{self.sma.period}": self.sma.value,
+            f"EMA_{self.ema.period}": self.ema.value,
+            f"RSI_{self.rsi.period}": self.rsi.value,
+            "signal": self.signal,
+        }
@@ -8,58 +8,140 @@ Features:
 - RSI, MACD indicators
 - Detect simple candlestick patterns
 - Generate signals (buy/hold/sell)
+- Streaming mode: O(1)-per-bar live indicators seeded from history (stream)
+- Panel mode: the same indicators for a whole dates x tickers close matrix in
+  one vectorized pass (the single-ticker methods are wrappers over it)
+- Result modes: analyze() returns a dict of float64 Series ("full", default),
+  a float32 array-backed TechnicalResult ("compact") or latest values and the
+  signal only ("summary"); see agents/analysis_result.py
 """
 
 import pandas as pd
 import numpy as np
 import logging
+from numpy.lib.stride_tricks import sliding_window_view
+
+from agent_tools.analysis_result import RESULT_MODES, TechnicalResult
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+RSI_OVERSOLD = 30
+RSI_OVERBOUGHT = 70
+
+
+# -----------------------
+# Panel kernels (dates x tickers)
+# -----------------------
+# All kernels take a 2-D float array with one column per ticker and return an
+# array of the same shape. NaN marks "no bar" (e.g. before a ticker listed), and
+# a window containing a NaN yields NaN, exactly like pandas rolling().mean().
+
+def _as_panel(closes) -> np.ndarray:
+    values = np.asarray(closes, dtype="float64")
+    return values.reshape(-1, 1) if values.ndim == 1 else values
+
+
+def rolling_mean_panel(values: np.ndarray, period: int) -> np.ndarray:
+    """Column-wise rolling mean over `period` rows; NaN until the window is full."""
+    values = _as_panel(values)
+    out = np.full(values.shape, np.nan)
+    if period <= len(values):
+        out[period - 1:] = sliding_window_view(values, period, axis=0).mean(axis=-1)
+    return out
+
+
+def sma_panel(closes, period: int = 20) -> np.ndarray:
+    """Simple Moving Average for every column."""
+    return rolling_mean_panel(closes, period)
+
+
+def ema_panel(closes, period: int = 20) -> np.ndarray:
+    """
+    Exponential Moving Average (span=period, adjust=False) for every column.
+    The recursion runs in pandas' compiled ewm kernel over the whole 2-D block
+    at once, so leading NaNs (late listings) are handled per column.
+    """
+    return pd.DataFrame(_as_panel(closes)).ewm(span=period, adjust=False).mean().to_numpy()
+
+
+def rsi_panel(closes, period: int = 14) -> np.ndarray:
+    """Relative Strength Index (simple-average gains/losses) for every column."""
+    closes = _as_panel(closes)
+    delta = np.full(closes.shape, np.nan)
+    delta[1:] = closes[1:] - closes[:-1]
+    avg_gain = rolling_mean_panel(np.clip(delta, 0, None), period)
+    avg_loss = rolling_mean_panel(-np.clip(delta, None, 0), period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rs = avg_gain / avg_loss
+        return 100 - (100 / (1 + rs))
+
+
+def last_valid_panel(values) -> np.ndarray:
+    """Last non-NaN value of each column (NaN for all-NaN columns)."""
+    values = _as_panel(values)
+    valid = ~np.isnan(values)
+    last = len(values) - 1 - np.argmax(valid[::-1], axis=0)
+    out = values[last, np.arange(values.shape[1])] if len(values) else np.full(values.shape[1], np.nan)
+    return np.where(valid.any(axis=0), out, np.nan)
+
+
+def signal_panel(rsi: np.ndarray, oversold: float = RSI_OVERSOLD, overbought: float = RSI_OVERBOUGHT,
+                 last_valid: bool = True) -> np.ndarray:
+    """
+    Buy/Sell/Hold for every column from its latest RSI: the last non-NaN value
+    (tickers without a bar on the panel's last date), or with last_valid=False
+    the last row as is, so a NaN there (e.g. a missing latest close) gives Hold.
+    """
+    rsi = _as_panel(rsi)
+    latest = last_valid_panel(rsi) if last_valid else (rsi[-1] if len(rsi) else np.full(rsi.shape[1], np.nan))
+    return np.where(latest < oversold, "Buy", np.where(latest > overbought, "Sell", "Hold"))
+
 
 class TechnicalAgent:
-    def __init__(self):
+    def __init__(self, result: str = "full"):
+        """
+        Args:
+            result: What analyze() returns: "full" (dict of pandas Series),
+                "compact" (TechnicalResult) or "summary" (summary-only TechnicalResult).
+        """
+        if result not in RESULT_MODES:
+            raise ValueError(f"result must be one of {RESULT_MODES}, got {result!r}")
         self.name = "TechnicalAgent"
+        self.result = result
+
+    def _close_column(self, data: pd.DataFrame, indicator: str):
+        if "Close" not in data.columns:
+            logger.error("DataFrame missing 'Close' column for %s calculation", indicator)
+            return None
+        return data["Close"]
 
     def calculate_sma(self, data: pd.DataFrame, period: int = 20) -> pd.Series:
         """
         Simple Moving Average
         """
-        if "Close" not in data.columns:
-            logger.error("DataFrame missing 'Close' column for SMA calculation")
+        close = self._close_column(data, "SMA")
+        if close is None:
             return pd.Series()
-        sma = data["Close"].rolling(window=period).mean()
-        return sma
+        return pd.Series(sma_panel(close, period)[:, 0], index=close.index, name=close.name)
 
     def calculate_ema(self, data: pd.DataFrame, period: int = 20) -> pd.Series:
         """
         Exponential Moving Average
         """
-        if "Close" not in data.columns:
-            logger.error("DataFrame missing 'Close' column for EMA calculation")
+        close = self._close_column(data, "EMA")
+        if close is None:
             return pd.Series()
-        ema = data["Close"].ewm(span=period, adjust=False).mean()
-        return ema
+        return pd.Series(ema_panel(close, period)[:, 0], index=close.index, name=close.name)
 
     def calculate_rsi(self, data: pd.DataFrame, period: int = 14) -> pd.Series:
         """
         Relative Strength Index
         """
-        if "Close" not in data.columns:
-            logger.error("DataFrame missing 'Close' column for RSI calculation")
+        close = self._close_column(data, "RSI")
+        if close is None:
             return pd.Series()
-
-        delta = data["Close"].diff()
-        gain = delta.clip(lower=0)
-        loss = -delta.clip(upper=0)
-
-        avg_gain = gain.rolling(window=period).mean()
-        avg_loss = loss.rolling(window=period).mean()
-
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
-        return rsi
+        return pd.Series(rsi_panel(close, period)[:, 0], index=close.index, name=close.name)
 
     def analyze(self, data: pd.DataFrame) -> dict:
         """
@@ -69,6 +151,8 @@ class TechnicalAgent:
         if data.empty:
             logger.warning("Empty OHLCV data provided for analysis")
             return {}
+        if self.result != "full":
+            return self._analyze_compact(data)
 
         result = {}
         result["SMA_20"] = self.calculate_sma(data, period=20)
@@ -77,13 +161,8 @@ class TechnicalAgent:
 
         # Generate simple signal
         try:
-            latest_rsi = result["RSI_14"].iloc[-1]
-            if latest_rsi < 30:
-                signal = "Buy"
-            elif latest_rsi > 70:
-                signal = "Sell"
-            else:
-                signal = "Hold"
+            # Signal from the last bar's RSI, as before the panel kernels: NaN there means Hold.
+            signal = str(signal_panel(result["RSI_14"].to_numpy(), last_valid=False)[0])
             result["signal"] = signal
             logger.info("Technical analysis complete. Signal: %s", signal)
         except Exception as e:
@@ -92,6 +171,62 @@ class TechnicalAgent:
 
         return result
 
+    def _analyze_compact(self, data: pd.DataFrame):
+        """analyze() straight from the kernels into a TechnicalResult, without intermediate Series."""
+        close = self._close_column(data, "analysis")
+        values = close.to_numpy() if close is not None else np.empty(0)
+        indicators = {
+            "SMA_20": sma_panel(values, 20)[:, 0],
+            "EMA_20": ema_panel(values, 20)[:, 0],
+            "RSI_14": rsi_panel(values, 14)[:, 0],
+        }
+        signal = str(signal_panel(indicators["RSI_14"], last_valid=False)[0]) if len(values) else "Hold"
+        logger.info("Technical analysis complete. Signal: %s", signal)
+        return TechnicalResult.from_arrays(indicators, signal, index=close.index if close is not None else None,
+                                           summary_only=self.result == "summary")
+
+    def stream(self, data: pd.DataFrame, sma_period: int = 20, ema_period: int = 20, rsi_period: int = 14):
+        """
+        Seed live indicators from OHLCV history. The returned StreamingTechnicals
+        is then advanced with .update(close) in O(1) per new bar.
+        """
+        from agent_tools.streaming_indicators import StreamingTechnicals
+
+        live = StreamingTechnicals(sma_period, ema_period, rsi_period)
+        close = self._close_column(data, "streaming") if not data.empty else None
+        if close is not None:
+            live.seed(close.to_numpy())
+        return live
+
+    def analyze_panel(self, closes, sma_period: int = 20, ema_period: int = 20, rsi_period: int = 14) -> dict:
+        """
+        Vectorized technical analysis for many tickers at once.
+
+        Args:
+            closes: dates x tickers close matrix. Either a DataFrame (columns are
+                tickers, e.g. DataAgent.ohlcv_many(...).data.xs("Close", axis=1, level=1))
+                or a 2-D NumPy array. NaN marks dates a ticker has no bar.
+
+        Returns:
+            dict with "SMA_<n>", "EMA_<n>", "RSI_<n>" matrices (DataFrames when a
+            DataFrame was passed, else arrays) and "signal" (ticker -> Buy/Sell/Hold).
+        """
+        values = _as_panel(closes)
+        indicators = {
+            f"SMA_{sma_period}": sma_panel(values, sma_period),
+            f"EMA_{ema_period}": ema_panel(values, ema_period),
+            f"RSI_{rsi_period}": rsi_panel(values, rsi_period),
+        }
+        signals = signal_panel(indicators[f"RSI_{rsi_period}"])
+
+        if isinstance(closes, pd.DataFrame):
+            result = {k: pd.DataFrame(v, index=closes.index, columns=closes.columns) for k, v in indicators.items()}
+            result["signal"] = pd.Series(signals, index=closes.columns, name="signal")
+        else:
+            result = dict(indicators, signal=signals)
+        logger.info("Panel technical analysis complete for %d tickers", values.shape[1])
+        return result
+
 
 # Example usage
 if __name__ == "__main__":
@@ -0,0 +1,391 @@
+# benchmarks/suite.py
+"""
+Benchmark Suite
+---------------
+Wall time, peak RSS and allocations for the analysis hot paths, on synthetic
+data (benchmarks.synthetic), compared against a stored baseline.
+
+Cases (each at the sizes of the chosen profile):
+- technical.analyze        TechnicalAgent.analyze on one OHLCV series
+- technical.analyze_panel  TechnicalAgent.analyze_panel on a dates x tickers panel
+- fundamental.ratios       FundamentalAgent.calculate_ratios per ticker
+- fundamental.ratio_panel  ratio_panel + trend_panel over every ticker and period
+- strategy.generate        StrategyAgent.generate_strategy per ticker
+- strategy.score_panel     score_panel / strategy_panel over every ticker
+- sentiment.score          SentimentAgent.score over a headline batch
+- stream.ingest            StreamIngestor over a synthetic tick tape
+- alerts.evaluate          AlertEngine ticks where 1% of the universe changed
+- orchestrator.analyze     Orchestrator.analyze_stock end to end with synthetic
+                           data in place of the providers
+
+Profiles size the inputs: "quick" (1k bars, 10 tickers; CI smoke), "default"
+(100k bars, 500 tickers) and "full" (10M bars, 5k tickers).
+
+Measurement, per case:
+- wall time: median and min of `repeats` timed runs after one warm-up
+- peak RSS: each case runs in a fresh (spawned) process, so ru_maxrss is that
+  case's own high-water mark; `rss_growth_mb` is the part reached while the
+  stage ran (not during setup)
+- allocations: tracemalloc peak during one extra run (NumPy and pandas
+  buffers are traced)
+
+A baseline is a JSON file of results keyed by case id. With --baseline, cases
+slower than (1 + time tolerance) x baseline, or using more than
+(1 + memory tolerance) x baseline memory, are flagged and the run exits 1.
+The quick-profile baseline is committed as benchmarks/baseline.json (BASELINE_PATH)
+and is what a bare --baseline compares against; re-save it on the reference
+machine whenever a change is meant to move the numbers.
+
+Example Usage:
+
+    python -m benchmarks.suite --profile quick --baseline        # pre-deploy check
+    python -m benchmarks.suite --profile quick --save-baseline benchmarks/baseline.json
+    python -m benchmarks.suite --profile default --cases technical fundamental --output results.json
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from benchmarks import synthetic
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+PROFILES = {
+    "quick": {"bars": 1_000, "tickers": 10, "panel_bars": 252},
+    "default": {"bars": 100_000, "tickers": 500, "panel_bars": 2_520},
+    "full": {"bars": 10_000_000, "tickers": 5_000, "panel_bars": 2_520},
+}
+TIME_TOLERANCE = 0.25
+MEMORY_TOLERANCE = 0.25
+# Differences below these floors are noise, never regressions.
+MIN_TIME_DELTA = 0.001  # seconds
+MIN_MEMORY_DELTA = 1.0  # MB
+METRICS = ("wall_median_s", "rss_growth_mb", "alloc_peak_mb")
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+
+@dataclass
+class Case:
+    name: str
+    setup: Callable[[Dict], Callable[[], object]]  # profile sizes -> zero-arg stage to time
+    params: Callable[[Dict], Dict]                 # sizes shown in the case id
+
+    def case_id(self, sizes: Dict) -> str:
+        return f"{self.name}[{','.join(f'{k}={v}' for k, v in self.params(sizes).items())}]"
+
+
+CASES: Dict[str, Case] = {}
+
+
+def case(name: str, params: Callable[[Dict], Dict]):
+    def register(setup):
+        CASES[name] = Case(name, setup, params)
+        return setup
+    return register
+
+
+# -----------------------
+# Cases
+# -----------------------
+@case("technical.analyze", lambda s: {"bars": s["bars"]})
+def _technical_analyze(sizes):
+    from agent_tools.technical_agent import TechnicalAgent
+
+    agent, data = TechnicalAgent(), synthetic.ohlcv(sizes["bars"])
+    return lambda: agent.analyze(data)
+
+
+@case("technical.analyze_panel", lambda s: {"bars": s["panel_bars"], "tickers": s["tickers"]})
+def _technical_panel(sizes):
+    from agent_tools.technical_agent import TechnicalAgent
+
+    agent, closes = TechnicalAgent(), synthetic.close_panel(sizes["panel_bars"], sizes["tickers"], gap_fraction=0.1)
+    return lambda: agent.analyze_panel(closes)
+
+
+@case("fundamental.ratios", lambda s: {"tickers": s["tickers"]})
+def _fundamental_ratios(sizes):
+    from agent_tools.fundamental_agent import FundamentalAgent
+
+    agent, statements = FundamentalAgent(), list(synthetic.statements(sizes["tickers"]).values())
+    return lambda: [agent.calculate_ratios(s) for s in statements]
+
+
+@case("fundamental.ratio_panel", lambda s: {"tickers": s["tickers"]})
+def _fundamental_panel(sizes):
+    from agent_tools.fundamental_agent import latest_ratios, ratio_panel, trend_panel
+
+    statements = synthetic.statements(sizes["tickers"])
+
+    def run():
+        panel = ratio_panel(statements)
+        return latest_ratios(panel).join(trend_panel(panel))
+    return run
+
+
+def _labels(n: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    return (rng.choice(["Buy", "Sell", "Hold"], n), rng.choice(["Strong", "Neutral", "Weak"], n),
+            rng.choice(["Positive", "Neutral", "Negative"], n))
+
+
+@case("strategy.generate", lambda s: {"tickers": s["tickers"]})
+def _strategy_generate(sizes):
+    from agent_tools.strategy_agent import StrategyAgent
+
+    agent, votes = StrategyAgent(), list(zip(*_labels(sizes["tickers"])))
+    return lambda: [agent.generate_strategy(t, f, s) for t, f, s in votes]
+
+
+@case("strategy.score_panel", lambda s: {"tickers": s["tickers"]})
+def _strategy_panel(sizes):
+    from agent_tools.strategy_agent import score_panel, strategy_panel
+
+    technical, fundamental, sentiment = _labels(sizes["tickers"])
+    return lambda: strategy_panel(score_panel(technical, fundamental, sentiment))
+
+
+@case("sentiment.score", lambda s: {"headlines": 20 * s["tickers"]})
+def _sentiment_score(sizes):
+    from agent_tools.sentiment_agent import SentimentAgent
+
+    agent, texts = SentimentAgent(), synthetic.headlines(20 * sizes["tickers"])
+    return lambda: agent.score(texts)
+
+
+def _n_ticks(sizes) -> int:
+    return min(100 * sizes["bars"], 5_000_000)
+
+
+@case("stream.ingest", lambda s: {"ticks": _n_ticks(s), "symbols": s["tickers"]})
+def _stream_ingest(sizes):
+    from core.streaming import STREAM_BATCH_SIZE, StreamIngestor
+
+    tape = synthetic.ticks(_n_ticks(sizes), sizes["tickers"])
+    batches = [tuple(tape[c].to_numpy()[i:i + STREAM_BATCH_SIZE] for c in tape.columns)
+               for i in range(0, len(tape), STREAM_BATCH_SIZE)]
+    return lambda: StreamIngestor().run(batches)
+
+
+@case("alerts.evaluate", lambda s: {"symbols": s["tickers"], "ticks": 100})
+def _alerts_evaluate(sizes):
+    from agent_tools.technical_agent import TechnicalAgent
+    from core.alerts import AlertEngine
+
+    closes = synthetic.close_panel(252, sizes["tickers"])
+    panel = TechnicalAgent().analyze_panel(closes)
+    engine = AlertEngine(["RSI_14 crosses below 30", "RSI_14 crosses above 70", "Close < SMA_20 * 0.95",
+                          "Close crosses above EMA_20 and RSI_14 < 70"])
+    engine.update_panel(panel, closes)
+    engine.evaluate()
+    rng = np.random.default_rng(0)
+    changed = max(1, sizes["tickers"] // 100)
+    updates = []
+    for _ in range(100):
+        rows = rng.choice(sizes["tickers"], changed, replace=False)
+        frame = pd.DataFrame({"Close": closes.iloc[-1, rows].to_numpy() * rng.normal(1, 0.02, changed),
+                              "RSI_14": rng.uniform(10, 90, changed)}, index=closes.columns[rows])
+        updates.append(frame)
+
+    def run():
+        for frame in updates:
+            engine.update_many(frame)
+            engine.evaluate()
+    return run
+
+
+class SyntheticDataAgent:
+    """Stands in for DataAgent so the orchestrator runs without providers."""
+
+    def __init__(self, n_bars: int):
+        self._ohlcv = synthetic.ohlcv(n_bars)
+        self._financials = synthetic.statements(1)["T0000"]
+
+    def latest_price(self, symbol):
+        return float(self._ohlcv["Close"].iloc[-1])
+
+    def financials(self, symbol):
+        return self._financials
+
+    def ohlcv(self, symbol):
+        return self._ohlcv
+
+
+@case("orchestrator.analyze", lambda s: {"bars": min(s["bars"], 1_000_000)})
+def _orchestrator(sizes):
+    from core.orchestrator import Orchestrator
+
+    orchestrator = Orchestrator()
+    orchestrator.data_agent = SyntheticDataAgent(min(sizes["bars"], 1_000_000))
+    news = synthetic.headlines(20)
+    orchestrator.sentiment_agent.fetch_news = lambda symbol: news
+    return lambda: orchestrator.analyze_stock("T0000")
+
+
+# -----------------------
+# Measurement
+# -----------------------
+def _max_rss_mb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / 1024 ** 2 if sys.platform == "darwin" else rss / 1024  # bytes on macOS, KiB on Linux
+
+
+def measure(name: str, sizes: Dict, repeats: int = 5) -> Dict:
+    """Set up and time one case in this process."""
+    logging.disable(logging.INFO)  # Agents log every call; keep it out of the timings
+    try:
+        stage = CASES[name].setup(sizes)
+        rss_before = _max_rss_mb()
+        stage()  # Warm-up (imports, caches, first-touch pages)
+        times = []
+        for _ in range(repeats):
+            started = time.perf_counter()
+            stage()
+            times.append(time.perf_counter() - started)
+        rss_after = _max_rss_mb()
+
+        tracemalloc.start()
+        try:
+            stage()
+            _, alloc_peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    finally:
+        logging.disable(logging.NOTSET)
+    return {
+        "case": CASES[name].case_id(sizes),
+        "wall_median_s": statistics.median(times),
+        "wall_min_s": min(times),
+        "repeats": repeats,
+        "peak_rss_mb": rss_after,
+        "rss_growth_mb": rss_after - rss_before if rss_after is not None else None,
+        "alloc_peak_mb": alloc_peak / 1024 ** 2,
+    }
+
+
+def _measure_args(args):
+    return measure(*args)
+
+
+def run(names: Optional[List[str]] = None, profile: str = "quick", repeats: int = 5,
+        isolate: bool = True) -> pd.DataFrame:
+    """
+    Measure the selected cases (all by default; a prefix such as "technical"
+    selects a group). With `isolate` every case gets its own spawned process.
+    """
+    sizes = PROFILES[profile]
+    selected = [n for n in CASES if not names or any(n == p or n.startswith(p + ".") for p in names)]
+    if not selected:
+        raise ValueError(f"No benchmark cases match {names}; available: {sorted(CASES)}")
+    rows = []
+    for name in selected:
+        logger.info("Benchmarking %s (%s)", name, profile)
+        if isolate:
+            with multiprocessing.get_context("spawn").Pool(1) as pool:
+                rows.append(pool.apply(_measure_args, ((name, sizes, repeats),)))
+        else:
+            rows.append(measure(name, sizes, repeats))
+    return pd.DataFrame(rows).set_index("case")
+
+
+# -----------------------
+# Baselines
+# -----------------------
+def save_baseline(results: pd.DataFrame, path: str, profile: str):
+    payload = {
+        "profile": profile,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": json.loads(results.to_json(orient="index")),
+    }
+    with open(path, "w") as f:
+        json.dump(payload, f, indent=2)
+    logger.info("Saved baseline for %d cases to %s", len(results), path)
+
+
+def load_baseline(path: str = BASELINE_PATH, profile: Optional[str] = None) -> pd.DataFrame:
+    with open(path, "r") as f:
+        payload = json.load(f)
+    if profile and payload.get("profile") != profile:
+        logger.warning("Baseline %s was recorded with profile %r, not %r; case ids will not match.",
+                       path, payload.get("profile"), profile)
+    return pd.DataFrame.from_dict(payload["results"], orient="index")
+
+
+def compare(results: pd.DataFrame, baseline: pd.DataFrame, time_tolerance: float = TIME_TOLERANCE,
+            memory_tolerance: float = MEMORY_TOLERANCE) -> pd.DataFrame:
+    """
+    Per case and metric: current value, baseline, ratio and a `regression` flag.
+    Cases missing from the baseline are reported with NaN baselines, never flagged.
+    """
+    base = baseline.reindex(results.index)
+    table = pd.DataFrame(index=results.index)
+    regression = pd.Series(False, index=results.index)
+    for metric in METRICS:
+        current = pd.to_numeric(results[metric], errors="coerce")
+        before = pd.to_numeric(base[metric], errors="coerce") if metric in base else pd.Series(np.nan, index=base.index)
+        tolerance, floor = ((time_tolerance, MIN_TIME_DELTA) if metric.endswith("_s")
+                            else (memory_tolerance, MIN_MEMORY_DELTA))
+        table[metric] = current
+        table[f"{metric}_baseline"] = before
+        table[f"{metric}_ratio"] = current / before.where(before > 0)
+        regression |= (current > before * (1 + tolerance)) & (current - before > floor)
+    table["regression"] = regression
+    return table
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the stock-advisor analysis pipeline.")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="quick")
+    parser.add_argument("--cases", nargs="*", help=f"Case names or groups; default all of {sorted(CASES)}")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--inline", action="store_true", help="Run every case in this process (RSS is cumulative)")
+    parser.add_argument("--baseline", nargs="?", const=BASELINE_PATH,
+                        help=f"Baseline JSON to compare against (default {os.path.relpath(BASELINE_PATH)})")
+    parser.add_argument("--save-baseline", help="Write these results as the new baseline")
+    parser.add_argument("--output", help="Write results to .json or .csv")
+    parser.add_argument("--time-tolerance", type=float, default=TIME_TOLERANCE)
+    parser.add_argument("--memory-tolerance", type=float, default=MEMORY_TOLERANCE)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    results = run(args.cases, args.profile, args.repeats, isolate=not args.inline)
+    print(results.to_string(float_format=lambda v: f"{v:.4g}"))
+
+    if args.output:
+        if args.output.endswith(".csv"):
+            results.to_csv(args.output)
+        else:
+            results.to_json(args.output, orient="index", indent=2)
+    if args.save_baseline:
+        save_baseline(results, args.save_baseline, args.profile)
+    if args.baseline:
+        table = compare(results, load_baseline(args.baseline, args.profile), args.time_tolerance, args.memory_tolerance)
+        print("\n--- Baseline comparison ---")
+        print(table[[f"{m}_ratio" for m in METRICS] + ["regression"]].to_string(float_format=lambda v: f"{v:.3f}"))
+        if table["regression"].any():
+            print(f"\nRegressions: {', '.join(table.index[table['regression']])}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+# benchmarks/synthetic.py
+"""
+Synthetic Market Data
+---------------------
+Deterministic generators for benchmark inputs, sized from a handful of bars to
+millions of bars and thousands of tickers, with no provider calls.
+
+Features:
+- ohlcv(n_bars): single-ticker OHLCV frame (geometric random walk closes,
+  consistent Open/High/Low around them, integer volumes)
+- close_panel(n_bars, n_tickers): dates x tickers close matrix, with optional
+  NaN gaps for late listings
+- statements(n_tickers, n_periods): per-ticker statement dicts shaped like
+  utils.data_fetcher.fetch_financials (dated columns, newest first)
+- headlines(n): headline strings drawn from a small finance vocabulary
+- ticks(n, n_symbols): trade tape for the streaming ingestor
+
+Example Usage:
+
+    from benchmarks.synthetic import close_panel, ohlcv
+
+    df = ohlcv(100_000)
+    closes = close_panel(2_520, 500)
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+def _dates(n_bars: int, freq: str = "B", end: str = "2024-12-31") -> pd.DatetimeIndex:
+    # Intraday frequencies keep multi-million bar series inside pandas' timestamp range.
+    return pd.date_range(end=end, periods=n_bars, freq=freq)
+
+
+def ohlcv(n_bars: int, seed: int = 0, freq: Optional[str] = None, start_price: float = 100.0) -> pd.DataFrame:
+    """OHLCV frame with `n_bars` rows (daily bars up to 50k, minute bars beyond)."""
+    rng = np.random.default_rng(seed)
+    freq = freq or ("B" if n_bars <= 50_000 else "min")
+    drift, vol = (0.0002, 0.015) if freq in ("B", "D") else (0.0, 0.001)  # Per-bar, so long minute series stay finite
+    close = start_price * np.exp(np.cumsum(rng.normal(drift, vol, n_bars)))
+    open_ = np.empty(n_bars)
+    open_[0] = start_price
+    open_[1:] = close[:-1] * np.exp(rng.normal(0, 0.003, n_bars - 1))
+    spread = np.abs(rng.normal(0, 0.006, n_bars))
+    return pd.DataFrame({
+        "Open": open_,
+        "High": np.maximum(open_, close) * (1 + spread),
+        "Low": np.minimum(open_, close) * (1 - spread),
+        "Close": close,
+        "Volume": rng.integers(100_000, 5_000_000, n_bars),
+    }, index=_dates(n_bars, freq))
+
+
+def close_panel(n_bars: int, n_tickers: int, seed: int = 0, gap_fraction: float = 0.0,
+                dtype: str = "float64") -> pd.DataFrame:
+    """
+    Dates x tickers closes (columns T0000, T0001, ...). With `gap_fraction`, that
+    share of tickers starts trading part-way through (leading NaNs).
+    """
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0.0002, 0.02, size=(n_bars, n_tickers)).astype(dtype)
+    closes = (100 * np.exp(np.cumsum(returns, axis=0))).astype(dtype)
+    if gap_fraction:
+        late = rng.random(n_tickers) < gap_fraction
+        starts = rng.integers(0, n_bars // 2, n_tickers)
+        closes[np.arange(n_bars)[:, None] < np.where(late, starts, 0)] = np.nan
+    columns = [f"T{i:04d}" for i in range(n_tickers)]
+    return pd.DataFrame(closes, index=_dates(n_bars), columns=columns)
+
+
+def statements(n_tickers: int, n_periods: int = 4, seed: int = 0) -> Dict[str, Dict[str, pd.DataFrame]]:
+    """Annual statements per ticker, current yfinance row labels, newest period first."""
+    rng = np.random.default_rng(seed)
+    periods = pd.DatetimeIndex([pd.Timestamp("2024-12-31") - pd.DateOffset(years=k) for k in range(n_periods)])
+    out = {}
+    for i in range(n_tickers):
+        revenue = rng.uniform(1e9, 1e11) * np.cumprod(rng.normal(1.0, 0.08, n_periods))
+        net_income = revenue * rng.normal(0.12, 0.06, n_periods)
+        equity = revenue * rng.uniform(0.3, 1.5)
+        assets = equity * rng.uniform(1.5, 4.0)
+        out[f"T{i:04d}"] = {
+            "financials": pd.DataFrame(
+                [revenue, revenue * 0.45, revenue * 0.2, net_income],
+                index=["Total Revenue", "Gross Profit", "Operating Income", "Net Income"], columns=periods),
+            "balance_sheet": pd.DataFrame(
+                [assets, assets - equity, equity, assets * 0.4, assets * 0.25],
+                index=["Total Assets", "Total Liabilities Net Minority Interest", "Stockholders Equity",
+                       "Current Assets", "Current Liabilities"], columns=periods),
+            "cashflow": pd.DataFrame([net_income * 1.1], index=["Free Cash Flow"], columns=periods),
+            "earnings": pd.DataFrame([net_income], index=["Net Income"], columns=periods),
+        }
+    return out
+
+
+_SUBJECTS = ["Apple", "Tesla", "Nvidia", "Bank", "Retailer", "Chipmaker", "Automaker", "Insurer"]
+_VERBS = ["beats estimates", "misses estimates", "shares surge", "shares plunge sharply", "is upgraded",
+          "is downgraded", "does not meet guidance", "announces buyback", "faces fraud probe", "holds steady"]
+
+
+def headlines(n: int, seed: int = 0) -> List[str]:
+    rng = np.random.default_rng(seed)
+    subjects = rng.choice(_SUBJECTS, n)
+    verbs = rng.choice(_VERBS, n)
+    return [f"{s} {v} in quarter {q}" for s, v, q in zip(subjects, verbs, rng.integers(1, 5, n))]
+
+
+def ticks(n: int, n_symbols: int = 10, seed: int = 0, start: float = 1_704_205_800.0,
+          rate: float = 1_000.0) -> pd.DataFrame:
+    """
+    Tick tape with `n` trades over `n_symbols` symbols (columns symbol, timestamp,
+    price, size), arriving at about `rate` ticks per second from `start` (epoch s).
+    """
+    rng = np.random.default_rng(seed)
+    symbols = np.array([f"T{i:04d}" for i in range(n_symbols)])
+    codes = rng.integers(0, n_symbols, n)
+    timestamps = start + np.cumsum(rng.exponential(1 / rate, n))
+    steps = rng.normal(0, 0.0002, n)
+    prices = np.empty(n)
+    for code in range(n_symbols):  # Independent random walk per symbol
+        mask = codes == code
+        prices[mask] = 100.0 * np.exp(np.cumsum(steps[mask]))
+    return pd.DataFrame({"symbol": symbols[codes], "timestamp": timestamps, "price": prices.round(4),
+                         "size": rng.integers(1, 500, n)})
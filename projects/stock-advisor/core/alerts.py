@@ -0,0 +1,456 @@
+# core/alerts.py
+"""
+Alert Engine
+------------
+
+Declarative alert rules over the indicator panel (Close, SMA_20, EMA_20,
+RSI_14, ... per symbol), evaluated incrementally as new values arrive.
+
+Rules are small expressions, compiled once into vectorized NumPy predicates:
+
+    RSI_14 crosses below 30
+    Close < SMA_20 * 0.95                       # price 5% below its 20-bar SMA
+    Close crosses above EMA_20 and RSI_14 < 70
+
+- Operands: panel fields (any name, e.g. Close, Volume, SMA_20) and numbers,
+  combined with + - * / and parentheses.
+- Comparisons: < <= > >= == != and "crosses above" / "crosses below"
+  (previous value on one side of the threshold, current value on the other).
+- Conditions combine with "and" / "or".
+- A rule can be limited to a symbol universe (e.g. the S&P 500 list) and can
+  carry a cooldown in seconds.
+
+How evaluation stays cheap:
+- The engine keeps two rows per symbol for every field used by any rule (the
+  current values and those as of the last evaluate()) in preallocated
+  symbols x fields arrays.
+- update() / update_many() / update_panel() write new values and mark only
+  the symbols whose values actually changed.
+- evaluate() runs every rule once over the changed rows only, so a tick costs
+  O(changed symbols x rules) array work, independent of universe size.
+- Firings are edge-triggered per (rule, symbol): a condition that stays true
+  fires once, and fires again only after it has been false in between (and
+  after the rule's cooldown).
+
+Events go to sinks: CallbackSink(fn), FileSink(path) (JSON lines) and
+WebhookSink(url) (JSON POST; with url=None it keeps payloads in .outbox as a
+local stand-in).
+
+Example Usage:
+
+    engine = AlertEngine(["RSI_14 crosses below 30", Rule("dip", "Close < SMA_20 * 0.95", symbols=sp500)],
+                         sinks=[CallbackSink(print), FileSink("alerts.jsonl")])
+    panel = TechnicalAgent().analyze_panel(closes)
+    engine.update_panel(panel, closes)
+    engine.evaluate()
+
+    ingestor = StreamIngestor(on_bar=engine.on_bar)   # live: evaluate per completed bar
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+logger.setLevel(os.getenv("LOG_LEVEL", "INFO"))
+
+ALERT_WEBHOOK_URL = os.getenv("ALERT_WEBHOOK_URL")
+
+Values = Dict[str, np.ndarray]
+Predicate = Callable[[Values, Values], np.ndarray]
+
+# -----------------------
+# Rule language
+# -----------------------
+_TOKEN = re.compile(r"\s*(crosses\s+above|crosses\s+below|<=|>=|==|!=|<|>|[-+*/()]|"
+                    r"\d+(?:\.\d+)?|[A-Za-z_][A-Za-z0-9_.]*)")
+_ARITHMETIC = {"+": np.add, "-": np.subtract, "*": np.multiply, "/": np.divide}
+_COMPARISONS = {"<": np.less, "<=": np.less_equal, ">": np.greater, ">=": np.greater_equal,
+                "==": np.equal, "!=": np.not_equal}
+
+
+class RuleSyntaxError(ValueError):
+    """An alert expression could not be parsed."""
+
+
+def _tokenize(expression: str) -> List[str]:
+    tokens, pos = [], 0
+    expression = expression.strip()
+    while pos < len(expression):
+        m = _TOKEN.match(expression, pos)
+        if not m or not m.group(1):
+            raise RuleSyntaxError(f"Unexpected input at {expression[pos:]!r} in {expression!r}")
+        tokens.append(re.sub(r"\s+", " ", m.group(1)))
+        pos = m.end()
+    return tokens
+
+
+class _Parser:
+    """Recursive descent: or -> and -> comparison -> sum -> product -> atom."""
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        self.tokens = _tokenize(expression)
+        self.pos = 0
+        self.fields: List[str] = []
+
+    def _peek(self) -> Optional[str]:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def _take(self, expected: Optional[str] = None) -> str:
+        token = self._peek()
+        if token is None or (expected is not None and token.lower() != expected):
+            raise RuleSyntaxError(f"Expected {expected or 'more input'} in {self.expression!r}")
+        self.pos += 1
+        return token
+
+    def parse(self) -> Predicate:
+        predicate = self._or()
+        if self._peek() is not None:
+            raise RuleSyntaxError(f"Unexpected {self._peek()!r} in {self.expression!r}")
+        return predicate
+
+    def _or(self) -> Predicate:
+        parts = [self._and()]
+        while (self._peek() or "").lower() == "or":
+            self._take()
+            parts.append(self._and())
+        if len(parts) == 1:
+            return parts[0]
+        return lambda cur, prev: np.logical_or.reduce([p(cur, prev) for p in parts])
+
+    def _and(self) -> Predicate:
+        parts = [self._comparison()]
+        while (self._peek() or "").lower() == "and":
+            self._take()
+            parts.append(self._comparison())
+        if len(parts) == 1:
+            return parts[0]
+        return lambda cur, prev: np.logical_and.reduce([p(cur, prev) for p in parts])
+
+    def _comparison(self) -> Predicate:
+        if self._peek() == "(":
+            # Parenthesised condition, unless it is an arithmetic group such as "(High + Low) / 2 > ..."
+            start = self.pos
+            try:
+                self._take("(")
+                inner = self._or()
+                self._take(")")
+                return inner
+            except RuleSyntaxError:
+                self.pos = start
+        left = self._sum()
+        op = (self._peek() or "").lower()
+        if op not in _COMPARISONS and op not in ("crosses above", "crosses below"):
+            raise RuleSyntaxError(f"Expected a comparison, got {op or 'end of input'!r} in {self.expression!r}")
+        self._take()
+        right = self._sum()
+        if op in _COMPARISONS:
+            compare = _COMPARISONS[op]
+            return lambda cur, prev: compare(left(cur), right(cur))
+        now_, before = (np.greater, np.less_equal) if op == "crosses above" else (np.less, np.greater_equal)
+        return lambda cur, prev: now_(left(cur), right(cur)) & before(left(prev), right(prev))
+
+    def _sum(self):
+        value = self._product()
+        while self._peek() in ("+", "-"):
+            apply, rhs, lhs = _ARITHMETIC[self._take()], self._product(), value
+            value = lambda v, apply=apply, lhs=lhs, rhs=rhs: apply(lhs(v), rhs(v))
+        return value
+
+    def _product(self):
+        value = self._atom()
+        while self._peek() in ("*", "/"):
+            apply, rhs, lhs = _ARITHMETIC[self._take()], self._atom(), value
+            value = lambda v, apply=apply, lhs=lhs, rhs=rhs: apply(lhs(v), rhs(v))
+        return value
+
+    def _atom(self):
+        token = self._take()
+        if token == "(":
+            value = self._sum()
+            self._take(")")
+            return value
+        if token == "-":
+            inner = self._atom()
+            return lambda v: -inner(v)
+        if re.fullmatch(r"\d+(?:\.\d+)?", token):
+            number = float(token)
+            return lambda v: number
+        if token.lower() in ("and", "or") or not re.fullmatch(r"[A-Za-z_][A-Za-z0-9_.]*", token):
+            raise RuleSyntaxError(f"Expected a field or number, got {token!r} in {self.expression!r}")
+        if token not in self.fields:
+            self.fields.append(token)
+        return lambda v: v[token]
+
+
+@dataclass
+class Rule:
+    """
+    One alert rule.
+
+    Attributes:
+        name: Identifier used in events (defaults to the expression).
+        when: Condition expression, e.g. "RSI_14 crosses below 30".
+        symbols: Universe the rule applies to (None = every symbol).
+        cooldown: Minimum seconds between firings for one symbol.
+    """
+    name: str
+    when: Optional[str] = None
+    symbols: Optional[Iterable[str]] = None
+    cooldown: float = 0.0
+    predicate: Predicate = field(init=False, repr=False)
+    fields: List[str] = field(init=False)
+
+    def __post_init__(self):
+        self.when = self.when or self.name
+        parser = _Parser(self.when)
+        self.predicate = parser.parse()
+        self.fields = parser.fields
+        if self.symbols is not None:
+            self.symbols = frozenset(s.upper() for s in self.symbols)
+
+    @classmethod
+    def from_dict(cls, spec: Mapping) -> "Rule":
+        return cls(spec.get("name") or spec["when"], spec.get("when"), spec.get("symbols"),
+                   float(spec.get("cooldown", 0)))
+
+
+@dataclass
+class AlertEvent:
+    rule: str
+    symbol: str
+    time: float
+    values: Dict[str, Optional[float]]
+    expression: str = ""
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+# -----------------------
+# Sinks
+# -----------------------
+class CallbackSink:
+    """Calls fn(event) for every event."""
+
+    def __init__(self, fn: Callable[[AlertEvent], None]):
+        self.fn = fn
+
+    def emit(self, events: List[AlertEvent]):
+        for event in events:
+            self.fn(event)
+
+
+class FileSink:
+    """Appends events to a JSON-lines file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def emit(self, events: List[AlertEvent]):
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            for event in events:
+                f.write(json.dumps(event.to_dict()) + "\n")
+
+
+class WebhookSink:
+    """
+    POSTs {"events": [...]} to `url` once per evaluation (paced by the
+    "webhook" rate-limiter bucket). Without a url the payloads are kept in
+    .outbox, a local stand-in for the receiving service.
+    """
+
+    def __init__(self, url: Optional[str] = ALERT_WEBHOOK_URL, timeout: float = 10):
+        self.url = url
+        self.timeout = timeout
+        self.outbox: List[dict] = []
+
+    def emit(self, events: List[AlertEvent]):
+        payload = {"events": [e.to_dict() for e in events]}
+        if not self.url:
+            self.outbox.append(payload)
+            return
+        import requests
+
+        from utils.rate_limiter import get_rate_limiter
+
+        get_rate_limiter().call("webhook", requests.post, self.url, json=payload, timeout=self.timeout)
+
+
+# -----------------------
+# Engine
+# -----------------------
+class AlertEngine:
+    """
+    Methods:
+        add_rule(rule): Register a Rule, expression string or dict.
+        update(symbol, values) / update_many(frame) / update_panel(panel, closes): Feed new values.
+        on_bar(bar, snapshot): StreamIngestor callback (update + evaluate).
+        evaluate(now): Run the rules over changed symbols, emit and return new events.
+    """
+
+    def __init__(self, rules: Iterable[Union[Rule, str, Mapping]] = (), sinks: Sequence = (),
+                 capacity: int = 256, clock: Callable[[], float] = time.time):
+        self.rules: List[Rule] = []
+        self.sinks = list(sinks)
+        self.fields: List[str] = []
+        self.clock = clock
+        self._rows: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._cur = np.full((capacity, 0), np.nan)
+        self._prev = np.full((capacity, 0), np.nan)
+        self._changed = np.zeros(capacity, dtype=bool)
+        self._active = np.zeros((0, capacity), dtype=bool)      # rule x symbol: condition currently true
+        self._in_scope = np.zeros((0, capacity), dtype=bool)    # rule x symbol: symbol in the rule's universe
+        self._last_fired = np.full((0, capacity), -np.inf)
+        self._lock = threading.RLock()
+        self.stats = {"evaluations": 0, "rows_evaluated": 0, "events": 0}
+        for rule in rules:
+            self.add_rule(rule)
+
+    # -----------------------
+    # Rules and layout
+    # -----------------------
+    def add_rule(self, rule: Union[Rule, str, Mapping]) -> Rule:
+        if isinstance(rule, str):
+            rule = Rule(rule)
+        elif isinstance(rule, Mapping):
+            rule = Rule.from_dict(rule)
+        with self._lock:
+            new_fields = [f for f in rule.fields if f not in self.fields]
+            if new_fields:
+                self.fields += new_fields
+                pad = np.full((len(self._cur), len(new_fields)), np.nan)
+                self._cur, self._prev = np.hstack([self._cur, pad]), np.hstack([self._prev, pad.copy()])
+            capacity = len(self._changed)
+            scope = np.array([rule.symbols is None or name in rule.symbols for name in self._names]
+                             + [rule.symbols is None] * (capacity - len(self._names)), dtype=bool)
+            self.rules.append(rule)
+            self._active = np.vstack([self._active, np.zeros(capacity, dtype=bool)])
+            self._in_scope = np.vstack([self._in_scope, scope])
+            self._last_fired = np.vstack([self._last_fired, np.full(capacity, -np.inf)])
+        return rule
+
+    def _grow(self, capacity: int):
+        def resize(a, fill, axis):
+            shape = list(a.shape)
+            shape[axis] = capacity - a.shape[axis]
+            return np.concatenate([a, np.full(shape, fill, dtype=a.dtype)], axis=axis)
+
+        self._cur, self._prev = resize(self._cur, np.nan, 0), resize(self._prev, np.nan, 0)
+        self._changed = resize(self._changed, False, 0)
+        self._active = resize(self._active, False, 1)
+        self._in_scope = resize(self._in_scope, False, 1)
+        self._last_fired = resize(self._last_fired, -np.inf, 1)
+
+    def _row(self, symbol: str) -> int:
+        row = self._rows.get(symbol)
+        if row is None:
+            row = self._rows[symbol] = len(self._names)
+            self._names.append(symbol)
+            if row == len(self._changed):
+                self._grow(2 * row)
+            self._in_scope[:, row] = [r.symbols is None or symbol in r.symbols for r in self.rules]
+        return row
+
+    # -----------------------
+    # Updates
+    # -----------------------
+    def _write(self, rows: np.ndarray, new: np.ndarray):
+        """
+        Store `new` for the rows whose values changed. `previous` is snapshotted
+        only on a row's first change since the last evaluate(), so several
+        updates in between still compare against the last evaluated values.
+        """
+        old = self._cur[rows]
+        differs = ~((old == new) | (np.isnan(old) & np.isnan(new))).all(axis=1)
+        rows, new = rows[differs], new[differs]
+        first = rows[~self._changed[rows]]
+        self._prev[first] = self._cur[first]
+        self._cur[rows] = new
+        self._changed[rows] = True
+
+    def update(self, symbol: str, values: Mapping[str, float]):
+        with self._lock:
+            row = self._row(symbol.upper())
+            new = self._cur[row].copy()
+            for j, name in enumerate(self.fields):
+                if name in values and values[name] is not None:
+                    new[j] = float(values[name])
+            self._write(np.array([row]), new[None, :])
+
+    def update_many(self, frame: pd.DataFrame):
+        """Latest values for many symbols: index = symbols, columns = fields (missing fields keep their value)."""
+        with self._lock:
+            rows = np.array([self._row(str(s).upper()) for s in frame.index], dtype=np.int64)
+            if not len(rows):
+                return
+            new = self._cur[rows].copy()
+            for j, name in enumerate(self.fields):
+                if name in frame.columns:
+                    column = pd.to_numeric(frame[name], errors="coerce").to_numpy("float64")
+                    new[:, j] = np.where(np.isnan(column), new[:, j], column)
+            self._write(rows, new)
+
+    def update_panel(self, panel: Mapping, closes: Optional[pd.DataFrame] = None):
+        """Latest row of a TechnicalAgent.analyze_panel result (plus Close from `closes`)."""
+        latest = {name: values.iloc[-1] for name, values in panel.items() if isinstance(values, pd.DataFrame)}
+        if closes is not None:
+            latest["Close"] = closes.iloc[-1]
+        if latest:
+            self.update_many(pd.DataFrame(latest))
+
+    def on_bar(self, bar, snapshot: Mapping):
+        """StreamIngestor on_bar callback: store the bar's OHLCV plus indicator snapshot and evaluate."""
+        values = {"Open": bar.open, "High": bar.high, "Low": bar.low, "Close": bar.close, "Volume": bar.volume}
+        values.update({k: v for k, v in snapshot.items() if isinstance(v, (int, float))})
+        self.update(bar.symbol, values)
+        return self.evaluate(now=float(bar.time))
+
+    # -----------------------
+    # Evaluation
+    # -----------------------
+    def evaluate(self, now: Optional[float] = None) -> List[AlertEvent]:
+        now = self.clock() if now is None else now
+        with self._lock:
+            rows = np.flatnonzero(self._changed[:len(self._names)])
+            if not len(rows):
+                return []
+            cur = {name: self._cur[rows, j] for j, name in enumerate(self.fields)}
+            prev = {name: self._prev[rows, j] for j, name in enumerate(self.fields)}
+            events = []
+            with np.errstate(invalid="ignore", divide="ignore"):
+                for r, rule in enumerate(self.rules):
+                    hit = np.broadcast_to(rule.predicate(cur, prev), rows.shape) & self._in_scope[r, rows]
+                    fire = hit & ~self._active[r, rows] & (now - self._last_fired[r, rows] >= rule.cooldown)
+                    self._active[r, rows] = hit
+                    fired_rows = rows[fire]
+                    self._last_fired[r, fired_rows] = now
+                    for row in fired_rows.tolist():
+                        values = {name: (None if np.isnan(v) else float(v))
+                                  for name, v in zip(self.fields, self._cur[row]) if name in rule.fields}
+                        events.append(AlertEvent(rule.name, self._names[row], now, values, rule.when))
+            self._changed[rows] = False
+            self.stats["evaluations"] += 1
+            self.stats["rows_evaluated"] += len(rows)
+            self.stats["events"] += len(events)
+
+        if events:
+            for sink in self.sinks:
+                try:
+                    sink.emit(events)
+                except Exception as e:
+                    logger.exception("Alert sink %s failed: %s", type(sink).__name__, e)
+        return events
@@ -0,0 +1,294 @@
+# core/backtester.py
+"""
+Vectorized Backtester
+---------------------
+
+Replays the StrategyAgent vote (Technical + Fundamental + Sentiment) over full
+OHLCV history for a whole universe at once. Every step is a NumPy operation on
+a dates x tickers matrix; there is no Python loop per bar or per ticker, so a
+10-year daily run over 500 symbols takes well under a second of compute.
+
+How a run works:
+- Technical votes come from the rolling RSI (rsi_panel): +1 below `oversold`,
+  -1 above `overbought`, 0 otherwise, exactly like TechnicalAgent.analyze.
+- Fundamental and sentiment votes have no bar-by-bar history; pass them as a
+  per-ticker constant (labels such as "Strong"/"Weak" or +1/0/-1) or as a full
+  dates x tickers matrix when you have point-in-time data. Omitted = neutral.
+- score = sum of votes; Buy (score > 0) opens a long, Sell (score < 0) goes
+  flat (or short with allow_short), Hold keeps the previous position.
+- Positions are sized into portfolio weights ("equal", "fixed" or
+  "inverse_vol") and traded at the close of the bar that produced the signal,
+  then held from the next bar: a position earns returns from t+1 on, never the
+  return of its own signal bar.
+- Transaction costs and slippage are charged in basis points of traded
+  notional; turnover is the sum of absolute weight changes per bar.
+
+Example Usage:
+
+    from core.backtester import backtest, load_closes
+
+    closes = load_closes(["AAPL", "MSFT", "NVDA"], period="10y")
+    result = backtest(closes, fundamental={"AAPL": "Strong"}, cost_bps=5, slippage_bps=2)
+    print(result.stats)
+    result.equity.plot()
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import os
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from agent_tools.strategy_agent import score_panel
+from agent_tools.technical_agent import RSI_OVERBOUGHT, RSI_OVERSOLD, _as_panel, rolling_mean_panel, rsi_panel
+
+logger = logging.getLogger(__name__)
+logger.setLevel(os.getenv("LOG_LEVEL", "INFO"))
+
+TRADING_DAYS = 252
+SIZING_METHODS = ("equal", "fixed", "inverse_vol")
+
+
+@dataclass
+class BacktestResult:
+    """
+    Output of a backtest run.
+
+    Attributes:
+        equity: Portfolio value per bar.
+        returns: Portfolio return per bar, net of costs.
+        drawdown: equity / running peak - 1 (0 at new highs, negative below).
+        turnover: Sum of |weight change| per bar (1.0 = whole book traded once).
+        weights: Held weights, dates x tickers.
+        ticker_equity: Each ticker traded on its own with full capital, dates x tickers.
+        stats: Summary metrics (total_return, cagr, volatility, sharpe, max_drawdown, ...).
+    """
+    equity: pd.Series
+    returns: pd.Series
+    drawdown: pd.Series
+    turnover: pd.Series
+    weights: pd.DataFrame
+    ticker_equity: pd.DataFrame
+    stats: Dict[str, float] = field(default_factory=dict)
+
+
+# -----------------------
+# Signal replay
+# -----------------------
+def technical_votes(rsi: np.ndarray, oversold: float = RSI_OVERSOLD,
+                    overbought: float = RSI_OVERBOUGHT) -> np.ndarray:
+    """+1 / -1 / 0 per bar from an RSI matrix (NaN warm-up bars vote 0)."""
+    return np.where(rsi < oversold, 1, np.where(rsi > overbought, -1, 0)).astype(np.int8)
+
+
+def broadcast_votes(votes, shape, columns=None) -> np.ndarray:
+    """
+    Expand fundamental / sentiment input to a dates x tickers vote matrix.
+
+    Accepts None (all neutral), a single label or number, a per-ticker
+    dict/Series (keyed by column name) or sequence, or a full matrix.
+    Labels are mapped through the StrategyAgent signal lists.
+    """
+    if votes is None:
+        return np.zeros(shape, dtype=np.int8)
+    if isinstance(votes, pd.DataFrame):
+        votes = votes.reindex(columns=columns) if columns is not None else votes
+        votes = votes.fillna(0).to_numpy()
+    elif isinstance(votes, (dict, pd.Series)):
+        votes = pd.Series(votes)
+        votes = (votes.reindex(columns) if columns is not None else votes).fillna(0).to_numpy()
+    votes = np.asarray(votes)
+    if votes.dtype.kind in "OUS":
+        votes = score_panel(votes, 0, 0)
+    return np.broadcast_to(votes.astype(np.int8), shape)
+
+
+def forward_fill(values: np.ndarray, fill: float = 0.0) -> np.ndarray:
+    """Column-wise forward fill of NaN without a Python loop; leading NaN become `fill`."""
+    valid = ~np.isnan(values)
+    rows = np.where(valid, np.arange(len(values))[:, None], 0)
+    np.maximum.accumulate(rows, axis=0, out=rows)
+    out = values[rows, np.arange(values.shape[1])]
+    out[~np.maximum.accumulate(valid, axis=0)] = fill
+    return out
+
+
+def target_positions(scores: np.ndarray, allow_short: bool = False) -> np.ndarray:
+    """Buy -> +1, Sell -> 0 (or -1 with allow_short), Hold -> previous position."""
+    decision = np.where(scores > 0, 1.0, np.where(scores < 0, -1.0 if allow_short else 0.0, np.nan))
+    return forward_fill(decision)
+
+
+# -----------------------
+# Sizing and accounting
+# -----------------------
+def bar_returns(closes: np.ndarray) -> np.ndarray:
+    """Simple close-to-close returns; 0 where either bar is missing."""
+    returns = np.zeros(closes.shape)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns[1:] = closes[1:] / closes[:-1] - 1
+    returns[~np.isfinite(returns)] = 0.0
+    return returns
+
+
+def size_positions(positions: np.ndarray, returns: np.ndarray, sizing: str = "equal",
+                   max_weight: Optional[float] = None, vol_window: int = 20) -> np.ndarray:
+    """
+    Turn +1/0/-1 positions into portfolio weights.
+
+    - equal: capital split evenly over the open positions of each bar
+    - fixed: every open position gets `max_weight` (default 1 / n_tickers)
+    - inverse_vol: open positions weighted by 1 / rolling volatility of returns
+    Weights are capped at `max_weight` when given.
+    """
+    if sizing not in SIZING_METHODS:
+        raise ValueError(f"Unknown sizing '{sizing}'; expected one of {SIZING_METHODS}")
+    active = np.abs(positions)
+
+    if sizing == "fixed":
+        weights = positions * (max_weight if max_weight is not None else 1.0 / positions.shape[1])
+    else:
+        if sizing == "inverse_vol":
+            variance = rolling_mean_panel(returns ** 2, vol_window) - rolling_mean_panel(returns, vol_window) ** 2
+            with np.errstate(divide="ignore"):
+                strength = 1.0 / np.sqrt(np.clip(variance, 1e-12, None))
+            strength = np.where(np.isfinite(strength), strength, 0.0) * active
+        else:
+            strength = active
+        total = strength.sum(axis=1, keepdims=True)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            weights = np.where(total > 0, np.sign(positions) * strength / total, 0.0)
+
+    if max_weight is not None:
+        weights = np.clip(weights, -max_weight, max_weight)
+    return weights
+
+
+def drawdown(equity: np.ndarray, initial_capital: Optional[float] = None) -> np.ndarray:
+    """Fractional distance below the running peak (<= 0); the starting capital counts as a peak."""
+    peak = np.maximum.accumulate(equity if initial_capital is None else np.maximum(equity, initial_capital))
+    return equity / peak - 1
+
+
+def summarize(returns: np.ndarray, equity: np.ndarray, turnover: np.ndarray, weights: np.ndarray,
+              initial_capital: float, periods_per_year: int = TRADING_DAYS) -> Dict[str, float]:
+    """Headline metrics for a portfolio return series."""
+    n = len(returns)
+    years = n / periods_per_year if n else 0.0
+    total = float(equity[-1] / initial_capital - 1) if n else 0.0
+    std = float(returns.std(ddof=1)) if n > 1 else 0.0
+    return {
+        "total_return": total,
+        "cagr": float((1 + total) ** (1 / years) - 1) if years > 0 and total > -1 else float("nan"),
+        "volatility": std * math.sqrt(periods_per_year),
+        "sharpe": float(returns.mean() / std * math.sqrt(periods_per_year)) if std > 0 else float("nan"),
+        "max_drawdown": float(drawdown(equity, initial_capital).min()) if n else 0.0,
+        "avg_turnover": float(turnover.mean()) if n else 0.0,
+        "annual_turnover": float(turnover.mean() * periods_per_year) if n else 0.0,
+        "trades": int(np.count_nonzero(np.diff(weights, axis=0, prepend=0))),
+        "exposure": float(np.abs(weights).sum(axis=1).mean()) if n else 0.0,
+        "bars": n,
+    }
+
+
+# -----------------------
+# Entry points
+# -----------------------
+def backtest(closes, fundamental=None, sentiment=None, rsi=None, rsi_period: int = 14,
+             oversold: float = RSI_OVERSOLD, overbought: float = RSI_OVERBOUGHT,
+             allow_short: bool = False, sizing: str = "equal", max_weight: Optional[float] = None,
+             vol_window: int = 20, cost_bps: float = 5.0, slippage_bps: float = 0.0,
+             initial_capital: float = 100_000.0, periods_per_year: int = TRADING_DAYS) -> BacktestResult:
+    """
+    Backtest the StrategyAgent vote over a close matrix.
+
+    Args:
+        closes: dates x tickers closes (DataFrame, or 2-D array). NaN = no bar.
+        fundamental, sentiment: Extra votes, see broadcast_votes.
+        rsi: Precomputed RSI matrix (skips rsi_panel, e.g. when sweeping thresholds).
+        oversold, overbought: RSI thresholds for the technical vote.
+        allow_short: Sell opens a short instead of going flat.
+        sizing, max_weight, vol_window: Position sizing, see size_positions.
+        cost_bps, slippage_bps: Charged on traded notional, in basis points.
+    """
+    index = closes.index if isinstance(closes, pd.DataFrame) else pd.RangeIndex(len(closes))
+    columns = closes.columns if isinstance(closes, pd.DataFrame) else pd.RangeIndex(_as_panel(closes).shape[1])
+    prices = _as_panel(closes)
+
+    rsi = rsi_panel(prices, rsi_period) if rsi is None else _as_panel(rsi)
+    scores = score_panel(
+        technical_votes(rsi, oversold, overbought),
+        broadcast_votes(fundamental, prices.shape, columns),
+        broadcast_votes(sentiment, prices.shape, columns),
+    )
+    # No trading on bars without a price.
+    positions = np.where(np.isnan(prices), 0.0, target_positions(scores, allow_short))
+    returns = bar_returns(prices)
+    weights = size_positions(positions, returns, sizing, max_weight, vol_window)
+
+    # Decide on bar t's close, hold from t+1: the signal bar never earns its own return.
+    held = np.zeros_like(weights)
+    held[1:] = weights[:-1]
+    trades = np.abs(np.diff(held, axis=0, prepend=0))
+    cost_rate = (cost_bps + slippage_bps) / 10_000
+
+    turnover = trades.sum(axis=1)
+    port_returns = (held * returns).sum(axis=1) - turnover * cost_rate
+    equity = initial_capital * np.cumprod(1 + port_returns)
+
+    unit = np.zeros_like(positions)
+    unit[1:] = positions[:-1]
+    ticker_returns = unit * returns - np.abs(np.diff(unit, axis=0, prepend=0)) * cost_rate
+    ticker_equity = initial_capital * np.cumprod(1 + ticker_returns, axis=0)
+
+    stats = summarize(port_returns, equity, turnover, held, initial_capital, periods_per_year)
+    logger.debug("Backtested %d tickers x %d bars: total return %.2f%%, max drawdown %.2f%%",
+                 prices.shape[1], len(prices), stats["total_return"] * 100, stats["max_drawdown"] * 100)
+    return BacktestResult(
+        equity=pd.Series(equity, index=index, name="equity"),
+        returns=pd.Series(port_returns, index=index, name="returns"),
+        drawdown=pd.Series(drawdown(equity, initial_capital), index=index, name="drawdown"),
+        turnover=pd.Series(turnover, index=index, name="turnover"),
+        weights=pd.DataFrame(held, index=index, columns=columns),
+        ticker_equity=pd.DataFrame(ticker_equity, index=index, columns=columns),
+        stats=stats,
+    )
+
+
+def load_closes(symbols: Iterable[str], period: str = "10y", interval: str = "1d") -> pd.DataFrame:
+    """dates x tickers close matrix from the OHLCV cache / batched downloads."""
+    from agent_tools.data_agent import DataAgent
+
+    batch = DataAgent().ohlcv_many(symbols, period=period, interval=interval)
+    if batch.failures:
+        logger.warning("No OHLCV for %d symbols: %s", len(batch.failures), sorted(batch.failures))
+    if batch.data.empty:
+        return pd.DataFrame()
+    return batch.data.xs("Close", axis=1, level=1)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Backtest the strategy vote over a symbol universe.")
+    parser.add_argument("symbols", nargs="+")
+    parser.add_argument("--period", default="10y")
+    parser.add_argument("--sizing", default="equal", choices=SIZING_METHODS)
+    parser.add_argument("--cost-bps", type=float, default=5.0)
+    parser.add_argument("--slippage-bps", type=float, default=0.0)
+    parser.add_argument("--allow-short", action="store_true")
+    args = parser.parse_args()
+
+    result = backtest(load_closes(args.symbols, period=args.period), sizing=args.sizing,
+                      cost_bps=args.cost_bps, slippage_bps=args.slippage_bps, allow_short=args.allow_short)
+    for name, value in result.stats.items():
+        print(f"{name:>16}: {value:.4f}" if isinstance(value, float) else f"{name:>16}: {value}")
+
+
+if __name__ == "__main__":
+    main()
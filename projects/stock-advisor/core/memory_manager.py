@@ -1,40 +1,142 @@
 # core/memory_manager.py
+"""
+Memory Manager
+--------------
+Persistent cache for per-symbol analyses and the portfolio snapshot.
+
+Backed by SQLite in WAL mode, one row per (namespace, key) with its own
+timestamps, so a save or lookup touches a single row regardless of cache size
+and several threads / worker processes can share one cache file.
+
+- Entries may carry a TTL; expired entries read as missing and are purged lazily.
+- A legacy JSON cache (cache.json) is imported once into cache.db and renamed
+  to cache.json.migrated.
+"""
 import json
+import sqlite3
+import threading
+import time
 from pathlib import Path
+from typing import Optional
+
+ANALYSIS = "analysis"
+PORTFOLIO = "portfolio"
+PORTFOLIO_KEY = "default"
+
 
 class MemoryManager:
-    def __init__(self, cache_file: str = "cache.json"):
-        self.cache_file = Path(cache_file)
-        if not self.cache_file.exists():
-            self._write_cache({"analysis": {}, "portfolio": {}})
+    def __init__(self, cache_file: str = "cache.json", ttl: Optional[float] = None):
+        """
+        Args:
+            cache_file: Cache path. A ".json" path is the legacy name: data is stored
+                in the sibling ".db" file. Either way, an existing sibling ".json"
+                cache is imported once.
+            ttl: Default lifetime in seconds for saved analyses (None = never expire).
+        """
+        path = Path(cache_file)
+        self.legacy_file = path.with_suffix(".json")
+        self.cache_file = path.with_suffix(".db") if path.suffix == ".json" else path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.cache_file), timeout=30, check_same_thread=False,
+                                     isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                namespace  TEXT NOT NULL,
+                key        TEXT NOT NULL,
+                value      TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                expires_at REAL,
+                PRIMARY KEY (namespace, key)
+            ) WITHOUT ROWID
+            """
+        )
+        if self.legacy_file != self.cache_file and self.legacy_file.exists():
+            self._import_legacy()
 
-    def _read_cache(self):
-        with open(self.cache_file, "r") as f:
-            return json.load(f)
+    def _import_legacy(self):
+        try:
+            with open(self.legacy_file, "r") as f:
+                legacy = json.load(f)
+        except (OSError, ValueError):
+            return
+        for symbol, analysis in (legacy.get(ANALYSIS) or {}).items():
+            if self.get_analysis(symbol) is None:
+                self.save_analysis(symbol, analysis, ttl=0)
+        if legacy.get(PORTFOLIO) and self.get_portfolio() is None:
+            self.save_portfolio(legacy[PORTFOLIO])
+        # Import once: later deletes/expiries must not be resurrected from the JSON.
+        self.legacy_file.replace(self.legacy_file.with_name(self.legacy_file.name + ".migrated"))
 
-    def _write_cache(self, data):
-        with open(self.cache_file, "w") as f:
-            json.dump(data, f, indent=4)
+    # -----------------------
+    # Row access
+    # -----------------------
+    def _put(self, namespace: str, key: str, value, ttl: Optional[float] = None):
+        now = time.time()
+        expires_at = now + ttl if ttl else None
+        payload = json.dumps(value)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (namespace, key, value, updated_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (namespace, key, payload, now, expires_at),
+            )
 
-    def save_analysis(self, symbol: str, analysis: dict):
-        cache = self._read_cache()
-        cache["analysis"][symbol] = analysis
-        self._write_cache(cache)
+    def _get_entry(self, namespace: str, key: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, updated_at, expires_at FROM entries WHERE namespace = ? AND key = ?",
+                (namespace, key),
+            ).fetchone()
+        if row is None:
+            return None
+        value, updated_at, expires_at = row
+        if expires_at is not None and expires_at <= time.time():
+            with self._lock:
+                self._conn.execute(
+                    "DELETE FROM entries WHERE namespace = ? AND key = ? AND expires_at <= ?",
+                    (namespace, key, time.time()),
+                )
+            return None
+        return {"value": json.loads(value), "updated_at": updated_at, "expires_at": expires_at}
+
+    # -----------------------
+    # Public API
+    # -----------------------
+    def save_analysis(self, symbol: str, analysis: dict, ttl: Optional[float] = None):
+        """Store an analysis; `ttl` (seconds) overrides the manager default, 0 = never expire."""
+        self._put(ANALYSIS, symbol, analysis, self.ttl if ttl is None else ttl)
 
     def get_analysis(self, symbol: str):
-        cache = self._read_cache()
-        return cache["analysis"].get(symbol)
+        entry = self._get_entry(ANALYSIS, symbol)
+        return entry["value"] if entry else None
+
+    def get_analysis_entry(self, symbol: str) -> Optional[dict]:
+        """Analysis plus its metadata: {"value", "updated_at", "expires_at"} or None."""
+        return self._get_entry(ANALYSIS, symbol)
 
     def save_portfolio(self, portfolio_data: dict):
-        cache = self._read_cache()
-        cache["portfolio"] = portfolio_data
-        self._write_cache(cache)
+        self._put(PORTFOLIO, PORTFOLIO_KEY, portfolio_data)
 
     def get_portfolio(self):
-        cache = self._read_cache()
-        portfolio = cache.get("portfolio")
+        entry = self._get_entry(PORTFOLIO, PORTFOLIO_KEY)
+        portfolio = entry["value"] if entry else None
         return portfolio if portfolio else None
 
+    def purge_expired(self) -> int:
+        """Delete all expired entries; returns how many were removed."""
+        with self._lock:
+            cur = self._conn.execute("DELETE FROM entries WHERE expires_at IS NOT NULL AND expires_at <= ?",
+                                     (time.time(),))
+        return cur.rowcount
 
     def clear_cache(self):
-        self._write_cache({"analysis": {}, "portfolio": {}})
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
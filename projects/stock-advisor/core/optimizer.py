@@ -0,0 +1,276 @@
+# core/optimizer.py
+"""
+Strategy Parameter Sweep
+------------------------
+
+Evaluates a grid (or a random sample of it) of strategy parameters against
+cached price history with the vectorized backtester, and writes a leaderboard
+scored with walk-forward validation.
+
+Tunable parameters:
+- rsi_period, oversold, overbought: TechnicalAgent RSI vote
+- roe_strong, max_debt_to_equity, roe_weak: FundamentalAgent cutoffs (need
+  per-ticker `ratios`, e.g. from fetch_ratios)
+
+How it stays cheap:
+- RSI matrices are computed once per distinct rsi_period in the parent and
+  shipped to each worker once (pool initializer); grid points only slice them.
+- Grid points are fanned out over a process pool in chunks.
+
+Walk-forward: the history is cut into `folds + 1` equal segments. Fold k
+trains on segments [0..k] and tests on segment k+1. Every grid point is scored
+on every train and test window; the leaderboard ranks by mean out-of-sample
+(test) objective, and the walk-forward table shows, for each fold, the point
+with the best train score and how it then did on the unseen test window.
+
+Example Usage:
+
+    from core.backtester import load_closes
+    from core.optimizer import fetch_ratios, sweep
+
+    closes = load_closes(symbols, period="10y")
+    result = sweep(closes, ratios=fetch_ratios(symbols), workers=8, output="sweep.csv")
+    print(result.leaderboard.head(10))
+    print(result.walk_forward)
+"""
+
+from __future__ import annotations
+
+import itertools
+import logging
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+from agent_tools.fundamental_agent import MAX_DEBT_TO_EQUITY, ROE_STRONG, ROE_WEAK, signal_panel
+from agent_tools.technical_agent import RSI_OVERBOUGHT, RSI_OVERSOLD, rsi_panel
+from core.backtester import backtest
+
+logger = logging.getLogger(__name__)
+logger.setLevel(os.getenv("LOG_LEVEL", "INFO"))
+
+DEFAULT_GRID: Dict[str, List] = {
+    "rsi_period": [7, 14, 21],
+    "oversold": [20, 25, RSI_OVERSOLD, 35],
+    "overbought": [65, RSI_OVERBOUGHT, 75, 80],
+    "roe_strong": [0.10, ROE_STRONG, 0.20],
+    "max_debt_to_equity": [0.5, MAX_DEBT_TO_EQUITY, 2.0],
+    "roe_weak": [0.0, ROE_WEAK],
+}
+DEFAULTS = {
+    "rsi_period": 14, "oversold": RSI_OVERSOLD, "overbought": RSI_OVERBOUGHT,
+    "roe_strong": ROE_STRONG, "max_debt_to_equity": MAX_DEBT_TO_EQUITY, "roe_weak": ROE_WEAK,
+}
+FUNDAMENTAL_PARAMS = ("roe_strong", "max_debt_to_equity", "roe_weak")
+
+
+@dataclass
+class SweepResult:
+    """
+    Attributes:
+        leaderboard: One row per grid point, ranked by mean test objective.
+        walk_forward: One row per fold: chosen params, train and test objective.
+    """
+    leaderboard: pd.DataFrame
+    walk_forward: pd.DataFrame
+
+
+# Per-process state, set once by the pool initializer (or inline for workers=1).
+_state: Dict = {}
+
+
+def _init_worker(state: Dict):
+    global _state
+    _state = state
+
+
+def param_grid(grid: Optional[Dict[str, Iterable]] = None, search: str = "grid",
+               n_iter: Optional[int] = None, seed: int = 0) -> List[Dict]:
+    """
+    Expand a parameter grid into a list of parameter dicts.
+    search="random" samples `n_iter` distinct points from the grid instead.
+    Unspecified parameters keep their current defaults.
+    """
+    grid = dict(DEFAULT_GRID if grid is None else grid)
+    unknown = set(grid) - set(DEFAULTS)
+    if unknown:
+        raise ValueError(f"Unknown sweep parameters: {sorted(unknown)}")
+    keys = list(grid)
+    points = [dict(DEFAULTS, **dict(zip(keys, values))) for values in itertools.product(*(grid[k] for k in keys))]
+    points = [p for p in points if p["oversold"] < p["overbought"]]
+    if search == "random":
+        points = random.Random(seed).sample(points, min(n_iter or len(points), len(points)))
+    elif search != "grid":
+        raise ValueError(f"Unknown search '{search}'; expected 'grid' or 'random'")
+    return points
+
+
+def walk_forward_windows(n_bars: int, folds: int = 4) -> List[Tuple[slice, slice]]:
+    """(train, test) row slices for anchored walk-forward over `folds` test segments."""
+    segment = n_bars // (folds + 1)
+    if segment < 2:
+        raise ValueError(f"{n_bars} bars are too few for {folds} walk-forward folds")
+    return [(slice(0, (k + 1) * segment), slice((k + 1) * segment, (k + 2) * segment if k < folds - 1 else n_bars))
+            for k in range(folds)]
+
+
+def fetch_ratios(symbols: Iterable[str]) -> pd.DataFrame:
+    """Latest roe / debt_to_equity per ticker (index) via FundamentalAgent."""
+    from agent_tools.fundamental_agent import FundamentalAgent
+
+    symbols = list(symbols)
+    summary = FundamentalAgent().analyze_many(symbols)
+    return summary.reindex(index=symbols, columns=["roe", "debt_to_equity"])
+
+
+def _objective(stats: Dict, objective: str) -> float:
+    value = stats.get(objective, float("nan"))
+    return float("nan") if value is None else float(value)
+
+
+def evaluate(params: Dict) -> Dict:
+    """Score one grid point on the full history and on every walk-forward window."""
+    closes, rsi, ratios = _state["closes"], _state["rsi"][params["rsi_period"]], _state["ratios"]
+    objective, windows, kwargs = _state["objective"], _state["windows"], _state["backtest_kwargs"]
+
+    fundamental = None
+    if ratios is not None:
+        fundamental = signal_panel(ratios[:, 0], ratios[:, 1], params["roe_strong"],
+                                   params["max_debt_to_equity"], params["roe_weak"])
+
+    def run(rows: slice) -> Dict:
+        return backtest(closes[rows], rsi=rsi[rows], fundamental=fundamental,
+                        oversold=params["oversold"], overbought=params["overbought"], **kwargs).stats
+
+    full = run(slice(None))
+    row = dict(params)
+    row.update({k: full[k] for k in ("total_return", "cagr", "sharpe", "max_drawdown", "annual_turnover")})
+    for k, (train, test) in enumerate(windows):
+        row[f"train_{k}"] = _objective(run(train), objective)
+        row[f"test_{k}"] = _objective(run(test), objective)
+    return row
+
+
+def _evaluate_chunk(chunk: List[Dict]) -> List[Dict]:
+    return [evaluate(p) for p in chunk]
+
+
+def rank_leaderboard(rows: List[Dict], folds: int, objective: str) -> pd.DataFrame:
+    board = pd.DataFrame(rows)
+    board[f"train_{objective}"] = board[[f"train_{k}" for k in range(folds)]].mean(axis=1)
+    board[f"test_{objective}"] = board[[f"test_{k}" for k in range(folds)]].mean(axis=1)
+    board = board.sort_values([f"test_{objective}", f"train_{objective}"], ascending=False,
+                              na_position="last", kind="stable").reset_index(drop=True)
+    board.insert(0, "rank", range(1, len(board) + 1))
+    return board
+
+
+def walk_forward_table(board: pd.DataFrame, folds: int) -> pd.DataFrame:
+    """Per fold: the best-in-train grid point and its out-of-sample score."""
+    rows = []
+    for k in range(folds):
+        scores = board[f"train_{k}"]
+        if scores.notna().any():
+            best = board.loc[scores.idxmax()]
+            rows.append(dict({p: best[p] for p in DEFAULTS}, fold=k, train=best[f"train_{k}"], test=best[f"test_{k}"]))
+    return pd.DataFrame(rows, columns=["fold", *DEFAULTS, "train", "test"])
+
+
+def sweep(closes: pd.DataFrame, ratios: Optional[pd.DataFrame] = None, grid: Optional[Dict] = None,
+          search: str = "grid", n_iter: Optional[int] = None, seed: int = 0, folds: int = 4,
+          objective: str = "sharpe", workers: Optional[int] = None, chunk_size: int = 8,
+          output: Optional[str] = "sweep_leaderboard.csv", **backtest_kwargs) -> SweepResult:
+    """
+    Run a parameter sweep and return (and optionally write) the leaderboard.
+
+    Args:
+        closes: dates x tickers close matrix (see core.backtester.load_closes).
+        ratios: DataFrame indexed by ticker with roe / debt_to_equity columns.
+            Without it the fundamental cutoffs have no effect and are not swept.
+        grid, search, n_iter, seed: See param_grid.
+        folds: Walk-forward folds.
+        objective: BacktestResult.stats key to maximize (sharpe, cagr, total_return, ...).
+        workers: Processes (default: os.cpu_count()); 1 runs inline.
+        output: Leaderboard path (.csv or .parquet); None to skip writing.
+        **backtest_kwargs: Passed to every backtest (sizing, cost_bps, slippage_bps, ...).
+    """
+    grid = dict(DEFAULT_GRID if grid is None else grid)
+    if ratios is None:
+        for name in FUNDAMENTAL_PARAMS:
+            grid.pop(name, None)
+    points = param_grid(grid, search, n_iter, seed)
+    windows = walk_forward_windows(len(closes), folds)
+
+    prices = closes.to_numpy(dtype="float64")
+    started = time.perf_counter()
+    state = {
+        "closes": prices,
+        "rsi": {p: rsi_panel(prices, p) for p in sorted({pt["rsi_period"] for pt in points})},
+        "ratios": None if ratios is None else ratios.reindex(closes.columns)[["roe", "debt_to_equity"]].to_numpy(dtype="float64"),
+        "objective": objective,
+        "windows": windows,
+        "backtest_kwargs": backtest_kwargs,
+    }
+    logger.info("Sweeping %d parameter sets over %d tickers x %d bars (%d folds)",
+                len(points), prices.shape[1], len(prices), folds)
+
+    workers = workers or os.cpu_count() or 1
+    chunks = [points[i:i + chunk_size] for i in range(0, len(points), max(1, chunk_size))]
+    rows: List[Dict] = []
+    if workers == 1 or len(chunks) <= 1:
+        _init_worker(state)
+        for chunk in chunks:
+            rows.extend(_evaluate_chunk(chunk))
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks)), initializer=_init_worker,
+                                 initargs=(state,)) as pool:
+            for chunk_rows in pool.map(_evaluate_chunk, chunks):
+                rows.extend(chunk_rows)
+
+    elapsed = time.perf_counter() - started
+    logger.info("Swept %d parameter sets in %.1fs (%.1f sets/s)", len(points), elapsed,
+                len(points) / elapsed if elapsed else math.inf)
+
+    board = rank_leaderboard(rows, folds, objective)
+    result = SweepResult(leaderboard=board, walk_forward=walk_forward_table(board, folds))
+    if output:
+        from core.screener import write_table
+        write_table(board, Path(output))
+        logger.info("Wrote sweep leaderboard to %s", output)
+    return result
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Sweep strategy parameters with walk-forward validation.")
+    parser.add_argument("symbols", nargs="+")
+    parser.add_argument("--period", default="10y")
+    parser.add_argument("--search", default="grid", choices=["grid", "random"])
+    parser.add_argument("--n-iter", type=int, default=None)
+    parser.add_argument("--folds", type=int, default=4)
+    parser.add_argument("--objective", default="sharpe")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--no-fundamentals", action="store_true")
+    parser.add_argument("--output", default="sweep_leaderboard.csv")
+    args = parser.parse_args()
+
+    from core.backtester import load_closes
+
+    closes = load_closes(args.symbols, period=args.period)
+    ratios = None if args.no_fundamentals else fetch_ratios(closes.columns)
+    result = sweep(closes, ratios=ratios, search=args.search, n_iter=args.n_iter, folds=args.folds,
+                   objective=args.objective, workers=args.workers, output=args.output)
+    print(result.leaderboard.head(15).to_string(index=False))
+    print(result.walk_forward.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,54 +1,169 @@
 # core/orchestrator.py
+import asyncio
 import logging
+import os
+import time
 import pandas as pd
-from agents.data_agent import DataAgent
-from agents.technical_agent import TechnicalAgent
-from agents.fundamental_agent import FundamentalAgent
-from agents.sentiment_agent import SentimentAgent
-from agents.strategy_agent import StrategyAgent
-from agents.portfolio_agent import PortfolioAgent
+from agent_tools.analysis_result import TechnicalResult
+from agent_tools.data_agent import DataAgent
+from agent_tools.technical_agent import TechnicalAgent
+from agent_tools.fundamental_agent import FundamentalAgent
+from agent_tools.sentiment_agent import SentimentAgent
+from agent_tools.strategy_agent import StrategyAgent
+from agent_tools.portfolio_agent import PortfolioAgent
+from agent_tools.risk_agent import RiskAgent
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# What analyze_stock keeps of the analyses: "full" (indicator Series and the raw
+# financial statements), "compact" (float32 TechnicalResult, no statements) or
+# "summary" (latest indicator values and signals only).
+ANALYSIS_RESULT_MODE = os.getenv("ANALYSIS_RESULT_MODE", "compact")
+
+
+def _timed(timings: dict, stage: str, fn, *args):
+    """Run fn(*args) and record its wall time (seconds) under timings[stage]."""
+    start = time.perf_counter()
+    try:
+        return fn(*args)
+    finally:
+        timings[stage] = time.perf_counter() - start
+
+
+def signal_of(analysis):
+    """Agents return either a bare signal or a dict carrying one under "signal"."""
+    if isinstance(analysis, TechnicalResult):
+        return analysis.signal
+    return analysis.get("signal") if isinstance(analysis, dict) else analysis
+
+
+def compact_fundamental(analysis):
+    """Fundamental analysis without the raw statements it was computed from."""
+    if isinstance(analysis, dict) and "financials" in analysis:
+        return {k: v for k, v in analysis.items() if k != "financials"}
+    return analysis
+
+
 class Orchestrator:
-    def __init__(self):
+    def __init__(self, result_mode: str = ANALYSIS_RESULT_MODE):
+        self.result_mode = result_mode
         self.data_agent = DataAgent()
-        self.technical_agent = TechnicalAgent()
+        self.technical_agent = TechnicalAgent(result=result_mode)
         self.fundamental_agent = FundamentalAgent()
         self.sentiment_agent = SentimentAgent()
         self.strategy_agent = StrategyAgent()
         self.portfolio_agent = PortfolioAgent()
+        self.risk_agent = RiskAgent()
 
     def analyze_stock(self, symbol: str) -> dict:
         """Main orchestrator function to analyze a stock and generate strategy"""
         logger.info("Starting analysis for: %s", symbol)
+        timings = {}
+        started = time.perf_counter()
 
         # Step 1: Fetch data
-        latest_price = self.data_agent.latest_price(symbol)
-        financials = self.data_agent.financials(symbol)
-        ohlcv = self.data_agent.ohlcv(symbol)  # Pass DataFrame to TechnicalAgent
+        latest_price = _timed(timings, "latest_price", self.data_agent.latest_price, symbol)
+        financials = _timed(timings, "financials", self.data_agent.financials, symbol)
+        ohlcv = _timed(timings, "ohlcv", self.data_agent.ohlcv, symbol)  # Pass DataFrame to TechnicalAgent
 
         # Step 2: Technical Analysis
-        tech_signal = self.technical_agent.analyze(ohlcv)
+        tech_signal = _timed(timings, "technical", self.technical_agent.analyze, ohlcv)
 
-        # Step 3: Fundamental Analysis
-        fund_signal = self.fundamental_agent.analyze(financials)
+        # Step 3: Fundamental Analysis (on the statements fetched above, no second download)
+        fund_signal = _timed(timings, "fundamental", self.fundamental_agent.analyze, financials)
 
         # Step 4: Sentiment Analysis
-        news_headlines = self.sentiment_agent.fetch_news(symbol)
-        sentiment_signal = self.sentiment_agent.analyze_sentiment(" ".join(news_headlines))
+        news_headlines = _timed(timings, "news", self.sentiment_agent.fetch_news, symbol)
+        sentiment_signal = _timed(timings, "sentiment", self._sentiment, news_headlines)
+
+        # Step 5: What adding the symbol would do to the portfolio's risk
+        impact = _timed(timings, "portfolio_impact", self._portfolio_impact, symbol)
+
+        # Step 6 & 7: Strategy and portfolio info
+        result = self._finalize(symbol, latest_price, tech_signal, fund_signal, sentiment_signal,
+                                news_headlines, timings, impact)
+        timings["total"] = time.perf_counter() - started
+
+        logger.info("Analysis complete for %s: %s", symbol, result)
+        return result
+
+    async def analyze_stock_async(self, symbol: str) -> dict:
+        """
+        Concurrent variant of analyze_stock.
+
+        The four fetches (price, financials, OHLCV, news) run at the same time on
+        worker threads, and each analysis starts as soon as its own input has
+        arrived, so latency is roughly the slowest fetch-plus-analysis chain
+        instead of the sum of all stages. Per-stage timings are returned under
+        result["timings"].
+        """
+        logger.info("Starting concurrent analysis for: %s", symbol)
+        timings = {}
+        started = time.perf_counter()
 
-        # Step 5: Strategy
-        strategy = self.strategy_agent.generate_strategy(
-            tech_signal, fund_signal, sentiment_signal
+        def stage(name, fn, *args):
+            return asyncio.to_thread(_timed, timings, name, fn, *args)
+
+        async def after(upstream, name, fn):
+            return await stage(name, fn, await upstream)
+
+        price_task = asyncio.ensure_future(stage("latest_price", self.data_agent.latest_price, symbol))
+        financials_task = asyncio.ensure_future(stage("financials", self.data_agent.financials, symbol))
+        ohlcv_task = asyncio.ensure_future(stage("ohlcv", self.data_agent.ohlcv, symbol))
+        news_task = asyncio.ensure_future(stage("news", self.sentiment_agent.fetch_news, symbol))
+
+        latest_price, tech_signal, fund_signal, sentiment_signal, news_headlines, impact = await asyncio.gather(
+            price_task,
+            after(ohlcv_task, "technical", self.technical_agent.analyze),
+            after(financials_task, "fundamental", self.fundamental_agent.analyze),
+            after(news_task, "sentiment", self._sentiment),
+            news_task,
+            stage("portfolio_impact", self._portfolio_impact, symbol),
         )
 
-        # Step 6: Portfolio info
+        result = self._finalize(symbol, latest_price, tech_signal, fund_signal, sentiment_signal,
+                                news_headlines, timings, impact)
+        timings["total"] = time.perf_counter() - started
+
+        logger.info("Concurrent analysis complete for %s in %.3fs", symbol, timings["total"])
+        return result
+
+    def analyze_stock_concurrent(self, symbol: str) -> dict:
+        """Blocking wrapper around analyze_stock_async for callers without an event loop."""
+        return asyncio.run(self.analyze_stock_async(symbol))
+
+    def screen(self, symbols, workers=None, output="screen_results.csv", **kwargs) -> pd.DataFrame:
+        """
+        Run the full pipeline over a symbol universe on a process pool and write a
+        ranked table to `output` (.csv or .parquet). Resumable; see core.screener.
+        """
+        from core.screener import screen
+        return screen(symbols, workers=workers, output=output, orchestrator=self, **kwargs)
+
+    def _sentiment(self, news_headlines):
+        return self.sentiment_agent.analyze_sentiment(" ".join(news_headlines))
+
+    def _portfolio_impact(self, symbol):
+        try:
+            return self.risk_agent.portfolio_impact(self.portfolio_agent, symbol)
+        except Exception as e:
+            logger.exception("Portfolio impact failed for %s: %s", symbol, e)
+            return {"error": str(e)}
+
+    def _finalize(self, symbol, latest_price, tech_signal, fund_signal, sentiment_signal,
+                  news_headlines, timings, portfolio_impact=None) -> dict:
+        # Strategy
+        strategy = _timed(timings, "strategy", self.strategy_agent.generate_strategy,
+                          signal_of(tech_signal), signal_of(fund_signal), sentiment_signal)
+
+        # Portfolio info
         portfolio_value = self.portfolio_agent.get_portfolio_value()
+        if self.result_mode != "full":
+            fund_signal = compact_fundamental(fund_signal)
 
-        result = {
+        return {
             "symbol": symbol,
             "latest_price": latest_price,
             "technical": tech_signal,
@@ -56,18 +171,17 @@ class Orchestrator:
             "sentiment": sentiment_signal,
             "strategy": strategy,
             "portfolio_value": portfolio_value,
+            "portfolio_impact": portfolio_impact,
             "news_headlines": news_headlines,
+            "timings": timings,
         }
 
-        logger.info("Analysis complete for %s: %s", symbol, result)
-        return result
-
 
 def main():
     orchestrator = Orchestrator()
     symbol = input("Enter stock symbol to analyze: ").strip().upper()
-    result = orchestrator.analyze_stock(symbol)
-    
+    result = orchestrator.analyze_stock_concurrent(symbol)
+
     print("\n--- Stock Analysis Result ---")
     print(f"Symbol: {result['symbol']}")
     print(f"Latest Price: {result['latest_price']}")
@@ -76,9 +190,13 @@ def main():
     print(f"Sentiment: {result['sentiment']}")
     print(f"Strategy: {result['strategy']}")
     print(f"Portfolio Value: {result['portfolio_value']}")
+    print(f"Portfolio Impact: {result['portfolio_impact']}")
     print("News Headlines:")
     for i, headline in enumerate(result['news_headlines'], 1):
         print(f"{i}. {headline}")
+    print("Stage timings (s):")
+    for stage, seconds in result['timings'].items():
+        print(f"  {stage}: {seconds:.3f}")
 
 
 if __name__ == "__main__":
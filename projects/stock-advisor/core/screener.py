@@ -0,0 +1,233 @@
+# core/screener.py
+"""
+Universe Screener
+-----------------
+
+Runs the full Technical/Fundamental/Sentiment/Strategy pipeline over a large
+symbol universe (e.g. a nightly S&P 500 / Russell run) and writes a ranked table.
+
+- The universe is split into small shards and fanned out over a process pool;
+  each worker process builds its own Orchestrator once and reuses it.
+- OHLCV is prefetched in batches by the parent (DataAgent.ohlcv_many) into the
+  shared on-disk OHLCV cache, so workers read bars from local disk.
+- Every finished shard is appended to a JSONL checkpoint; a re-run with the
+  same output path skips symbols already in the checkpoint, so a crashed run
+  resumes where it stopped. The checkpoint is removed once the table is written.
+- Worker processes split each provider's rate limit between them and make
+  their requests at BATCH priority.
+- The result table is written as Parquet when the output ends in ".parquet"
+  (requires pyarrow), otherwise as CSV.
+
+Example Usage:
+
+    from core.orchestrator import Orchestrator
+
+    table = Orchestrator().screen(symbols, workers=8, output="screen_2025-11-24.csv")
+    print(table.head(20))
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from agent_tools.analysis_result import TechnicalResult
+
+logger = logging.getLogger(__name__)
+logger.setLevel(os.getenv("LOG_LEVEL", "INFO"))
+
+SCREEN_COLUMNS = [
+    "rank", "symbol", "score", "strategy", "technical", "fundamental", "sentiment",
+    "latest_price", "rsi_14", "elapsed", "error",
+]
+
+# Per-process orchestrator, created once by the pool initializer.
+_worker_orchestrator = None
+
+
+def _init_worker(workers: int = 1):
+    global _worker_orchestrator
+    from core.orchestrator import Orchestrator
+    from utils.rate_limiter import BATCH, get_rate_limiter, set_priority
+
+    # Each process has its own limiter: split the provider budget across the pool,
+    # and queue behind any interactive use of the same process.
+    get_rate_limiter().scale(1 / max(1, workers))
+    set_priority(BATCH)
+    _worker_orchestrator = Orchestrator()
+
+
+def _latest(value) -> Optional[float]:
+    """Last non-NaN value of a Series-like indicator, as a plain float."""
+    if isinstance(value, float):  # Summary-only TechnicalResult
+        return None if math.isnan(value) else value
+    try:
+        value = value.dropna()
+        return float(value.iloc[-1]) if len(value) else None
+    except AttributeError:
+        return None
+
+
+def screen_row(orchestrator, symbol: str) -> Dict:
+    """Analyze one symbol and flatten the result into a JSON-serializable row."""
+    from core.orchestrator import signal_of
+
+    started = time.perf_counter()
+    try:
+        result = orchestrator.analyze_stock_concurrent(symbol)
+        technical = result.get("technical")
+        tech, fund, sent = signal_of(technical), signal_of(result.get("fundamental")), result.get("sentiment")
+        return {
+            "symbol": symbol,
+            "score": orchestrator.strategy_agent.score(tech, fund, sent),
+            "strategy": result.get("strategy"),
+            "technical": tech,
+            "fundamental": fund,
+            "sentiment": sent,
+            "latest_price": result.get("latest_price"),
+            "rsi_14": _latest(technical.latest.get("RSI_14") if isinstance(technical, TechnicalResult)
+                             else technical.get("RSI_14") if isinstance(technical, dict) else None),
+            "elapsed": time.perf_counter() - started,
+            "error": None,
+        }
+    except Exception as e:
+        logger.exception("Screening failed for %s: %s", symbol, e)
+        return {"symbol": symbol, "score": None, "elapsed": time.perf_counter() - started, "error": str(e)}
+
+
+def _screen_shard(symbols: List[str]) -> List[Dict]:
+    return [screen_row(_worker_orchestrator, s) for s in symbols]
+
+
+def _read_checkpoint(path: Path) -> Dict[str, Dict]:
+    rows = {}
+    if not path.exists():
+        return rows
+    with open(path, "r") as f:
+        for line in f:
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError:
+                # A crash mid-write can leave a truncated last line; that shard is simply redone.
+                continue
+            rows[row["symbol"]] = row
+    return rows
+
+
+def _append_checkpoint(path: Path, rows: List[Dict]):
+    with open(path, "a") as f:
+        for row in rows:
+            f.write(json.dumps(row, default=str) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def rank_rows(rows: Iterable[Dict]) -> pd.DataFrame:
+    """Order by score (desc), then lowest RSI first; failed symbols go last."""
+    table = pd.DataFrame(list(rows)).reindex(columns=[c for c in SCREEN_COLUMNS if c != "rank"])
+    table = table.sort_values(["score", "rsi_14", "symbol"], ascending=[False, True, True],
+                              na_position="last", kind="stable").reset_index(drop=True)
+    table.insert(0, "rank", range(1, len(table) + 1))
+    return table
+
+
+def write_table(table: pd.DataFrame, output: Path):
+    output.parent.mkdir(parents=True, exist_ok=True)
+    if output.suffix == ".parquet":
+        table.to_parquet(output, index=False)
+    else:
+        table.to_csv(output, index=False)
+
+
+def screen(symbols: Iterable[str], workers: Optional[int] = None, output: str = "screen_results.csv",
+           shard_size: int = 10, prefetch: bool = True, period: str = "1y", interval: str = "1d",
+           orchestrator=None) -> pd.DataFrame:
+    """
+    Screen a symbol universe and return the ranked table (also written to `output`).
+
+    Args:
+        symbols: Universe to screen.
+        workers: Worker processes (default: os.cpu_count()). 1 runs inline with
+            `orchestrator`, which is handy for debugging.
+        output: Result table path (.csv or .parquet). The checkpoint lives next
+            to it as <output>.checkpoint.jsonl.
+        shard_size: Symbols per task; small shards keep workers evenly loaded.
+        prefetch: Warm the shared OHLCV cache with batched downloads first.
+    """
+    symbols = list(dict.fromkeys(s.strip().upper() for s in symbols if s and s.strip()))
+    workers = workers or os.cpu_count() or 1
+    output = Path(output)
+    checkpoint = output.with_name(output.name + ".checkpoint.jsonl")
+
+    done = _read_checkpoint(checkpoint)
+    pending = [s for s in symbols if s not in done]
+    logger.info("Screening %d symbols (%d already checkpointed) on %d workers",
+                len(symbols), len(symbols) - len(pending), workers)
+
+    if pending and prefetch:
+        from agent_tools.data_agent import DataAgent
+        batch = DataAgent().ohlcv_many(pending, period=period, interval=interval)
+        if batch.failures:
+            logger.warning("Prefetch found no OHLCV for %d symbols", len(batch.failures))
+
+    shards = [pending[i:i + shard_size] for i in range(0, len(pending), max(1, shard_size))]
+    started = time.perf_counter()
+    if workers == 1:
+        if orchestrator is None:
+            from core.orchestrator import Orchestrator
+            orchestrator = Orchestrator()
+        from utils.rate_limiter import BATCH, request_priority
+
+        with request_priority(BATCH):
+            for shard in shards:
+                rows = [screen_row(orchestrator, s) for s in shard]
+                _append_checkpoint(checkpoint, rows)
+                done.update((r["symbol"], r) for r in rows)
+    elif shards:
+        pool_size = min(workers, len(shards))
+        with ProcessPoolExecutor(max_workers=pool_size, initializer=_init_worker, initargs=(pool_size,)) as pool:
+            futures = [pool.submit(_screen_shard, shard) for shard in shards]
+            for i, future in enumerate(as_completed(futures), 1):
+                rows = future.result()
+                _append_checkpoint(checkpoint, rows)
+                done.update((r["symbol"], r) for r in rows)
+                logger.info("Screened shard %d/%d (%d symbols)", i, len(shards), len(done))
+
+    elapsed = time.perf_counter() - started
+    if pending:
+        logger.info("Screened %d symbols in %.1fs (%.2f symbols/s)",
+                    len(pending), elapsed, len(pending) / elapsed if elapsed else math.inf)
+
+    table = rank_rows(done[s] for s in symbols if s in done)
+    write_table(table, output)
+    checkpoint.unlink(missing_ok=True)
+    logger.info("Wrote screen results to %s", output)
+    return table
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Screen a symbol universe and write a ranked table.")
+    parser.add_argument("universe", help="Text file with one symbol per line")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--output", default="screen_results.csv")
+    parser.add_argument("--shard-size", type=int, default=10)
+    args = parser.parse_args()
+
+    with open(args.universe, "r") as f:
+        symbols = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    table = screen(symbols, workers=args.workers, output=args.output, shard_size=args.shard_size)
+    print(table.head(25).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,309 @@
+# core/watchlist.py
+"""
+Watchlist Refresher
+-------------------
+
+Keeps precomputed Orchestrator.analyze_stock results for watchlist symbols
+(config.DEFAULT_STOCK_SYMBOLS plus any user watchlists) in the analysis store
+(core.memory_manager), so interactive requests for those symbols are served
+instantly instead of paying the cold fetch + analysis pipeline.
+
+Cadence follows US market hours (America/New_York, weekdays; exchange holidays
+are treated as regular days):
+- regular session (09:30-16:00): refresh every WATCHLIST_REFRESH_OPEN seconds (15 min)
+- pre / post market (04:00-09:30, 16:00-20:00): every WATCHLIST_REFRESH_EXTENDED (1 h)
+- closed: every WATCHLIST_REFRESH_CLOSED (6 h)
+An analysis saved before the latest session close is stale once the market has
+closed, so the first post-close refresh picks up closing prices.
+
+How it runs:
+- A scheduler thread wakes every WATCHLIST_POLL seconds and submits every
+  stale or missing watchlist symbol to a bounded thread pool
+  (WATCHLIST_WORKERS). A symbol is never refreshed twice concurrently.
+- Background refreshes run at BATCH provider priority, behind interactive calls.
+- get(symbol) returns the stored analysis with its age straight away; a stale
+  one also schedules a background refresh. Only a symbol with no stored
+  analysis is computed inline.
+
+Results are stored JSON-safe: indicator Series and TechnicalResults are reduced
+to their latest values.
+
+Example Usage:
+
+    refresher = WatchlistRefresher()
+    refresher.start()
+    view = refresher.get("AAPL")     # {"analysis": {...}, "age": 312.4, "stale": False, "refreshing": False}
+    refresher.stop()
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pandas as pd
+
+from agent_tools.analysis_result import TechnicalResult
+from core.memory_manager import MemoryManager
+from utils.rate_limiter import BATCH, INTERACTIVE, request_priority
+
+logger = logging.getLogger(__name__)
+logger.setLevel(os.getenv("LOG_LEVEL", "INFO"))
+
+WATCHLIST_WORKERS = int(os.getenv("WATCHLIST_WORKERS", "4"))
+WATCHLIST_POLL = float(os.getenv("WATCHLIST_POLL", "60"))
+WATCHLIST_REFRESH_OPEN = float(os.getenv("WATCHLIST_REFRESH_OPEN", str(15 * 60)))
+WATCHLIST_REFRESH_EXTENDED = float(os.getenv("WATCHLIST_REFRESH_EXTENDED", str(60 * 60)))
+WATCHLIST_REFRESH_CLOSED = float(os.getenv("WATCHLIST_REFRESH_CLOSED", str(6 * 60 * 60)))
+
+MARKET_TZ = ZoneInfo("America/New_York")
+PRE_MARKET, MARKET_OPEN, MARKET_CLOSE, POST_MARKET = (4, 0), (9, 30), (16, 0), (20, 0)
+
+
+# -----------------------
+# Market hours
+# -----------------------
+def _at(day: datetime, hm) -> datetime:
+    return day.replace(hour=hm[0], minute=hm[1], second=0, microsecond=0)
+
+
+def market_session(now: Optional[float] = None) -> str:
+    """"open", "extended" (pre/post market) or "closed" at epoch time `now`."""
+    local = datetime.fromtimestamp(time.time() if now is None else now, MARKET_TZ)
+    if local.weekday() >= 5:
+        return "closed"
+    if _at(local, MARKET_OPEN) <= local < _at(local, MARKET_CLOSE):
+        return "open"
+    if _at(local, PRE_MARKET) <= local < _at(local, POST_MARKET):
+        return "extended"
+    return "closed"
+
+
+def refresh_interval(now: Optional[float] = None) -> float:
+    """Seconds a stored analysis stays fresh during the current session."""
+    return {"open": WATCHLIST_REFRESH_OPEN, "extended": WATCHLIST_REFRESH_EXTENDED,
+            "closed": WATCHLIST_REFRESH_CLOSED}[market_session(now)]
+
+
+def last_close(now: Optional[float] = None) -> float:
+    """Epoch time of the most recent regular-session close at or before `now`."""
+    local = datetime.fromtimestamp(time.time() if now is None else now, MARKET_TZ)
+    day = local if local >= _at(local, MARKET_CLOSE) else local - timedelta(days=1)
+    while day.weekday() >= 5:
+        day -= timedelta(days=1)
+    return _at(day, MARKET_CLOSE).timestamp()
+
+
+def is_stale(updated_at: float, now: Optional[float] = None) -> bool:
+    now = time.time() if now is None else now
+    return now - updated_at >= refresh_interval(now) or updated_at < last_close(now)
+
+
+def _jsonable(value):
+    """Analysis result -> JSON-safe value (Series become their latest value, NaN becomes None)."""
+    if isinstance(value, TechnicalResult):
+        return _jsonable(value.to_dict())
+    if isinstance(value, dict):
+        return {str(k): _jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    if isinstance(value, pd.Series):
+        value = value.dropna()
+        return _jsonable(value.iloc[-1]) if len(value) else None
+    if isinstance(value, pd.DataFrame):
+        return _jsonable(value.iloc[-1].to_dict()) if len(value) else None
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+
+class WatchlistRefresher:
+    """
+    Methods:
+        start() / stop(): Run / stop the background scheduler thread.
+        get(symbol): Stored analysis with its age; schedules a refresh when stale.
+        refresh(symbol): Submit a refresh to the worker pool (deduplicated); returns its Future.
+        refresh_due(): Submit every stale or missing watchlist symbol.
+        add(symbols) / remove(symbols): Edit the watchlist.
+    """
+
+    def __init__(self, symbols: Optional[Iterable[str]] = None, memory: Optional[MemoryManager] = None,
+                 orchestrator_factory: Optional[Callable[[], object]] = None, workers: int = WATCHLIST_WORKERS,
+                 poll: float = WATCHLIST_POLL, clock: Callable[[], float] = time.time):
+        if symbols is None:
+            from config import DEFAULT_STOCK_SYMBOLS
+            symbols = DEFAULT_STOCK_SYMBOLS
+        self.symbols: List[str] = []
+        self.add(symbols)
+        self.memory = memory or MemoryManager()
+        if orchestrator_factory is None:
+            from core.orchestrator import Orchestrator
+            orchestrator_factory = Orchestrator
+        self._factory = orchestrator_factory
+        self._local = threading.local()  # One orchestrator per worker thread
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="watchlist")
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.poll = poll
+        self.clock = clock
+        self.stats = {"refreshed": 0, "failed": 0, "hits": 0, "stale_hits": 0, "misses": 0}
+
+    # -----------------------
+    # Watchlist
+    # -----------------------
+    def add(self, symbols: Iterable[str]):
+        for symbol in symbols:
+            symbol = symbol.strip().upper()
+            if symbol and symbol not in self.symbols:
+                self.symbols.append(symbol)
+
+    def remove(self, symbols: Iterable[str]):
+        drop = {s.strip().upper() for s in symbols}
+        self.symbols = [s for s in self.symbols if s not in drop]
+
+    # -----------------------
+    # Refreshing
+    # -----------------------
+    def _orchestrator(self):
+        orchestrator = getattr(self._local, "orchestrator", None)
+        if orchestrator is None:
+            orchestrator = self._local.orchestrator = self._factory()
+        return orchestrator
+
+    def _count(self, name: str):
+        with self._lock:
+            self.stats[name] += 1
+
+    def _run(self, symbol: str, priority: int) -> dict:
+        try:
+            with request_priority(priority):
+                analysis = _jsonable(self._orchestrator().analyze_stock(symbol))
+            self.memory.save_analysis(symbol, analysis, ttl=0)
+            self._count("refreshed")
+            return analysis
+        except Exception as e:
+            self._count("failed")
+            logger.exception("Watchlist refresh failed for %s: %s", symbol, e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(symbol, None)
+
+    def refresh(self, symbol: str, priority: int = BATCH) -> Future:
+        symbol = symbol.upper()
+        with self._lock:
+            future = self._inflight.get(symbol)
+            if future is None:
+                future = self._inflight[symbol] = self._pool.submit(self._run, symbol, priority)
+        return future
+
+    def _refresh_inline(self, symbol: str) -> dict:
+        """
+        Analyze `symbol` in the calling thread at INTERACTIVE priority instead of
+        queueing behind background refreshes. A refresh already running for it
+        (background or another caller) is joined rather than repeated.
+        """
+        with self._lock:
+            future = self._inflight.get(symbol)
+            owner = future is None
+            if owner:
+                future = self._inflight[symbol] = Future()
+        if not owner:
+            return future.result()
+        try:
+            future.set_result(self._run(symbol, INTERACTIVE))
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        return future.result()
+
+    def is_due(self, symbol: str) -> bool:
+        entry = self.memory.get_analysis_entry(symbol.upper())
+        return entry is None or is_stale(entry["updated_at"], self.clock())
+
+    def refresh_due(self) -> List[Future]:
+        return [self.refresh(symbol) for symbol in list(self.symbols) if self.is_due(symbol)]
+
+    # -----------------------
+    # Interactive access
+    # -----------------------
+    def get(self, symbol: str, refresh: bool = True) -> Optional[dict]:
+        """
+        {"analysis", "updated_at", "age" (seconds), "stale", "refreshing"}. A stale
+        analysis is returned as is and refreshed in the background; a symbol with
+        nothing stored is analyzed inline at interactive priority.
+        """
+        symbol = symbol.strip().upper()
+        entry = self.memory.get_analysis_entry(symbol)
+        if entry is None:
+            self._count("misses")
+            if not refresh:
+                return None
+            analysis = self._refresh_inline(symbol)
+            return {"analysis": analysis, "updated_at": self.clock(), "age": 0.0, "stale": False,
+                    "refreshing": False}
+
+        now = self.clock()
+        stale = is_stale(entry["updated_at"], now)
+        self._count("stale_hits" if stale else "hits")
+        if stale and refresh:
+            self.refresh(symbol)
+        with self._lock:
+            refreshing = symbol in self._inflight
+        return {"analysis": entry["value"], "updated_at": entry["updated_at"],
+                "age": max(0.0, now - entry["updated_at"]), "stale": stale, "refreshing": refreshing}
+
+    # -----------------------
+    # Scheduler
+    # -----------------------
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                due = self.refresh_due()
+                if due:
+                    logger.info("Watchlist refresh: %d symbol(s) due (%s)", len(due), market_session(self.clock()))
+            except Exception as e:
+                logger.exception("Watchlist scheduler tick failed: %s", e)
+            self._stop.wait(self.poll)
+
+    def start(self) -> "WatchlistRefresher":
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="watchlist-scheduler", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, wait: bool = True):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._pool.shutdown(wait=wait)
+
+
+def main():
+    refresher = WatchlistRefresher().start()
+    logger.info("Refreshing watchlist %s; Ctrl+C to stop", ", ".join(refresher.symbols))
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        refresher.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# tests/test_alerts.py
+
+import json
+
+import numpy as np
+import pytest
+
+from agent_tools.technical_agent import TechnicalAgent
+from benchmarks import synthetic
+from core.alerts import AlertEngine, CallbackSink, FileSink, Rule, RuleSyntaxError, WebhookSink
+from core.streaming import StreamIngestor
+
+
+def test_rules_fire_on_edges_and_dedupe(tmp_path):
+    seen = []
+    webhook = WebhookSink(url=None)
+    engine = AlertEngine(["RSI_14 crosses below 30",
+                          Rule("dip", "Close < SMA_20 * 0.95", symbols=["AAPL"], cooldown=60)],
+                         sinks=[CallbackSink(seen.append), FileSink(str(tmp_path / "alerts.jsonl")), webhook])
+
+    engine.update("AAPL", {"RSI_14": 35, "Close": 100, "SMA_20": 100})
+    engine.update("MSFT", {"RSI_14": 35, "Close": 100, "SMA_20": 100})
+    assert engine.evaluate(now=0) == []
+
+    engine.update("AAPL", {"RSI_14": 28, "Close": 94})
+    engine.update("MSFT", {"RSI_14": 29, "Close": 94})                     # Outside the "dip" universe
+    events = engine.evaluate(now=10)
+    assert sorted((e.rule, e.symbol) for e in events) == [
+        ("RSI_14 crosses below 30", "AAPL"), ("RSI_14 crosses below 30", "MSFT"), ("dip", "AAPL")]
+    assert events[-1].values == {"Close": 94.0, "SMA_20": 100.0}
+
+    engine.update("AAPL", {"RSI_14": 25, "Close": 93})                     # Still true: no repeat
+    assert engine.evaluate(now=20) == []
+    engine.update("AAPL", {"Close": 99})
+    engine.evaluate(now=30)
+    engine.update("AAPL", {"Close": 90})                                   # Re-armed, but within cooldown
+    assert engine.evaluate(now=40) == []
+    engine.update("AAPL", {"Close": 99})
+    engine.evaluate(now=80)
+    engine.update("AAPL", {"Close": 90})
+    assert [e.rule for e in engine.evaluate(now=90)] == ["dip"]
+
+    assert len(seen) == 4
+    lines = (tmp_path / "alerts.jsonl").read_text().splitlines()
+    assert [json.loads(line)["symbol"] for line in lines] == [e.symbol for e in seen]
+    assert sum(len(p["events"]) for p in webhook.outbox) == 4
+
+    with pytest.raises(RuleSyntaxError):
+        Rule("bad", "RSI_14 below 30")
+
+
+def test_crossing_survives_several_updates_between_evaluations():
+    engine = AlertEngine(["RSI_14 crosses below 30"])
+    engine.update("B", {"RSI_14": 35, "Close": 60})
+    engine.evaluate(now=0)
+    engine.update("B", {"RSI_14": 28})
+    engine.update("B", {"Close": 50})
+    assert [e.symbol for e in engine.evaluate(now=1)] == ["B"]
+
+
+def test_panel_updates_only_evaluate_changed_symbols():
+    closes = synthetic.close_panel(120, 500, seed=3)
+    panel = TechnicalAgent().analyze_panel(closes)
+    engine = AlertEngine(["Close < SMA_20 * 0.95", "RSI_14 < 30", "Close crosses above EMA_20 and RSI_14 < 70"])
+    engine.update_panel(panel, closes)
+    first = engine.evaluate(now=0)
+    assert engine.stats["rows_evaluated"] == 500
+
+    expected = {s for s in closes.columns
+                if closes[s].iloc[-1] < panel["SMA_20"][s].iloc[-1] * 0.95 or panel["RSI_14"][s].iloc[-1] < 30}
+    assert {e.symbol for e in first if e.rule != "Close crosses above EMA_20 and RSI_14 < 70"} == expected
+
+    engine.update_panel(panel, closes)                                     # Nothing changed
+    assert engine.evaluate(now=1) == []
+    assert engine.stats["rows_evaluated"] == 500
+
+    moved = closes.copy()
+    moved.iloc[-1, :7] *= 0.5
+    engine.update_panel({"SMA_20": panel["SMA_20"]}, moved)
+    events = engine.evaluate(now=2)
+    assert engine.stats["rows_evaluated"] == 507
+    assert {e.symbol for e in events} <= set(closes.columns[:7])
+
+
+def test_stream_ingestor_feeds_engine():
+    events = []
+    engine = AlertEngine(["Close > SMA_20 * 1.0", "RSI_14 > 0"], sinks=[CallbackSink(events.append)])
+    ingestor = StreamIngestor(on_bar=engine.on_bar, lateness=0)
+    tape = synthetic.ticks(20_000, 3, rate=10)
+    ingestor.ingest(tape["symbol"], tape["timestamp"], tape["price"], tape["size"])
+    ingestor.flush()
+    assert engine.stats["evaluations"] == ingestor.bars > 0
+    assert {e.symbol for e in events} <= set(ingestor.store.symbols)
+    assert np.isfinite([e.time for e in events]).all()
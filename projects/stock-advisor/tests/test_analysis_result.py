@@ -0,0 +1,72 @@
+# tests/test_analysis_result.py
+
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from agent_tools.analysis_result import TechnicalResult
+from agent_tools.technical_agent import TechnicalAgent
+from benchmarks import synthetic
+from core.orchestrator import compact_fundamental, signal_of
+
+
+@pytest.fixture
+def ohlcv():
+    data = synthetic.ohlcv(5_000)
+    data.index = data.index.tz_localize("America/New_York")
+    return data
+
+
+def test_compact_result_matches_full_analysis(ohlcv):
+    full = TechnicalAgent().analyze(ohlcv)
+    compact = TechnicalAgent(result="compact").analyze(ohlcv)
+
+    assert isinstance(compact, TechnicalResult)
+    assert compact["signal"] == full["signal"] == signal_of(compact)
+    assert set(compact) == set(full) and "RSI_14" in compact
+    for key in ["SMA_20", "EMA_20", "RSI_14"]:
+        series = compact[key]
+        assert series.dtype == np.float32
+        pd.testing.assert_index_equal(series.index, full[key].index)
+        np.testing.assert_allclose(series, full[key], rtol=1e-6, equal_nan=True)
+        assert compact.latest[key] == full[key].dropna().iloc[-1]  # Latest values keep full precision
+    assert compact.nbytes == 3 * 4 * len(ohlcv) + 8 * len(ohlcv)
+
+    summary = TechnicalAgent(result="summary").analyze(ohlcv)
+    assert summary.is_summary and summary.nbytes == 0
+    assert summary["RSI_14"] == compact.latest["RSI_14"]
+    assert summary.to_dict() == compact.summary().to_dict()
+
+    with pytest.raises(ValueError):
+        TechnicalAgent(result="tiny")
+
+
+def test_binary_round_trip_and_pickle(ohlcv):
+    compact = TechnicalAgent(result="compact").analyze(ohlcv)
+    restored = TechnicalResult.from_bytes(compact.to_bytes())
+    pd.testing.assert_frame_equal(restored.to_frame(), compact.to_frame())
+    assert restored.latest == compact.latest and restored.signal == compact.signal
+
+    short = TechnicalAgent(result="compact").analyze(pd.DataFrame({"Close": [10.0, 11.0, 12.0]}))
+    again = pickle.loads(pickle.dumps(short))
+    assert again.to_dict() == {"SMA_20": None, "EMA_20": pytest.approx(10.2766, abs=1e-4), "RSI_14": None,
+                               "signal": "Hold"}
+    pd.testing.assert_index_equal(again["EMA_20"].index, pd.RangeIndex(3))
+
+    summary = pickle.loads(pickle.dumps(compact.summary()))
+    assert summary.is_summary and summary.to_dict() == compact.to_dict()
+
+    full = pickle.dumps(TechnicalAgent().analyze(ohlcv))
+    assert len(pickle.dumps(compact)) < len(full) / 2
+    assert len(summary.to_bytes()) < 200
+
+    with pytest.raises(ValueError):
+        TechnicalResult.from_bytes(b"JUNK" + bytes(10))
+
+
+def test_compact_fundamental_drops_statements():
+    analysis = {"signal": "Strong", "ratios": {"roe": 0.3}, "trend": "Improving", "financials": {"x": pd.DataFrame()}}
+    assert compact_fundamental(analysis) == {"signal": "Strong", "ratios": {"roe": 0.3}, "trend": "Improving"}
+    assert compact_fundamental("Strong") == "Strong"
@@ -0,0 +1,111 @@
+# tests/test_backtester.py
+
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from agent_tools.strategy_agent import StrategyAgent, score_panel, strategy_panel
+from agent_tools.technical_agent import rsi_panel
+from core.backtester import (
+    backtest,
+    broadcast_votes,
+    drawdown,
+    forward_fill,
+    size_positions,
+    target_positions,
+    technical_votes,
+)
+
+
+def random_walk(n_bars=300, n_tickers=4, seed=0):
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0.0003, 0.02, size=(n_bars, n_tickers))
+    closes = 100 * np.cumprod(1 + returns, axis=0)
+    index = pd.bdate_range("2020-01-01", periods=n_bars)
+    return pd.DataFrame(closes, index=index, columns=[f"T{i}" for i in range(n_tickers)])
+
+
+def test_score_panel_matches_strategy_agent():
+    agent = StrategyAgent()
+    tech = np.array(["Buy", "Sell", "Hold", "Buy"])
+    fund = np.array(["Weak", "Weak", "Strong", "Neutral"])
+    sent = np.array(["Positive", "Neutral", "Negative", "Negative"])
+    scores = score_panel(tech, fund, sent)
+    assert list(scores) == [agent.score(*s) for s in zip(tech, fund, sent)]
+    assert list(strategy_panel(scores)) == [agent.generate_strategy(*s) for s in zip(tech, fund, sent)]
+
+
+def test_technical_votes_and_hold_keeps_position():
+    rsi = np.array([[np.nan], [25.0], [50.0], [75.0], [50.0], [20.0]])
+    votes = technical_votes(rsi)
+    assert votes[:, 0].tolist() == [0, 1, 0, -1, 0, 1]
+    assert target_positions(votes)[:, 0].tolist() == [0, 1, 1, 0, 0, 1]
+    assert target_positions(votes, allow_short=True)[:, 0].tolist() == [0, 1, 1, -1, -1, 1]
+
+
+def test_forward_fill_per_column():
+    values = np.array([[np.nan, 1.0], [2.0, np.nan], [np.nan, np.nan], [3.0, 0.0]])
+    assert forward_fill(values).tolist() == [[0.0, 1.0], [2.0, 1.0], [2.0, 1.0], [3.0, 0.0]]
+
+
+def test_broadcast_votes_accepts_labels_per_ticker():
+    votes = broadcast_votes({"B": "Strong", "A": "Weak"}, (2, 3), pd.Index(["A", "B", "C"]))
+    assert votes.tolist() == [[-1, 1, 0], [-1, 1, 0]]
+    assert broadcast_votes(None, (2, 2)).sum() == 0
+
+
+def test_equal_sizing_splits_capital_over_open_positions():
+    positions = np.array([[1.0, 1.0, 0.0], [1.0, 0.0, 0.0], [0.0, 0.0, 0.0]])
+    weights = size_positions(positions, np.zeros_like(positions))
+    assert weights.tolist() == [[0.5, 0.5, 0.0], [1.0, 0.0, 0.0], [0.0, 0.0, 0.0]]
+    fixed = size_positions(positions, np.zeros_like(positions), sizing="fixed", max_weight=0.2)
+    assert fixed.max() == 0.2
+    with pytest.raises(ValueError):
+        size_positions(positions, positions, sizing="kelly")
+
+
+def test_signal_trades_on_next_bar_only():
+    # Buy fires on bar 2's close: the position is held from bar 3, so only 80 -> 120 is earned.
+    closes = pd.DataFrame({"X": [100.0, 90.0, 80.0, 120.0, 120.0]})
+    rsi = np.array([[50.0], [50.0], [10.0], [50.0], [50.0]])
+    result = backtest(closes, rsi=rsi, cost_bps=0)
+    assert result.weights["X"].tolist() == [0.0, 0.0, 0.0, 1.0, 1.0]
+    assert result.equity.iloc[-1] == pytest.approx(100_000 * 120 / 80)
+
+
+def test_costs_and_slippage_reduce_returns_by_turnover():
+    closes = random_walk()
+    free = backtest(closes, cost_bps=0)
+    costly = backtest(closes, cost_bps=10, slippage_bps=5)
+    assert (free.turnover == costly.turnover).all()
+    drag = (free.returns - costly.returns).to_numpy()
+    np.testing.assert_allclose(drag, costly.turnover.to_numpy() * 15 / 10_000)
+    assert costly.stats["total_return"] < free.stats["total_return"]
+
+
+def test_result_shapes_and_drawdown():
+    closes = random_walk()
+    result = backtest(closes, fundamental={"T0": "Strong"}, sizing="inverse_vol")
+    assert result.weights.shape == closes.shape
+    assert result.ticker_equity.shape == closes.shape
+    assert (result.weights.abs().sum(axis=1) <= 1 + 1e-9).all()
+    assert (result.drawdown <= 0).all()
+    assert result.stats["max_drawdown"] == pytest.approx(result.drawdown.min())
+    assert drawdown(np.array([1.0, 2.0, 1.0, 3.0])).tolist() == [0.0, 0.0, -0.5, 0.0]
+
+
+def test_rsi_precomputed_matches_internal():
+    closes = random_walk(n_tickers=2)
+    a = backtest(closes)
+    b = backtest(closes, rsi=rsi_panel(closes.to_numpy(), 14))
+    pd.testing.assert_series_equal(a.equity, b.equity)
+
+
+def test_large_universe_is_fast():
+    closes = random_walk(n_bars=2520, n_tickers=500, seed=1)
+    started = time.perf_counter()
+    result = backtest(closes, slippage_bps=2)
+    assert time.perf_counter() - started < 10
+    assert len(result.equity) == 2520
@@ -0,0 +1,48 @@
+# tests/test_bar_store.py
+
+import numpy as np
+import pandas as pd
+
+from benchmarks import synthetic
+from utils.bar_store import BarStore
+
+
+def _expected_bars(tape: pd.DataFrame, symbol: str) -> pd.DataFrame:
+    ticks = tape[tape["symbol"] == symbol].set_index(pd.to_datetime(tape.loc[tape["symbol"] == symbol, "timestamp"],
+                                                                     unit="s", utc=True))
+    bars = ticks["price"].resample("1min").ohlc().dropna()
+    bars["volume"] = ticks["size"].resample("1min").sum()
+    return bars
+
+
+def test_ticks_aggregate_into_ring_of_minute_bars():
+    tape = synthetic.ticks(20_000, 3, rate=20)  # ~16 minutes
+    store = BarStore(capacity=8)
+    completed = [bar for row in tape.itertuples(index=False) if (bar := store.add_tick(*row))]
+
+    expected = _expected_bars(tape, "T0001")
+    bars = store.bars("T0001")
+    assert len(bars) == 8 and store.late_ticks == 0  # Only the newest `capacity` bars are kept
+    np.testing.assert_allclose(bars[["Open", "High", "Low", "Close", "Volume"]].to_numpy(),
+                               expected.iloc[-9:-1].to_numpy())  # Last minute is still forming
+    assert store.forming_bar("T0001").close == tape[tape["symbol"] == "T0001"]["price"].iloc[-1]
+    assert len(completed) == sum(len(_expected_bars(tape, s)) - 1 for s in store.symbols)
+    np.testing.assert_array_equal(store.closes("T0001"), bars["Close"].to_numpy())
+
+
+def test_batches_match_single_ticks_and_drop_late_ticks():
+    tape = synthetic.ticks(50_000, 40, rate=100)
+    single, batched = BarStore(symbols=4), BarStore(symbols=4)  # Forces slot growth
+    for row in tape.itertuples(index=False):
+        single.add_tick(*row)
+    for start in range(0, len(tape), 3_000):
+        chunk = tape.iloc[start:start + 3_000]
+        batched.add_ticks(chunk["symbol"], chunk["timestamp"], chunk["price"], chunk["size"])
+
+    for symbol in ("T0000", "T0039"):
+        pd.testing.assert_frame_equal(single.bars(symbol), batched.bars(symbol))
+
+    last = batched.last_bar("T0000")
+    batched.add_tick("T0000", last.time + 1, 1.0, 10)  # Minute already closed
+    assert batched.late_ticks == 1 and batched.last_bar("T0000") == last
+    assert len(batched.flush(tape["timestamp"].iloc[-1] + 60)) == 40
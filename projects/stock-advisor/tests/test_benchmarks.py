@@ -0,0 +1,49 @@
+# tests/test_benchmarks.py
+
+import numpy as np
+import pandas as pd
+
+from benchmarks import suite, synthetic
+
+
+def test_synthetic_generators_are_deterministic_and_consistent():
+    df = synthetic.ohlcv(500, seed=3)
+    assert len(df) == 500 and df.index.is_monotonic_increasing
+    assert (df["High"] >= df[["Open", "Close"]].max(axis=1)).all()
+    assert (df["Low"] <= df[["Open", "Close"]].min(axis=1)).all()
+    pd.testing.assert_frame_equal(df, synthetic.ohlcv(500, seed=3))
+
+    panel = synthetic.close_panel(300, 20, gap_fraction=0.5, seed=1)
+    assert panel.shape == (300, 20) and panel.iloc[-1].notna().all() and panel.isna().any().any()
+
+    statements = synthetic.statements(3, n_periods=5)
+    assert list(statements) == ["T0000", "T0001", "T0002"]
+    assert statements["T0000"]["balance_sheet"].shape == (5, 5)
+
+
+def test_measure_reports_time_and_memory():
+    row = suite.measure("strategy.score_panel", suite.PROFILES["quick"], repeats=2)
+    assert row["case"] == "strategy.score_panel[tickers=10]"
+    assert 0 < row["wall_min_s"] <= row["wall_median_s"]
+    assert row["alloc_peak_mb"] > 0
+
+
+def test_compare_flags_regressions_beyond_tolerance():
+    baseline = pd.DataFrame({"wall_median_s": [0.10, 0.10, 0.0001], "rss_growth_mb": [10.0, 10.0, 1.0],
+                             "alloc_peak_mb": [5.0, 5.0, 0.1]}, index=["fast", "slow", "tiny"])
+    results = pd.DataFrame({"wall_median_s": [0.11, 0.20, 0.0005], "rss_growth_mb": [10.0, 10.0, 1.5],
+                            "alloc_peak_mb": [5.0, 5.0, 0.3]}, index=["fast", "slow", "tiny"])
+    table = suite.compare(results, baseline)
+    assert table["regression"].tolist() == [False, True, False]  # "tiny" is under the noise floors
+    assert table.loc["slow", "wall_median_s_ratio"] == 2.0
+
+    table = suite.compare(results.rename(index={"fast": "new"}), baseline)
+    assert not table.loc["new", "regression"] and np.isnan(table.loc["new", "wall_median_s_baseline"])
+
+
+def test_committed_baseline_covers_every_quick_case():
+    baseline = suite.load_baseline(profile="quick")
+    sizes = suite.PROFILES["quick"]
+    assert sorted(baseline.index) == sorted(c.case_id(sizes) for c in suite.CASES.values())
+    assert (baseline[list(suite.METRICS)].apply(pd.to_numeric) >= 0).all().all()
+    assert not suite.compare(baseline, baseline)["regression"].any()
@@ -0,0 +1,68 @@
+# tests/test_cassette.py
+
+import pandas as pd
+import pytest
+
+from utils import data_fetcher
+from utils.cassette import Cassette, CassetteMiss, request_key, set_cassette, use_cassette
+from utils.rate_limiter import RateLimiter
+
+
+class FakeTicker:
+    def __init__(self, symbol):
+        self.ticker = symbol
+
+    def history(self, **kwargs):
+        FakeTicker.downloads += 1
+        return pd.DataFrame({"Close": [1.0, 2.0]}, index=pd.date_range("2024-01-01", periods=2))
+
+
+def test_request_key_is_stable_and_scrubs_secrets():
+    a = request_key("newsapi", pd.DataFrame, ("x",), {"params": {"q": "AAPL", "apiKey": "secret"}})
+    b = request_key("newsapi", pd.DataFrame, ("x",), {"params": {"apiKey": "other", "q": "AAPL"}})
+    assert a == b and "secret" not in a
+    assert "FakeTicker(AAPL)" in request_key("yahoo", FakeTicker("aapl").history, (), {"period": "1y"})
+
+
+def test_record_then_replay_without_network(tmp_path):
+    limiter = RateLimiter()
+    calls = []
+
+    def provider(x):
+        calls.append(x)
+        if x < 0:
+            raise ValueError("bad input")
+        return {"value": x}
+
+    with use_cassette("record", str(tmp_path)) as cassette:
+        assert limiter.call("yahoo", provider, 2) == {"value": 2}
+        with pytest.raises(ValueError):
+            limiter.call("yahoo", provider, -1)
+    assert cassette.stats()["recorded"] == 2 and list(tmp_path.glob("yahoo/*.pkl.gz"))
+
+    slept = []
+    replay = Cassette("replay", str(tmp_path), latency="25", sleep=slept.append)
+    previous = set_cassette(replay)
+    try:
+        assert limiter.call("yahoo", provider, 2) == {"value": 2}
+        with pytest.raises(ValueError):  # recorded errors replay too
+            limiter.call("yahoo", provider, -1)
+        with pytest.raises(CassetteMiss):
+            limiter.call("yahoo", provider, 3)
+    finally:
+        set_cassette(previous)
+    assert calls == [2, -1]
+    assert slept == [0.025, 0.025]
+    stats = replay.stats()
+    assert stats["replayed"] == 2 and stats["misses"] == 1 and stats["injected_seconds"] == pytest.approx(0.05)
+
+
+def test_data_fetcher_replays_recorded_history(tmp_path, monkeypatch):
+    FakeTicker.downloads = 0
+    monkeypatch.setattr(data_fetcher.yf, "Ticker", FakeTicker)
+    with use_cassette("record", str(tmp_path)):
+        recorded = data_fetcher.fetch_ohlcv("AAPL", use_cache=False)
+    with use_cassette("replay", str(tmp_path)):
+        replayed = data_fetcher.fetch_ohlcv("AAPL", use_cache=False)
+    assert FakeTicker.downloads == 1
+    pd.testing.assert_frame_equal(recorded, replayed)
@@ -1,7 +1,12 @@
 # tests/test_data_agent.py
 import pytest
 import pandas as pd
-from agents.data_agent import DataAgent
+from unittest.mock import MagicMock
+from agent_tools import data_agent
+from agent_tools.data_agent import DataAgent
+from utils import data_fetcher
+from utils.data_fetcher import BatchResult
+from utils.ohlcv_cache import OHLCVCache
 
 @pytest.fixture
 def agent():
@@ -36,3 +41,44 @@ def test_financials(agent):
     for key in ["financials", "balance_sheet", "cashflow"]:
         assert key in financials, f"{key} missing in financials dict"
         assert isinstance(financials[key], pd.DataFrame), f"{key} should be a DataFrame"
+
+# -----------------------
+# Bulk methods (provider mocked)
+# -----------------------
+def fake_download(tickers, **kwargs):
+    """yf.download(group_by="ticker") shape; BAD* symbols come back empty."""
+    index = pd.date_range(end=pd.Timestamp.now(tz="America/New_York").normalize(), periods=5, freq="D", name="Date")
+    frames = {}
+    for t in tickers:
+        value = float("nan") if t.startswith("BAD") else 100.0 + len(t)
+        frames[t] = pd.DataFrame({f: value for f in ["Open", "High", "Low", "Close", "Volume"]}, index=index)
+    return pd.concat(frames, axis=1)
+
+def test_ohlcv_many_and_latest_prices_batch_through_the_fetcher(agent, monkeypatch, tmp_path):
+    calls = []
+
+    def recording_download(tickers, **kwargs):
+        calls.append(list(tickers))
+        return fake_download(tickers, **kwargs)
+
+    monkeypatch.setattr(data_fetcher, "get_ohlcv_cache", lambda: OHLCVCache(cache_dir=str(tmp_path)))
+    monkeypatch.setattr(data_fetcher.yf, "download", recording_download)
+
+    result = agent.ohlcv_many(["aapl", "MSFT", "BAD1"], period="5d", batch_size=2, max_workers=1)
+    assert sorted(map(len, calls)) == [1, 2]
+    assert list(result.data.columns.get_level_values(0).unique()) == ["AAPL", "MSFT"]
+    assert set(result.failures) == {"BAD1"}
+
+    prices = agent.latest_prices(["AAPL", "GOOGL", "BAD2"], batch_size=3)
+    assert prices.data == {"AAPL": 104.0, "GOOGL": 105.0} and set(prices.failures) == {"BAD2"}
+
+def test_bulk_methods_forward_only_explicit_pool_settings(agent, monkeypatch):
+    companies = MagicMock(return_value=BatchResult({"AAPL": {"ticker": "AAPL"}}))
+    financials = MagicMock(return_value=BatchResult({}, {"BAD": "no data"}))
+    monkeypatch.setattr(data_agent, "fetch_company_info_many", companies)
+    monkeypatch.setattr(data_agent, "fetch_financials_many", financials)
+
+    assert agent.companies(["AAPL"]).data == {"AAPL": {"ticker": "AAPL"}}
+    companies.assert_called_once_with(["AAPL"])
+    assert agent.financials_many(["BAD"], max_workers=3, frequency="quarterly").failures == {"BAD": "no data"}
+    financials.assert_called_once_with(["BAD"], frequency="quarterly", max_workers=3)
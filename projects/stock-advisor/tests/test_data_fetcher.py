@@ -1,10 +1,13 @@
 # tests/test_data_fetcher.py
 
 import sys
+import time
 import utils.data_fetcher as data_fetcher
 from pathlib import Path
+import numpy as np
 import pytest
 import pandas as pd
+from utils.ohlcv_cache import OHLCVCache, period_start
 
 # Add project root to sys.path so `utils` can be imported
 # sys.path.append(str(Path(__file__).resolve().parent.parent))
@@ -30,3 +33,72 @@ def test_fetch_financials(symbol):
     fin = data_fetcher.fetch_financials(symbol)
     assert isinstance(fin, dict)
     assert all(key in fin for key in ["financials", "balance_sheet", "cashflow", "earnings"])
+
+
+# -----------------------
+# Bulk fetches (yf.download mocked)
+# -----------------------
+def fake_download(tickers, period=None, interval=None, **kwargs):
+    """Mimic yf.download(group_by="ticker"): MultiIndex columns, NaN for unknown symbols."""
+    index = pd.date_range("2025-01-01", periods=5, freq="D", name="Date")
+    frames = {}
+    for t in tickers:
+        value = float("nan") if t.startswith("BAD") else 100.0 + len(t)
+        frames[t] = pd.DataFrame({f: value for f in ["Open", "High", "Low", "Close", "Volume"]}, index=index)
+    return pd.concat(frames, axis=1)
+
+
+def test_fetch_ohlcv_many_batches_and_reports_failures(monkeypatch):
+    calls = []
+
+    def recording_download(tickers, **kwargs):
+        calls.append(list(tickers))
+        return fake_download(tickers, **kwargs)
+
+    monkeypatch.setattr(data_fetcher.yf, "download", recording_download)
+    result = data_fetcher.fetch_ohlcv_many(
+        ["aapl", "MSFT", "BAD1", "AAPL", "NVDA"], batch_size=2, max_workers=2, use_cache=False
+    )
+
+    assert sorted(map(len, calls)) == [2, 2]
+    assert isinstance(result.data.columns, pd.MultiIndex)
+    assert list(result.data.columns.get_level_values(0).unique()) == ["AAPL", "MSFT", "NVDA"]
+    assert set(result.failures) == {"BAD1"}
+
+
+def test_fetch_ohlcv_many_batch_exception_marks_whole_batch(monkeypatch):
+    def flaky_download(tickers, **kwargs):
+        if "MSFT" in tickers:
+            raise ConnectionError("429 Too Many Requests")
+        return fake_download(tickers, **kwargs)
+
+    monkeypatch.setattr(data_fetcher.yf, "download", flaky_download)
+    result = data_fetcher.fetch_ohlcv_many(["AAPL", "MSFT", "NVDA"], batch_size=1, use_cache=False)
+    assert list(result.data.columns.get_level_values(0).unique()) == ["AAPL", "NVDA"]
+    assert "429" in result.failures["MSFT"]
+
+
+def test_fetch_ohlcv_many_keeps_longer_cached_history(monkeypatch, tmp_path):
+    cache = OHLCVCache(cache_dir=str(tmp_path))
+    monkeypatch.setattr(data_fetcher, "get_ohlcv_cache", lambda: cache)
+    end = pd.Timestamp.now(tz="America/New_York").normalize()
+    history = pd.DataFrame({f: np.arange(250, dtype=float) for f in ["Open", "High", "Low", "Close", "Volume"]},
+                           index=pd.date_range(end - pd.Timedelta(days=249), periods=250, freq="D",
+                                               tz="America/New_York", name="Date"))
+    covers_from = period_start("1y")
+    cache.store("AAPL", "1d", history.iloc[:-1], covers_from, fetched_at=time.time() - 2 * 3600)  # 2 h stale
+
+    monkeypatch.setattr(data_fetcher.yf, "download", lambda tickers, **kwargs: history.iloc[-5:])
+    result = data_fetcher.fetch_ohlcv_many(["AAPL"], period="5d")
+    assert len(result.data) == 5
+
+    stored, meta = cache.load("AAPL", "1d")
+    assert len(stored) == 250 and stored.index[-1] == history.index[-1]
+    assert meta["covers_from"] == covers_from.value
+
+
+def test_fetch_latest_prices(monkeypatch):
+    monkeypatch.setattr(data_fetcher.yf, "download", fake_download)
+    result = data_fetcher.fetch_latest_prices(["AAPL", "GOOGL", "BAD2"], batch_size=2)
+    assert result.data == {"AAPL": 104.0, "GOOGL": 105.0}
+    assert set(result.failures) == {"BAD2"}
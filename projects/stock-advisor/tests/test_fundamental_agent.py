@@ -1,9 +1,17 @@
 # tests/test_fundamental_agent.py
 
 import pytest
+import numpy as np
 import pandas as pd
 from unittest.mock import patch, MagicMock
-from agents.fundamental_agent import FundamentalAgent
+from agent_tools.fundamental_agent import FundamentalAgent
+from agent_tools.fundamental_agent import LINE_ITEMS, latest_ratios, line_items, ratio_panel, trend_panel
+from benchmarks import synthetic
+from utils import statement_cache
+
+@pytest.fixture(autouse=True)
+def isolated_statement_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(statement_cache, "_default_cache", statement_cache.StatementCache(str(tmp_path)))
 
 @pytest.fixture
 def agent():
@@ -63,3 +71,100 @@ def test_analyze_empty_data(agent):
     assert result["signal"] == "Data Unavailable"
     assert result["ratios"] == {}
     assert result["financials"] == {}
+
+def test_analyze_accepts_prefetched_statements(agent):
+    agent.fetch_financials = MagicMock()
+    financials = fake_ticker("AAPL")
+    result = agent.analyze({"financials": financials.financials, "balance_sheet": financials.balance_sheet})
+    agent.fetch_financials.assert_not_called()
+    assert result["ratios"]["roe"] == pytest.approx(0.3)
+    assert agent.analyze({"error": "boom"})["signal"] == "Data Unavailable"
+
+def dated_statements(net_income, equity, revenue, liabilities):
+    periods = pd.to_datetime(["2024-12-31", "2023-12-31", "2022-12-31"])  # newest first, like yfinance
+    return {
+        "financials": pd.DataFrame([net_income, revenue], index=["Net Income", "Total Revenue"], columns=periods),
+        "balance_sheet": pd.DataFrame([liabilities, equity],
+                                      index=["Total Liabilities Net Minority Interest", "Stockholders Equity"],
+                                      columns=periods),
+    }
+
+def test_ratio_panel_and_trends_across_tickers():
+    statements = {
+        "UP": dated_statements([30, 20, 10], [100, 100, 100], [200, 200, 200], [50, 60, 70]),
+        "DOWN": dated_statements([5, 10, 20], [100, 100, 100], [100, 100, 100], [150, 120, 90]),
+    }
+    panel = ratio_panel(statements)
+    up = panel.loc["UP"]
+    assert list(up.index) == sorted(up.index)  # oldest period first
+    np.testing.assert_allclose(up["roe"], [0.1, 0.2, 0.3])
+    np.testing.assert_allclose(up["debt_to_equity"], [0.7, 0.6, 0.5])
+    np.testing.assert_allclose(up["revenue_growth"].iloc[1:], [0.0, 0.0])
+    assert panel.loc["DOWN", "earnings_growth"].iloc[-1] == pytest.approx(-0.5)
+
+    trends = trend_panel(panel)
+    assert trends.loc["UP", "trend"] == "Improving"
+    assert trends.loc["DOWN", "trend"] == "Deteriorating"
+    assert trends.loc["UP", "roe_slope"] == pytest.approx(0.1)
+
+def pandas_ratio_panel(statements):
+    """Reference: the same ratios computed with pandas label alignment."""
+    frames = {}
+    for ticker, financials in statements.items():
+        columns = {}
+        for item, (statement, labels) in LINE_ITEMS.items():
+            df = financials.get(statement)
+            label = next((l for l in labels if df is not None and l in df.index), None)
+            if label is not None:
+                row = df.loc[label]
+                row = row.iloc[0] if isinstance(row, pd.DataFrame) else row
+                columns[item] = pd.to_numeric(row, errors="coerce").astype("float64")
+        frames[ticker] = pd.DataFrame(columns).reindex(columns=list(LINE_ITEMS)).sort_index()
+    items = pd.concat(frames, names=["ticker", "period"])
+
+    def ratio(numerator, denominator):
+        return items[numerator] / items[denominator].where(items[denominator] != 0)
+
+    def growth(column):
+        previous = items.groupby(level="ticker")[column].shift()
+        return (items[column] - previous) / previous.abs().where(previous != 0)
+
+    return pd.DataFrame({
+        "debt_to_equity": ratio("total_liabilities", "equity"), "roe": ratio("net_income", "equity"),
+        "profit_margin": ratio("net_income", "revenue"), "roa": ratio("net_income", "total_assets"),
+        "gross_margin": ratio("gross_profit", "revenue"), "operating_margin": ratio("operating_income", "revenue"),
+        "current_ratio": ratio("current_assets", "current_liabilities"),
+        "fcf_margin": ratio("free_cash_flow", "revenue"),
+        "revenue_growth": growth("revenue"), "earnings_growth": growth("net_income"),
+    })
+
+def test_ratio_panel_matches_pandas_reference():
+    statements = synthetic.statements(25, n_periods=5, seed=7)
+    statements["T0003"]["balance_sheet"].loc["Stockholders Equity"] = 0.0  # zero denominators
+    statements["T0004"]["financials"].iloc[:, 1] = np.nan                   # missing period
+    statements["T0005"]["financials"] = statements["T0005"]["financials"].astype(object)
+    statements["T0005"]["financials"].iloc[0, 0] = "n/a"                     # non-numeric cell
+    pd.testing.assert_frame_equal(ratio_panel(statements), pandas_ratio_panel(statements), check_names=False)
+
+def test_line_items_keeps_first_duplicate_label_and_aligns_undated_columns():
+    financials = {
+        "financials": pd.DataFrame([[10.0, 8.0], [99.0, 99.0], [100.0, 80.0]],
+                                   index=["Net Income", "Net Income", "Total Revenue"]),
+        "balance_sheet": pd.DataFrame([[50.0, 40.0, 30.0]], index=["Stockholders Equity"]),
+    }
+    items = line_items(financials)
+    assert list(items.index) == [-2, -1, 0]  # newest column is period 0
+    np.testing.assert_allclose(items["net_income"], [np.nan, 8.0, 10.0])
+    np.testing.assert_allclose(items["equity"], [30.0, 40.0, 50.0])
+    assert items["free_cash_flow"].isna().all()
+    assert line_items({"financials": pd.DataFrame([[1.0]], index=["Unrelated"])}).empty
+
+def test_latest_ratios_do_not_borrow_older_periods(agent):
+    statements = dated_statements([30, 20, 10], [np.nan, 100, 100], [200, 200, 200], [50, 60, 70])
+    ratios = agent.calculate_ratios(statements)
+    assert ratios["profit_margin"] == pytest.approx(0.15)
+    assert "roe" not in ratios and "debt_to_equity" not in ratios  # no 2024 equity; 2023's is not reused
+
+    latest = latest_ratios(ratio_panel({"A": statements}))
+    assert latest.loc["A", "profit_margin"] == pytest.approx(0.15)
+    assert np.isnan(latest.loc["A", "roe"]) and np.isnan(latest.loc["A", "debt_to_equity"])
@@ -0,0 +1,74 @@
+# tests/test_info_cache.py
+
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import utils.data_fetcher as data_fetcher
+from utils import info_cache
+from utils.info_cache import TTLCache, field_ttl, get_info
+
+
+@pytest.fixture(autouse=True)
+def clear_info_cache():
+    info_cache.get_info_cache().invalidate()
+    yield
+    info_cache.get_info_cache().invalidate()
+
+
+def fake_ticker(symbol):
+    mock = MagicMock()
+    mock.info = {"longName": f"{symbol} Inc.", "sector": "Technology", "regularMarketPrice": 101.5}
+    return mock
+
+
+def test_lru_eviction_and_stats():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # a becomes most recently used
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats() == {"size": 2, "hits": 3, "misses": 1, "evictions": 1}
+
+
+def test_ttl_expiry(monkeypatch):
+    cache = TTLCache(ttl=10)
+    cache.set("a", 1)
+    real_time = time.time
+    monkeypatch.setattr(time, "time", lambda: real_time() + 11)
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_field_ttl():
+    assert field_ttl("regularMarketPrice") == info_cache.INFO_PRICE_TTL
+    assert field_ttl("dayHigh") == info_cache.INFO_PRICE_TTL
+    assert field_ttl("longName") == info_cache.INFO_STATIC_TTL
+
+
+@patch("yfinance.Ticker", side_effect=fake_ticker)
+def test_per_field_freshness(mock_ticker, monkeypatch):
+    assert get_info("aapl", ["longName"])["longName"] == "AAPL Inc."
+    get_info("AAPL", ["regularMarketPrice"])
+    assert mock_ticker.call_count == 1
+
+    # A minute later the static fields are still fresh but the price is not
+    real_time = time.time
+    monkeypatch.setattr(time, "time", lambda: real_time() + 60)
+    get_info("AAPL", ["sector"])
+    assert mock_ticker.call_count == 1
+    get_info("AAPL", ["regularMarketPrice"])
+    assert mock_ticker.call_count == 2
+
+
+@patch("yfinance.Ticker", side_effect=fake_ticker)
+def test_fetcher_call_sites_share_cache(mock_ticker):
+    info = data_fetcher.fetch_company_info("MSFT")
+    price = data_fetcher.fetch_latest_price("MSFT")
+    again = data_fetcher.fetch_company_info("MSFT")
+    assert info == again and info["longName"] == "MSFT Inc."
+    assert price == 101.5
+    assert mock_ticker.call_count == 1
@@ -1,6 +1,11 @@
 # tests/test_memory_manager.py
 
+import json
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
 import pytest
 from core.memory_manager import MemoryManager
 
@@ -54,3 +59,65 @@ def test_persistence(tmp_path):
     manager2 = MemoryManager(str(cache_file))
     assert manager2.get_analysis("AAPL") == {"signal": "Sell"}
     assert manager2.get_portfolio() == {"total_value": 5000}
+
+def test_ttl_expiry(memory_manager, monkeypatch):
+    memory_manager.save_analysis("AAPL", {"signal": "Buy"}, ttl=60)
+    memory_manager.save_analysis("MSFT", {"signal": "Hold"})
+    entry = memory_manager.get_analysis_entry("AAPL")
+    assert entry["value"] == {"signal": "Buy"}
+    assert entry["expires_at"] - entry["updated_at"] == pytest.approx(60)
+
+    real_time = time.time
+    monkeypatch.setattr(time, "time", lambda: real_time() + 120)
+    assert memory_manager.get_analysis("AAPL") is None
+    assert memory_manager.get_analysis("MSFT") == {"signal": "Hold"}
+    assert memory_manager.purge_expired() == 0  # AAPL already purged lazily
+
+def test_default_ttl(tmp_path, monkeypatch):
+    manager = MemoryManager(str(tmp_path / "cache.db"), ttl=10)
+    manager.save_analysis("AAPL", {"signal": "Buy"})
+    manager.save_portfolio({"total_value": 1})
+
+    real_time = time.time
+    monkeypatch.setattr(time, "time", lambda: real_time() + 11)
+    assert manager.purge_expired() == 1
+    assert manager.get_portfolio() == {"total_value": 1}
+
+def test_legacy_json_import(tmp_path):
+    legacy = tmp_path / "cache.json"
+    legacy.write_text(json.dumps({"analysis": {"AAPL": {"signal": "Buy"}}, "portfolio": {"total_value": 10}}))
+
+    manager = MemoryManager(str(legacy))
+    assert manager.cache_file == tmp_path / "cache.db"
+    assert manager.get_analysis("AAPL") == {"signal": "Buy"}
+    assert manager.get_portfolio() == {"total_value": 10}
+    assert not legacy.exists()
+
+def test_default_and_db_paths_import_sibling_json(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "cache.json").write_text(json.dumps({"analysis": {"AAPL": {"signal": "Buy"}}}))
+    manager = MemoryManager()
+    assert manager.cache_file == Path("cache.db")
+    assert manager.get_analysis("AAPL") == {"signal": "Buy"}
+
+    (tmp_path / "other.json").write_text(json.dumps({"portfolio": {"total_value": 5}}))
+    assert MemoryManager(str(tmp_path / "other.db")).get_portfolio() == {"total_value": 5}
+    assert not (tmp_path / "other.json").exists()
+
+def _write_symbols(args):
+    path, worker = args
+    manager = MemoryManager(path)
+    for i in range(50):
+        manager.save_analysis(f"W{worker}-{i}", {"worker": worker, "i": i})
+    return worker
+
+def test_concurrent_writers_do_not_clobber(tmp_path):
+    path = str(tmp_path / "shared.db")
+    MemoryManager(path)
+    with ProcessPoolExecutor(max_workers=4) as pool:
+        list(pool.map(_write_symbols, [(path, w) for w in range(4)]))
+
+    manager = MemoryManager(path)
+    for w in range(4):
+        for i in range(50):
+            assert manager.get_analysis(f"W{w}-{i}") == {"worker": w, "i": i}
@@ -1,7 +1,8 @@
 # tests/test_news_agent.py
+import json
 import pytest
 from unittest.mock import patch, MagicMock
-from agents.news_agent import NewsAgent
+from agent_tools.news_agent import NewsAgent
 
 @pytest.fixture
 def agent():
@@ -25,7 +26,7 @@ def mock_fetch_news(*args, **kwargs):
         }
     ]
 
-def mock_analyze_sentiment(text):
+def mock_analyze_sentiment(text, source=None):
     """Return fake sentiment based on keyword"""
     if "record high" in text:
         return "Positive"
@@ -58,3 +59,58 @@ def test_fetch_news_without_api_key(agent):
     agent.NEWS_API_KEY = None
     news = agent.fetch_news("Apple")
     assert news == []
+
+class FakeAsyncCompletions:
+    """Labels headlines containing 'record' Positive, 'falls' Negative; counts calls."""
+
+    def __init__(self):
+        self.calls = []
+
+    async def create(self, model, messages, temperature, response_format):
+        lines = [l for l in messages[0]["content"].splitlines() if l[:1].isdigit()]
+        self.calls.append(len(lines))
+        labels = []
+        for line in lines:
+            index, headline = line.split(". ", 1)
+            sentiment = "Positive" if "record" in headline else "Negative" if "falls" in headline else "Neutral"
+            labels.append({"index": int(index), "sentiment": sentiment})
+        message = MagicMock(content=json.dumps({"labels": labels}))
+        return MagicMock(choices=[MagicMock(message=message)], usage=MagicMock(total_tokens=10 * len(lines)))
+
+@pytest.fixture
+def batch_agent(tmp_path):
+    from utils.sentiment_cache import SentimentCache
+    agent = NewsAgent(sentiment_cache=SentimentCache(str(tmp_path / "sentiment.db")))
+    completions = FakeAsyncCompletions()
+    agent.async_client = MagicMock()
+    agent.async_client.chat.completions = completions
+    return agent, completions
+
+def test_analyze_batch_chunks_dedupes_and_caches(batch_agent):
+    agent, completions = batch_agent
+    headlines = ["Apple stock hits record high - Reuters", "Tesla falls 5%", "Fed holds rates",
+                 "APPLE stock hits record high!", "", "Oil falls on supply"]
+    labels = agent.analyze_batch(headlines, batch_size=2, concurrency=2)
+
+    assert labels == ["Positive", "Negative", "Neutral", "Positive", "Neutral", "Negative"]
+    assert completions.calls == [2, 2]  # 4 distinct headlines, 2 per call
+
+    assert agent.analyze_batch(["Apple stock hits record high - Bloomberg"]) == ["Positive"]
+    assert completions.calls == [2, 2]  # served from the cache
+    stats = agent.sentiment_stats()
+    assert stats["hits"] == 1 and stats["tokens_saved"] == 10 and stats["entries"] == 4
+
+def test_fetch_and_analyze_uses_batch_mode(batch_agent):
+    agent, completions = batch_agent
+    with patch.object(NewsAgent, 'fetch_news', side_effect=mock_fetch_news):
+        result = agent.fetch_and_analyze("Apple", limit=2)
+    assert [a["sentiment"] for a in result] == ["Neutral", "Positive"]
+    assert completions.calls == [2]
+
+def test_headline_key_only_drops_source_attribution():
+    from utils.sentiment_cache import headline_key
+    assert headline_key("Fed raises rates - markets tumble") != headline_key("Fed raises rates - markets rally")
+    assert headline_key("Fed raises rates - markets tumble") != headline_key("Fed raises rates")
+    assert headline_key("Fed raises rates - Reuters") == headline_key("Fed raises rates")
+    assert headline_key("Fed raises rates - Acme Wire", source="Acme Wire") == headline_key("Fed raises rates")
+    assert headline_key("Fed raises rates - Acme Wire") != headline_key("Fed raises rates")
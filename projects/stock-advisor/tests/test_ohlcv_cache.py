@@ -0,0 +1,160 @@
+# tests/test_ohlcv_cache.py
+
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.ohlcv_cache import OHLCVCache, period_start, window
+
+
+def make_bars(start, periods, tz="America/New_York", dividend_at=None):
+    index = pd.date_range(start, periods=periods, freq="D", tz=tz, name="Date")
+    close = np.arange(periods, dtype=float) + 100
+    df = pd.DataFrame({
+        "Open": close - 1,
+        "High": close + 1,
+        "Low": close - 2,
+        "Close": close,
+        "Volume": np.full(periods, 1000, dtype=np.int64),
+        "Dividends": np.zeros(periods),
+        "Stock Splits": np.zeros(periods),
+    }, index=index)
+    if dividend_at is not None:
+        df.iloc[dividend_at, df.columns.get_loc("Dividends")] = 0.25
+    return df
+
+
+class FakeProvider:
+    """Serves slices of a fixed 'true' history and records every call."""
+
+    def __init__(self, history):
+        self.history = history
+        self.calls = []
+
+    def __call__(self, start, period):
+        self.calls.append((start, period))
+        if start is not None:
+            return self.history[self.history.index >= start]
+        ps = period_start(period)
+        return self.history if ps is None else self.history[self.history.index >= ps]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return OHLCVCache(cache_dir=str(tmp_path))
+
+
+@pytest.fixture
+def history():
+    end = pd.Timestamp.now(tz="America/New_York").normalize()
+    return make_bars(end - pd.Timedelta(days=399), 400)
+
+
+def test_first_call_downloads_and_persists(cache, history):
+    provider = FakeProvider(history)
+    df = cache.get("AAPL", "1y", "1d", provider)
+    assert provider.calls == [(None, "1y")]
+    assert not df.empty
+
+    stored, meta = cache.load("AAPL", "1d")
+    assert meta["columns"] == list(history.columns)
+    assert str(stored.index.tz) == "America/New_York"
+    pd.testing.assert_frame_equal(stored, df, check_dtype=False, check_index_type=False, check_freq=False)
+
+
+def test_fresh_cache_served_without_network(cache, history):
+    provider = FakeProvider(history)
+    first = cache.get("AAPL", "1y", "1d", provider)
+    second = cache.get("AAPL", "6mo", "1d", provider)
+    assert len(provider.calls) == 1
+    assert second.index[-1] == first.index[-1]
+    assert second.index[0] >= period_start("6mo")
+
+
+def test_stale_cache_fetches_only_tail(cache, history):
+    provider = FakeProvider(history.iloc[:-5])
+    cache.get("AAPL", "1y", "1d", provider)
+
+    # Expire the series and let the provider know about 5 more bars
+    _, meta = cache.load("AAPL", "1d")
+    cache._write_meta(cache._series_dir("AAPL", "1d"), dict(meta, fetched_at=time.time() - 86400))
+    provider.history = history
+
+    df = cache.get("AAPL", "1y", "1d", provider)
+    start, period = provider.calls[-1]
+    assert period is None and start == history.index[-6]
+    assert df.index[-1] == history.index[-1]
+    assert df.index.is_unique and df.index.is_monotonic_increasing
+
+
+def test_empty_delta_restamps_freshness(cache, history):
+    provider = FakeProvider(history)
+    cache.get("AAPL", "1y", "1d", provider)
+    _, meta = cache.load("AAPL", "1d")
+    cache._write_meta(cache._series_dir("AAPL", "1d"), dict(meta, fetched_at=0))
+
+    provider.history = history.iloc[:0]
+    df = cache.get("AAPL", "1y", "1d", provider)
+    assert not df.empty
+    _, meta = cache.load("AAPL", "1d")
+    assert cache.is_fresh(meta, "1d")
+
+
+def test_longer_period_triggers_full_download(cache, history):
+    provider = FakeProvider(history)
+    cache.get("AAPL", "6mo", "1d", provider)
+    cache.get("AAPL", "1y", "1d", provider)
+    assert provider.calls == [(None, "6mo"), (None, "1y")]
+
+
+def test_dividend_in_delta_refetches_full_history(cache, history):
+    provider = FakeProvider(history.iloc[:-3])
+    cache.get("AAPL", "1y", "1d", provider)
+    _, meta = cache.load("AAPL", "1d")
+    cache._write_meta(cache._series_dir("AAPL", "1d"), dict(meta, fetched_at=0))
+
+    provider.history = make_bars(history.index[0], len(history), dividend_at=len(history) - 1)
+    cache.get("AAPL", "1y", "1d", provider)
+    assert provider.calls[-1] == (None, "1y")
+
+
+def test_delta_failure_serves_cached(cache, history):
+    cache.get("AAPL", "1y", "1d", FakeProvider(history))
+    _, meta = cache.load("AAPL", "1d")
+    cache._write_meta(cache._series_dir("AAPL", "1d"), dict(meta, fetched_at=0))
+
+    def broken(start, period):
+        raise ConnectionError("429 Too Many Requests")
+
+    df = cache.get("AAPL", "1y", "1d", broken)
+    assert not df.empty
+
+
+def test_invalidate(cache, history):
+    cache.get("AAPL", "1y", "1d", FakeProvider(history))
+    cache.invalidate("AAPL")
+    df, meta = cache.load("AAPL", "1d")
+    assert df.empty and meta is None
+
+
+def test_day_periods_are_trading_sessions_on_hit_and_miss(cache):
+    end = pd.Timestamp.now(tz="America/New_York").normalize()
+    history = make_bars(end - pd.Timedelta(days=59), 60)
+    history = history[history.index.dayofweek < 5]           # Sessions only, weekends missing
+
+    def provider(start, period):                              # Yahoo: "Nd" = last N sessions
+        return history[history.index >= start] if start is not None else window(history, period)
+
+    miss = cache.get("AAPL", "5d", "1d", provider)
+    hit = cache.get("AAPL", "5d", "1d", provider)
+    assert len(miss) == 5
+    pd.testing.assert_frame_equal(hit, miss, check_dtype=False, check_index_type=False, check_freq=False)
+
+    cache.get("AAPL", "1mo", "1d", provider)                  # Longer calendar span: new download
+    assert len(cache.get("AAPL", "1d", "1d", provider)) == 1
+
+    friday = make_bars("2024-06-10", 5)                       # Mon-Fri; asked on the weekend
+    assert list(window(friday, "1d").index) == [friday.index[-1]]
+    assert len(window(friday, "3d")) == 3 and len(window(friday, "10d")) == 5
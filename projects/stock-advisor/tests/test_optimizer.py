@@ -0,0 +1,89 @@
+# tests/test_optimizer.py
+
+import multiprocessing
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from agent_tools.fundamental_agent import signal_panel
+from core import optimizer
+
+
+def random_walk(n_bars=500, n_tickers=3, seed=0):
+    rng = np.random.default_rng(seed)
+    closes = 100 * np.cumprod(1 + rng.normal(0.0002, 0.02, size=(n_bars, n_tickers)), axis=0)
+    return pd.DataFrame(closes, index=pd.bdate_range("2018-01-01", periods=n_bars),
+                        columns=["AAA", "BBB", "CCC"][:n_tickers])
+
+
+RATIOS = pd.DataFrame({"roe": [0.25, 0.08, 0.01], "debt_to_equity": [0.4, 1.5, 0.2]},
+                      index=["AAA", "BBB", "CCC"])
+SMALL_GRID = {"rsi_period": [7, 14], "oversold": [25, 30], "overbought": [70, 75], "roe_strong": [0.1, 0.2]}
+
+
+def test_fundamental_signal_panel_matches_agent_rule():
+    labels = signal_panel([0.25, 0.25, 0.08, 0.01, np.nan], [0.4, 1.5, 0.2, 0.2, np.nan])
+    assert labels.tolist() == ["Strong", "Neutral", "Neutral", "Weak", "Weak"]
+    assert signal_panel([0.12], [0.4], roe_strong=0.10).tolist() == ["Strong"]
+
+
+def test_param_grid_and_random_search():
+    points = optimizer.param_grid({"oversold": [20, 30], "overbought": [25, 70]})
+    # oversold >= overbought combinations are dropped; other params keep their defaults.
+    assert [(p["oversold"], p["overbought"]) for p in points] == [(20, 25), (20, 70), (30, 70)]
+    assert all(p["rsi_period"] == 14 and p["roe_strong"] == 0.15 for p in points)
+
+    sample = optimizer.param_grid(SMALL_GRID, search="random", n_iter=5, seed=1)
+    assert len(sample) == 5 and sample == optimizer.param_grid(SMALL_GRID, search="random", n_iter=5, seed=1)
+    with pytest.raises(ValueError):
+        optimizer.param_grid({"macd_fast": [12]})
+
+
+def test_walk_forward_windows_are_anchored_and_ordered():
+    windows = optimizer.walk_forward_windows(103, folds=4)
+    assert [(w[0].stop, w[1].start, w[1].stop) for w in windows] == [(20, 20, 40), (40, 40, 60),
+                                                                     (60, 60, 80), (80, 80, 103)]
+    assert all(train.start == 0 for train, _ in windows)
+    with pytest.raises(ValueError):
+        optimizer.walk_forward_windows(5, folds=4)
+
+
+def test_sweep_inline_writes_ranked_leaderboard(tmp_path):
+    output = tmp_path / "sweep.csv"
+    result = optimizer.sweep(random_walk(), ratios=RATIOS, grid=SMALL_GRID, folds=3, workers=1,
+                             output=str(output), cost_bps=5)
+
+    board = result.leaderboard
+    assert len(board) == 16 and list(board["rank"]) == list(range(1, 17))
+    scores = board["test_sharpe"].dropna()
+    assert (scores.diff().dropna() <= 1e-12).all()
+    assert output.exists() and len(pd.read_csv(output)) == 16
+
+    wf = result.walk_forward
+    assert list(wf["fold"]) == [0, 1, 2]
+    for fold, train in zip(wf["fold"], wf["train"]):
+        assert train == board[f"train_{fold}"].max()
+
+
+def test_sweep_without_ratios_skips_fundamental_params():
+    result = optimizer.sweep(random_walk(), grid=SMALL_GRID, folds=2, workers=1, output=None)
+    assert len(result.leaderboard) == 8
+    assert set(result.leaderboard["roe_strong"]) == {0.15}
+
+
+def test_evaluate_reuses_precomputed_rsi(monkeypatch):
+    calls = []
+    real = optimizer.rsi_panel
+    monkeypatch.setattr(optimizer, "rsi_panel", lambda values, period: calls.append(period) or real(values, period))
+    optimizer.sweep(random_walk(), grid=SMALL_GRID, folds=2, workers=1, output=None)
+    assert sorted(calls) == [7, 14]
+
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != "fork",
+                    reason="process pool test relies on fork to share the test module")
+def test_process_pool_matches_inline():
+    closes = random_walk()
+    inline = optimizer.sweep(closes, ratios=RATIOS, grid=SMALL_GRID, folds=2, workers=1, output=None)
+    pooled = optimizer.sweep(closes, ratios=RATIOS, grid=SMALL_GRID, folds=2, workers=2, chunk_size=3, output=None)
+    pd.testing.assert_frame_equal(inline.leaderboard, pooled.leaderboard)
@@ -1,4 +1,6 @@
 # tests/test_orchestrator.py
+import time
+
 import pandas as pd
 import pytest
 from unittest.mock import patch
@@ -63,3 +65,55 @@ def test_analyze_stock(MockData, MockTechnical, MockFundamental, MockSentiment,
     assert result["strategy"] == "Buy"
     assert result["portfolio_value"] == 2000.0
     assert result["news_headlines"] == ["Good news headline"]
+
+
+def _slow(value, delay=0.2):
+    def call(*args, **kwargs):
+        time.sleep(delay)
+        return value
+    return call
+
+
+@patch("core.orchestrator.PortfolioAgent")
+@patch("core.orchestrator.StrategyAgent")
+@patch("core.orchestrator.SentimentAgent")
+@patch("core.orchestrator.FundamentalAgent")
+@patch("core.orchestrator.TechnicalAgent")
+@patch("core.orchestrator.DataAgent")
+def test_analyze_stock_concurrent(MockData, MockTechnical, MockFundamental, MockSentiment, MockStrategy, MockPortfolio):
+    ohlcv_df = pd.DataFrame({"Close": [151, 152]})
+
+    # Every fetch takes 200ms; run sequentially they would take 800ms
+    mock_data = MockData.return_value
+    mock_data.latest_price.side_effect = _slow(150.0)
+    mock_data.financials.side_effect = _slow({"financials": {}})
+    mock_data.ohlcv.side_effect = _slow(ohlcv_df)
+    MockSentiment.return_value.fetch_news.side_effect = _slow(["Good news headline"])
+
+    MockTechnical.return_value.analyze.return_value = "Buy"
+    MockFundamental.return_value.analyze.return_value = "Strong"
+    MockSentiment.return_value.analyze_sentiment.return_value = "Positive"
+    MockStrategy.return_value.generate_strategy.return_value = "Buy"
+    MockPortfolio.return_value.get_portfolio_value.return_value = 2000.0
+
+    orchestrator = Orchestrator()
+    result = orchestrator.analyze_stock_concurrent("AAPL")
+
+    assert result["latest_price"] == 150.0
+    assert result["technical"] == "Buy"
+    assert result["fundamental"] == "Strong"
+    assert result["sentiment"] == "Positive"
+    assert result["strategy"] == "Buy"
+    assert result["news_headlines"] == ["Good news headline"]
+
+    # Each analysis got its own upstream input
+    MockTechnical.return_value.analyze.assert_called_once_with(ohlcv_df)
+    MockFundamental.return_value.analyze.assert_called_once_with({"financials": {}})
+    MockSentiment.return_value.analyze_sentiment.assert_called_once_with("Good news headline")
+
+    timings = result["timings"]
+    for stage in ["latest_price", "financials", "ohlcv", "news", "technical", "fundamental",
+                  "sentiment", "strategy", "total"]:
+        assert stage in timings
+    assert timings["ohlcv"] >= 0.2
+    assert timings["total"] < 0.6, "fetch stages should overlap"
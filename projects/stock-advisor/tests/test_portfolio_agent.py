@@ -1,7 +1,7 @@
 # tests/test_portfolio_agent.py
 
 import pytest
-from agents.portfolio_agent import PortfolioAgent
+from agent_tools.portfolio_agent import PortfolioAgent
 
 @pytest.fixture
 def portfolio():
@@ -49,3 +49,38 @@ def test_remove_nonexistent_position_logs_warning(caplog, portfolio):
     with caplog.at_level("WARNING"):
         portfolio.remove_position("MSFT", 5)
         assert "not in portfolio" in caplog.text
+
+def test_removal_consumes_oldest_lots_first(portfolio):
+    portfolio.add_position("AAPL", 10, 100.0)
+    portfolio.add_position("AAPL", 10, 200.0)
+    portfolio.remove_position("AAPL", 15)
+    _, shares, _, cost_basis = portfolio.holdings()
+    assert shares.tolist() == [5]
+    assert cost_basis.tolist() == [5 * 200.0]
+    assert portfolio.get_unrealized_pnl() == {"AAPL": 0.0}
+
+def test_allocation_and_many_lots(portfolio):
+    for i in range(3000):
+        portfolio.add_position(f"S{i % 300}", 1, 10.0)
+    allocation = portfolio.get_allocation()
+    assert len(allocation) == 300
+    assert sum(allocation.values()) == pytest.approx(1.0)
+    assert portfolio.get_portfolio_value() == pytest.approx(3000 * 10.0)
+
+def test_mark_to_market_and_history(portfolio):
+    import numpy as np
+    import pandas as pd
+
+    portfolio.add_position("AAPL", 10, 100.0)
+    portfolio.add_position("MSFT", 2, 300.0)
+    dates = pd.bdate_range("2024-01-01", periods=3)
+    closes = pd.DataFrame({"AAPL": [101.0, 102.0, 103.0], "MSFT": [310.0, np.nan, 330.0]}, index=dates)
+
+    history = portfolio.backfill_history(closes)
+    assert list(history.columns) == ["date", "total_value"]
+    assert history["total_value"].tolist() == [1630.0, 1640.0, 1690.0]  # MSFT gap forward-filled
+
+    value = portfolio.mark_to_market(closes)
+    assert value == 10 * 103.0 + 2 * 330.0
+    assert portfolio.get_positions()["MSFT"]["price"] == 330.0
+    assert len(portfolio.history()) == 3
@@ -0,0 +1,172 @@
+# tests/test_rate_limiter.py
+
+import threading
+import time
+
+import pytest
+import requests
+
+from utils.rate_limiter import (
+    BATCH,
+    INTERACTIVE,
+    RateLimiter,
+    RateLimitTimeout,
+    TokenBucket,
+    backoff_delay,
+    current_priority,
+    parse_retry_after,
+    provider_limit,
+    request_priority,
+    retry_hint,
+)
+
+
+def make_response(status, retry_after=None):
+    r = requests.Response()
+    r.status_code = status
+    if retry_after is not None:
+        r.headers["Retry-After"] = str(retry_after)
+    return r
+
+
+def test_bucket_paces_after_burst():
+    bucket = TokenBucket(rate=20, burst=2)
+    started = time.monotonic()
+    for _ in range(4):
+        bucket.acquire()
+    # Two tokens are free, the next two take ~1/20s each.
+    assert time.monotonic() - started >= 0.08
+    assert bucket.stats()["granted"] == 4
+
+
+def test_interactive_jumps_ahead_of_batch():
+    bucket = TokenBucket(rate=10, burst=1)
+    bucket.acquire()  # drain the bucket so everyone below has to queue
+    order = []
+
+    def worker(name, priority):
+        bucket.acquire(priority)
+        order.append(name)
+
+    batch = [threading.Thread(target=worker, args=(f"batch{i}", BATCH)) for i in range(3)]
+    for t in batch:
+        t.start()
+    time.sleep(0.02)
+    interactive = threading.Thread(target=worker, args=("interactive", INTERACTIVE))
+    interactive.start()
+    for t in batch + [interactive]:
+        t.join()
+
+    # The first batch waiter may already hold the head slot; the interactive call beats the rest.
+    assert order.index("interactive") <= 1
+
+
+def test_acquire_timeout_leaves_queue_clean():
+    bucket = TokenBucket(rate=0.1, burst=1)
+    bucket.acquire()
+    with pytest.raises(RateLimitTimeout):
+        bucket.acquire(timeout=0.05)
+    assert bucket.stats()["queued"] == 0
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    assert 0 <= parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+
+
+def test_backoff_is_jittered_and_capped():
+    delays = [backoff_delay(10, base=0.5, cap=4) for _ in range(50)]
+    assert all(0 <= d <= 4 for d in delays)
+    assert len(set(delays)) > 1
+    assert 2 <= backoff_delay(0, retry_after=2, base=0.5) <= 2.5
+
+
+def test_retry_hint():
+    assert retry_hint(make_response(429, 7)) == (True, 7.0)
+    assert retry_hint(make_response(503)) == (True, None)
+    assert retry_hint(make_response(404)) == (False, None)
+    assert retry_hint(requests.ConnectionError("reset")) == (True, None)
+    assert retry_hint(ValueError("bad ticker")) == (False, None)
+
+    class YFRateLimitError(Exception):
+        pass
+
+    assert retry_hint(YFRateLimitError("Too Many Requests. Rate limited.")) == (True, None)
+
+
+def test_call_retries_throttled_response_then_succeeds():
+    sleeps = []
+    limiter = RateLimiter(limits={"newsapi": (0, 1)}, max_retries=3, backoff_base=0.01, sleep=sleeps.append)
+    responses = [make_response(429), make_response(503), make_response(200)]
+
+    result = limiter.call("newsapi", responses.pop, 0)
+
+    assert result.status_code == 200
+    assert len(sleeps) == 2
+    stats = limiter.stats()["newsapi"]
+    assert stats["throttled"] == 2 and stats["retries"] == 2
+
+
+def test_call_honors_retry_after_by_pausing_bucket():
+    limiter = RateLimiter(limits={"serper": (0, 1)}, max_retries=1, backoff_base=0.01)
+    responses = [make_response(200), make_response(429, retry_after=0.1)]
+    started = time.monotonic()
+
+    assert limiter.call("serper", responses.pop).status_code == 200
+    assert time.monotonic() - started >= 0.1
+
+
+def test_call_returns_last_response_or_raises_after_retries():
+    limiter = RateLimiter(limits={"yahoo": (0, 1)}, max_retries=2, backoff_base=0.001)
+    assert limiter.call("yahoo", lambda: make_response(429)).status_code == 429
+    assert limiter.stats()["yahoo"]["throttled"] == 3
+
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        raise requests.ConnectionError("reset")
+
+    with pytest.raises(requests.ConnectionError):
+        limiter.call("yahoo", flaky)
+    assert len(calls) == 3
+
+
+def test_non_retryable_errors_raise_immediately():
+    limiter = RateLimiter(limits={"yahoo": (0, 1)}, backoff_base=0.001)
+    calls = []
+
+    def bad():
+        calls.append(1)
+        raise KeyError("regularMarketPrice")
+
+    with pytest.raises(KeyError):
+        limiter.call("yahoo", bad)
+    assert calls == [1]
+
+
+def test_retry_after_beyond_cap_fails_fast():
+    sleeps = []
+    limiter = RateLimiter(limits={"yahoo": (0, 1)}, backoff_cap=5, sleep=sleeps.append)
+    assert limiter.call("yahoo", lambda: make_response(429, retry_after=3600)).status_code == 429
+    assert sleeps == []
+
+
+def test_priority_context_and_env_override(monkeypatch):
+    assert current_priority() == INTERACTIVE
+    with request_priority(BATCH):
+        assert current_priority() == BATCH
+    assert current_priority() == INTERACTIVE
+
+    monkeypatch.setenv("RATE_LIMIT_YAHOO", "7,3")
+    assert provider_limit("yahoo") == (7.0, 3.0)
+    assert provider_limit("unknown") == (1.0, 5)
+
+
+def test_scale_splits_budget():
+    limiter = RateLimiter(limits={"yahoo": (4, 8)})
+    limiter.scale(0.25)
+    stats = limiter.stats()["yahoo"]
+    assert stats["rate"] == 1 and stats["burst"] == 2
@@ -0,0 +1,99 @@
+# tests/test_resample.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils import data_fetcher, ohlcv_cache
+from utils.data_fetcher import OHLCRequest
+from utils.resample import base_interval, resample_ohlcv
+
+
+def intraday_bars(days, freq="5min", end=None):
+    """Regular-session bars (09:30-16:00 New York) for the last `days` weekdays."""
+    end = end or pd.Timestamp.now(tz="America/New_York").normalize()
+    sessions = pd.bdate_range(end=end, periods=days)
+    index = pd.DatetimeIndex(np.concatenate([
+        pd.date_range(f"{d:%Y-%m-%d} 09:30", f"{d:%Y-%m-%d} 15:55", freq=freq, tz="America/New_York")
+        for d in sessions]), name="Datetime").tz_convert("America/New_York")
+    rng = np.random.default_rng(len(index))
+    close = 100 + rng.normal(0, 0.1, len(index)).cumsum()
+    return pd.DataFrame({"Open": close + 0.05, "High": close + 0.2, "Low": close - 0.2, "Close": close,
+                         "Volume": rng.integers(100, 1_000, len(index)).astype(float),
+                         "Dividends": 0.0, "Stock Splits": 0.0}, index=index)
+
+
+def test_session_aware_aggregation():
+    bars = intraday_bars(3, end=pd.Timestamp("2024-03-12", tz="America/New_York"))  # Spans the DST change
+    bars.iloc[10, bars.columns.get_loc("Stock Splits")] = 2.0
+
+    hourly = resample_ohlcv(bars, "1h")
+    assert len(hourly) == 3 * 7  # 09:30 ... 15:30 per session; the last bar is half an hour
+    assert (hourly.index.strftime("%H:%M")[:7] == ["09:30", "10:30", "11:30", "12:30", "13:30", "14:30",
+                                                    "15:30"]).all()
+    first = bars.iloc[:12]
+    assert hourly.iloc[0][["Open", "High", "Low", "Close", "Volume"]].tolist() == [
+        first["Open"].iloc[0], first["High"].max(), first["Low"].min(), first["Close"].iloc[-1], first["Volume"].sum()]
+    assert hourly["Stock Splits"].tolist().count(2.0) == 1 and hourly["Stock Splits"].sum() == 2.0
+
+    daily = bars.groupby(bars.index.normalize()).agg({"Close": "last", "Volume": "sum"})
+    weekly = resample_ohlcv(pd.concat([daily.assign(Open=daily["Close"])]), "1wk")
+    assert (weekly.index.dayofweek == 0).all() and (weekly.index.hour == 0).all()
+    assert weekly["Volume"].sum() == bars["Volume"].sum()
+
+
+def test_base_interval_respects_provider_lookback():
+    assert base_interval("5d", "1h") == "5m"
+    assert base_interval("1mo", "15m") == "5m"
+    assert base_interval("6mo", "1h") == "1h"     # Beyond the 60-day 5m lookback
+    assert base_interval("1y", "1wk") == "1d"
+    assert base_interval("1mo", "1d") == "1d"     # Daily bars never come from intraday by default
+    assert base_interval("5d", "1m") == "1m"      # Finer than every base
+
+
+@pytest.fixture
+def provider(tmp_path, monkeypatch):
+    monkeypatch.setattr(ohlcv_cache, "_default_cache", ohlcv_cache.OHLCVCache(cache_dir=str(tmp_path)))
+    calls = []
+    minute5, daily = intraday_bars(25), None
+
+    def download(req, start=None, period=None):
+        calls.append((req.interval, period))
+        assert req.interval in ("5m", "1d")
+        if req.interval == "5m":
+            return minute5
+        return resample_ohlcv(intraday_bars(300), "1d") if daily is None else daily
+
+    monkeypatch.setattr(data_fetcher, "_download_ohlcv", download)
+    return calls, minute5
+
+
+def test_one_base_download_serves_every_timeframe(provider):
+    calls, minute5 = provider
+    hourly = data_fetcher.fetch_ohlcv(OHLCRequest("AAPL", period="5d", interval="1h"))
+    quarter = data_fetcher.fetch_ohlcv(OHLCRequest("AAPL", period="1mo", interval="15m"))
+    base = data_fetcher.fetch_ohlcv(OHLCRequest("AAPL", period="1mo", interval="5m"))
+    assert calls == [("5m", "1mo")]
+
+    assert hourly.index.normalize().nunique() == 5                      # Last 5 sessions, like the provider
+    assert quarter["Volume"].sum() == pytest.approx(base["Volume"].sum())
+    assert hourly["High"].iloc[-1] == minute5["High"].iloc[-6:].max()  # 15:30-16:00
+
+    weekly = data_fetcher.fetch_ohlcv(OHLCRequest("AAPL", period="1y", interval="1wk"))
+    monthly = data_fetcher.fetch_ohlcv(OHLCRequest("AAPL", period="1y", interval="1mo"))
+    assert calls == [("5m", "1mo"), ("1d", "1y")]
+    assert (weekly.index.dayofweek == 0).all() and (monthly.index.day == 1).all()
+    assert weekly["Volume"].sum() == pytest.approx(monthly["Volume"].sum())
+
+
+def test_one_day_period_is_the_last_session_and_no_cache_downloads_directly(provider, monkeypatch):
+    calls, minute5 = provider
+    last_session = data_fetcher.fetch_ohlcv(OHLCRequest("AAPL", period="1d", interval="1h"))
+    assert len(last_session) == 7 and last_session.index.normalize().nunique() == 1
+    assert last_session.index[0].date() == minute5.index[-1].date()
+
+    assert calls == [("5m", "1mo")]
+    monkeypatch.setattr(data_fetcher, "_download_ohlcv", lambda req, start=None, period=None: calls.append(
+        (req.interval, period)) or minute5)
+    data_fetcher.fetch_ohlcv(OHLCRequest("MSFT", period="1d", interval="1h"), use_cache=False)
+    assert calls[-1] == ("1h", None)                                    # Not another month of 5m bars
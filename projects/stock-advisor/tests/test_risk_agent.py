@@ -0,0 +1,112 @@
+# tests/test_risk_agent.py
+
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from agent_tools.portfolio_agent import PortfolioAgent
+from agent_tools.risk_agent import (
+    RiskAgent,
+    RunningCovariance,
+    betas,
+    historical_cvar,
+    historical_var,
+    ledoit_wolf,
+    parametric_var,
+    returns_panel,
+    risk_contributions,
+)
+
+
+def closes_panel(n_bars=400, seed=0):
+    rng = np.random.default_rng(seed)
+    market = rng.normal(0.0004, 0.01, n_bars)
+    returns = np.column_stack([
+        1.5 * market + rng.normal(0, 0.01, n_bars),   # AAA: high beta
+        0.5 * market + rng.normal(0, 0.005, n_bars),  # BBB: low beta
+        rng.normal(0, 0.02, n_bars),                  # CCC: idiosyncratic
+        market,                                       # SPY
+    ])
+    closes = 100 * np.cumprod(1 + returns, axis=0)
+    return pd.DataFrame(closes, index=pd.bdate_range("2022-01-03", periods=n_bars),
+                        columns=["AAA", "BBB", "CCC", "SPY"])
+
+
+def test_var_and_cvar():
+    returns = np.linspace(-0.10, 0.09, 20)  # 20 evenly spaced daily returns
+    assert historical_var(returns, 0.95) == pytest.approx(-np.quantile(returns, 0.05))
+    assert historical_cvar(returns, 0.95) >= historical_var(returns, 0.95)
+    assert parametric_var(0.0, 0.01, 0.99) == pytest.approx(NormalDist().inv_cdf(0.99) * 0.01)
+
+
+def test_running_covariance_matches_batch():
+    rows = np.random.default_rng(1).normal(size=(250, 5))
+    running = RunningCovariance(5)
+    running.update(rows[:100])
+    for row in rows[100:]:
+        running.update(row)
+    np.testing.assert_allclose(running.cov, np.cov(rows, rowvar=False), atol=1e-12)
+    np.testing.assert_allclose(running.mean, rows.mean(axis=0), atol=1e-12)
+
+    running.update([np.nan, 1, 1, 1, 1])  # incomplete rows are skipped
+    assert running.n == 250
+
+
+def test_ledoit_wolf_shrinks_when_few_observations():
+    rng = np.random.default_rng(2)
+    cov, intensity = ledoit_wolf(rng.normal(size=(20, 50)))
+    assert 0 < intensity <= 1
+    assert np.all(np.linalg.eigvalsh(cov) > 0)  # sample covariance would be singular here
+
+
+def test_risk_contributions_sum_to_one_and_betas():
+    returns = returns_panel(closes_panel())
+    cov = np.cov(returns[["AAA", "BBB", "CCC"]].to_numpy(), rowvar=False)
+    contrib = risk_contributions([0.4, 0.4, 0.2], cov)
+    assert contrib.sum() == pytest.approx(1.0)
+
+    beta = betas(returns[["AAA", "BBB"]].to_numpy(), returns["SPY"].to_numpy())
+    assert beta[0] == pytest.approx(1.5, abs=0.2)
+    assert beta[1] == pytest.approx(0.5, abs=0.2)
+
+
+def test_analyze_portfolio_report():
+    portfolio = PortfolioAgent()
+    portfolio.add_position("AAA", 10, 100.0)
+    portfolio.add_position("BBB", 10, 100.0)
+    report = RiskAgent().analyze_portfolio(portfolio, closes=closes_panel())
+
+    assert report["positions"] == 2
+    assert report["historical_cvar"] >= report["historical_var"] > 0
+    assert sum(report["contributions"].values()) == pytest.approx(1.0)
+    assert report["correlation"].loc["AAA", "AAA"] == pytest.approx(1.0)
+    assert 0.5 < report["beta"] < 1.5
+
+    shrunk = RiskAgent().analyze_portfolio(portfolio, closes=closes_panel(), shrink=True)
+    assert sum(shrunk["contributions"].values()) == pytest.approx(1.0)
+
+
+def test_covariance_model_is_topped_up_incrementally():
+    returns = returns_panel(closes_panel())[["AAA", "BBB"]]
+    agent = RiskAgent()
+    agent.covariance(returns.iloc[:200])
+    model = agent._models[("AAA", "BBB")]
+    cov = agent.covariance(returns)
+    assert agent._models[("AAA", "BBB")] is model and model.running.n == len(returns)
+    np.testing.assert_allclose(cov, np.cov(returns.to_numpy(), rowvar=False), atol=1e-12)
+
+
+def test_portfolio_impact():
+    portfolio = PortfolioAgent()
+    portfolio.add_position("BBB", 10, 100.0)
+    impact = RiskAgent().portfolio_impact(portfolio, "CCC", closes=closes_panel())
+
+    assert impact["weight"] == 0.5
+    assert impact["after"]["volatility"] > impact["before"]["volatility"]  # CCC is the noisier asset
+    assert impact["delta_var"] == pytest.approx(impact["after"]["historical_var"] - impact["before"]["historical_var"])
+    assert 0 < impact["risk_contribution"] < 1
+    assert abs(impact["correlation_to_portfolio"]) < 0.3
+
+    assert RiskAgent().portfolio_impact(PortfolioAgent(), "CCC")["positions"] == 0
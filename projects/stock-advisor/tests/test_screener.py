@@ -0,0 +1,80 @@
+# tests/test_screener.py
+
+import json
+import multiprocessing
+
+import pandas as pd
+import pytest
+
+from agent_tools.strategy_agent import StrategyAgent
+from core import screener
+
+SIGNALS = {
+    "AAA": ("Buy", "Strong", "Positive"),
+    "BBB": ("Hold", "Neutral", "Neutral"),
+    "CCC": ("Sell", "Weak", "Negative"),
+    "DDD": ("Buy", "Neutral", "Neutral"),
+}
+
+
+class FakeOrchestrator:
+    def __init__(self):
+        self.strategy_agent = StrategyAgent()
+        self.calls = []
+
+    def analyze_stock_concurrent(self, symbol):
+        self.calls.append(symbol)
+        if symbol == "ERR":
+            raise RuntimeError("provider down")
+        tech, fund, sent = SIGNALS[symbol]
+        return {
+            "symbol": symbol,
+            "latest_price": 100.0,
+            "technical": {"signal": tech, "RSI_14": pd.Series([50.0, 25.0])},
+            "fundamental": {"signal": fund},
+            "sentiment": sent,
+            "strategy": self.strategy_agent.generate_strategy(tech, fund, sent),
+        }
+
+
+def test_screen_ranks_and_writes_table(tmp_path):
+    output = tmp_path / "screen.csv"
+    fake = FakeOrchestrator()
+    table = screener.screen(["ccc", "AAA", "ERR", "BBB", "DDD"], workers=1, output=str(output),
+                            shard_size=2, prefetch=False, orchestrator=fake)
+
+    assert list(table["symbol"]) == ["AAA", "DDD", "BBB", "CCC", "ERR"]
+    assert list(table["rank"]) == [1, 2, 3, 4, 5]
+    assert table.loc[0, "score"] == 3
+    assert table.loc[0, "rsi_14"] == 25.0
+    assert table.loc[4, "error"] == "provider down"
+
+    written = pd.read_csv(output)
+    assert list(written["symbol"]) == list(table["symbol"])
+    assert not (tmp_path / "screen.csv.checkpoint.jsonl").exists()
+
+
+def test_screen_resumes_from_checkpoint(tmp_path):
+    output = tmp_path / "screen.csv"
+    checkpoint = tmp_path / "screen.csv.checkpoint.jsonl"
+    with open(checkpoint, "w") as f:
+        f.write(json.dumps({"symbol": "AAA", "score": 3, "strategy": "Buy", "error": None}) + "\n")
+        f.write('{"symbol": "BB')  # truncated line from a crash
+
+    fake = FakeOrchestrator()
+    table = screener.screen(["AAA", "BBB", "CCC"], workers=1, output=str(output),
+                            prefetch=False, orchestrator=fake)
+
+    assert fake.calls == ["BBB", "CCC"]
+    assert set(table["symbol"]) == {"AAA", "BBB", "CCC"}
+
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != "fork",
+                    reason="Workers only inherit the patched Orchestrator under fork")
+def test_screen_process_pool(tmp_path, monkeypatch):
+    import core.orchestrator
+
+    monkeypatch.setattr(core.orchestrator, "Orchestrator", FakeOrchestrator)
+    table = screener.screen(list(SIGNALS), workers=2, output=str(tmp_path / "screen.csv"),
+                            shard_size=1, prefetch=False)
+    assert list(table["symbol"]) == ["AAA", "DDD", "BBB", "CCC"]
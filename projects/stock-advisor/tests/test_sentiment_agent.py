@@ -1,6 +1,6 @@
 # tests/test_sentiment_agent.py
 import pytest
-from agents.sentiment_agent import SentimentAgent
+from agent_tools.sentiment_agent import SentimentAgent
 from unittest.mock import patch
 
 @pytest.fixture
@@ -40,3 +40,23 @@ def test_fetch_news(agent):
         news = agent.fetch_news("AAPL")
         mock_news.assert_called_once_with("AAPL")
         assert news == ["News 1", "News 2"]
+
+def test_lexicon_scores_batch_with_negation(agent):
+    texts = ["Apple beats estimates", "Tesla doesn't beat estimates", "Shares plunge sharply",
+             "Quarterly report published", "Profit is not bad"]
+    scores = agent.score(texts)
+    assert scores.shape == (5,)
+    assert scores[0] > 0 > scores[1]
+    plain, intensified, softened, leading = agent.score(["Shares plunge", "Shares plunge sharply",
+                                                          "Shares plunge slightly", "Shares sharply plunge"])
+    assert intensified < plain < softened < 0  # intensifier after the word it scales
+    assert leading == intensified               # ... or before it
+    assert agent.score(["Shares sharply"])[0] == 0
+    assert scores[3] == 0 and scores[4] > 0
+    assert list(agent.analyze_batch(texts)) == ["Positive", "Negative", "Negative", "Neutral", "Positive"]
+
+def test_analyze_sentiment_uses_scorer_with_api_key(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    agent = SentimentAgent()
+    assert agent.analyze_sentiment(["Bank downgraded after fraud probe"]) == "Negative"
+    assert agent.analyze_sentiment("Company beats earnings estimates!") == "Positive"
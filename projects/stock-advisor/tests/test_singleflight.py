@@ -0,0 +1,105 @@
+# tests/test_singleflight.py
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+import utils.data_fetcher as data_fetcher
+from utils.singleflight import SingleFlight, coalesce
+
+
+def slow_counter(delay=0.2):
+    calls = []
+
+    def fn(value):
+        calls.append(value)
+        time.sleep(delay)
+        return {"value": value}
+
+    return fn, calls
+
+
+def test_threaded_callers_share_one_execution():
+    flight = SingleFlight()
+    fn, calls = slow_counter()
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: flight.do(("fn", "AAPL"), fn, "AAPL"), range(8)))
+
+    assert calls == ["AAPL"]
+    assert all(r == {"value": "AAPL"} for r in results)
+    assert flight.stats() == {"calls": 8, "executions": 1, "coalesced": 7, "in_flight": 0,
+                              "coalesced_by_name": {"fn": 7}}
+
+
+def test_different_keys_run_separately_and_next_call_refetches():
+    flight = SingleFlight()
+    fn, calls = slow_counter(0.05)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(lambda s: flight.do(("fn", s), fn, s), ["AAPL", "MSFT", "AAPL", "MSFT"]))
+    flight.do(("fn", "AAPL"), fn, "AAPL")
+    assert sorted(calls) == ["AAPL", "AAPL", "MSFT"]
+
+
+def test_exception_is_shared():
+    flight = SingleFlight()
+    started = threading.Event()
+
+    def boom():
+        started.set()
+        time.sleep(0.1)
+        raise ConnectionError("429")
+
+    def follower():
+        started.wait()
+        return flight.do("k", boom)
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        leader = pool.submit(flight.do, "k", boom)
+        other = pool.submit(follower)
+        for future in (leader, other):
+            with pytest.raises(ConnectionError):
+                future.result()
+    assert flight.executions == 1 and flight.in_flight() == 0
+
+
+def test_async_and_threaded_callers_mix():
+    flight = SingleFlight()
+    fn, calls = slow_counter()
+
+    @coalesce(lambda symbol: ("quote", symbol), flight=flight)
+    def quote(symbol):
+        return fn(symbol)
+
+    async def main():
+        thread_result = asyncio.to_thread(quote, "AAPL")
+        return await asyncio.gather(quote.aio("AAPL"), quote.aio("AAPL"), thread_result)
+
+    results = asyncio.run(main())
+    assert calls == ["AAPL"]
+    assert all(r == {"value": "AAPL"} for r in results)
+    assert flight.coalesced == 2
+
+
+def test_fetch_ohlcv_coalesced(monkeypatch):
+    frame = pd.DataFrame({"Close": [1.0, 2.0]})
+    calls = []
+
+    def fake_download(req, start=None, period=None):
+        calls.append(req.ticker)
+        time.sleep(0.2)
+        return frame
+
+    monkeypatch.setattr(data_fetcher, "_download_ohlcv", fake_download)
+    before = data_fetcher.fetch_ohlcv.flight.stats()["coalesced_by_name"].get("fetch_ohlcv", 0)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(lambda _: data_fetcher.fetch_ohlcv("AAPL", use_cache=False), range(4)))
+
+    assert calls == ["AAPL"]
+    assert all(r.equals(frame) for r in results)
+    assert len({id(r) for r in results}) == 4, "followers get their own copy"
+    after = data_fetcher.fetch_ohlcv.flight.stats()["coalesced_by_name"]["fetch_ohlcv"]
+    assert after - before == 3
@@ -0,0 +1,75 @@
+# tests/test_statement_cache.py
+
+import time
+
+import pandas as pd
+import pytest
+
+from utils import data_fetcher
+from utils.statement_cache import StatementCache
+
+
+def statement(periods, revenue):
+    return pd.DataFrame([revenue], index=["Total Revenue"], columns=pd.to_datetime(periods))
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return StatementCache(str(tmp_path))
+
+
+def test_round_trip_and_merge_by_fiscal_period(cache):
+    cache.store("aapl", "annual", {"financials": statement(["2023-09-30", "2022-09-30"], [100.0, 90.0])})
+    merged = cache.store("AAPL", "annual", {"financials": statement(["2024-09-30", "2023-09-30"], [120.0, 101.0])})
+
+    loaded, meta = cache.load("AAPL")
+    pd.testing.assert_frame_equal(loaded["financials"], merged["financials"])
+    assert list(loaded["financials"].columns) == list(pd.to_datetime(["2024-09-30", "2023-09-30", "2022-09-30"]))
+    assert loaded["financials"].loc["Total Revenue"].tolist() == [120.0, 101.0, 90.0]  # restatement wins
+    assert meta["latest_period"].startswith("2024-09-30")
+
+
+def test_refreshes_only_when_a_filing_is_due(cache):
+    calls = []
+
+    def download(names):
+        calls.append(list(names))
+        return {name: statement([recent], [1.0]) for name in names}
+
+    recent = (pd.Timestamp.now() - pd.Timedelta(days=30)).normalize()
+    cache.get("MSFT", download, ["financials"])
+    cache.get("MSFT", download, ["financials"])
+    assert calls == [["financials"]]
+
+    cache.get("MSFT", download, ["financials", "cashflow"])  # only the statement never cached
+    assert calls[-1] == ["cashflow"]
+
+    _, meta = cache.load("MSFT")
+    assert cache.is_fresh(meta)
+    overdue = time.time() + 500 * 86400  # next annual filing is long past
+    assert not cache.is_fresh(meta, now=overdue)
+    meta["checked_at"] = overdue - 3600  # re-checked an hour ago without a new period
+    assert cache.is_fresh(meta, now=overdue)
+
+
+def test_fetch_financials_shares_cache(monkeypatch, cache):
+    requested = []
+
+    class FakeTicker:
+        def __init__(self, symbol):
+            self.symbol = symbol
+
+        def __getattr__(self, name):
+            requested.append(name)
+            return statement([pd.Timestamp.now().normalize() - pd.Timedelta(days=10)], [5.0])
+
+    monkeypatch.setattr(data_fetcher.yf, "Ticker", FakeTicker)
+    monkeypatch.setattr(data_fetcher, "get_statement_cache", lambda: cache)
+
+    first = data_fetcher.fetch_financials("NVDA")
+    again = data_fetcher.fetch_financials("NVDA")
+    assert sorted(requested) == ["balance_sheet", "cashflow", "financials", "income_stmt"]
+    pd.testing.assert_frame_equal(first["earnings"], again["earnings"])
+
+    data_fetcher.fetch_financials("NVDA", frequency="quarterly")
+    assert "quarterly_income_stmt" in requested
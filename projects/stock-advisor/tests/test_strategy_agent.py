@@ -1,7 +1,10 @@
 # tests/test_strategy_agent.py
 
+import itertools
+
+import numpy as np
 import pytest
-from agents.strategy_agent import StrategyAgent
+from agent_tools.strategy_agent import StrategyAgent, score_panel, strategy_panel, vote_panel
 
 @pytest.fixture
 def agent():
@@ -35,3 +38,17 @@ def test_strategy_all_neutral(agent):
 def test_strategy_empty_strings(agent):
     strategy = agent.generate_strategy("", "", "")
     assert strategy == "Hold"
+
+def test_panel_functions_match_generate_strategy(agent):
+    labels = ["Buy", "Sell", "Hold", "Strong", "Weak", "Neutral", "Positive", "Negative", "", "Data Unavailable"]
+    combos = list(itertools.product(labels, repeat=3))
+    technical, fundamental, sentiment = (np.array(c, dtype=object) for c in zip(*combos))
+
+    scores = score_panel(technical, fundamental, sentiment)
+    assert scores.tolist() == [agent.score(*c) for c in combos]
+    assert strategy_panel(scores).tolist() == [agent.generate_strategy(*c) for c in combos]
+
+    # Numeric votes and broadcasting: one fundamental / sentiment label against a column of votes.
+    votes = vote_panel(technical)
+    np.testing.assert_array_equal(score_panel(votes, fundamental, sentiment), scores)
+    assert strategy_panel(score_panel(np.array([1, 0, -1]), "Weak", "Positive")).tolist() == ["Buy", "Hold", "Sell"]
@@ -0,0 +1,61 @@
+# tests/test_streaming.py
+
+import socket
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from agent_tools.technical_agent import TechnicalAgent
+from benchmarks import synthetic
+from core.streaming import ReplayFeed, SocketFeed, StreamIngestor
+
+
+@pytest.fixture
+def tape():
+    return synthetic.ticks(30_000, 5, rate=10)  # ~50 minutes
+
+
+def test_replay_feed_updates_indicators_per_bar(tape, tmp_path):
+    path = tmp_path / "ticks.csv.gz"
+    tape.to_csv(path, index=False)
+    seen = []
+    ingestor = StreamIngestor(on_bar=lambda bar, snapshot: seen.append((bar.symbol, snapshot)), lateness=0)
+
+    stats = ingestor.run(ReplayFeed(str(path), batch_size=1_000))
+    ingestor.flush(tape["timestamp"].iloc[-1] + 60)
+
+    assert stats["ticks"] == len(tape) and stats["late_ticks"] == 0
+    bars = ingestor.store.bars("T0002")
+    batch = TechnicalAgent().analyze(pd.DataFrame({"Close": bars["Close"].to_numpy()}))
+    snapshot = ingestor.snapshot("T0002")
+    assert snapshot["SMA_20"] == pytest.approx(batch["SMA_20"].iloc[-1])
+    assert snapshot["RSI_14"] == pytest.approx(batch["RSI_14"].iloc[-1])
+    assert [s for s in seen if s[0] == "T0002"][-1][1] == snapshot
+    assert len(seen) == sum(len(ingestor.store.bars(s)) for s in ingestor.store.symbols)
+
+
+def test_socket_feed_and_throughput(tape):
+    lines = "".join(f"{s},{t},{p},{v}\n" for s, t, p, v in tape.itertuples(index=False)).encode()
+    server = socket.create_server(("127.0.0.1", 0))
+    port = server.getsockname()[1]
+
+    def serve():
+        conn, _ = server.accept()
+        with conn:
+            conn.sendall(lines)
+        server.close()
+
+    threading.Thread(target=serve, daemon=True).start()
+    ingestor = StreamIngestor()
+    stats = ingestor.run(SocketFeed("127.0.0.1", port, timeout=10))
+    assert stats["ticks"] == len(tape) and stats["symbols"] == 5
+    np.testing.assert_allclose(ingestor.store.bars("T0000")["Close"].iloc[-1],
+                               tape[tape["symbol"] == "T0000"].set_index("timestamp")["price"]
+                               .groupby(lambda t: int(t // 60)).last().iloc[-2])
+
+    big = synthetic.ticks(500_000, 100)
+    stats = StreamIngestor().run([tuple(big[c].to_numpy()[i:i + 5_000] for c in big.columns)
+                                  for i in range(0, len(big), 5_000)])
+    assert stats["ticks_per_second"] > 50_000  # Tens of thousands of ticks/s with a wide margin
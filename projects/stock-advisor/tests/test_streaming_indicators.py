@@ -0,0 +1,62 @@
+# tests/test_streaming_indicators.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from agent_tools.streaming_indicators import RecursiveEMA, RollingRSI, RollingSMA, StreamingTechnicals
+from agent_tools.technical_agent import TechnicalAgent
+
+
+@pytest.fixture
+def closes():
+    np.random.seed(3)
+    return 100 + np.random.randn(600).cumsum()
+
+
+@pytest.fixture
+def batch(closes):
+    return TechnicalAgent().analyze(pd.DataFrame({"Close": closes}))
+
+
+@pytest.mark.parametrize("indicator, key", [
+    (RollingSMA(20), "SMA_20"),
+    (RecursiveEMA(20), "EMA_20"),
+    (RollingRSI(14), "RSI_14"),
+])
+def test_bar_by_bar_matches_batch(indicator, key, closes, batch):
+    streamed = [indicator.update(x) for x in closes]
+    np.testing.assert_allclose(streamed, batch[key].to_numpy(), rtol=1e-9, equal_nan=True)
+
+
+def test_seeded_then_updated_matches_batch(closes, batch):
+    live = TechnicalAgent().stream(pd.DataFrame({"Close": closes[:400]}))
+    for x in closes[400:]:
+        snapshot = live.update(x)
+
+    assert live.bars == len(closes)
+    assert snapshot["SMA_20"] == pytest.approx(batch["SMA_20"].iloc[-1], rel=1e-9)
+    assert snapshot["EMA_20"] == pytest.approx(batch["EMA_20"].iloc[-1], rel=1e-9)
+    assert snapshot["RSI_14"] == pytest.approx(batch["RSI_14"].iloc[-1], rel=1e-9)
+    assert snapshot["signal"] == batch["signal"]
+
+
+def test_warmup_and_flat_prices():
+    live = StreamingTechnicals()
+    snapshot = live.update(10.0)
+    assert np.isnan(snapshot["SMA_20"]) and np.isnan(snapshot["RSI_14"])
+    assert snapshot["EMA_20"] == 10.0
+    assert snapshot["signal"] == "Hold"
+
+    rsi = RollingRSI(3)
+    for x in [1.0, 2.0, 3.0, 4.0]:
+        rsi.update(x)
+    assert rsi.value == 100.0
+
+
+def test_constant_memory():
+    sma = RollingSMA(5)
+    for x in range(10_000):
+        sma.update(float(x))
+    assert len(sma._buf) == 5
+    assert sma.value == pytest.approx(9997.0)
@@ -0,0 +1,88 @@
+# tests/test_symbol_index.py
+
+import pytest
+
+from utils import data_fetcher, symbol_index
+from utils.symbol_index import SymbolIndex, load_index
+
+
+@pytest.fixture
+def index(tmp_path, monkeypatch):
+    index = load_index(directory=str(tmp_path))
+    monkeypatch.setattr(symbol_index, "_default_index", index)
+    return index
+
+
+@pytest.mark.parametrize("query, symbol", [
+    ("msft", "MSFT"),                  # Exact symbol
+    ("Apple Inc.", "AAPL"),            # Corporate suffix ignored
+    ("bank of am", "BAC"),             # Phrase prefix
+    ("morgan st", "MS"),               # Word prefixes intersected
+    ("facebook", "META"),              # Alias
+    ("Procter & Gamble", "PG"),
+    ("mircosoft", "MSFT"),             # Trigram fuzzy match
+])
+def test_local_lookup(index, query, symbol):
+    results = index.search(query)
+    assert results[0]["symbol"] == symbol
+    assert set(results[0]) == {"symbol", "shortname", "exch", "type"}
+
+
+def test_remote_fallback_only_on_miss_and_learns(index, tmp_path, monkeypatch):
+    calls = []
+
+    def remote(name, limit):
+        calls.append(name)
+        return [{"symbol": "ZZZZ", "shortname": "Zephyr Widgets Corp", "exch": "NYSE", "type": "EQUITY"}]
+
+    monkeypatch.setattr(data_fetcher, "_search_remote", remote)
+    assert data_fetcher.search_tickers_by_company("nvidia")[0]["symbol"] == "NVDA"
+    assert data_fetcher.search_tickers_by_company("qwxv", remote=False) == []
+    assert calls == []
+
+    assert data_fetcher.search_tickers_by_company("qwxv")[0]["symbol"] == "ZZZZ"
+    assert data_fetcher.search_tickers_by_company("qwxv")[0]["symbol"] == "ZZZZ"   # Learned alias
+    assert data_fetcher.search_tickers_by_company("zephyr wid")[0]["symbol"] == "ZZZZ"
+    assert calls == ["qwxv"]
+    assert load_index(directory=str(tmp_path)).search("zephyr")[0]["symbol"] == "ZZZZ"  # Persisted
+
+
+def test_nasdaq_trader_listing_is_parsed():
+    text = ("ACT Symbol|Security Name|Exchange|CQS Symbol|ETF|Round Lot Size|Test Issue|NASDAQ Symbol\n"
+            "BRK.B|Berkshire Hathaway Inc. Class B|N|BRK.B|N|100|N|BRK=B\n"
+            "ZTEST|Test Issue Inc.|N|ZTEST|N|100|Y|ZTEST\n"
+            "File Creation Time: 0101202500:00|||||||\n")
+    rows = symbol_index._parse_nasdaq_trader(text, "other")
+    assert [(r["symbol"], r["exchange"]) for r in rows] == [("BRK-B", "NYSE")]
+    assert SymbolIndex(rows).search("berkshire hath")[0]["symbol"] == "BRK-B"
+
+
+@pytest.mark.parametrize("query, symbol", [
+    ("American Airlines", "AAL"),
+    ("United Airlines", "UAL"),
+    ("Johnson Controls", "JCI"),
+    ("General Mills", "GIS"),
+    ("General Dynamics", "GD"),
+    ("Micro Strategy", "MSTR"),
+    ("Apple Hospitality", "APLE"),
+])
+def test_near_miss_names_go_remote_before_fuzzy(index, monkeypatch, query, symbol):
+    calls = []
+
+    def remote(name, limit):
+        calls.append(name)
+        return [{"symbol": symbol, "shortname": query, "exch": "NYSE", "type": "EQUITY"}]
+
+    monkeypatch.setattr(data_fetcher, "_search_remote", remote)
+    assert index.search(query, fuzzy=False) == []
+    assert data_fetcher.search_tickers_by_company(query)[0]["symbol"] == symbol
+    assert calls == [query]
+
+
+def test_fuzzy_only_when_remote_is_off_or_fails(index, monkeypatch):
+    def down(name, limit):
+        raise ConnectionError("offline")
+
+    monkeypatch.setattr(data_fetcher, "_search_remote", down)
+    assert data_fetcher.search_tickers_by_company("mircosoft")[0]["symbol"] == "MSFT"
+    assert data_fetcher.search_tickers_by_company("mircosoft", remote=False)[0]["symbol"] == "MSFT"
@@ -3,7 +3,7 @@
 import pytest
 import pandas as pd
 import numpy as np
-from agents.technical_agent import TechnicalAgent
+from agent_tools.technical_agent import TechnicalAgent
 
 @pytest.fixture
 def sample_data():
@@ -51,3 +51,58 @@ def test_empty_data(agent):
     empty_df = pd.DataFrame()
     analysis = agent.analyze(empty_df)
     assert analysis == {}, "Analysis of empty data should return empty dictionary"
+
+# -----------------------
+# Panel mode
+# -----------------------
+@pytest.fixture
+def close_panel():
+    np.random.seed(7)
+    closes = pd.DataFrame(
+        100 + np.random.randn(120, 4).cumsum(axis=0),
+        columns=["AAA", "BBB", "CCC", "DDD"],
+        index=pd.date_range("2025-01-01", periods=120, freq="D"),
+    )
+    closes.iloc[:40, 1] = np.nan   # BBB listed later
+    closes.iloc[:115, 3] = np.nan  # DDD has too little history for any indicator
+    return closes
+
+def test_panel_matches_pandas_reference(agent, close_panel):
+    panel = agent.analyze_panel(close_panel)
+    for ticker in close_panel.columns:
+        close = close_panel[ticker]
+        delta = close.diff()
+        rs = delta.clip(lower=0).rolling(14).mean() / (-delta.clip(upper=0)).rolling(14).mean()
+        np.testing.assert_allclose(panel["SMA_20"][ticker], close.rolling(20).mean(), rtol=1e-10)
+        np.testing.assert_allclose(panel["EMA_20"][ticker], close.ewm(span=20, adjust=False).mean(), rtol=1e-10)
+        np.testing.assert_allclose(panel["RSI_14"][ticker], 100 - 100 / (1 + rs), rtol=1e-10)
+
+def test_panel_late_listing_matches_single_ticker(agent, close_panel):
+    panel = agent.analyze_panel(close_panel)
+    listed = close_panel[["BBB"]].dropna().rename(columns={"BBB": "Close"})
+    single = agent.analyze(listed)
+    for key in ["SMA_20", "EMA_20", "RSI_14"]:
+        np.testing.assert_array_equal(panel[key]["BBB"].dropna().to_numpy(), single[key].dropna().to_numpy())
+    assert panel["signal"]["BBB"] == single["signal"]
+
+def test_panel_signals(agent, close_panel):
+    panel = agent.analyze_panel(close_panel.to_numpy())
+    assert isinstance(panel["RSI_14"], np.ndarray)
+    assert panel["RSI_14"].shape == close_panel.shape
+    assert list(panel["signal"])[3] == "Hold"  # no RSI available
+    for signal, rsi in zip(panel["signal"][:3], panel["RSI_14"][-1, :3]):
+        assert signal == ("Buy" if rsi < 30 else "Sell" if rsi > 70 else "Hold")
+
+def test_single_ticker_wrappers_match_panel(agent, sample_data):
+    panel = agent.analyze_panel(sample_data[["Close"]])
+    np.testing.assert_array_equal(agent.calculate_sma(sample_data), panel["SMA_20"]["Close"])
+    np.testing.assert_array_equal(agent.calculate_ema(sample_data), panel["EMA_20"]["Close"])
+    np.testing.assert_array_equal(agent.calculate_rsi(sample_data), panel["RSI_14"]["Close"])
+
+def test_trailing_nan_close_gives_hold_for_single_series(agent):
+    data = pd.DataFrame({"Close": np.r_[np.linspace(100, 50, 40), np.nan]})
+    assert np.isnan(agent.calculate_rsi(data).iloc[-1])
+    assert agent.analyze(data)["signal"] == "Hold"
+    assert TechnicalAgent(result="compact").analyze(data).signal == "Hold"
+    # Panels fall back to each ticker's last valid RSI (tickers without a bar on the last date).
+    assert agent.analyze_panel(data[["Close"]])["signal"]["Close"] == "Buy"
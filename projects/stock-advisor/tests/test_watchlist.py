@@ -0,0 +1,103 @@
+# tests/test_watchlist.py
+
+import threading
+import time
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from core import watchlist
+from core.memory_manager import MemoryManager
+from core.watchlist import WatchlistRefresher, is_stale, market_session
+
+
+def ny(text):
+    return datetime.fromisoformat(text).replace(tzinfo=watchlist.MARKET_TZ).timestamp()
+
+
+def test_market_hours_cadence():
+    assert market_session(ny("2024-06-12 10:00")) == "open"
+    assert market_session(ny("2024-06-12 08:00")) == "extended"
+    assert market_session(ny("2024-06-12 21:00")) == "closed"
+    assert market_session(ny("2024-06-15 12:00")) == "closed"  # Saturday
+
+    assert not is_stale(ny("2024-06-12 10:00"), ny("2024-06-12 10:10"))
+    assert is_stale(ny("2024-06-12 10:00"), ny("2024-06-12 10:20"))      # 15 min during the session
+    assert is_stale(ny("2024-06-12 15:50"), ny("2024-06-12 16:05"))      # Predates the close
+    assert not is_stale(ny("2024-06-15 10:00"), ny("2024-06-15 14:00"))  # Weekend: 6 h cadence
+    assert is_stale(ny("2024-06-15 10:00"), ny("2024-06-15 16:30"))
+
+
+class FakeOrchestrator:
+    calls = []
+    running = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def analyze_stock(self, symbol):
+        with self.lock:
+            FakeOrchestrator.calls.append(symbol)
+            FakeOrchestrator.running += 1
+            FakeOrchestrator.peak = max(FakeOrchestrator.peak, FakeOrchestrator.running)
+        time.sleep(0.05)
+        with self.lock:
+            FakeOrchestrator.running -= 1
+        return {"symbol": symbol, "latest_price": 10.0, "strategy": "Buy",
+                "technical": {"RSI_14": pd.Series([40.0, 55.5]), "signal": "Hold"}, "run": len(self.calls)}
+
+
+@pytest.fixture
+def refresher(tmp_path):
+    FakeOrchestrator.calls, FakeOrchestrator.peak = [], 0
+    clock = {"now": ny("2024-06-12 11:00")}
+    r = WatchlistRefresher(["aapl", "MSFT", "GOOGL", "AMZN", "TSLA"], MemoryManager(str(tmp_path / "cache.db")),
+                           FakeOrchestrator, workers=2, clock=lambda: clock["now"])
+    r.clock_state = clock
+    yield r
+    r.stop()
+
+
+def test_refresh_due_uses_bounded_pool_and_stores_results(refresher):
+    for future in refresher.refresh_due():
+        future.result()
+    assert sorted(FakeOrchestrator.calls) == ["AAPL", "AMZN", "GOOGL", "MSFT", "TSLA"]
+    assert FakeOrchestrator.peak <= 2
+    stored = refresher.memory.get_analysis("AAPL")
+    assert stored["technical"] == {"RSI_14": 55.5, "signal": "Hold"}  # JSON-safe latest values
+    assert refresher.refresh_due() == []  # Nothing stale yet
+
+
+def test_get_serves_precomputed_and_refreshes_only_when_stale(refresher, monkeypatch):
+    monkeypatch.setattr(time, "time", lambda: refresher.clock_state["now"])  # Store timestamps too
+    first = refresher.get("NVDA")  # Nothing stored: computed inline
+    assert first["age"] == 0 and FakeOrchestrator.calls == ["NVDA"]
+
+    refresher.clock_state["now"] += 5 * 60
+    view = refresher.get("nvda")
+    assert not view["stale"] and not view["refreshing"] and FakeOrchestrator.calls == ["NVDA"]
+    assert view["analysis"]["run"] == 1
+
+    refresher.clock_state["now"] += 20 * 60
+    stale = refresher.get("NVDA")
+    assert stale["stale"] and stale["analysis"]["run"] == 1  # Old result returned immediately
+    refresher.get("NVDA")                                    # Refresh already in flight: not resubmitted
+    time.sleep(0.2)
+    assert FakeOrchestrator.calls == ["NVDA", "NVDA"]
+    assert refresher.stats["stale_hits"] == 2 and refresher.stats["misses"] == 1
+
+
+def test_miss_is_analyzed_inline_ahead_of_queued_refreshes(tmp_path):
+    FakeOrchestrator.calls, FakeOrchestrator.peak = [], 0
+    r = WatchlistRefresher(["AAPL", "MSFT", "GOOGL", "AMZN"], MemoryManager(str(tmp_path / "cache.db")),
+                           FakeOrchestrator, workers=1, clock=lambda: ny("2024-06-12 11:00"))
+    try:
+        queued = r.refresh_due()                  # ~0.2 s of work on the single worker
+        started = time.perf_counter()
+        view = r.get("NEW")
+        assert time.perf_counter() - started < 0.15
+        assert view["analysis"]["symbol"] == "NEW" and not queued[-1].done()
+        for future in queued:
+            future.result()
+    finally:
+        r.stop()
@@ -0,0 +1,238 @@
+# utils/bar_store.py
+"""
+Bar Store
+---------
+
+Aggregates ticks into fixed-interval (default 1-minute) OHLCV bars and keeps the
+most recent `capacity` bars of every symbol in NumPy ring buffers.
+
+Layout: one preallocated (symbols x capacity) array per field (bar start time,
+open, high, low, close, volume, ticks), plus one row per symbol for the bar
+currently being formed. A tick only writes into those arrays; memory is
+allocated when a new symbol appears (row capacity doubles) and never per tick
+or per bar.
+
+- add_tick(symbol, ts, price, size): one tick; returns the bar it completed, if any.
+- add_ticks(symbols, ts, prices, sizes): a batch of ticks, pre-aggregated per
+  (symbol, bar) with np.*.reduceat, then merged; the fast path for feeds that
+  deliver arrays.
+- flush(now): close bars whose interval has ended even if no later tick arrived.
+- bars(symbol) / closes(symbol): chronological copies of the ring.
+
+Ticks for a bar that is already completed (or older than the forming bar) are
+counted in `late_ticks` and dropped, so a symbol's bars are strictly increasing in time.
+Timestamps are epoch seconds.
+
+Example Usage:
+
+    store = BarStore(capacity=390)
+    bar = store.add_tick("AAPL", 1_700_000_000.5, 189.2, 100)   # None until the minute rolls over
+    store.bars("AAPL")                                          # DataFrame of completed bars
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+logger.setLevel(os.getenv("LOG_LEVEL", "INFO"))
+
+BAR_STORE_CAPACITY = int(os.getenv("BAR_STORE_CAPACITY", "1440"))  # One day of 1-minute bars
+FIELDS = ("open", "high", "low", "close", "volume")
+NO_BAR = np.iinfo(np.int64).min
+
+
+class Bar(NamedTuple):
+    symbol: str
+    time: int      # Bar start, epoch seconds
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+    ticks: int
+
+
+class BarStore:
+    """
+    Per-symbol ring buffers of completed bars plus the bar being formed.
+
+    Methods:
+        add_tick / add_ticks: Ingest ticks, returning completed bars.
+        flush(now): Complete bars whose interval has ended.
+        bars(symbol) / closes(symbol) / last_bar(symbol): Read completed bars.
+    """
+
+    def __init__(self, capacity: int = BAR_STORE_CAPACITY, interval: int = 60, symbols: int = 64):
+        self.capacity = capacity
+        self.interval = interval
+        self._slots: Dict[str, int] = {}
+        self._names: List[str] = []
+        # Completed bars: ring per symbol, _head = next write position, _count = bars held.
+        self._time = np.zeros((symbols, capacity), dtype=np.int64)
+        self._ohlcv = np.zeros((symbols, len(FIELDS), capacity))
+        self._ticks = np.zeros((symbols, capacity), dtype=np.int64)
+        self._head = np.zeros(symbols, dtype=np.int64)
+        self._count = np.zeros(symbols, dtype=np.int64)
+        # Forming bar per symbol.
+        self._cur_time = np.full(symbols, NO_BAR, dtype=np.int64)
+        self._cur = np.zeros((symbols, len(FIELDS)))
+        self._cur_ticks = np.zeros(symbols, dtype=np.int64)
+        self._last_time = np.full(symbols, NO_BAR, dtype=np.int64)  # Start of the newest completed bar
+        self.late_ticks = 0
+
+    # -----------------------
+    # Slots
+    # -----------------------
+    def _slot(self, symbol: str) -> int:
+        slot = self._slots.get(symbol)
+        if slot is None:
+            slot = self._slots[symbol] = len(self._names)
+            self._names.append(symbol)
+            if slot == len(self._head):
+                self._grow(2 * slot)
+        return slot
+
+    def _grow(self, size: int):
+        def resize(a, fill=0):
+            out = np.full((size,) + a.shape[1:], fill, dtype=a.dtype)
+            out[:len(a)] = a
+            return out
+
+        self._time, self._ohlcv, self._ticks = resize(self._time), resize(self._ohlcv), resize(self._ticks)
+        self._head, self._count = resize(self._head), resize(self._count)
+        self._cur_time, self._cur = resize(self._cur_time, NO_BAR), resize(self._cur)
+        self._cur_ticks, self._last_time = resize(self._cur_ticks), resize(self._last_time, NO_BAR)
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self._names)
+
+    # -----------------------
+    # Writes
+    # -----------------------
+    def _complete(self, slot: int) -> Bar:
+        """Move the forming bar of `slot` into its ring and return it."""
+        head = self._head[slot]
+        cur = self._cur[slot]
+        self._time[slot, head] = self._last_time[slot] = self._cur_time[slot]
+        self._ohlcv[slot, :, head] = cur
+        self._ticks[slot, head] = self._cur_ticks[slot]
+        self._head[slot] = (head + 1) % self.capacity
+        if self._count[slot] < self.capacity:
+            self._count[slot] += 1
+        bar = Bar(self._names[slot], int(self._cur_time[slot]), *cur.tolist(), int(self._cur_ticks[slot]))
+        self._cur_time[slot] = NO_BAR
+        return bar
+
+    def _merge(self, slot: int, start: int, o: float, h: float, l: float, c: float, v: float,
+               n: int) -> Optional[Bar]:
+        """Fold an aggregate for bar `start` into the slot's forming bar."""
+        current = self._cur_time[slot]
+        if start == current:
+            cur = self._cur[slot]
+            if h > cur[1]:
+                cur[1] = h
+            if l < cur[2]:
+                cur[2] = l
+            cur[3] = c
+            cur[4] += v
+            self._cur_ticks[slot] += n
+            return None
+        if start < current or start <= self._last_time[slot]:
+            self.late_ticks += n
+            return None
+        completed = self._complete(slot) if current != NO_BAR else None
+        self._cur_time[slot] = start
+        self._cur[slot] = (o, h, l, c, v)
+        self._cur_ticks[slot] = n
+        return completed
+
+    def add_tick(self, symbol: str, ts: float, price: float, size: float = 0.0) -> Optional[Bar]:
+        start = int(ts // self.interval) * self.interval
+        return self._merge(self._slot(symbol), start, price, price, price, price, size, 1)
+
+    def add_ticks(self, symbols: Sequence[str], ts, prices, sizes=None) -> List[Bar]:
+        """
+        Ingest a batch. Ticks are grouped by (symbol, bar) in one vectorized pass
+        (stable sort + reduceat), so the per-tick cost is a few array operations.
+        Returns completed bars in time order per symbol.
+        """
+        ts = np.asarray(ts, dtype="float64")
+        if not len(ts):
+            return []
+        prices = np.asarray(prices, dtype="float64")
+        sizes = np.zeros(len(ts)) if sizes is None else np.asarray(sizes, dtype="float64")
+        names, codes = np.unique(np.asarray(symbols), return_inverse=True)
+        slots = np.array([self._slot(str(s)) for s in names])[codes]
+        starts = (ts // self.interval).astype(np.int64) * self.interval
+
+        order = np.lexsort((ts, starts, slots))  # By slot, then bar, then arrival time
+        slots, starts, prices, sizes = slots[order], starts[order], prices[order], sizes[order]
+        boundary = np.flatnonzero((np.diff(slots) != 0) | (np.diff(starts) != 0)) + 1
+        first = np.concatenate(([0], boundary))
+        last = np.concatenate((boundary - 1, [len(slots) - 1]))
+
+        highs = np.maximum.reduceat(prices, first)
+        lows = np.minimum.reduceat(prices, first)
+        volumes = np.add.reduceat(sizes, first)
+        counts = last - first + 1
+
+        completed = []
+        for slot, start, o, h, l, c, v, n in zip(slots[first].tolist(), starts[first].tolist(),
+                                                 prices[first].tolist(), highs.tolist(), lows.tolist(),
+                                                 prices[last].tolist(), volumes.tolist(), counts.tolist()):
+            bar = self._merge(slot, start, o, h, l, c, v, n)
+            if bar is not None:
+                completed.append(bar)
+        return completed
+
+    def flush(self, now: float) -> List[Bar]:
+        """Complete every forming bar whose interval ended before `now`."""
+        start = int(now // self.interval) * self.interval
+        due = np.flatnonzero((self._cur_time[:len(self._names)] != NO_BAR)
+                             & (self._cur_time[:len(self._names)] < start))
+        return [self._complete(int(slot)) for slot in due]
+
+    # -----------------------
+    # Reads
+    # -----------------------
+    def _ring_order(self, slot: int, n: Optional[int]) -> np.ndarray:
+        count = int(self._count[slot])
+        n = count if n is None else min(n, count)
+        return (self._head[slot] - n + np.arange(n)) % self.capacity
+
+    def bars(self, symbol: str, n: Optional[int] = None) -> pd.DataFrame:
+        """Last `n` (default all held) completed bars, oldest first, indexed by bar start (UTC)."""
+        slot = self._slots.get(symbol)
+        if slot is None:
+            return pd.DataFrame(columns=[f.capitalize() for f in FIELDS] + ["Ticks"])
+        idx = self._ring_order(slot, n)
+        frame = pd.DataFrame(self._ohlcv[slot][:, idx].T, columns=[f.capitalize() for f in FIELDS],
+                             index=pd.to_datetime(self._time[slot, idx], unit="s", utc=True))
+        frame["Ticks"] = self._ticks[slot, idx]
+        return frame
+
+    def closes(self, symbol: str, n: Optional[int] = None) -> np.ndarray:
+        slot = self._slots.get(symbol)
+        if slot is None:
+            return np.zeros(0)
+        return self._ohlcv[slot, 3, self._ring_order(slot, n)]
+
+    def last_bar(self, symbol: str) -> Optional[Bar]:
+        slot = self._slots.get(symbol)
+        if slot is None or not self._count[slot]:
+            return None
+        i = (self._head[slot] - 1) % self.capacity
+        return Bar(symbol, int(self._time[slot, i]), *self._ohlcv[slot, :, i].tolist(), int(self._ticks[slot, i]))
+
+    def forming_bar(self, symbol: str) -> Optional[Bar]:
+        slot = self._slots.get(symbol)
+        if slot is None or self._cur_time[slot] == NO_BAR:
+            return None
+        return Bar(symbol, int(self._cur_time[slot]), *self._cur[slot].tolist(), int(self._cur_ticks[slot]))
@@ -0,0 +1,209 @@
+# utils/cassette.py
+"""
+Provider Cassettes
+------------------
+
+Record / replay layer for provider calls (Yahoo via yfinance / requests,
+NewsAPI), so tests and timing runs can work offline and deterministically.
+
+Every provider request in the stock advisor goes through
+utils.rate_limiter.RateLimiter.call (data_fetcher, info_cache, NewsAgent), and
+that is where the cassette sits:
+
+- record: the call runs normally (paced and retried) and its final outcome
+  (return value or exception) is written to a gzip-compressed pickle,
+  one file per distinct request.
+- replay: the recorded outcome is returned without touching the network or
+  the rate limiter, after an injected latency. A request that was never
+  recorded raises CassetteMiss.
+- off (default): calls pass straight through.
+
+A request is identified by provider, callable, the ticker behind a yfinance
+object and the call arguments (API keys are scrubbed from the key).
+
+    <cassette_dir>/<provider>/<sha1 of request key>.pkl.gz
+
+Injected latency (PROVIDER_CASSETTE_LATENCY) is a fixed number of milliseconds
+per call, or "recorded" to replay each call's measured duration. stats()
+totals the simulated network time separately from wall time, so benchmarks can
+report pure compute cost and simulated network cost side by side.
+
+Notes:
+- Requests with time-dependent arguments (e.g. the OHLCV cache's delta
+  `start`) only replay from the same cache state. Point OHLCV_CACHE_DIR /
+  STATEMENT_CACHE_DIR at an empty directory, or disable the caches, when
+  recording and replaying.
+- Cassettes are pickles: only replay files you recorded yourself.
+
+Example Usage:
+
+    PROVIDER_CASSETTE=record python -m core.orchestrator      # capture once
+    PROVIDER_CASSETTE=replay PROVIDER_CASSETTE_LATENCY=recorded python -m core.orchestrator
+
+    with use_cassette("replay", "tests/cassettes", latency=0):
+        fetch_ohlcv("AAPL")
+"""
+
+from __future__ import annotations
+
+import contextlib
+import gzip
+import hashlib
+import logging
+import os
+import pickle
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Union
+
+logger = logging.getLogger(__name__)
+logger.setLevel(os.getenv("LOG_LEVEL", "INFO"))
+
+MODES = ("off", "record", "replay")
+PROVIDER_CASSETTE = os.getenv("PROVIDER_CASSETTE", "off").lower()
+PROVIDER_CASSETTE_DIR = os.getenv("PROVIDER_CASSETTE_DIR", os.path.join(".cache", "cassettes"))
+PROVIDER_CASSETTE_LATENCY = os.getenv("PROVIDER_CASSETTE_LATENCY", "0")
+
+# Argument names whose values never go into a request key.
+SECRET_ARGS = {"apikey", "api_key", "appid", "key", "token", "access_key"}
+
+
+class CassetteMiss(LookupError):
+    """Replay mode was asked for a request that was never recorded."""
+
+
+def _describe(value) -> str:
+    """Stable text for one call argument (yfinance objects by ticker, not by id)."""
+    ticker = getattr(value, "ticker", None)
+    if isinstance(ticker, str):
+        return f"{type(value).__name__}({ticker.upper()})"
+    if isinstance(value, dict):
+        return "{" + ", ".join(f"{k!r}: {'***' if str(k).lower() in SECRET_ARGS else _describe(v)}"
+                               for k, v in sorted(value.items(), key=lambda kv: str(kv[0]))) + "}"
+    if isinstance(value, (list, tuple)):
+        return "[" + ", ".join(_describe(v) for v in value) + "]"
+    return repr(value)
+
+
+def request_key(provider: str, fn: Callable, args: tuple, kwargs: dict) -> str:
+    """Human-readable identity of a provider call."""
+    owner = getattr(fn, "__self__", None)
+    name = getattr(fn, "__qualname__", None) or type(fn).__name__
+    module = getattr(fn, "__module__", None)
+    parts = [provider, f"{module}.{name}" if module else name]
+    if owner is not None and not isinstance(owner, type(os)):
+        parts.append(_describe(owner))
+    parts += [_describe(a) for a in args]
+    parts += [f"{k}={'***' if k.lower() in SECRET_ARGS else _describe(v)}" for k, v in sorted(kwargs.items())]
+    return " ".join(parts)
+
+
+class Cassette:
+    """
+    Methods:
+        call(provider, fn, args, kwargs, run): Record, replay or pass through one call.
+        stats(): Counts plus recorded / injected network seconds.
+    """
+
+    def __init__(self, mode: str = "off", path: Optional[str] = None,
+                 latency: Union[str, float, Dict[str, float]] = 0, sleep: Callable[[float], None] = time.sleep):
+        if mode not in MODES:
+            raise ValueError(f"Unknown cassette mode {mode!r}; expected one of {MODES}")
+        self.mode = mode
+        self.path = Path(path or PROVIDER_CASSETTE_DIR)
+        self.latency = latency
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._stats = {"recorded": 0, "replayed": 0, "misses": 0, "network_seconds": 0.0, "injected_seconds": 0.0}
+
+    def _file(self, provider: str, key: str) -> Path:
+        return self.path / provider / f"{hashlib.sha1(key.encode('utf-8')).hexdigest()}.pkl.gz"
+
+    def _delay(self, provider: str, recorded: float) -> float:
+        latency = self.latency
+        if isinstance(latency, dict):
+            latency = latency.get(provider, latency.get("default", 0))
+        if isinstance(latency, str):
+            return recorded if latency == "recorded" else float(latency) / 1000
+        return float(latency) / 1000
+
+    def _bump(self, **increments):
+        with self._lock:
+            for name, value in increments.items():
+                self._stats[name] += value
+
+    def call(self, provider: str, fn: Callable, args: tuple, kwargs: dict, run: Callable[[], Any]):
+        """`run()` performs the real (rate-limited) request."""
+        if self.mode == "off":
+            return run()
+        key = request_key(provider, fn, args, kwargs)
+        path = self._file(provider, key)
+
+        if self.mode == "replay":
+            try:
+                with gzip.open(path, "rb") as f:
+                    entry = pickle.load(f)
+            except FileNotFoundError:
+                self._bump(misses=1)
+                raise CassetteMiss(f"No recording for {key}") from None
+            delay = self._delay(provider, entry.get("elapsed", 0.0))
+            if delay > 0:
+                self._sleep(delay)
+            self._bump(replayed=1, injected_seconds=delay)
+            if "error" in entry:
+                raise entry["error"]
+            return entry["response"]
+
+        started = time.perf_counter()
+        try:
+            response = run()
+            entry = {"key": key, "response": response}
+        except Exception as e:
+            response, entry = e, {"key": key, "error": e}
+        entry["elapsed"] = time.perf_counter() - started
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(path.name + f".{os.getpid()}.{threading.get_ident()}.tmp")
+            with gzip.open(tmp, "wb") as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+            self._bump(recorded=1, network_seconds=entry["elapsed"])
+        except Exception as e:  # Unpicklable responses are passed through unrecorded
+            logger.warning("Could not record %s: %s", key, e)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"mode": self.mode, **self._stats}
+
+
+_cassette: Optional[Cassette] = None
+
+
+def get_cassette() -> Cassette:
+    """Return the process-wide cassette configured by PROVIDER_CASSETTE*."""
+    global _cassette
+    if _cassette is None:
+        _cassette = Cassette(PROVIDER_CASSETTE, PROVIDER_CASSETTE_DIR, PROVIDER_CASSETTE_LATENCY)
+    return _cassette
+
+
+def set_cassette(cassette: Optional[Cassette]) -> Optional[Cassette]:
+    """Install `cassette` process-wide (None = reload from env); returns the previous one."""
+    global _cassette
+    previous, _cassette = _cassette, cassette
+    return previous
+
+
+@contextlib.contextmanager
+def use_cassette(mode: str, path: Optional[str] = None, latency: Union[str, float, Dict[str, float]] = 0):
+    """Temporarily record or replay provider calls."""
+    cassette = Cassette(mode, path, latency)
+    previous = set_cassette(cassette)
+    try:
+        yield cassette
+    finally:
+        set_cassette(previous)
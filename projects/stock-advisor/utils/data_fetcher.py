@@ -12,24 +12,56 @@ pandas DataFrames or simple dictionaries for easy consumption.
 Notes:
 - For production, consider using a paid provider (Polygon, Alpha Vantage) for reliability.
 - Handles errors gracefully and logs exceptions.
+- OHLCV history goes through the on-disk cache in utils.ohlcv_cache, so repeat
+  requests only download bars newer than the last cached one.
+- Financial statements go through utils.statement_cache, keyed by ticker and
+  fiscal period, and are refreshed only when a new filing is expected.
+- Every Yahoo request is paced and retried by the "yahoo" bucket of
+  utils.rate_limiter; bulk (*_many) fetches queue at BATCH priority behind
+  interactive lookups.
+- Intraday and weekly/monthly bars are resampled locally (utils.resample)
+  from one cached base series per symbol instead of separate downloads.
+- Company-name searches are answered by the local index in utils.symbol_index;
+  Yahoo's search endpoint is only called on a miss.
 """
 
 from __future__ import annotations
 
+import contextvars
 import logging
 import os
-from dataclasses import dataclass
-from typing import Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 import pandas as pd
 import yfinance as yf
 import requests
 
+from utils.info_cache import get_info
+from utils.ohlcv_cache import OHLCV_CACHE_ENABLED, get_ohlcv_cache, period_start, window
+from utils.rate_limiter import BATCH, get_rate_limiter, request_priority
+from utils.resample import base_interval, base_period, resample_ohlcv
+from utils.singleflight import coalesce
+from utils.statement_cache import STATEMENT_CACHE_ENABLED, STATEMENTS, YF_ATTRIBUTES, get_statement_cache
+from utils.symbol_index import SYMBOL_INDEX_ENABLED, get_symbol_index
+
 logger = logging.getLogger(__name__)
 logger.setLevel(os.getenv("LOG_LEVEL", "INFO"))
 
 NEWS_API_KEY = os.getenv("NEWS_API_KEY", None)
 
+# .info fields that gate the freshness of fetch_company_info. All static, so the company
+# card is served from the info cache for up to a day (its marketCap may be that old too).
+COMPANY_INFO_FIELDS = [
+    "longName", "shortName", "sector", "industry", "website", "country", "currency",
+    "logo_url", "longBusinessSummary", "shortBusinessSummary",
+]
+
+# Bulk download settings: symbols per yf.download call and concurrent calls in flight.
+YF_BATCH_SIZE = int(os.getenv("YF_BATCH_SIZE", "50"))
+YF_MAX_WORKERS = int(os.getenv("YF_MAX_WORKERS", "4"))
+
 
 @dataclass
 class OHLCRequest:
@@ -40,33 +72,79 @@ class OHLCRequest:
     prepost: bool = False
 
 
-def fetch_ohlcv(req: str | OHLCRequest) -> pd.DataFrame:
+def _download_ohlcv(req: OHLCRequest, start: Optional[pd.Timestamp] = None,
+                    period: Optional[str] = None) -> pd.DataFrame:
+    """
+    Raw yfinance history call. Uses `start` when given (delta refresh),
+    otherwise `period` (defaulting to req.period). Raises on provider errors.
+    """
+    ticker = yf.Ticker(req.ticker)
+    window = {"start": start} if start is not None else {"period": period or req.period}
+    df = get_rate_limiter().call(
+        "yahoo",
+        ticker.history,
+        interval=req.interval,
+        auto_adjust=req.auto_adjust,
+        prepost=req.prepost,
+        **window,
+    )
+    return df.rename(columns=lambda c: c.strip())
+
+
+def _ohlcv_key(req: str | OHLCRequest, use_cache: bool = OHLCV_CACHE_ENABLED) -> tuple:
+    if isinstance(req, str):
+        req = OHLCRequest(ticker=req)
+    return ("fetch_ohlcv", req.ticker.upper(), req.period, req.interval, req.auto_adjust, req.prepost, use_cache)
+
+
+@coalesce(_ohlcv_key)
+def fetch_ohlcv(req: str | OHLCRequest, use_cache: bool = OHLCV_CACHE_ENABLED) -> pd.DataFrame:
     """
     Download OHLCV data using yfinance.
     Accepts either a ticker string or OHLCRequest.
+
+    With `use_cache` (default, disable with OHLCV_CACHE=0) bars are served from
+    the on-disk OHLCV cache and only the missing tail is requested from Yahoo.
+    Concurrent identical requests share one fetch (await fetch_ohlcv.aio(...)
+    from asyncio code).
+
+    Intervals that can be derived from a base resolution (utils.resample:
+    5m bars for intraday targets, 1d bars for 1wk / 1mo) are aggregated
+    locally from the base series, so every timeframe of a symbol shares one
+    cached download. Without the cache the interval is downloaded as asked:
+    a longer base series would be fetched again on every call.
     """
     if isinstance(req, str):
         req = OHLCRequest(ticker=req)
 
+    base = base_interval(req.period, req.interval) if use_cache else req.interval
+    if base != req.interval:
+        bars = window(fetch_ohlcv(replace(req, interval=base, period=base_period(req.period, base)), use_cache),
+                      req.period)
+        logger.debug("Resampled %s %s bars to %s", req.ticker, base, req.interval)
+        return resample_ohlcv(bars, req.interval)
+
     logger.info("Fetching OHLCV for %s (%s @ %s)", req.ticker, req.period, req.interval)
     try:
-        ticker = yf.Ticker(req.ticker)
-        df = ticker.history(
-            period=req.period,
-            interval=req.interval,
-            auto_adjust=req.auto_adjust,
-            prepost=req.prepost,
-        )
+        if use_cache:
+            df = get_ohlcv_cache().get(
+                req.ticker,
+                req.period,
+                req.interval,
+                lambda start, period: _download_ohlcv(req, start, period),
+                auto_adjust=req.auto_adjust,
+                prepost=req.prepost,
+            )
+        else:
+            df = _download_ohlcv(req)
         if df.empty:
             logger.warning("No OHLCV data returned for %s", req.ticker)
-        df = df.rename(columns=lambda c: c.strip())
         return df
     except Exception as e:
         logger.exception("Failed to fetch OHLCV for %s: %s", req.ticker, e)
         return pd.DataFrame()
 
 
-
 def fetch_company_info(ticker: str) -> Dict:
     """
     Fetch basic company metadata using yfinance.
@@ -76,8 +154,7 @@ def fetch_company_info(ticker: str) -> Dict:
     """
     logger.info("Fetching company info for %s", ticker)
     try:
-        t = yf.Ticker(ticker)
-        info = t.info or {}
+        info = get_info(ticker, fields=COMPANY_INFO_FIELDS)
         return {
             "ticker": ticker.upper(),
             "longName": info.get("longName") or info.get("shortName"),
@@ -95,22 +172,34 @@ def fetch_company_info(ticker: str) -> Dict:
         return {"ticker": ticker.upper(), "error": str(e)}
 
 
-def fetch_financials(ticker: str, statements: Optional[list] = None) -> Dict[str, pd.DataFrame]:
+@coalesce(lambda ticker, statements=None, frequency="annual": (
+    "fetch_financials", ticker.upper(), tuple(sorted(statements)) if statements else None, frequency))
+def fetch_financials(ticker: str, statements: Optional[list] = None,
+                     frequency: str = "annual") -> Dict[str, pd.DataFrame]:
     """
     Fetch financial statements (income, balance sheet, cashflow, earnings).
+    Statements are served from the fiscal-period cache in utils.statement_cache
+    and only re-downloaded once a new filing is due. Concurrent identical
+    requests share one fetch.
 
-    Returns a dictionary mapping statement name -> DataFrame.
+    Returns a dictionary mapping statement name -> DataFrame (one column per
+    fiscal period, newest first); `frequency` is "annual" or "quarterly".
     """
     logger.info("Fetching financials for %s", ticker)
+    names = [name for name in STATEMENTS if statements is None or name in statements]
     try:
         t = yf.Ticker(ticker)
-        res = {
-            "financials": t.financials if (statements is None or "financials" in statements) else pd.DataFrame(),
-            "balance_sheet": t.balance_sheet if (statements is None or "balance_sheet" in statements) else pd.DataFrame(),
-            "cashflow": t.cashflow if (statements is None or "cashflow" in statements) else pd.DataFrame(),
-            "earnings": t.earnings if (statements is None or "earnings" in statements) else pd.DataFrame(),
-        }
-        return res
+        limiter = get_rate_limiter()
+        attributes = YF_ATTRIBUTES[frequency]
+
+        def download(wanted):
+            return {name: limiter.call("yahoo", getattr, t, attributes[name]) for name in wanted}
+
+        if STATEMENT_CACHE_ENABLED:
+            fetched = get_statement_cache().get(ticker, download, names, frequency)
+        else:
+            fetched = download(names)
+        return {name: fetched.get(name, pd.DataFrame()) for name in STATEMENTS}
     except Exception as e:
         logger.exception("Failed to fetch financials for %s: %s", ticker, e)
         return {"error": str(e)}
@@ -122,10 +211,9 @@ def fetch_latest_price(ticker: str) -> Optional[float]:
     """
     logger.debug("Fetching latest price for %s", ticker)
     try:
-        t = yf.Ticker(ticker)
-        price = t.info.get("regularMarketPrice") if t.info else None
+        price = get_info(ticker, fields=["regularMarketPrice"]).get("regularMarketPrice")
         if price is None:
-            hist = t.history(period="2d", interval="1d")
+            hist = get_rate_limiter().call("yahoo", yf.Ticker(ticker).history, period="2d", interval="1d")
             if not hist.empty:
                 price = float(hist["Close"].iloc[-1])
         return price
@@ -134,29 +222,235 @@ def fetch_latest_price(ticker: str) -> Optional[float]:
         return None
 
 
-def search_tickers_by_company(name: str, limit: int = 5) -> list:
+# -----------------------
+# Bulk (multi-ticker) fetches
+# -----------------------
+@dataclass
+class BatchResult:
+    """
+    Result of a multi-ticker fetch.
+
+    Attributes:
+        data: Wide DataFrame (OHLCV) or dict keyed by ticker (prices, info, ...).
+        failures (dict): ticker -> error message for symbols that returned nothing.
+    """
+    data: Any
+    failures: Dict[str, str] = field(default_factory=dict)
+
+
+def _normalize_tickers(tickers: Iterable[str]) -> List[str]:
+    """Uppercase, strip and de-duplicate tickers, preserving order."""
+    return list(dict.fromkeys(t.strip().upper() for t in tickers if t and t.strip()))
+
+
+def _chunks(items: List[str], size: int) -> List[List[str]]:
+    size = max(1, size)
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def _download_batch(batch: List[str], period: str, interval: str,
+                    auto_adjust: bool = True, prepost: bool = False) -> Dict[str, pd.DataFrame]:
+    """
+    One yf.download call for a batch of symbols. Returns ticker -> OHLCV frame;
+    symbols the provider had no data for are omitted. Raises on provider errors.
     """
-    Fuzzy search tickers by company name using Yahoo query endpoint.
+    df = get_rate_limiter().call(
+        "yahoo",
+        yf.download,
+        batch,
+        period=period,
+        interval=interval,
+        group_by="ticker",
+        auto_adjust=auto_adjust,
+        prepost=prepost,
+        actions=True,
+        ignore_tz=False,
+        threads=False,
+        progress=False,
+    )
+    if df is None or df.empty:
+        return {}
+    if not isinstance(df.columns, pd.MultiIndex):
+        df.columns = pd.MultiIndex.from_product([[batch[0]], df.columns])
+
+    frames = {}
+    available = set(df.columns.get_level_values(0))
+    for ticker in batch:
+        if ticker not in available:
+            continue
+        sub = df[ticker].dropna(how="all")
+        if not sub.empty:
+            frames[ticker] = sub.rename(columns=lambda c: c.strip())
+    return frames
+
+
+def _run_batches(tickers: List[str], fn: Callable[[List[str]], Dict[str, Any]],
+                 batch_size: int, max_workers: int) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    """
+    Run `fn` over provider-sized batches on a bounded thread pool, at BATCH
+    rate-limiter priority. Returns (results by ticker, failures by ticker).
+    """
+    results: Dict[str, Any] = {}
+    failures: Dict[str, str] = {}
+    batches = _chunks(tickers, batch_size)
+    if not batches:
+        return results, failures
+
+    with request_priority(BATCH), ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(batches)))) as pool:
+        # Pool threads don't inherit context variables; carry the BATCH priority over explicitly.
+        futures = [(batch, pool.submit(contextvars.copy_context().run, fn, batch)) for batch in batches]
+        for batch, future in futures:
+            try:
+                out = future.result()
+            except Exception as e:
+                logger.exception("Batch fetch failed for %s: %s", batch, e)
+                out = {}
+                failures.update({t: str(e) for t in batch})
+            results.update(out)
+            failures.update({t: "No data returned" for t in batch if t not in out and t not in failures})
+    return results, failures
+
+
+def fetch_ohlcv_many(tickers: Iterable[str], period: str = "1y", interval: str = "1d",
+                     auto_adjust: bool = True, prepost: bool = False,
+                     batch_size: int = YF_BATCH_SIZE, max_workers: int = YF_MAX_WORKERS,
+                     use_cache: bool = OHLCV_CACHE_ENABLED) -> BatchResult:
+    """
+    Download OHLCV for many tickers with one yf.download call per batch.
+
+    Fresh series are taken from the OHLCV cache; only the rest hit the network,
+    and what is downloaded is written back to the cache.
+
+    Returns:
+        BatchResult: `data` is a wide DataFrame with (ticker, field) MultiIndex
+        columns; `failures` maps ticker -> reason.
+    """
+    tickers = _normalize_tickers(tickers)
+    logger.info("Fetching OHLCV for %d tickers (%s @ %s)", len(tickers), period, interval)
+    cache = get_ohlcv_cache() if use_cache else None
+
+    frames: Dict[str, pd.DataFrame] = {}
+    if cache is not None:
+        for t in tickers:
+            cached = cache.peek(t, period, interval, auto_adjust, prepost)
+            if cached is not None and not cached.empty:
+                frames[t] = cached
+    pending = [t for t in tickers if t not in frames]
+
+    def download(batch: List[str]) -> Dict[str, pd.DataFrame]:
+        out = _download_batch(batch, period, interval, auto_adjust, prepost)
+        if cache is not None:
+            start = period_start(period)
+            for t, df in out.items():
+                cache.merge(t, interval, df, start, auto_adjust, prepost)
+        return out
+
+    downloaded, failures = _run_batches(pending, download, batch_size, max_workers)
+    frames.update(downloaded)
+    if failures:
+        logger.warning("No OHLCV data for %d of %d tickers", len(failures), len(tickers))
+
+    ordered = [t for t in tickers if t in frames]
+    data = pd.concat([frames[t] for t in ordered], axis=1, keys=ordered) if ordered else pd.DataFrame()
+    return BatchResult(data=data, failures=failures)
+
+
+def fetch_latest_prices(tickers: Iterable[str], batch_size: int = YF_BATCH_SIZE,
+                        max_workers: int = YF_MAX_WORKERS) -> BatchResult:
+    """
+    Latest close for many tickers, one yf.download call per batch instead of a
+    `.info` lookup per symbol.
+
+    Returns:
+        BatchResult: `data` maps ticker -> float; `failures` maps ticker -> reason.
+    """
+    tickers = _normalize_tickers(tickers)
+    logger.info("Fetching latest prices for %d tickers", len(tickers))
+
+    def download(batch: List[str]) -> Dict[str, float]:
+        prices = {}
+        for t, df in _download_batch(batch, period="5d", interval="1d").items():
+            close = df["Close"].dropna() if "Close" in df.columns else pd.Series(dtype=float)
+            if not close.empty:
+                prices[t] = float(close.iloc[-1])
+        return prices
+
+    prices, failures = _run_batches(tickers, download, batch_size, max_workers)
+    return BatchResult(data={t: prices[t] for t in tickers if t in prices}, failures=failures)
+
+
+def _fetch_each(tickers: Iterable[str], fn: Callable[[str], Dict], max_workers: int) -> BatchResult:
+    """Per-symbol fetches (no bulk endpoint) on a bounded thread pool."""
+    tickers = _normalize_tickers(tickers)
+
+    def run(batch: List[str]) -> Dict[str, Dict]:
+        out = fn(batch[0])
+        if "error" in out:
+            raise RuntimeError(out["error"])
+        return {batch[0]: out}
+
+    data, failures = _run_batches(tickers, run, batch_size=1, max_workers=max_workers)
+    return BatchResult(data={t: data[t] for t in tickers if t in data}, failures=failures)
+
+
+def fetch_company_info_many(tickers: Iterable[str], max_workers: int = YF_MAX_WORKERS) -> BatchResult:
+    """Company metadata for many tickers. `data` maps ticker -> info dict."""
+    return _fetch_each(tickers, fetch_company_info, max_workers)
+
+
+def fetch_financials_many(tickers: Iterable[str], max_workers: int = YF_MAX_WORKERS,
+                          frequency: str = "annual") -> BatchResult:
+    """Financial statements for many tickers. `data` maps ticker -> statements dict."""
+    return _fetch_each(tickers, lambda ticker: fetch_financials(ticker, frequency=frequency), max_workers)
+
+
+def _search_remote(name: str, limit: int) -> list:
+    """Yahoo query endpoint search. Raises on provider errors."""
+    url = "https://query2.finance.yahoo.com/v1/finance/search"
+    params = {"q": name, "quotesCount": limit, "newsCount": 0}
+    r = get_rate_limiter().call("yahoo", requests.get, url, params=params, timeout=10)
+    r.raise_for_status()
+    quotes = r.json().get("quotes", [])[:limit]
+    results = []
+    for q in quotes:
+        results.append({
+            "symbol": q.get("symbol"),
+            "shortname": q.get("shortname") or q.get("longname"),
+            "exch": q.get("exchDisp"),
+            "type": q.get("quoteType"),
+        })
+    return results
+
+
+def search_tickers_by_company(name: str, limit: int = 5, remote: bool = True) -> list:
+    """
+    Fuzzy search tickers by company name.
+
+    Answers from the local symbol index (utils.symbol_index) when it has an
+    exact or prefix match, and otherwise calls the Yahoo query endpoint; remote
+    hits are added to the local index. Trigram fuzzy matches from the index are
+    only returned when the remote search is off (`remote=False`, which never
+    leaves the process), fails or finds nothing.
 
     Returns a list of dicts with keys:
     ['symbol', 'shortname', 'exch', 'type']
     """
+    index = get_symbol_index() if SYMBOL_INDEX_ENABLED else None
+    if index is not None:
+        results = index.search(name, limit, fuzzy=not remote)
+        if results or not remote:
+            return results
+    elif not remote:
+        return []
+
     logger.info("Searching tickers for company name: %s", name)
     try:
-        url = "https://query2.finance.yahoo.com/v1/finance/search"
-        params = {"q": name, "quotesCount": limit, "newsCount": 0}
-        r = requests.get(url, params=params, timeout=10)
-        r.raise_for_status()
-        quotes = r.json().get("quotes", [])[:limit]
-        results = []
-        for q in quotes:
-            results.append({
-                "symbol": q.get("symbol"),
-                "shortname": q.get("shortname") or q.get("longname"),
-                "exch": q.get("exchDisp"),
-                "type": q.get("quoteType"),
-            })
-        return results
+        results = _search_remote(name, limit)
     except Exception as e:
         logger.exception("Ticker search failed for %s: %s", name, e)
-        return []
+        results = []
+    if not results:
+        return index.search(name, limit) if index is not None else []
+    if index is not None:
+        index.learn(name, results)
+    return results
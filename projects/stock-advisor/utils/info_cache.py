@@ -0,0 +1,150 @@
+# utils/info_cache.py
+"""
+Info Cache
+----------
+
+Process-wide, size-bounded LRU + TTL cache for yfinance `Ticker.info` payloads.
+
+`.info` is one of the slowest Yahoo calls, and the same symbol is looked up
+over and over (company card, latest price, chat tool calls). Each cached
+payload remembers when it was fetched; a lookup names the fields it needs and
+is served from memory as long as the payload is younger than the strictest
+freshness among those fields:
+
+- quote fields (prices, day range, volume, market cap, ...) -> INFO_PRICE_TTL (15s)
+- everything else (name, sector, summary, currency, ...)    -> INFO_STATIC_TTL (1 day)
+
+Example Usage:
+
+    from utils.info_cache import get_info
+
+    info = get_info("AAPL", fields=["longName", "sector"])   # cached for a day
+    price = get_info("AAPL", fields=["regularMarketPrice"])  # re-fetched after 15s
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Iterable, Optional
+
+import yfinance as yf
+
+from utils.rate_limiter import get_rate_limiter
+
+logger = logging.getLogger(__name__)
+logger.setLevel(os.getenv("LOG_LEVEL", "INFO"))
+
+INFO_CACHE_SIZE = int(os.getenv("INFO_CACHE_SIZE", "2048"))
+INFO_STATIC_TTL = float(os.getenv("INFO_STATIC_TTL", str(24 * 3600)))
+INFO_PRICE_TTL = float(os.getenv("INFO_PRICE_TTL", "15"))
+
+# Quote fields that move intraday; everything else in .info is treated as static.
+PRICE_FIELDS = {
+    "currentPrice", "previousClose", "open", "dayLow", "dayHigh", "volume",
+    "averageVolume", "averageVolume10days", "bid", "ask", "bidSize", "askSize",
+    "marketCap", "enterpriseValue", "trailingPE", "forwardPE", "priceToBook",
+    "fiftyDayAverage", "twoHundredDayAverage", "fiftyTwoWeekLow", "fiftyTwoWeekHigh",
+    "dividendYield", "beta",
+}
+PRICE_FIELD_PREFIXES = ("regularMarket", "preMarket", "postMarket")
+
+
+def field_ttl(name: str) -> float:
+    """Freshness (seconds) for a single .info field."""
+    if name in PRICE_FIELDS or name.startswith(PRICE_FIELD_PREFIXES):
+        return INFO_PRICE_TTL
+    return INFO_STATIC_TTL
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache whose entries also expire after a TTL.
+
+    Stats (hits, misses, evictions) are kept for monitoring.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()  # key -> (stored_at, expires_at, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_entry(self, key: Hashable, max_age: Optional[float] = None) -> Optional[tuple]:
+        """Return (stored_at, value) if present, unexpired and younger than max_age."""
+        now = time.time()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[1] <= now or (max_age is not None and now - entry[0] >= max_age):
+                if entry is not None and entry[1] <= now:
+                    del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0], entry[2]
+
+    def get(self, key: Hashable, default=None, max_age: Optional[float] = None):
+        entry = self.get_entry(key, max_age)
+        return default if entry is None else entry[1]
+
+    def set(self, key: Hashable, value, ttl: Optional[float] = None):
+        now = time.time()
+        with self._lock:
+            self._data[key] = (now, now + (self.ttl if ttl is None else ttl), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], object], ttl: Optional[float] = None,
+                    max_age: Optional[float] = None):
+        entry = self.get_entry(key, max_age)
+        if entry is not None:
+            return entry[1]
+        value = loader()
+        self.set(key, value, ttl)
+        return value
+
+    def invalidate(self, key: Optional[Hashable] = None):
+        with self._lock:
+            if key is None:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self) -> Dict[str, int]:
+        return {"size": len(self), "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+
+_info_cache = TTLCache(maxsize=INFO_CACHE_SIZE, ttl=INFO_STATIC_TTL)
+
+
+def get_info_cache() -> TTLCache:
+    """Return the process-wide .info cache."""
+    return _info_cache
+
+
+def get_info(ticker: str, fields: Optional[Iterable[str]] = None) -> Dict:
+    """
+    Return `yf.Ticker(ticker).info`, served from cache while every requested field
+    is still fresh. With no `fields`, the quote freshness (strictest) applies.
+    Raises whatever yfinance raises on provider errors.
+    """
+    key = ticker.upper()
+    max_age = min((field_ttl(f) for f in fields), default=INFO_PRICE_TTL) if fields else INFO_PRICE_TTL
+    info = _info_cache.get(key, max_age=max_age)
+    if info is None:
+        logger.debug("Info cache miss for %s (max_age=%ss)", key, max_age)
+        info = get_rate_limiter().call("yahoo", getattr, yf.Ticker(key), "info") or {}
+        _info_cache.set(key, info)
+    return info
@@ -0,0 +1,349 @@
+# utils/ohlcv_cache.py
+"""
+OHLCV Cache
+-----------
+
+Persistent, per-ticker/per-interval columnar store for OHLCV bars.
+
+Each (ticker, interval) series lives in its own directory as a single NumPy
+structured array (one int64 UTC-nanosecond timestamp field plus one float64
+field per OHLCV column) and a small JSON sidecar:
+
+    <cache_dir>/<TICKER>/<interval>[-raw][-prepost]/
+        bars.npy    # memory-mapped on read
+        meta.json   # columns, tz, covers_from, fetched_at
+
+On a request the cache:
+- serves straight from disk while the series is within the freshness window
+  configured for its interval,
+- otherwise asks the provider only for the tail after the last stored bar and
+  merges it in (the last bar is re-fetched because it may have been partial),
+- falls back to a full download when the cache does not reach back far enough
+  for the requested period, or when the delta contains a dividend/split (which
+  re-bases auto-adjusted history).
+
+Cache hits and downloads are cut to the period the same way (window()), the
+way the provider counts it: "Nd" is the last N trading sessions (so "1d" on a
+weekend is Friday's session), longer periods are calendar spans.
+
+Notes:
+- The provider call is injected, so this module has no yfinance dependency.
+- Writes go through a temp file + os.replace, with the data written before the
+  metadata, so concurrent readers (threads or worker processes) never see a
+  torn file.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+logger.setLevel(os.getenv("LOG_LEVEL", "INFO"))
+
+OHLCV_CACHE_DIR = os.getenv("OHLCV_CACHE_DIR", os.path.join(".cache", "ohlcv"))
+OHLCV_CACHE_ENABLED = os.getenv("OHLCV_CACHE", "1") != "0"
+
+# How long a cached series is served without asking the provider for new bars.
+DEFAULT_FRESHNESS: Dict[str, timedelta] = {
+    "1m": timedelta(minutes=1),
+    "2m": timedelta(minutes=2),
+    "5m": timedelta(minutes=5),
+    "15m": timedelta(minutes=15),
+    "30m": timedelta(minutes=30),
+    "60m": timedelta(hours=1),
+    "90m": timedelta(minutes=90),
+    "1h": timedelta(hours=1),
+    "1d": timedelta(hours=1),
+    "5d": timedelta(hours=6),
+    "1wk": timedelta(hours=12),
+    "1mo": timedelta(days=1),
+    "3mo": timedelta(days=1),
+}
+
+_PERIOD_RE = re.compile(r"^(\d+)(d|wk|mo|y)$")
+_PERIOD_UNITS = {"d": "days", "wk": "weeks", "mo": "months", "y": "years"}
+
+# Callable(start, period) -> DataFrame; exactly one of start/period is set.
+# Should raise on provider errors and return an empty frame when there are no bars.
+Downloader = Callable[[Optional[pd.Timestamp], Optional[str]], pd.DataFrame]
+
+
+def period_start(period: str, now: Optional[pd.Timestamp] = None) -> Optional[pd.Timestamp]:
+    """
+    Translate a yfinance period string ("5d", "6mo", "1y", "ytd", "max") into
+    the earliest UTC timestamp it covers. Returns None for "max".
+    """
+    now = now if now is not None else pd.Timestamp.now(tz="UTC")
+    if period == "max":
+        return None
+    if period == "ytd":
+        return pd.Timestamp(year=now.year, month=1, day=1, tz="UTC")
+    m = _PERIOD_RE.match(period)
+    if not m:
+        raise ValueError(f"Unsupported period: {period!r}")
+    n, unit = int(m.group(1)), m.group(2)
+    return now - pd.DateOffset(**{_PERIOD_UNITS[unit]: n})
+
+
+def period_sessions(period: str) -> Optional[int]:
+    """Number of trading sessions in a "<N>d" period; None for calendar periods."""
+    m = _PERIOD_RE.match(period)
+    return int(m.group(1)) if m and m.group(2) == "d" else None
+
+
+def window(df: pd.DataFrame, period: str, now: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+    """
+    Bars of a sorted series that fall in `period`: the last N sessions (dates in
+    the index time zone) for "<N>d" periods, else everything since period_start.
+    """
+    if df.empty:
+        return df
+    sessions = period_sessions(period)
+    if sessions is not None:
+        days = df.index.normalize()
+        first = days.unique()[-sessions:][0]
+        return df[days >= first]
+    start = period_start(period, now)
+    return df if start is None else df[df.index >= start]
+
+
+def atomic_write(path: Path, write: Callable) -> None:
+    """Call write(f) on a temp file next to `path`, then os.replace it into place."""
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+class OHLCVCache:
+    """
+    On-disk OHLCV store with incremental delta refresh.
+
+    Methods:
+        get(ticker, period, interval, download, ...): Cached-or-refreshed bars.
+        peek(ticker, period, interval, ...): Fresh cached bars or None, no network.
+        load(ticker, interval, ...): Raw cached bars and metadata, no network.
+        store(ticker, interval, df, covers_from, ...): Persist a series.
+        merge(ticker, interval, df, covers_from, ...): Persist a download without losing older cached bars.
+        invalidate(ticker, interval): Drop cached series.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, freshness: Optional[Dict[str, timedelta]] = None):
+        self.cache_dir = Path(cache_dir or OHLCV_CACHE_DIR)
+        self.freshness = dict(DEFAULT_FRESHNESS)
+        if freshness:
+            self.freshness.update(freshness)
+
+    # -----------------------
+    # Storage
+    # -----------------------
+    def _series_dir(self, ticker: str, interval: str, auto_adjust: bool = True, prepost: bool = False) -> Path:
+        name = interval + ("" if auto_adjust else "-raw") + ("-prepost" if prepost else "")
+        return self.cache_dir / ticker.upper() / name
+
+    def load(self, ticker: str, interval: str, auto_adjust: bool = True,
+             prepost: bool = False) -> Tuple[pd.DataFrame, Optional[Dict]]:
+        """
+        Read a cached series without touching the network.
+        Returns (DataFrame, meta) or (empty DataFrame, None) on a miss.
+        """
+        series_dir = self._series_dir(ticker, interval, auto_adjust, prepost)
+        try:
+            with open(series_dir / "meta.json", "r") as f:
+                meta = json.load(f)
+            bars = np.load(series_dir / "bars.npy", mmap_mode="r")
+        except (OSError, ValueError) as e:
+            if not isinstance(e, FileNotFoundError):
+                logger.warning("Unreadable OHLCV cache for %s @ %s: %s", ticker, interval, e)
+            return pd.DataFrame(), None
+
+        index = pd.to_datetime(np.asarray(bars["ts"]), utc=True)
+        index = index.tz_convert(meta["tz"]) if meta.get("tz") else index.tz_localize(None)
+        df = pd.DataFrame({col: np.asarray(bars[col]) for col in meta["columns"]}, index=index)
+        df.index.name = meta.get("index_name")
+        return df, meta
+
+    def store(self, ticker: str, interval: str, df: pd.DataFrame, covers_from: Optional[pd.Timestamp],
+              auto_adjust: bool = True, prepost: bool = False, fetched_at: Optional[float] = None) -> None:
+        """
+        Persist a full series. `covers_from` is the earliest timestamp the provider
+        was asked for (None for full history), used to decide whether a later
+        request for a longer period can be served from this series.
+        """
+        series_dir = self._series_dir(ticker, interval, auto_adjust, prepost)
+        series_dir.mkdir(parents=True, exist_ok=True)
+
+        columns = [c for c in df.columns if pd.api.types.is_numeric_dtype(df[c])]
+        index = pd.DatetimeIndex(df.index)
+        tz = str(index.tz) if index.tz is not None else None
+        utc = index.tz_convert("UTC") if index.tz is not None else index.tz_localize("UTC")
+
+        bars = np.empty(len(df), dtype=[("ts", "<i8")] + [(c, "<f8") for c in columns])
+        bars["ts"] = utc.as_unit("ns").asi8
+        for c in columns:
+            bars[c] = df[c].to_numpy(dtype="float64", na_value=np.nan)
+
+        meta = {
+            "ticker": ticker.upper(),
+            "interval": interval,
+            "columns": columns,
+            "tz": tz,
+            "index_name": df.index.name,
+            "covers_from": None if covers_from is None else int(covers_from.value),
+            "fetched_at": fetched_at if fetched_at is not None else time.time(),
+        }
+
+        # Data first, then metadata: a reader that sees the new meta also sees the new bars.
+        atomic_write(series_dir / "bars.npy", lambda f: np.save(f, bars))
+        self._write_meta(series_dir, meta)
+
+    def merge(self, ticker: str, interval: str, df: pd.DataFrame, covers_from: Optional[pd.Timestamp],
+              auto_adjust: bool = True, prepost: bool = False) -> None:
+        """
+        Persist bars downloaded outside get() (e.g. by a bulk download) for
+        `covers_from` onwards. When they overlap the cached series they replace
+        its tail, like a delta refresh, and the series keeps its older coverage,
+        so a short download never truncates a longer cached history.
+        """
+        if df.empty:
+            return
+        cached, meta = self.load(ticker, interval, auto_adjust, prepost)
+        old_from = self._covers_from(meta) if meta is not None else covers_from
+        longer = meta is not None and not cached.empty and (
+            old_from is None or (covers_from is not None and old_from < covers_from))
+        # Contiguous with the cached bars, and no dividend/split re-basing the adjusted history.
+        if longer and df.index[0] <= cached.index[-1] and not self._rebases_history(df, cached.index[-1]):
+            df = pd.concat([cached[cached.index < df.index[0]], df.reindex(columns=cached.columns)])
+            df = df[~df.index.duplicated(keep="last")].sort_index()
+            covers_from = old_from
+        self.store(ticker, interval, df, covers_from, auto_adjust, prepost)
+
+    def _write_meta(self, series_dir: Path, meta: Dict) -> None:
+        atomic_write(series_dir / "meta.json", lambda f: f.write(json.dumps(meta).encode()))
+
+    def invalidate(self, ticker: str, interval: Optional[str] = None) -> None:
+        """Remove cached data for a ticker (all intervals if interval is None)."""
+        root = self.cache_dir / ticker.upper()
+        targets = [p for p in root.glob("*") if interval is None or p.name.split("-")[0] == interval]
+        for series_dir in targets:
+            for f in series_dir.iterdir():
+                f.unlink()
+            series_dir.rmdir()
+
+    # -----------------------
+    # Refresh policy
+    # -----------------------
+    def is_fresh(self, meta: Dict, interval: str, now: Optional[float] = None) -> bool:
+        """True when the series was refreshed within the interval's freshness window."""
+        max_age = self.freshness.get(interval, timedelta(0))
+        now = now if now is not None else time.time()
+        return now - meta.get("fetched_at", 0) < max_age.total_seconds()
+
+    @staticmethod
+    def _covers(meta: Dict, period: str, cached: pd.DataFrame, now: Optional[pd.Timestamp] = None) -> bool:
+        covers_from = meta.get("covers_from")
+        if covers_from is None:
+            return True
+        sessions = period_sessions(period)
+        if sessions is not None:
+            # The series is contiguous from covers_from, so N stored sessions include the last N.
+            return cached.index.normalize().nunique() >= sessions
+        start = period_start(period, now)
+        return start is not None and covers_from <= start.value
+
+    @staticmethod
+    def _rebases_history(delta: pd.DataFrame, last_ts: pd.Timestamp) -> bool:
+        new = delta[delta.index > last_ts]
+        for col in ("Dividends", "Stock Splits"):
+            if col in new.columns and (new[col].fillna(0) != 0).any():
+                return True
+        return False
+
+    def peek(self, ticker: str, period: str, interval: str, auto_adjust: bool = True,
+             prepost: bool = False) -> Optional[pd.DataFrame]:
+        """
+        Return the cached window for `period` if it is fresh and long enough,
+        else None. Never touches the network (used by batch downloads).
+        """
+        cached, meta = self.load(ticker, interval, auto_adjust, prepost)
+        if meta is None or cached.empty or not self._covers(meta, period, cached) or not self.is_fresh(meta, interval):
+            return None
+        return window(cached, period)
+
+    def get(self, ticker: str, period: str, interval: str, download: Downloader,
+            auto_adjust: bool = True, prepost: bool = False) -> pd.DataFrame:
+        """
+        Return bars for `period` @ `interval`, downloading only what the cache lacks.
+        """
+        now = pd.Timestamp.now(tz="UTC")
+        start = period_start(period, now)
+        cached, meta = self.load(ticker, interval, auto_adjust, prepost)
+
+        if meta is None or cached.empty or not self._covers(meta, period, cached, now):
+            logger.info("OHLCV cache miss for %s @ %s (%s); full download", ticker, interval, period)
+            return self._full_refresh(ticker, period, interval, start, download, auto_adjust, prepost)
+
+        if self.is_fresh(meta, interval):
+            logger.debug("OHLCV cache hit for %s @ %s", ticker, interval)
+            return window(cached, period, now)
+
+        last_ts = cached.index[-1]
+        logger.info("OHLCV cache stale for %s @ %s; fetching bars since %s", ticker, interval, last_ts)
+        try:
+            delta = download(last_ts, None)
+        except Exception as e:
+            logger.warning("Delta refresh failed for %s @ %s, serving cached bars: %s", ticker, interval, e)
+            return window(cached, period, now)
+
+        if delta.empty:
+            # Provider answered with nothing new (e.g. market closed): just re-stamp freshness.
+            self._write_meta(self._series_dir(ticker, interval, auto_adjust, prepost),
+                             dict(meta, fetched_at=time.time()))
+            return window(cached, period, now)
+
+        if self._rebases_history(delta, last_ts):
+            logger.info("Corporate action in delta for %s; refetching full history", ticker)
+            return self._full_refresh(ticker, period, interval, start, download, auto_adjust, prepost)
+
+        delta = delta.reindex(columns=cached.columns)
+        merged = pd.concat([cached[cached.index < delta.index[0]], delta])
+        merged = merged[~merged.index.duplicated(keep="last")].sort_index()
+        self.store(ticker, interval, merged, self._covers_from(meta), auto_adjust, prepost)
+        return window(merged, period, now)
+
+    @staticmethod
+    def _covers_from(meta: Dict) -> Optional[pd.Timestamp]:
+        value = meta.get("covers_from")
+        return None if value is None else pd.Timestamp(value, tz="UTC")
+
+    def _full_refresh(self, ticker, period, interval, start, download, auto_adjust, prepost) -> pd.DataFrame:
+        df = download(None, period)
+        if not df.empty:
+            self.store(ticker, interval, df, start, auto_adjust, prepost)
+        return window(df, period)
+
+_default_cache: Optional[OHLCVCache] = None
+
+
+def get_ohlcv_cache() -> OHLCVCache:
+    """Return the process-wide OHLCVCache rooted at OHLCV_CACHE_DIR."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = OHLCVCache()
+    return _default_cache
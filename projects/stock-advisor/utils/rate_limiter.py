@@ -0,0 +1,344 @@
+# utils/rate_limiter.py
+"""
+Provider Rate Limiter
+---------------------
+
+Process-wide, provider-aware pacing and retry for every external data call
+(Yahoo Finance, NewsAPI, Serper, SerpAPI, OpenWeatherMap, ExchangeRate).
+
+- One token bucket per provider keeps the request rate at the provider's
+  ceiling; bursts up to the bucket size go out immediately.
+- Callers waiting for a token are served by priority, then arrival order:
+  INTERACTIVE requests (a user waiting on a page or chat answer) jump ahead of
+  BATCH jobs (screener, bulk prefetch).
+- 429 / 502 / 503 / 504 responses, rate-limit exceptions and connection errors
+  are retried with jittered exponential backoff. A Retry-After header is
+  honoured and pauses the whole provider bucket, so other callers don't keep
+  hammering a provider that just pushed back.
+- After the last retry the final response is returned (so the caller's
+  raise_for_status() reports it) or the final exception is re-raised.
+- Calls can be recorded to / replayed from disk with utils.cassette
+  (PROVIDER_CASSETTE=record|replay).
+
+Limits are "rate,burst" (requests per second, bucket size) and can be
+overridden per provider with RATE_LIMIT_<PROVIDER>, e.g. RATE_LIMIT_YAHOO=4,10.
+A rate of 0 disables pacing for that provider (retries still apply).
+
+Example Usage:
+
+    from utils.rate_limiter import BATCH, get_rate_limiter, request_priority
+
+    limiter = get_rate_limiter()
+    r = limiter.call("newsapi", requests.get, url, params=params, timeout=10)
+
+    with request_priority(BATCH):       # everything inside queues behind interactive calls
+        df = limiter.call("yahoo", yf.download, tickers, period="1y")
+"""
+
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import email.utils
+import heapq
+import itertools
+import logging
+import os
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import requests
+
+from utils.cassette import get_cassette
+
+logger = logging.getLogger(__name__)
+logger.setLevel(os.getenv("LOG_LEVEL", "INFO"))
+
+INTERACTIVE = 0
+BATCH = 10
+
+# (requests per second, burst) per provider; conservative defaults for free tiers.
+DEFAULT_LIMITS: Dict[str, Tuple[float, float]] = {
+    "yahoo": (2.0, 5),
+    "newsapi": (1.0, 5),
+    "serper": (5.0, 10),
+    "serpapi": (1.0, 5),
+    "openweathermap": (1.0, 10),
+    "exchangerate": (1.0, 5),
+}
+FALLBACK_LIMIT = (1.0, 5)
+
+RATE_LIMIT_MAX_RETRIES = int(os.getenv("RATE_LIMIT_MAX_RETRIES", "4"))
+RATE_LIMIT_BACKOFF_BASE = float(os.getenv("RATE_LIMIT_BACKOFF_BASE", "0.5"))
+RATE_LIMIT_BACKOFF_CAP = float(os.getenv("RATE_LIMIT_BACKOFF_CAP", "30"))
+
+RETRY_STATUSES = {429, 502, 503, 504}
+# Raised by yfinance when Yahoo throttles; matched by name so older yfinance versions work too.
+RATE_LIMIT_EXCEPTIONS = {"YFRateLimitError", "RateLimitError", "TooManyRequests"}
+
+_priority: contextvars.ContextVar[int] = contextvars.ContextVar("request_priority", default=INTERACTIVE)
+
+
+class RateLimitTimeout(TimeoutError):
+    """No token became available within the caller's max_wait."""
+
+
+def provider_limit(provider: str) -> Tuple[float, float]:
+    """(rate, burst) for a provider, honouring RATE_LIMIT_<PROVIDER> overrides."""
+    override = os.getenv(f"RATE_LIMIT_{provider.upper()}")
+    if override:
+        rate, _, burst = override.partition(",")
+        return float(rate), float(burst or DEFAULT_LIMITS.get(provider, FALLBACK_LIMIT)[1])
+    return DEFAULT_LIMITS.get(provider, FALLBACK_LIMIT)
+
+
+@contextlib.contextmanager
+def request_priority(level: int):
+    """Run the enclosed calls (including asyncio.to_thread work) at `level`."""
+    token = _priority.set(level)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def set_priority(level: int):
+    """Set the priority for the current context, e.g. once in a batch worker process."""
+    _priority.set(level)
+
+
+def current_priority() -> int:
+    return _priority.get()
+
+
+def parse_retry_after(value) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)."""
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(str(value))
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+def backoff_delay(attempt: int, retry_after: Optional[float] = None,
+                  base: float = RATE_LIMIT_BACKOFF_BASE, cap: float = RATE_LIMIT_BACKOFF_CAP) -> float:
+    """
+    Full-jitter exponential backoff: uniform(0, min(cap, base * 2**attempt)).
+    With a Retry-After, wait at least that long plus a little jitter so clients
+    released together don't all retry at the same instant.
+    """
+    if retry_after is not None:
+        return retry_after + random.uniform(0, base)
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def retry_hint(outcome) -> Tuple[bool, Optional[float]]:
+    """
+    Classify a response or exception: (should_retry, retry_after_seconds).
+    """
+    response = outcome if isinstance(outcome, requests.Response) else getattr(outcome, "response", None)
+    status = getattr(response, "status_code", None)
+    if isinstance(status, int):
+        if status in RETRY_STATUSES:
+            return True, parse_retry_after(response.headers.get("Retry-After"))
+        return False, None
+    if isinstance(outcome, BaseException):
+        if isinstance(outcome, (requests.ConnectionError, requests.Timeout)):
+            return True, None
+        if type(outcome).__name__ in RATE_LIMIT_EXCEPTIONS or "Too Many Requests" in str(outcome):
+            return True, None
+    return False, None
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket whose waiters are served in (priority, arrival) order.
+
+    Stats: granted (tokens handed out), waited (total seconds callers spent
+    queued), throttled (retryable pushback seen), retries, paused_until.
+    """
+
+    def __init__(self, rate: float, burst: float = 1):
+        self.rate = rate
+        self.capacity = max(1.0, float(burst))
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._cond = threading.Condition()
+        self._waiters: list = []
+        self._seq = itertools.count()
+        self.granted = 0
+        self.waited = 0.0
+        self.throttled = 0
+        self.retries = 0
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, priority: int = INTERACTIVE, timeout: Optional[float] = None) -> float:
+        """Block until a token is granted; returns the seconds spent waiting."""
+        start = time.monotonic()
+        if self.rate <= 0 and start >= self._paused_until:
+            with self._cond:
+                self.granted += 1
+            return 0.0
+
+        deadline = None if timeout is None else start + timeout
+        ticket = (priority, next(self._seq))
+        with self._cond:
+            heapq.heappush(self._waiters, ticket)
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    head = self._waiters[0] == ticket
+                    ready = now >= self._paused_until and (self.rate <= 0 or self.tokens >= 1)
+                    if head and ready:
+                        heapq.heappop(self._waiters)
+                        if self.rate > 0:
+                            self.tokens -= 1
+                        self.granted += 1
+                        self.waited += now - start
+                        self._cond.notify_all()
+                        return now - start
+
+                    delay = None
+                    if head:
+                        refill = (1 - self.tokens) / self.rate if self.rate > 0 else 0.0
+                        delay = max(self._paused_until - now, refill, 0.001)
+                    if deadline is not None:
+                        if now >= deadline:
+                            raise RateLimitTimeout(f"No token within {timeout}s")
+                        delay = deadline - now if delay is None else min(delay, deadline - now)
+                    self._cond.wait(delay)
+            except BaseException:
+                if ticket in self._waiters:
+                    self._waiters.remove(ticket)
+                    heapq.heapify(self._waiters)
+                    self._cond.notify_all()
+                raise
+
+    def pause(self, seconds: float):
+        """Hold every waiter for `seconds` (provider asked us to back off)."""
+        with self._cond:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._cond.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "rate": self.rate,
+                "burst": self.capacity,
+                "granted": self.granted,
+                "queued": len(self._waiters),
+                "waited": round(self.waited, 3),
+                "throttled": self.throttled,
+                "retries": self.retries,
+            }
+
+
+class RateLimiter:
+    """Per-provider token buckets plus a retry loop around each provider call."""
+
+    def __init__(self, limits: Optional[Dict[str, Tuple[float, float]]] = None,
+                 max_retries: int = RATE_LIMIT_MAX_RETRIES, backoff_base: float = RATE_LIMIT_BACKOFF_BASE,
+                 backoff_cap: float = RATE_LIMIT_BACKOFF_CAP, sleep: Callable[[float], None] = time.sleep):
+        self.limits = dict(limits or {})
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self._sleep = sleep
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, provider: str) -> TokenBucket:
+        with self._lock:
+            bucket = self._buckets.get(provider)
+            if bucket is None:
+                rate, burst = self.limits.get(provider) or provider_limit(provider)
+                bucket = self._buckets[provider] = TokenBucket(rate, burst)
+            return bucket
+
+    def scale(self, factor: float):
+        """
+        Scale every provider's rate, e.g. by 1/N in each of N worker processes so
+        the pool as a whole stays under the provider ceiling.
+        """
+        for provider in set(DEFAULT_LIMITS) | set(self.limits):
+            bucket = self.bucket(provider)
+            with bucket._cond:
+                bucket.rate *= factor
+                bucket.capacity = max(1.0, bucket.capacity * factor)
+                bucket.tokens = min(bucket.tokens, bucket.capacity)
+
+    def call(self, provider: str, fn: Callable, *args, priority: Optional[int] = None,
+             max_wait: Optional[float] = None, **kwargs):
+        """
+        Run fn(*args, **kwargs) once a `provider` token is available, retrying
+        throttled / transient failures. `priority` defaults to the context's
+        (see request_priority); `max_wait` bounds each wait for a token.
+
+        Under a record / replay cassette (utils.cassette) the outcome is captured
+        or served from disk; replayed calls skip pacing entirely.
+        """
+        return get_cassette().call(provider, fn, args, kwargs,
+                                   lambda: self._call(provider, fn, args, kwargs, priority, max_wait))
+
+    def _call(self, provider: str, fn: Callable, args: tuple, kwargs: dict,
+              priority: Optional[int], max_wait: Optional[float]):
+        bucket = self.bucket(provider)
+        priority = current_priority() if priority is None else priority
+        for attempt in range(self.max_retries + 1):
+            bucket.acquire(priority, timeout=max_wait)
+            try:
+                outcome = fn(*args, **kwargs)
+            except Exception as e:
+                outcome = e
+            retry, retry_after = retry_hint(outcome)
+            if not retry:
+                if isinstance(outcome, Exception):
+                    raise outcome
+                return outcome
+
+            with bucket._cond:
+                bucket.throttled += 1
+            if attempt == self.max_retries or (retry_after is not None and retry_after > self.backoff_cap):
+                logger.warning("%s still throttled after %d attempt(s): %s", provider, attempt + 1,
+                               getattr(outcome, "status_code", outcome))
+                if isinstance(outcome, Exception):
+                    raise outcome
+                return outcome
+
+            delay = backoff_delay(attempt, retry_after, self.backoff_base, self.backoff_cap)
+            with bucket._cond:
+                bucket.retries += 1
+            logger.info("%s throttled (%s); retry %d/%d in %.2fs", provider,
+                        getattr(outcome, "status_code", type(outcome).__name__), attempt + 1,
+                        self.max_retries, delay)
+            if retry_after is not None:
+                # The provider named a wait: hold everyone queued on it; our next acquire() waits it out.
+                bucket.pause(delay)
+            else:
+                self._sleep(delay)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            buckets = dict(self._buckets)
+        return {provider: bucket.stats() for provider, bucket in buckets.items()}
+
+
+_default_limiter = RateLimiter()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Return the process-wide limiter shared by the data fetchers and agents."""
+    return _default_limiter
@@ -0,0 +1,156 @@
+# utils/resample.py
+"""
+OHLCV Resampling
+----------------
+
+Derives coarser bars from a finer base series, so one cached download at the
+base resolution serves every timeframe (5m, 15m, 30m, 1h, 1d, 1wk, 1mo).
+
+Aggregation per output bar: Open = first, High = max, Low = min, Close /
+Adj Close = last, Volume / Dividends / Capital Gains = sum, Stock Splits =
+product of the split ratios (0 = none), exactly like the provider's own bars.
+
+Bins follow session boundaries in the exchange time zone of the index:
+- Intraday targets never span two sessions. Bins are anchored at each session's
+  first bar (09:30 for US equities), so 1h bars are 09:30, 10:30, ... like
+  Yahoo's, and the last bar of a session may be short.
+- Daily bars are one per session date, labelled at local midnight.
+- Weekly bars are labelled on the Monday of the week, monthly bars on the 1st.
+
+base_interval() picks the base resolution for a request: the finest interval of
+OHLCV_BASE_INTERVALS that divides the target and whose provider lookback
+(e.g. 60 days for 5m bars) covers the requested period. Daily-and-longer
+targets only come from intraday bases with OHLCV_DAILY_FROM_INTRADAY=1: summed
+intraday volume misses auction prints, so by default they come from 1d bars.
+
+Example Usage:
+
+    hourly = resample_ohlcv(five_minute_bars, "1h")
+    weekly = resample_ohlcv(daily_bars, "1wk")
+    base_interval("5d", "1h")   # "5m"
+"""
+
+from __future__ import annotations
+
+import os
+from typing import Dict, Optional
+
+import pandas as pd
+
+from utils.ohlcv_cache import period_start
+
+OHLCV_BASE_INTERVALS = [i.strip() for i in os.getenv("OHLCV_BASE_INTERVALS", "5m,1h,1d").split(",") if i.strip()]
+OHLCV_DAILY_FROM_INTRADAY = os.getenv("OHLCV_DAILY_FROM_INTRADAY", "0") == "1"
+
+INTRADAY: Dict[str, pd.Timedelta] = {
+    "1m": pd.Timedelta(minutes=1), "2m": pd.Timedelta(minutes=2), "5m": pd.Timedelta(minutes=5),
+    "15m": pd.Timedelta(minutes=15), "30m": pd.Timedelta(minutes=30), "60m": pd.Timedelta(hours=1),
+    "90m": pd.Timedelta(minutes=90), "1h": pd.Timedelta(hours=1),
+}
+CALENDAR = ("1d", "1wk", "1mo")  # Session-calendar targets, coarsest last
+
+# How far back the provider serves each intraday resolution, and the period a
+# base series is downloaded with so later, shorter requests are cache hits.
+PROVIDER_LOOKBACK = {"1m": pd.Timedelta(days=7), "2m": pd.Timedelta(days=60), "5m": pd.Timedelta(days=60),
+                     "15m": pd.Timedelta(days=60), "30m": pd.Timedelta(days=60), "90m": pd.Timedelta(days=60),
+                     "60m": pd.Timedelta(days=730), "1h": pd.Timedelta(days=730)}
+BASE_PERIODS = {"1m": "5d", "2m": "1mo", "5m": "1mo", "15m": "1mo", "30m": "1mo", "90m": "1mo",
+                "60m": "1y", "1h": "1y", "1d": "1y"}
+
+
+def _rank(interval: str) -> Optional[int]:
+    """Order of an interval from finest to coarsest; None if not resamplable."""
+    if interval in INTRADAY:
+        return int(INTRADAY[interval] / pd.Timedelta(minutes=1))
+    if interval in CALENDAR:
+        return 10 ** 6 * (CALENDAR.index(interval) + 1)
+    return None
+
+
+def can_derive(base: str, target: str) -> bool:
+    """True when `target` bars can be aggregated from `base` bars."""
+    if base == target:
+        return True
+    if _rank(base) is None or _rank(target) is None or _rank(base) > _rank(target):
+        return False
+    if target in INTRADAY:
+        return INTRADAY[target] % INTRADAY[base] == pd.Timedelta(0)
+    if base in INTRADAY:
+        return OHLCV_DAILY_FROM_INTRADAY
+    return base == "1d"  # 1wk / 1mo from daily bars
+
+
+def base_interval(period: str, interval: str, bases=None, now: Optional[pd.Timestamp] = None) -> str:
+    """Finest configured base that can produce `interval` over `period` (else `interval` itself)."""
+    try:
+        start = period_start(period, now)
+    except ValueError:
+        return interval
+    span = None if start is None else (now if now is not None else pd.Timestamp.now(tz="UTC")) - start
+    for base in OHLCV_BASE_INTERVALS if bases is None else bases:
+        if not can_derive(base, interval):
+            continue
+        lookback = PROVIDER_LOOKBACK.get(base)
+        if lookback is not None and (span is None or span > lookback):
+            continue
+        return base
+    return interval
+
+
+def base_period(period: str, base: str) -> str:
+    """Period to download the base series with: the request's, or BASE_PERIODS[base] if that is longer."""
+    default = BASE_PERIODS.get(base)
+    if default is None:
+        return period
+    now = pd.Timestamp.now(tz="UTC")
+    try:
+        start = period_start(period, now)
+    except ValueError:
+        return period
+    return period if start is None or start < period_start(default, now) else default
+
+
+def _labels(index: pd.DatetimeIndex, interval: str) -> pd.DatetimeIndex:
+    """Start of the output bar each input bar belongs to."""
+    sessions = index.normalize()
+    if interval in INTRADAY:
+        ts = pd.Series(index, index=index)
+        first = ts.groupby(sessions).transform("min")  # Session open
+        step = INTRADAY[interval]
+        return pd.DatetimeIndex(first + (ts - first) // step * step)
+    if interval == "1d":
+        return sessions
+    # Calendar arithmetic on wall-clock dates, so DST changes cannot shift labels off midnight.
+    local = sessions.tz_localize(None) if index.tz is not None else sessions
+    if interval == "1wk":
+        local = local - pd.to_timedelta(local.dayofweek, unit="D")
+    elif interval == "1mo":
+        local = local - pd.to_timedelta(local.day - 1, unit="D")
+    else:
+        raise ValueError(f"Cannot resample to {interval!r}")
+    return local.tz_localize(index.tz) if index.tz is not None else local
+
+
+def resample_ohlcv(df: pd.DataFrame, interval: str) -> pd.DataFrame:
+    """Aggregate OHLCV bars (sorted DatetimeIndex) into `interval` bars."""
+    if df.empty:
+        return df
+    labels = _labels(df.index, interval)
+    grouped = df.groupby(labels, sort=True)
+    out = {}
+    for column in df.columns:
+        if column == "Open":
+            out[column] = grouped[column].first()
+        elif column == "High":
+            out[column] = grouped[column].max()
+        elif column == "Low":
+            out[column] = grouped[column].min()
+        elif column in ("Volume", "Dividends", "Capital Gains"):
+            out[column] = grouped[column].sum()
+        elif column == "Stock Splits":
+            out[column] = df[column].replace(0, 1).groupby(labels, sort=True).prod().replace(1, 0)
+        else:  # Close, Adj Close and anything else: value at the end of the bar
+            out[column] = grouped[column].last()
+    result = pd.DataFrame(out)[list(df.columns)]
+    result.index.name = df.index.name if interval in INTRADAY else "Date"
+    return result
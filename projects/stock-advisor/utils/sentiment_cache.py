@@ -0,0 +1,174 @@
+# utils/sentiment_cache.py
+"""
+Headline Sentiment Cache
+------------------------
+
+Persistent store of LLM sentiment labels keyed by a hash of the normalized
+headline, so the same wire story seen for several tickers, or again on the
+next refresh, is classified once.
+
+Normalization lowercases, drops a trailing " - Source" attribution, strips
+punctuation and collapses whitespace, so syndicated copies of a headline share
+one key. The attribution is only dropped when it names the article's source
+(NewsAPI source.name) or one of NEWS_SOURCES, so a trailing clause such as
+"- markets tumble" stays part of the key. Each row also keeps the prompt/completion tokens its classification
+cost (its share of the batch), which is what a later hit saves.
+
+Backed by SQLite in WAL mode like core.memory_manager, so threads and worker
+processes can share one file.
+
+Example Usage:
+
+    cache = get_sentiment_cache()
+    label = cache.get("Apple stock hits record high")           # "Positive", or None on a miss
+    labels = cache.get_many([headline_key(t) for t in texts])   # {key: label} for hits
+    key = headline_key("Apple stock hits record high - Reuters")   # same key as without " - Reuters"
+    cache.stats()   # {"hits", "misses", "hit_rate", "tokens_used", "tokens_saved", "entries"}
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+logger.setLevel(os.getenv("LOG_LEVEL", "INFO"))
+
+SENTIMENT_CACHE_PATH = os.getenv("SENTIMENT_CACHE_PATH", os.path.join(".cache", "sentiment.db"))
+
+# Outlets whose trailing " - Name" attribution is dropped even without the article's source.
+NEWS_SOURCES = frozenset(
+    name.strip().lower()
+    for name in os.getenv(
+        "NEWS_SOURCES",
+        "Reuters,Bloomberg,CNBC,MarketWatch,Yahoo Finance,Barron's,The Wall Street Journal,WSJ,"
+        "Financial Times,FT,Forbes,Business Insider,Fox Business,Investopedia,Motley Fool,"
+        "The Motley Fool,Seeking Alpha,Benzinga,Zacks,TheStreet,Associated Press,AP,CNN,CNN Business",
+    ).split(",")
+    if name.strip()
+)
+
+_ATTRIBUTION = re.compile(r"\s+[-|–—]\s+([^-|–—]{1,40})$")
+_PUNCTUATION = re.compile(r"[^\w\s%$.]|(?<!\d)\.|\.(?!\d)")
+
+
+def normalize_headline(text: str, source: Optional[str] = None) -> str:
+    """Canonical form of a headline used for cache keys (`source`: the article's outlet name)."""
+    text = (text or "").strip()
+    match = _ATTRIBUTION.search(text)
+    if match:
+        name = match.group(1).strip().lower()
+        if name in NEWS_SOURCES or (source and name == source.strip().lower()):
+            text = text[:match.start()]
+    text = _PUNCTUATION.sub(" ", text.lower())
+    return " ".join(text.split())
+
+
+def headline_key(text: str, source: Optional[str] = None) -> str:
+    return hashlib.sha1(normalize_headline(text, source).encode("utf-8")).hexdigest()
+
+
+class SentimentCache:
+    """
+    Methods:
+        get_many(headlines): {key: label} for cached headlines (counts hits/misses).
+        put_many(labels, tokens): Store {key: label}, each costing `tokens`.
+        stats(): Hit rate and token accounting for this process.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path or SENTIMENT_CACHE_PATH)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS headline_sentiment (
+                key        TEXT PRIMARY KEY,
+                label      TEXT NOT NULL,
+                model      TEXT,
+                tokens     REAL NOT NULL DEFAULT 0,
+                created_at REAL NOT NULL
+            ) WITHOUT ROWID
+            """
+        )
+        self.hits = 0
+        self.misses = 0
+        self.tokens_used = 0.0
+        self.tokens_saved = 0.0
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, str]:
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        with self._lock:
+            # Chunked to stay under SQLite's bound-parameter limit.
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                rows = self._conn.execute(
+                    f"SELECT key, label, tokens FROM headline_sentiment WHERE key IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+                for key, label, tokens in rows:
+                    found[key] = label
+                    self.tokens_saved += tokens
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def get(self, text: str) -> Optional[str]:
+        key = headline_key(text)
+        return self.get_many([key]).get(key)
+
+    def put_many(self, labels: Dict[str, str], tokens: float = 0.0, model: Optional[str] = None):
+        """Store labels; `tokens` is the per-headline cost of classifying them."""
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO headline_sentiment (key, label, model, tokens, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(key, label, model, tokens, now) for key, label in labels.items()],
+            )
+            self.tokens_used += tokens * len(labels)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM headline_sentiment").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "tokens_used": int(self.tokens_used),
+            "tokens_saved": int(self.tokens_saved),
+            "entries": entries,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM headline_sentiment")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_default_cache: Optional[SentimentCache] = None
+_default_lock = threading.Lock()
+
+
+def get_sentiment_cache() -> SentimentCache:
+    """Return the process-wide SentimentCache at SENTIMENT_CACHE_PATH."""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = SentimentCache()
+    return _default_cache
@@ -0,0 +1,155 @@
+# utils/singleflight.py
+"""
+Single-Flight Request Coalescing
+--------------------------------
+
+When several agents/users ask for the same data at the same moment, only the
+first caller (the "leader") runs the provider request; everyone else asking for
+the same key while it is in flight waits for and receives the leader's result
+(or exception). Nothing is cached afterwards: the next call after completion
+starts a new flight.
+
+Works for threaded and asyncio callers (and a mix of both) because each flight
+is a concurrent.futures.Future: threads block on .result(), coroutines await
+asyncio.wrap_future().
+
+Example Usage:
+
+    from utils.singleflight import coalesce
+
+    @coalesce(lambda ticker, period="1y": ("history", ticker.upper(), period))
+    def history(ticker, period="1y"):
+        ...
+
+    history.flight.stats()  # {"calls": .., "executions": .., "coalesced": .., ...}
+"""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import functools
+import logging
+import os
+import threading
+from collections import Counter
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+logger = logging.getLogger(__name__)
+logger.setLevel(os.getenv("LOG_LEVEL", "INFO"))
+
+
+def _share(value):
+    """Followers get their own copy of mutable frames so one caller can't mutate another's result."""
+    return value.copy() if hasattr(value, "copy") and callable(value.copy) else copy.copy(value)
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key into one execution.
+
+    Counters:
+        calls: total do()/do_async() calls
+        executions: calls that actually ran the function (leaders)
+        coalesced: calls that piggy-backed on an in-flight execution
+        coalesced_by_name: coalesced counts per key[0] (usually the function name)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight: Dict[Hashable, Future] = {}
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+        self.coalesced_by_name: Counter = Counter()
+
+    def _join(self, key: Hashable) -> Tuple[Future, bool]:
+        with self._lock:
+            self.calls += 1
+            future = self._inflight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                self.coalesced_by_name[key[0] if isinstance(key, tuple) and key else key] += 1
+                return future, False
+            future = Future()
+            self._inflight[key] = future
+            self.executions += 1
+            return future, True
+
+    def _finish(self, key: Hashable, future: Future, fn: Callable, args, kwargs):
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            with self._lock:
+                del self._inflight[key]
+            future.set_exception(e)
+            raise
+        with self._lock:
+            del self._inflight[key]
+        future.set_result(result)
+        return result
+
+    def do(self, key: Hashable, fn: Callable, *args, **kwargs) -> Any:
+        """Run fn(*args, **kwargs) unless an identical call is in flight; then wait for it."""
+        future, leader = self._join(key)
+        if leader:
+            return self._finish(key, future, fn, args, kwargs)
+        logger.debug("Coalesced call for %s", key)
+        return _share(future.result())
+
+    async def do_async(self, key: Hashable, fn: Callable, *args, **kwargs) -> Any:
+        """
+        Async variant: the leader runs the (blocking) fn on a worker thread; followers,
+        async or threaded, share its result without blocking the event loop.
+        """
+        future, leader = self._join(key)
+        if leader:
+            return await asyncio.to_thread(self._finish, key, future, fn, args, kwargs)
+        logger.debug("Coalesced async call for %s", key)
+        return _share(await asyncio.wrap_future(future))
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._inflight)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "executions": self.executions,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._inflight),
+                "coalesced_by_name": dict(self.coalesced_by_name),
+            }
+
+
+_default_flight = SingleFlight()
+
+
+def get_singleflight() -> SingleFlight:
+    """Return the process-wide SingleFlight shared by the data fetchers."""
+    return _default_flight
+
+
+def coalesce(key_fn: Callable[..., Hashable], flight: SingleFlight = None):
+    """
+    Decorator: route calls through `flight` (default: the process-wide one),
+    keyed by key_fn(*args, **kwargs). The wrapper exposes `.flight` and an
+    awaitable `.aio(*args, **kwargs)` for asyncio callers.
+    """
+    flight = flight or _default_flight
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            return flight.do(key_fn(*args, **kwargs), fn, *args, **kwargs)
+
+        async def aio(*args, **kwargs):
+            return await flight.do_async(key_fn(*args, **kwargs), fn, *args, **kwargs)
+
+        wrapper.flight = flight
+        wrapper.aio = aio
+        return wrapper
+
+    return decorator
@@ -0,0 +1,220 @@
+# utils/statement_cache.py
+"""
+Financial Statement Cache
+-------------------------
+
+Persistent per-ticker store for financial statements (income statement,
+balance sheet, cash flow), keyed by ticker, frequency (annual / quarterly) and
+fiscal period. DataAgent.financials, FundamentalAgent and the bulk fetchers
+all read through it, so a statement is downloaded once and shared.
+
+    <cache_dir>/<TICKER>/<frequency>.json   # every statement, one column per fiscal period
+
+Refresh policy: statements only change when a company files. A cached set is
+served until the next filing is due (latest fiscal period end + one period +
+the filing lag); after that the provider is asked at most once per
+STATEMENT_RECHECK_HOURS until a newer period shows up. Downloaded periods are
+merged into the cached ones (restated values win), so history accumulates
+beyond the four periods Yahoo returns at a time.
+
+Notes:
+- The provider call is injected, so this module has no yfinance dependency.
+- Writes go through a temp file + os.replace (utils.ohlcv_cache.atomic_write).
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from datetime import timedelta
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.ohlcv_cache import atomic_write
+
+logger = logging.getLogger(__name__)
+logger.setLevel(os.getenv("LOG_LEVEL", "INFO"))
+
+STATEMENT_CACHE_DIR = os.getenv("STATEMENT_CACHE_DIR", os.path.join(".cache", "statements"))
+STATEMENT_CACHE_ENABLED = os.getenv("STATEMENT_CACHE", "1") != "0"
+STATEMENT_RECHECK = timedelta(hours=float(os.getenv("STATEMENT_RECHECK_HOURS", "24")))
+
+STATEMENTS = ("financials", "balance_sheet", "cashflow", "earnings")
+FREQUENCIES = ("annual", "quarterly")
+
+# yfinance Ticker attribute per (frequency, statement). "earnings" is the income
+# statement: Ticker.earnings is deprecated upstream.
+YF_ATTRIBUTES = {
+    "annual": {"financials": "financials", "balance_sheet": "balance_sheet",
+               "cashflow": "cashflow", "earnings": "income_stmt"},
+    "quarterly": {"financials": "quarterly_financials", "balance_sheet": "quarterly_balance_sheet",
+                  "cashflow": "quarterly_cashflow", "earnings": "quarterly_income_stmt"},
+}
+
+# Period length and how long after a period ends its filing usually appears.
+FILING_INTERVAL = {"annual": timedelta(days=365), "quarterly": timedelta(days=91)}
+FILING_LAG = {"annual": timedelta(days=90), "quarterly": timedelta(days=45)}
+
+
+def _period_label(col) -> str:
+    return pd.Timestamp(col).date().isoformat() if isinstance(col, (pd.Timestamp, np.datetime64)) else str(col)
+
+
+def _period_value(label: str):
+    try:
+        return pd.Timestamp(label)
+    except (TypeError, ValueError):
+        return label
+
+
+def _encode(df: pd.DataFrame) -> Dict:
+    values = df.to_numpy(dtype="float64", na_value=np.nan)
+    return {
+        "periods": [_period_label(c) for c in df.columns],
+        "items": [str(i) for i in df.index],
+        "values": [[None if np.isnan(v) else float(v) for v in row] for row in values],
+    }
+
+
+def _decode(payload: Dict) -> pd.DataFrame:
+    columns = [_period_value(p) for p in payload["periods"]]
+    values = np.array([[np.nan if v is None else v for v in row] for row in payload["values"]], dtype="float64")
+    return pd.DataFrame(values.reshape(len(payload["items"]), len(columns)), index=payload["items"], columns=columns)
+
+
+def latest_period(statements: Dict[str, pd.DataFrame]) -> Optional[pd.Timestamp]:
+    """Most recent fiscal period end across statements (None if no dated periods)."""
+    dates = [c for df in statements.values() if isinstance(df, pd.DataFrame) for c in df.columns
+             if isinstance(c, pd.Timestamp)]
+    return max(dates) if dates else None
+
+
+def merge_periods(cached: pd.DataFrame, fresh: pd.DataFrame) -> pd.DataFrame:
+    """Union of fiscal periods and line items; values from `fresh` win. Newest period first."""
+    if cached is None or cached.empty:
+        merged = fresh
+    elif fresh is None or fresh.empty:
+        merged = cached
+    else:
+        merged = fresh.combine_first(cached)
+    if all(isinstance(c, pd.Timestamp) for c in merged.columns):
+        merged = merged[sorted(merged.columns, reverse=True)]
+    return merged
+
+
+class StatementCache:
+    """
+    Disk-backed statement store.
+
+    Methods:
+        get(ticker, download, statements, frequency): Cached-or-refreshed statements.
+        load(ticker, frequency): Cached statements and metadata, no network.
+        store(ticker, frequency, statements): Merge and persist statements.
+        invalidate(ticker): Drop a ticker's cached statements.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, recheck: timedelta = STATEMENT_RECHECK):
+        self.cache_dir = Path(cache_dir or STATEMENT_CACHE_DIR)
+        self.recheck = recheck
+        self._lock = threading.Lock()
+
+    def _path(self, ticker: str, frequency: str) -> Path:
+        return self.cache_dir / ticker.upper() / f"{frequency}.json"
+
+    def load(self, ticker: str, frequency: str = "annual") -> Tuple[Dict[str, pd.DataFrame], Optional[Dict]]:
+        try:
+            with open(self._path(ticker, frequency), "r") as f:
+                payload = json.load(f)
+        except (OSError, ValueError) as e:
+            if not isinstance(e, FileNotFoundError):
+                logger.warning("Unreadable statement cache for %s (%s): %s", ticker, frequency, e)
+            return {}, None
+        return {name: _decode(body) for name, body in payload["statements"].items()}, payload["meta"]
+
+    def store(self, ticker: str, frequency: str, statements: Dict[str, pd.DataFrame],
+              checked_at: Optional[float] = None) -> Dict[str, pd.DataFrame]:
+        """Merge `statements` into the cached periods, persist, and return the merged set."""
+        path = self._path(ticker, frequency)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            cached, _ = self.load(ticker, frequency)
+            merged = dict(cached)
+            for name, df in statements.items():
+                if isinstance(df, pd.DataFrame):
+                    merged[name] = merge_periods(cached.get(name), df)
+            latest = latest_period(merged)
+            payload = {
+                "meta": {
+                    "ticker": ticker.upper(),
+                    "frequency": frequency,
+                    "latest_period": latest.isoformat() if latest is not None else None,
+                    "checked_at": checked_at if checked_at is not None else time.time(),
+                },
+                "statements": {name: _encode(df) for name, df in merged.items()},
+            }
+            atomic_write(path, lambda f: f.write(json.dumps(payload).encode()))
+        return merged
+
+    def invalidate(self, ticker: str):
+        for path in (self.cache_dir / ticker.upper()).glob("*.json"):
+            path.unlink()
+
+    def next_filing(self, meta: Dict) -> Optional[pd.Timestamp]:
+        """When the next filing after the cached latest period is expected."""
+        if not meta or not meta.get("latest_period"):
+            return None
+        frequency = meta.get("frequency", "annual")
+        return pd.Timestamp(meta["latest_period"]) + FILING_INTERVAL[frequency] + FILING_LAG[frequency]
+
+    def is_fresh(self, meta: Optional[Dict], now: Optional[float] = None) -> bool:
+        if not meta:
+            return False
+        now = time.time() if now is None else now
+        due = self.next_filing(meta)
+        if due is not None and pd.Timestamp(now, unit="s") < due:
+            return True
+        return now - meta.get("checked_at", 0) < self.recheck.total_seconds()
+
+    def get(self, ticker: str, download: Callable[[Iterable[str]], Dict[str, pd.DataFrame]],
+            statements: Optional[Iterable[str]] = None, frequency: str = "annual") -> Dict[str, pd.DataFrame]:
+        """
+        Statements for a ticker, downloading (download(names) -> name -> DataFrame)
+        only when a new filing may exist or a requested statement was never cached.
+        """
+        names = list(statements or STATEMENTS)
+        cached, meta = self.load(ticker, frequency)
+        missing = [n for n in names if n not in cached]
+        if self.is_fresh(meta) and not missing:
+            logger.debug("Statement cache hit for %s (%s)", ticker, frequency)
+            return {n: cached[n] for n in names}
+
+        wanted = names if not self.is_fresh(meta) else missing
+        logger.info("Refreshing %s statements for %s (%s)", frequency, ticker, ", ".join(wanted))
+        fresh = download(wanted)
+        if not any(isinstance(df, pd.DataFrame) and not df.empty for df in fresh.values()):
+            # Nothing came back (provider hiccup or unknown ticker): keep what we had, record nothing.
+            logger.warning("No %s statements returned for %s", frequency, ticker)
+            return {n: cached.get(n, pd.DataFrame()) for n in names}
+        merged = self.store(ticker, frequency, fresh)
+        before = meta.get("latest_period") if meta else None
+        after = latest_period(merged)
+        if before and after is not None and after.isoformat() != before:
+            logger.info("New %s filing for %s: %s", frequency, ticker, after.date())
+        return {n: merged.get(n, pd.DataFrame()) for n in names}
+
+
+_default_cache: Optional[StatementCache] = None
+
+
+def get_statement_cache() -> StatementCache:
+    """Return the process-wide StatementCache rooted at STATEMENT_CACHE_DIR."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = StatementCache()
+    return _default_cache
@@ -0,0 +1,315 @@
+# utils/symbol_index.py
+"""
+Symbol Index
+------------
+
+Local company-name -> ticker lookup, so resolving "apple" or "bank of america"
+does not cost a Yahoo search round trip.
+
+Sources (loaded in this order, earlier entries rank first):
+- Bundled listing: data/symbols.csv (large caps, ETFs, crypto with common
+  aliases such as "google" -> GOOGL, "facebook" -> META).
+- Refreshed listing: <SYMBOL_INDEX_DIR>/listing.csv, written by refresh_listing()
+  from the Nasdaq Trader symbol directory (all NASDAQ / NYSE / NYSE Arca / Cboe
+  listings).
+- Learned entries: <SYMBOL_INDEX_DIR>/learned.csv. Hits confirmed by the remote
+  Yahoo search are appended here, with the query that found them as an alias.
+
+Lookups:
+- Exact symbol ("msft") first.
+- Prefix trie over normalized names, aliases, their words and symbols:
+  "micro" -> MSFT, MU, AMD...; "bank of am" -> BAC. Multi-word queries intersect
+  the per-word prefix matches ("morgan st" -> MS).
+- Fuzzy fallback: character trigram index scored by Dice coefficient, for
+  typos ("mircosoft" -> MSFT). search(..., fuzzy=False) skips it; the ticker
+  search only uses it when the remote search is off or fails.
+
+Names are normalized before indexing and lookup: lower case, "&" -> "and",
+punctuation removed, corporate suffixes ("Inc.", "Corporation", "Class A",
+"- Common Stock") dropped.
+
+Example Usage:
+
+    index = get_symbol_index()
+    index.search("alphabet")        # [{"symbol": "GOOGL", "shortname": "Alphabet Inc. Class A", ...}, ...]
+    refresh_listing()               # optional: index every US listing
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import logging
+import os
+import re
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+logger.setLevel(os.getenv("LOG_LEVEL", "INFO"))
+
+SYMBOL_LISTING_PATH = os.getenv(
+    "SYMBOL_LISTING_PATH", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "symbols.csv"))
+SYMBOL_INDEX_DIR = os.getenv("SYMBOL_INDEX_DIR", os.path.join(".cache", "symbols"))
+SYMBOL_INDEX_ENABLED = os.getenv("SYMBOL_INDEX_ENABLED", "true").lower() not in ("0", "false", "no")
+
+FIELDS = ["symbol", "name", "exchange", "type", "aliases"]
+MAX_IDS_PER_NODE = 32      # Best-ranked entries kept per trie node
+FUZZY_THRESHOLD = 0.45     # Minimum trigram Dice similarity for a fuzzy hit
+MIN_FUZZY_LENGTH = 3
+
+NASDAQ_TRADER_URLS = {
+    "nasdaq": "https://www.nasdaqtrader.com/dynamic/SymDir/nasdaqlisted.txt",
+    "other": "https://www.nasdaqtrader.com/dynamic/SymDir/otherlisted.txt",
+}
+NASDAQ_TRADER_EXCHANGES = {"A": "NYSE American", "N": "NYSE", "P": "NYSE Arca", "Z": "Cboe BZX", "V": "IEX"}
+
+_SUFFIX = re.compile(r"\s+-\s+.*$|\s+class\s+[a-z]\b.*$")
+_STOPWORDS = frozenset({"inc", "incorporated", "corp", "corporation", "co", "company", "ltd", "limited", "plc",
+                        "llc", "lp", "sa", "nv", "ag", "se", "the", "holdings", "holding", "common", "stock",
+                        "ordinary", "shares", "adr", "ads"})
+
+
+def normalize(text: str) -> str:
+    """Lower-case words of a company name without punctuation or corporate suffixes."""
+    text = _SUFFIX.sub("", (text or "").lower()).replace("&", " and ").replace("'", "")
+    words = re.sub(r"[^a-z0-9]+", " ", text).split()
+    kept = [w for w in words if w not in _STOPWORDS]
+    return " ".join(kept or words)
+
+
+def _trigrams(text: str) -> set:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class _Node:
+    __slots__ = ("children", "ids")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        self.ids: List[int] = []
+
+
+class SymbolIndex:
+    """
+    In-memory symbol directory.
+
+    Methods:
+        add(entries): Index listing rows (dicts with FIELDS); returns how many were new.
+        search(query, limit): Ranked matches as Yahoo-search-shaped dicts.
+        learn(query, results): Add remote hits, with `query` as an alias, and persist them.
+    """
+
+    def __init__(self, entries: Iterable[dict] = (), learned_path: Optional[str] = None):
+        self.learned_path = learned_path
+        self._entries: List[dict] = []
+        self._by_symbol: Dict[str, int] = {}
+        self._keys: List[List[str]] = []              # Normalized name + aliases per entry
+        self._root = _Node()
+        self._grams: Dict[str, set] = defaultdict(set)
+        self._lock = threading.Lock()
+        self.add(entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # -----------------------
+    # Building
+    # -----------------------
+    def _insert(self, key: str, i: int):
+        node = self._root
+        for ch in key:
+            node = node.children.get(ch) or node.children.setdefault(ch, _Node())
+            if len(node.ids) < MAX_IDS_PER_NODE and i not in node.ids:
+                node.ids.append(i)
+
+    def _index_keys(self, i: int, keys: Iterable[str]):
+        for key in keys:
+            if not key or key in self._keys[i]:
+                continue
+            self._keys[i].append(key)
+            self._insert(key, i)
+            for word in key.split()[1:]:
+                self._insert(word, i)
+            for gram in _trigrams(key):
+                self._grams[gram].add(i)
+
+    def add(self, entries: Iterable[dict]) -> int:
+        added = 0
+        with self._lock:
+            for row in entries:
+                symbol = (row.get("symbol") or "").strip().upper()
+                if not symbol:
+                    continue
+                aliases = row.get("aliases") or []
+                if isinstance(aliases, str):
+                    aliases = aliases.split("|")
+                keys = [normalize(row.get("name") or "")] + [normalize(a) for a in aliases]
+                i = self._by_symbol.get(symbol)
+                if i is None:
+                    i = self._by_symbol[symbol] = len(self._entries)
+                    self._entries.append({"symbol": symbol, "shortname": row.get("name") or symbol,
+                                          "exch": row.get("exchange") or row.get("exch"),
+                                          "type": row.get("type")})
+                    self._keys.append([])
+                    self._insert(symbol.lower(), i)
+                    added += 1
+                self._index_keys(i, keys)
+        return added
+
+    # -----------------------
+    # Lookup
+    # -----------------------
+    def _prefix(self, key: str) -> List[int]:
+        node = self._root
+        for ch in key:
+            node = node.children.get(ch)
+            if node is None:
+                return []
+        return node.ids
+
+    def _fuzzy(self, q: str, limit: int) -> List[int]:
+        grams = _trigrams(q)
+        overlap: Dict[int, int] = defaultdict(int)
+        for gram in grams:
+            for i in self._grams.get(gram, ()):
+                overlap[i] += 1
+        scored = []
+        floor = FUZZY_THRESHOLD * len(grams) / 2  # Dice >= threshold needs at least this many shared grams
+        for i, shared in overlap.items():
+            if shared < floor:
+                continue
+            best = max(2 * len(grams & _trigrams(k)) / (len(grams) + len(_trigrams(k))) for k in self._keys[i])
+            if best >= FUZZY_THRESHOLD:
+                scored.append((-best, i))
+        return [i for _, i in sorted(scored)[:limit]]
+
+    def search(self, query: str, limit: int = 5, fuzzy: bool = True) -> List[dict]:
+        """
+        Exact and prefix matches; with `fuzzy`, trigram matches when there are none.
+        Fuzzy hits are guesses ("american airlines" -> AXP when AAL is not
+        indexed), so callers with a better source should ask it first.
+        """
+        q = normalize(query)
+        if not q:
+            return []
+        ranked: Dict[int, int] = {}  # entry -> rank (lower first); dicts keep first-seen order for ties
+
+        exact = self._by_symbol.get(query.strip().upper())
+        if exact is not None:
+            ranked[exact] = 0
+        for i in self._prefix(q):
+            ranked.setdefault(i, 1 if q in self._keys[i] else 2)
+        words = q.split()
+        if len(words) > 1:
+            common = set(self._prefix(words[0]))
+            for word in words[1:]:
+                common &= set(self._prefix(word))
+            for i in self._prefix(words[0]):
+                if i in common:
+                    ranked.setdefault(i, 3)
+        if fuzzy and not ranked and len(q) >= MIN_FUZZY_LENGTH:
+            for i in self._fuzzy(q, limit):
+                ranked.setdefault(i, 4)
+
+        order = sorted(ranked, key=ranked.__getitem__)[:limit]
+        return [dict(self._entries[i]) for i in order]
+
+    # -----------------------
+    # Learning
+    # -----------------------
+    def learn(self, query: str, results: List[dict]) -> int:
+        """Index remote hits; the top hit also gets `query` as an alias."""
+        rows = [{"symbol": r.get("symbol"), "name": r.get("shortname"), "exchange": r.get("exch"),
+                 "type": r.get("type"), "aliases": query if n == 0 else ""}
+                for n, r in enumerate(results) if r.get("symbol")]
+        if not rows:
+            return 0
+        added = self.add(rows)
+        if self.learned_path:
+            try:
+                os.makedirs(os.path.dirname(self.learned_path) or ".", exist_ok=True)
+                new_file = not os.path.exists(self.learned_path)
+                with self._lock, open(self.learned_path, "a", newline="", encoding="utf-8") as f:
+                    writer = csv.DictWriter(f, fieldnames=FIELDS)
+                    if new_file:
+                        writer.writeheader()
+                    writer.writerows(rows)
+            except OSError as e:
+                logger.warning("Could not persist learned symbols: %s", e)
+        return added
+
+
+def read_listing(path: str) -> List[dict]:
+    """Rows of a listing CSV (FIELDS columns); [] when the file does not exist."""
+    try:
+        with open(path, newline="", encoding="utf-8") as f:
+            return list(csv.DictReader(f))
+    except FileNotFoundError:
+        return []
+
+
+def _parse_nasdaq_trader(text: str, source: str) -> List[dict]:
+    rows = []
+    for rec in csv.DictReader(io.StringIO(text), delimiter="|"):
+        symbol = rec.get("Symbol") or rec.get("ACT Symbol")
+        if not symbol or symbol.startswith("File Creation Time") or rec.get("Test Issue") == "Y":
+            continue
+        exchange = "NASDAQ" if source == "nasdaq" else NASDAQ_TRADER_EXCHANGES.get(rec.get("Exchange"), rec.get("Exchange"))
+        rows.append({"symbol": symbol.replace(".", "-"), "name": rec.get("Security Name", ""),  # Yahoo style BRK-B
+                     "exchange": exchange, "type": "ETF" if rec.get("ETF") == "Y" else "EQUITY", "aliases": ""})
+    return rows
+
+
+def refresh_listing(directory: str = SYMBOL_INDEX_DIR) -> int:
+    """
+    Download the Nasdaq Trader symbol directory into <directory>/listing.csv and
+    reload the shared index. Returns the number of listings written.
+    """
+    import requests
+
+    from utils.rate_limiter import get_rate_limiter
+
+    rows = []
+    for source, url in NASDAQ_TRADER_URLS.items():
+        r = get_rate_limiter().call("nasdaqtrader", requests.get, url, timeout=30)
+        r.raise_for_status()
+        rows += _parse_nasdaq_trader(r.text, source)
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, "listing.csv")
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+    os.replace(tmp, path)
+    logger.info("Refreshed symbol listing: %d symbols", len(rows))
+
+    global _default_index
+    _default_index = None
+    return len(rows)
+
+
+def load_index(listing_path: str = SYMBOL_LISTING_PATH, directory: str = SYMBOL_INDEX_DIR) -> SymbolIndex:
+    learned = os.path.join(directory, "learned.csv")
+    index = SymbolIndex(read_listing(listing_path), learned_path=learned)
+    index.add(read_listing(os.path.join(directory, "listing.csv")))
+    index.add(read_listing(learned))
+    logger.debug("Symbol index loaded: %d symbols", len(index))
+    return index
+
+
+_default_index: Optional[SymbolIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_symbol_index() -> SymbolIndex:
+    """Shared index, built on first use."""
+    global _default_index
+    if _default_index is None:
+        with _index_lock:
+            if _default_index is None:
+                _default_index = load_index()
+    return _default_index
@@ -1,6 +1,7 @@
 from agents import function_tool, RunContextWrapper
 from contexts import UserContext
 from serpapi import GoogleSearch
+from tools.rate_limiter import RateLimiter
 import os
 import json
 
@@ -26,7 +27,7 @@ def get_weather_forecast(wrapper: RunContextWrapper[UserContext], city: str, dat
         "hl": "en"
     })
 
-    result = search.get_dict()
+    result = RateLimiter.call("serpapi", search.get_dict)
 
     # Attempt to parse structured weather snippet
     weather_info = ""
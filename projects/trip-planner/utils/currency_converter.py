@@ -1,5 +1,7 @@
 import requests
 
+from utils.rate_limiter import RateLimiter
+
 class CurrencyConverter:
     def __init__(self, api_key: str):
         self.base_url = f"https://v6.exchangerate-api.com/v6/{api_key}/latest/"
@@ -7,7 +9,7 @@ class CurrencyConverter:
     def convert(self, amount:float, from_currency:str, to_currency:str):
         """Convert the amount from one currency to another"""
         url = f"{self.base_url}/{from_currency}"
-        response = requests.get(url)
+        response = RateLimiter.call("exchangerate", requests.get, url)
         if response.status_code != 200:
             raise Exception("API call failed:", response.json())
         rates = response.json()["conversion_rates"]
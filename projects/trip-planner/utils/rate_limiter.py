@@ -0,0 +1,133 @@
+import email.utils
+import heapq
+import itertools
+import os
+import random
+import threading
+import time
+
+import requests
+
+
+class RateLimiter:
+    """
+    Paces calls per provider with a token bucket ("rate,burst" requests/second,
+    override with RATE_LIMIT_<PROVIDER>=rate,burst) and retries 429/5xx and
+    connection errors with jittered exponential backoff, honouring Retry-After.
+    Waiters are served by priority: INTERACTIVE calls go ahead of BATCH ones.
+
+    Usage:
+        response = RateLimiter.call("serper", requests.post, url, json=payload)
+    """
+
+    INTERACTIVE = 0
+    BATCH = 10
+    LIMITS = {
+        "yahoo": (2.0, 5),
+        "newsapi": (1.0, 5),
+        "serper": (5.0, 10),
+        "serpapi": (1.0, 5),
+        "openweathermap": (1.0, 10),
+        "exchangerate": (1.0, 5),
+    }
+    RETRY_STATUSES = {429, 502, 503, 504}
+    MAX_RETRIES = int(os.getenv("RATE_LIMIT_MAX_RETRIES", "4"))
+    BACKOFF_BASE = float(os.getenv("RATE_LIMIT_BACKOFF_BASE", "0.5"))
+    BACKOFF_CAP = float(os.getenv("RATE_LIMIT_BACKOFF_CAP", "30"))
+
+    _cond = threading.Condition()
+    _buckets = {}   # provider -> {"rate", "burst", "tokens", "updated", "paused_until", "waiters"}
+    _seq = itertools.count()
+
+    @classmethod
+    def _bucket(cls, provider):
+        bucket = cls._buckets.get(provider)
+        if bucket is None:
+            rate, burst = cls.LIMITS.get(provider, (1.0, 5))
+            override = os.getenv(f"RATE_LIMIT_{provider.upper()}")
+            if override:
+                rate, _, b = override.partition(",")
+                rate, burst = float(rate), float(b or burst)
+            bucket = cls._buckets[provider] = {
+                "rate": float(rate), "burst": max(1.0, float(burst)), "tokens": max(1.0, float(burst)),
+                "updated": time.monotonic(), "paused_until": 0.0, "waiters": [],
+            }
+        return bucket
+
+    @classmethod
+    def acquire(cls, provider, priority=INTERACTIVE):
+        """Block until `provider` has a token for this caller (priority, then arrival order)."""
+        ticket = (priority, next(cls._seq))
+        with cls._cond:
+            bucket = cls._bucket(provider)
+            heapq.heappush(bucket["waiters"], ticket)
+            while True:
+                now = time.monotonic()
+                if bucket["rate"] > 0:
+                    bucket["tokens"] = min(bucket["burst"],
+                                           bucket["tokens"] + (now - bucket["updated"]) * bucket["rate"])
+                bucket["updated"] = now
+                head = bucket["waiters"][0] == ticket
+                if head and now >= bucket["paused_until"] and (bucket["rate"] <= 0 or bucket["tokens"] >= 1):
+                    heapq.heappop(bucket["waiters"])
+                    bucket["tokens"] -= 1 if bucket["rate"] > 0 else 0
+                    cls._cond.notify_all()
+                    return
+                delay = None
+                if head:
+                    refill = (1 - bucket["tokens"]) / bucket["rate"] if bucket["rate"] > 0 else 0.0
+                    delay = max(bucket["paused_until"] - now, refill, 0.001)
+                cls._cond.wait(delay)
+
+    @classmethod
+    def _retry_after(cls, outcome):
+        """(should_retry, seconds) for a response or exception."""
+        response = outcome if isinstance(outcome, requests.Response) else getattr(outcome, "response", None)
+        status = getattr(response, "status_code", None)
+        if isinstance(status, int):
+            if status not in cls.RETRY_STATUSES:
+                return False, None
+            value = response.headers.get("Retry-After")
+            if value is None:
+                return True, None
+            try:
+                return True, max(0.0, float(value))
+            except ValueError:
+                try:
+                    return True, max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+                except (TypeError, ValueError):
+                    return True, None
+        if isinstance(outcome, (requests.ConnectionError, requests.Timeout)):
+            return True, None
+        if isinstance(outcome, Exception) and "Too Many Requests" in str(outcome):
+            return True, None
+        return False, None
+
+    @classmethod
+    def call(cls, provider, fn, *args, priority=INTERACTIVE, **kwargs):
+        """
+        Run fn(*args, **kwargs) under `provider`'s limit. After the last retry the
+        final response is returned (callers' raise_for_status still applies) or
+        the final exception is raised.
+        """
+        for attempt in range(cls.MAX_RETRIES + 1):
+            cls.acquire(provider, priority)
+            try:
+                outcome = fn(*args, **kwargs)
+            except Exception as e:
+                outcome = e
+            retry, retry_after = cls._retry_after(outcome)
+            if not retry or attempt == cls.MAX_RETRIES or (retry_after or 0) > cls.BACKOFF_CAP:
+                if isinstance(outcome, Exception):
+                    raise outcome
+                return outcome
+
+            if retry_after is not None:
+                # Hold everyone queued on this provider; the next acquire() waits it out.
+                with cls._cond:
+                    bucket = cls._bucket(provider)
+                    bucket["paused_until"] = max(bucket["paused_until"],
+                                                 time.monotonic() + retry_after + random.uniform(0, cls.BACKOFF_BASE))
+                    cls._cond.notify_all()
+            else:
+                time.sleep(random.uniform(0, min(cls.BACKOFF_CAP, cls.BACKOFF_BASE * 2 ** attempt)))
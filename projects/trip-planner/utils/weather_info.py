@@ -1,5 +1,7 @@
 import requests
 
+from utils.rate_limiter import RateLimiter
+
 class WeatherForecastTool:
     def __init__(self, api_key:str):
         self.api_key = api_key
@@ -13,7 +15,7 @@ class WeatherForecastTool:
                 "q": place,
                 "appid": self.api_key,
             }
-            response = requests.get(url, params=params)
+            response = RateLimiter.call("openweathermap", requests.get, url, params=params)
             return response.json() if response.status_code == 200 else {}
         except Exception as e:
             raise e
@@ -28,7 +30,7 @@ class WeatherForecastTool:
                 "cnt": 10,
                 "units": "metric"
             }
-            response = requests.get(url, params=params)
+            response = RateLimiter.call("openweathermap", requests.get, url, params=params)
             return response.json() if response.status_code == 200 else {}
         except Exception as e:
             raise e
\ No newline at end of file